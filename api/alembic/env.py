@@ -22,6 +22,16 @@ if db_url:
 
 target_metadata = SQLModel.metadata
 
+# Tables that live outside SQLModel.metadata and are managed by hand-written
+# migrations (FTS5 virtual table and its shadow tables, backup change log).
+_UNMANAGED_TABLE_PREFIXES = ("transaction_fts", "change_log")
+
+
+def include_name(name: str | None, type_: str, parent_names: object) -> bool:
+    if type_ == "table" and name is not None:
+        return not name.startswith(_UNMANAGED_TABLE_PREFIXES)
+    return True
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -30,6 +40,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         compare_type=True,
+        include_name=include_name,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -42,6 +53,7 @@ def do_run_migrations(connection: Connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
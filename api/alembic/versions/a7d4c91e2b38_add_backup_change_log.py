@@ -0,0 +1,84 @@
+"""add backup change log
+
+Revision ID: a7d4c91e2b38
+Revises: f3b8d2a61c47
+Create Date: 2026-10-19 16:02:45.118406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d4c91e2b38"
+down_revision: Union[str, Sequence[str], None] = "f3b8d2a61c47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TRACKED_TABLES = (
+    "account",
+    "budget",
+    "categorization_rule",
+    "category",
+    "csv_profile",
+    "processed_file",
+    "recurring_pattern",
+    "transaction",
+    "transfer_candidate",
+    "watch_folder_config",
+    "watch_settings",
+)
+
+
+def _log_change(table: str, ref: str, deleted: int) -> str:
+    return f"""INSERT INTO change_log(table_name, row_id, seq, deleted)
+        VALUES ('{table}', {ref}.id,
+                (SELECT coalesce(max(seq), 0) + 1 FROM change_log), {deleted})
+        ON CONFLICT(table_name, row_id)
+        DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted;"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (table_name, row_id)
+        ) WITHOUT ROWID
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_change_log_seq ON change_log(seq)")
+    # Existing rows are covered by the first full backup (watermark 0)
+    for table in _TRACKED_TABLES:
+        for suffix, event, ref, deleted in (
+            ("ai", "INSERT", "new", 0),
+            ("au", "UPDATE", "new", 0),
+            ("ad", "DELETE", "old", 1),
+        ):
+            op.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS change_log_{table}_{suffix}
+                AFTER {event} ON "{table}"
+                BEGIN
+                    {_log_change(table, ref, deleted)}
+                END
+                """
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table in _TRACKED_TABLES:
+        for suffix in ("ai", "au", "ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS change_log_{table}_{suffix}")
+    op.execute("DROP TABLE IF EXISTS change_log")
@@ -0,0 +1,167 @@
+"""add payee dictionary
+
+Revision ID: b5e2f7a93c14
+Revises: a7d4c91e2b38
+Create Date: 2026-10-19 18:27:03.512944
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e2f7a93c14"
+down_revision: Union[str, Sequence[str], None] = "a7d4c91e2b38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_MAX_LENGTH = 255
+
+
+def _log_change(table: str, ref: str, deleted: int) -> str:
+    return f"""INSERT INTO change_log(table_name, row_id, seq, deleted)
+        VALUES ('{table}', {ref}.id,
+                (SELECT coalesce(max(seq), 0) + 1 FROM change_log), {deleted})
+        ON CONFLICT(table_name, row_id)
+        DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted;"""
+
+
+def _change_log_triggers(table: str) -> list[str]:
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS change_log_{table}_{suffix}
+        AFTER {event} ON "{table}"
+        BEGIN
+            {_log_change(table, ref, deleted)}
+        END
+        """
+        for suffix, event, ref, deleted in (
+            ("ai", "INSERT", "new", 0),
+            ("au", "UPDATE", "new", 0),
+            ("ad", "DELETE", "old", 1),
+        )
+    ]
+
+
+# Rebuilding "transaction" in batch mode (downgrade) drops its triggers
+_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS transaction_fts_ai AFTER INSERT ON "transaction"
+    BEGIN
+        INSERT INTO transaction_fts(rowid, payee, purpose, notes)
+        VALUES (new.id, new.payee, new.purpose, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transaction_fts_ad AFTER DELETE ON "transaction"
+    BEGIN
+        INSERT INTO transaction_fts(transaction_fts, rowid, payee, purpose, notes)
+        VALUES ('delete', old.id, old.payee, old.purpose, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transaction_fts_au
+    AFTER UPDATE OF payee, purpose, notes ON "transaction"
+    BEGIN
+        INSERT INTO transaction_fts(transaction_fts, rowid, payee, purpose, notes)
+        VALUES ('delete', old.id, old.payee, old.purpose, old.notes);
+        INSERT INTO transaction_fts(rowid, payee, purpose, notes)
+        VALUES (new.id, new.payee, new.purpose, new.notes);
+    END
+    """,
+)
+
+
+def _normalize(raw: str) -> str:
+    # Same as my_private_finances.models.payee.normalize_payee
+    return " ".join(raw.split()).casefold()[:_MAX_LENGTH]
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    payee = sa.table(
+        "payee",
+        sa.column("id", sa.Integer),
+        sa.column("name", sa.String),
+        sa.column("normalized", sa.String),
+    )
+    # Oldest spelling first, so it names the payee
+    spellings = bind.execute(
+        sa.text(
+            'SELECT payee FROM "transaction" WHERE payee IS NOT NULL '
+            "GROUP BY payee ORDER BY min(id)"
+        )
+    ).scalars()
+    names: dict[str, str] = {}
+    keys: dict[str, str] = {}
+    for raw in spellings:
+        key = _normalize(raw)
+        if key:
+            names.setdefault(key, " ".join(raw.split())[:_MAX_LENGTH])
+            keys[raw] = key
+    if not names:
+        return
+    op.bulk_insert(payee, [{"name": n, "normalized": k} for k, n in names.items()])
+    ids = dict(bind.execute(sa.select(payee.c.normalized, payee.c.id)).tuples().all())
+
+    # Map spelling -> id in an indexed scratch table and update in one pass
+    op.execute("CREATE TEMPORARY TABLE payee_backfill (raw TEXT PRIMARY KEY, id INT)")
+    scratch = sa.table("payee_backfill", sa.column("raw"), sa.column("id"))
+    op.bulk_insert(scratch, [{"raw": r, "id": ids[k]} for r, k in keys.items()])
+    op.execute(
+        'UPDATE "transaction" SET payee_id = '
+        '(SELECT id FROM payee_backfill WHERE raw = "transaction".payee) '
+        "WHERE payee IS NOT NULL"
+    )
+    op.execute("DROP TABLE payee_backfill")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "payee",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("normalized", sa.String(length=255), nullable=False),
+        sa.Column("alias", sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_payee_normalized"), "payee", ["normalized"], unique=True)
+    if op.get_bind().dialect.name == "sqlite":
+        # ADD COLUMN may carry the reference inline; a batch rebuild of
+        # "transaction" (and of its triggers) is not needed
+        op.execute(
+            'ALTER TABLE "transaction" ADD COLUMN payee_id INTEGER REFERENCES payee (id)'
+        )
+        for stmt in _change_log_triggers("payee"):
+            op.execute(stmt)
+    else:
+        op.add_column(
+            "transaction",
+            sa.Column("payee_id", sa.Integer(), sa.ForeignKey("payee.id")),
+        )
+    op.create_index(
+        "ix_tx_account_payee_date",
+        "transaction",
+        ["account_id", "payee_id", "booking_date"],
+        unique=False,
+    )
+    _backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tx_account_payee_date", table_name="transaction")
+    with op.batch_alter_table("transaction") as batch_op:
+        batch_op.drop_column("payee_id")
+    if op.get_bind().dialect.name == "sqlite":
+        for stmt in (*_FTS_TRIGGERS, *_change_log_triggers("transaction")):
+            op.execute(stmt)
+        for suffix in ("ai", "au", "ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS change_log_payee_{suffix}")
+        op.execute("DELETE FROM change_log WHERE table_name = 'payee'")
+    op.drop_index(op.f("ix_payee_normalized"), table_name="payee")
+    op.drop_table("payee")
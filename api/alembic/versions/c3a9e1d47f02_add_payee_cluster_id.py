@@ -0,0 +1,65 @@
+"""add payee cluster id
+
+Revision ID: c3a9e1d47f02
+Revises: b5e2f7a93c14
+Create Date: 2026-10-19 20:11:38.204517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a9e1d47f02"
+down_revision: Union[str, Sequence[str], None] = "b5e2f7a93c14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _log_change(ref: str, deleted: int) -> str:
+    return f"""INSERT INTO change_log(table_name, row_id, seq, deleted)
+        VALUES ('payee', {ref}.id,
+                (SELECT coalesce(max(seq), 0) + 1 FROM change_log), {deleted})
+        ON CONFLICT(table_name, row_id)
+        DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted;"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        # Inline reference instead of a batch rebuild, which would drop the
+        # table's change-log triggers
+        op.execute(
+            "ALTER TABLE payee ADD COLUMN cluster_id INTEGER REFERENCES payee (id)"
+        )
+    else:
+        op.add_column(
+            "payee", sa.Column("cluster_id", sa.Integer(), sa.ForeignKey("payee.id"))
+        )
+    op.create_index(op.f("ix_payee_cluster_id"), "payee", ["cluster_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_payee_cluster_id"), table_name="payee")
+    with op.batch_alter_table("payee") as batch_op:
+        batch_op.drop_column("cluster_id")
+    if op.get_bind().dialect.name == "sqlite":
+        # The batch rebuild dropped the change-log triggers
+        for suffix, event, ref, deleted in (
+            ("ai", "INSERT", "new", 0),
+            ("au", "UPDATE", "new", 0),
+            ("ad", "DELETE", "old", 1),
+        ):
+            op.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS change_log_payee_{suffix}
+                AFTER {event} ON payee
+                BEGIN
+                    {_log_change(ref, deleted)}
+                END
+                """
+            )
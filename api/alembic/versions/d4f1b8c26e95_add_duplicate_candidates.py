@@ -0,0 +1,96 @@
+"""add duplicate candidates
+
+Revision ID: d4f1b8c26e95
+Revises: c3a9e1d47f02
+Create Date: 2026-10-19 21:42:17.630215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4f1b8c26e95"
+down_revision: Union[str, Sequence[str], None] = "c3a9e1d47f02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _log_change(ref: str, deleted: int) -> str:
+    return f"""INSERT INTO change_log(table_name, row_id, seq, deleted)
+        VALUES ('duplicate_candidate', {ref}.id,
+                (SELECT coalesce(max(seq), 0) + 1 FROM change_log), {deleted})
+        ON CONFLICT(table_name, row_id)
+        DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted;"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "duplicate_candidate",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("transaction_id", sa.Integer(), nullable=False),
+        sa.Column("duplicate_id", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Numeric(precision=3, scale=2), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.ForeignKeyConstraint(["duplicate_id"], ["transaction.id"]),
+        sa.ForeignKeyConstraint(["transaction_id"], ["transaction.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "transaction_id", "duplicate_id", name="uq_duplicate_candidate_pair"
+        ),
+    )
+    op.create_index(
+        op.f("ix_duplicate_candidate_duplicate_id"),
+        "duplicate_candidate",
+        ["duplicate_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_duplicate_candidate_transaction_id"),
+        "duplicate_candidate",
+        ["transaction_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tx_account_amount_date",
+        "transaction",
+        ["account_id", "amount_minor", "booking_date"],
+        unique=False,
+    )
+    if op.get_bind().dialect.name == "sqlite":
+        for suffix, event, ref, deleted in (
+            ("ai", "INSERT", "new", 0),
+            ("au", "UPDATE", "new", 0),
+            ("ad", "DELETE", "old", 1),
+        ):
+            op.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS change_log_duplicate_candidate_{suffix}
+                AFTER {event} ON "duplicate_candidate"
+                BEGIN
+                    {_log_change(ref, deleted)}
+                END
+                """
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for suffix in ("ai", "au", "ad"):
+            op.execute(
+                f"DROP TRIGGER IF EXISTS change_log_duplicate_candidate_{suffix}"
+            )
+        op.execute("DELETE FROM change_log WHERE table_name = 'duplicate_candidate'")
+    op.drop_index("ix_tx_account_amount_date", table_name="transaction")
+    op.drop_index(
+        op.f("ix_duplicate_candidate_transaction_id"), table_name="duplicate_candidate"
+    )
+    op.drop_index(
+        op.f("ix_duplicate_candidate_duplicate_id"), table_name="duplicate_candidate"
+    )
+    op.drop_table("duplicate_candidate")
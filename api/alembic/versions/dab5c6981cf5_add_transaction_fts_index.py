@@ -0,0 +1,75 @@
+"""add transaction fts index
+
+Revision ID: dab5c6981cf5
+Revises: 2c39994ff739
+Create Date: 2026-10-19 10:12:41.503117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "dab5c6981cf5"
+down_revision: Union[str, Sequence[str], None] = "2c39994ff739"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS transaction_fts USING fts5(
+            payee, purpose, notes,
+            content='transaction', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS transaction_fts_ai AFTER INSERT ON "transaction"
+        BEGIN
+            INSERT INTO transaction_fts(rowid, payee, purpose, notes)
+            VALUES (new.id, new.payee, new.purpose, new.notes);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS transaction_fts_ad AFTER DELETE ON "transaction"
+        BEGIN
+            INSERT INTO transaction_fts(transaction_fts, rowid, payee, purpose, notes)
+            VALUES ('delete', old.id, old.payee, old.purpose, old.notes);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS transaction_fts_au
+        AFTER UPDATE OF payee, purpose, notes ON "transaction"
+        BEGIN
+            INSERT INTO transaction_fts(transaction_fts, rowid, payee, purpose, notes)
+            VALUES ('delete', old.id, old.payee, old.purpose, old.notes);
+            INSERT INTO transaction_fts(rowid, payee, purpose, notes)
+            VALUES (new.id, new.payee, new.purpose, new.notes);
+        END
+        """
+    )
+    # Index all existing rows
+    op.execute("INSERT INTO transaction_fts(transaction_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("DROP TRIGGER IF EXISTS transaction_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS transaction_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS transaction_fts_ai")
+    op.execute("DROP TABLE IF EXISTS transaction_fts")
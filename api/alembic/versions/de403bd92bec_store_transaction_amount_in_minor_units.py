@@ -0,0 +1,81 @@
+"""store transaction amount in minor units
+
+Revision ID: de403bd92bec
+Revises: dab5c6981cf5
+Create Date: 2026-10-19 11:58:12.204731
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "de403bd92bec"
+down_revision: Union[str, Sequence[str], None] = "dab5c6981cf5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rebuilding "transaction" in batch mode drops its triggers, so the FTS
+# sync triggers from dab5c6981cf5 are recreated afterwards.
+_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS transaction_fts_ai AFTER INSERT ON "transaction"
+    BEGIN
+        INSERT INTO transaction_fts(rowid, payee, purpose, notes)
+        VALUES (new.id, new.payee, new.purpose, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transaction_fts_ad AFTER DELETE ON "transaction"
+    BEGIN
+        INSERT INTO transaction_fts(transaction_fts, rowid, payee, purpose, notes)
+        VALUES ('delete', old.id, old.payee, old.purpose, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transaction_fts_au
+    AFTER UPDATE OF payee, purpose, notes ON "transaction"
+    BEGIN
+        INSERT INTO transaction_fts(transaction_fts, rowid, payee, purpose, notes)
+        VALUES ('delete', old.id, old.payee, old.purpose, old.notes);
+        INSERT INTO transaction_fts(rowid, payee, purpose, notes)
+        VALUES (new.id, new.payee, new.purpose, new.notes);
+    END
+    """,
+)
+
+
+def _recreate_fts_triggers() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for stmt in _FTS_TRIGGERS:
+        op.execute(stmt)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "transaction", sa.Column("amount_minor", sa.BigInteger(), nullable=True)
+    )
+    op.execute(
+        'UPDATE "transaction" SET amount_minor = CAST(ROUND(amount * 100) AS INTEGER)'
+    )
+    with op.batch_alter_table("transaction") as batch_op:
+        batch_op.alter_column(
+            "amount_minor", existing_type=sa.BigInteger(), nullable=False
+        )
+        batch_op.drop_column("amount")
+    _recreate_fts_triggers()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column("transaction", sa.Column("amount", sa.Numeric(14, 2), nullable=True))
+    op.execute('UPDATE "transaction" SET amount = amount_minor / 100.0')
+    with op.batch_alter_table("transaction") as batch_op:
+        batch_op.alter_column("amount", existing_type=sa.Numeric(14, 2), nullable=False)
+        batch_op.drop_column("amount_minor")
+    _recreate_fts_triggers()
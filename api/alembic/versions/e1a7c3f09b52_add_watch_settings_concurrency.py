@@ -0,0 +1,33 @@
+"""add watch settings concurrency
+
+Revision ID: e1a7c3f09b52
+Revises: de403bd92bec
+Create Date: 2026-10-19 14:06:40.518233
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e1a7c3f09b52"
+down_revision: Union[str, Sequence[str], None] = "de403bd92bec"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "watch_settings",
+        sa.Column("concurrency", sa.Integer(), nullable=False, server_default="4"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("watch_settings") as batch_op:
+        batch_op.drop_column("concurrency")
@@ -0,0 +1,121 @@
+"""add category closure
+
+Revision ID: e7a2c5d9f413
+Revises: d4f1b8c26e95
+Create Date: 2026-10-19 23:05:41.918376
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a2c5d9f413"
+down_revision: Union[str, Sequence[str], None] = "d4f1b8c26e95"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same as my_private_finances.models.category_closure.CLOSURE_TRIGGERS
+_CLOSURE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS category_closure_ai AFTER INSERT ON category
+    BEGIN
+        INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+        VALUES (new.id, new.id, 0);
+        INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+        SELECT new.id, sub.descendant_id, sub.depth + 1
+        FROM category AS child
+        JOIN category_closure AS sub ON sub.ancestor_id = child.id
+        WHERE child.parent_id = new.id AND child.id != new.id;
+        INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+        SELECT up.ancestor_id, sub.descendant_id, up.depth + sub.depth + 1
+        FROM category_closure AS up, category_closure AS sub
+        WHERE up.descendant_id = new.parent_id AND sub.ancestor_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS category_closure_au
+    AFTER UPDATE OF parent_id ON category
+    WHEN old.parent_id IS NOT new.parent_id
+    BEGIN
+        DELETE FROM category_closure
+        WHERE descendant_id IN (
+            SELECT descendant_id FROM category_closure WHERE ancestor_id = new.id
+        )
+        AND ancestor_id IN (
+            SELECT ancestor_id FROM category_closure
+            WHERE descendant_id = new.id AND ancestor_id != new.id
+        );
+        INSERT INTO category_closure(ancestor_id, descendant_id, depth)
+        SELECT up.ancestor_id, sub.descendant_id, up.depth + sub.depth + 1
+        FROM category_closure AS up, category_closure AS sub
+        WHERE up.descendant_id = new.parent_id AND sub.ancestor_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS category_closure_ad AFTER DELETE ON category
+    BEGIN
+        DELETE FROM category_closure
+        WHERE ancestor_id IN (
+            SELECT ancestor_id FROM category_closure WHERE descendant_id = old.id
+        )
+        AND descendant_id IN (
+            SELECT descendant_id FROM category_closure WHERE ancestor_id = old.id
+        );
+    END
+    """,
+)
+
+# Guards the backfill against parent_id cycles in existing data
+_MAX_DEPTH = 64
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "category_closure",
+        sa.Column("ancestor_id", sa.Integer(), nullable=False),
+        sa.Column("descendant_id", sa.Integer(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["category.id"]),
+        sa.ForeignKeyConstraint(["descendant_id"], ["category.id"]),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        op.f("ix_category_closure_descendant_id"),
+        "category_closure",
+        ["descendant_id"],
+        unique=False,
+    )
+    op.execute(
+        f"""
+        INSERT OR IGNORE INTO category_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM category
+            UNION ALL
+            SELECT tree.ancestor_id, category.id, tree.depth + 1
+            FROM tree JOIN category ON category.parent_id = tree.descendant_id
+            WHERE tree.depth < {_MAX_DEPTH}
+        )
+        SELECT ancestor_id, descendant_id, min(depth) FROM tree
+        GROUP BY ancestor_id, descendant_id
+        """
+    )
+    if op.get_bind().dialect.name == "sqlite":
+        for stmt in _CLOSURE_TRIGGERS:
+            op.execute(stmt)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for suffix in ("ai", "au", "ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS category_closure_{suffix}")
+    op.drop_index(
+        op.f("ix_category_closure_descendant_id"), table_name="category_closure"
+    )
+    op.drop_table("category_closure")
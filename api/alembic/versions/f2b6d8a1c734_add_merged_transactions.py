@@ -0,0 +1,66 @@
+"""add merged transactions
+
+Revision ID: f2b6d8a1c734
+Revises: e7a2c5d9f413
+Create Date: 2026-10-19 23:48:12.504817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b6d8a1c734"
+down_revision: Union[str, Sequence[str], None] = "e7a2c5d9f413"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _log_change(ref: str, deleted: int) -> str:
+    return f"""INSERT INTO change_log(table_name, row_id, seq, deleted)
+        VALUES ('merged_transaction', {ref}.id,
+                (SELECT coalesce(max(seq), 0) + 1 FROM change_log), {deleted})
+        ON CONFLICT(table_name, row_id)
+        DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted;"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "merged_transaction",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("import_hash", sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["account.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "account_id", "import_hash", name="uq_merged_tx_account_import_hash"
+        ),
+    )
+    if op.get_bind().dialect.name == "sqlite":
+        for suffix, event, ref, deleted in (
+            ("ai", "INSERT", "new", 0),
+            ("au", "UPDATE", "new", 0),
+            ("ad", "DELETE", "old", 1),
+        ):
+            op.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS change_log_merged_transaction_{suffix}
+                AFTER {event} ON "merged_transaction"
+                BEGIN
+                    {_log_change(ref, deleted)}
+                END
+                """
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for suffix in ("ai", "au", "ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS change_log_merged_transaction_{suffix}")
+        op.execute("DELETE FROM change_log WHERE table_name = 'merged_transaction'")
+    op.drop_table("merged_transaction")
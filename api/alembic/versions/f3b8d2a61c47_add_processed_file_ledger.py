@@ -0,0 +1,55 @@
+"""add processed file ledger
+
+Revision ID: f3b8d2a61c47
+Revises: e1a7c3f09b52
+Create Date: 2026-10-19 15:21:07.934512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8d2a61c47"
+down_revision: Union[str, Sequence[str], None] = "e1a7c3f09b52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "processed_file",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("profile_id", sa.Integer(), nullable=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("file_name", sa.String(), nullable=False),
+        sa.Column("rows_created", sa.Integer(), nullable=False),
+        sa.Column("processed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["account_id"],
+            ["account.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["profile_id"],
+            ["csv_profile.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_processed_file_account_size",
+        "processed_file",
+        ["account_id", "size"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_processed_file_account_size", table_name="processed_file")
+    op.drop_table("processed_file")
@@ -0,0 +1,10 @@
+"""Benchmarks on synthetic, deterministic multi-account histories.
+
+    python -m benchmarks run --sizes 10k,100k --output results.json
+    python -m benchmarks compare baseline.json results.json
+
+``run`` generates German bank and Trade Republic CSV exports, imports them
+into a fresh SQLite database and times the import path, the detection jobs,
+ML training and the heavy report endpoints. ``compare`` flags scenarios that
+got slower than a stored baseline. Everything runs offline.
+"""
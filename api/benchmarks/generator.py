@@ -0,0 +1,606 @@
+"""Deterministic synthetic bank exports.
+
+A dataset is a household history over up to ten years: a German current
+account (semicolon-separated, ``DD.MM.YY`` dates, decimal comma) and a
+Trade Republic account (the app's transaction export, including TRADING
+rows the import filters out). Both get salary, rent, utilities and
+subscriptions as recurring payments, a monthly savings transfer from the
+current account to Trade Republic, and card payments at a few dozen
+merchants, whose payee strings vary by branch like real statements do.
+
+The same seed and size always produce byte-identical files. Each account
+is split into one file per calendar year.
+"""
+
+from __future__ import annotations
+
+import csv
+import random
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from my_private_finances.services.csv_import import ColumnMap
+
+END_MONTH = date(2026, 9, 1)
+
+# Small datasets get a longer history first, larger ones a denser one
+_ROWS_PER_MONTH = 150
+_MIN_MONTHS = 12
+_MAX_MONTHS = 120
+
+# Share of the non-recurring rows per account; TR rows are partly trades
+_BANK_DE_SHARE = 0.75
+_TR_TRADE_SHARE = 0.2
+
+_GERMAN_MONTHS = (
+    "Januar",
+    "Februar",
+    "Maerz",
+    "April",
+    "Mai",
+    "Juni",
+    "Juli",
+    "August",
+    "September",
+    "Oktober",
+    "November",
+    "Dezember",
+)
+
+
+@dataclass(frozen=True)
+class CsvLayout:
+    """Export format and the import options that read it."""
+
+    name: str
+    header: tuple[str, ...]
+    delimiter: str = ","
+    date_format: str = "iso"
+    decimal_comma: bool = False
+    column_map: ColumnMap | None = None
+    row_filters: dict[str, list[str]] | None = None
+    row_exclude_filters: dict[str, list[str]] | None = None
+
+    def import_options(self) -> dict[str, Any]:
+        return {
+            "delimiter": self.delimiter,
+            "date_format": self.date_format,
+            "decimal_comma": self.decimal_comma,
+            "column_map": self.column_map,
+            "row_filters": self.row_filters,
+            "row_exclude_filters": self.row_exclude_filters,
+        }
+
+
+BANK_DE = CsvLayout(
+    name="bank_de",
+    header=(
+        "Auftragskonto",
+        "Buchungstag",
+        "Valutadatum",
+        "Buchungstext",
+        "Verwendungszweck",
+        "Glaeubiger ID",
+        "Mandatsreferenz",
+        "Kundenreferenz (End-to-End)",
+        "Sammlerreferenz",
+        "Lastschrift Ursprungsbetrag",
+        "Auslagenersatz Ruecklastschrift",
+        "Beguenstigter/Zahlungspflichtiger",
+        "Kontonummer/IBAN",
+        "BIC (SWIFT-Code)",
+        "Betrag",
+        "Waehrung",
+        "Info",
+    ),
+    delimiter=";",
+    date_format="dmy",
+    decimal_comma=True,
+)
+
+TRADE_REPUBLIC = CsvLayout(
+    name="trade_republic",
+    header=(
+        "datetime",
+        "date",
+        "account_type",
+        "category",
+        "type",
+        "asset_class",
+        "name",
+        "symbol",
+        "shares",
+        "price",
+        "amount",
+        "fee",
+        "tax",
+        "currency",
+        "original_amount",
+        "original_currency",
+        "fx_rate",
+        "description",
+        "transaction_id",
+        "counterparty_name",
+        "counterparty_iban",
+        "payment_reference",
+        "mcc_code",
+    ),
+    column_map={
+        "booking_date": ["date"],
+        "amount": ["amount"],
+        "currency": ["currency"],
+        "payee": ["name", "counterparty_name"],
+        "purpose": ["type"],
+        "external_id": ["transaction_id"],
+        "notes": [],
+    },
+    row_filters={"category": ["CASH"]},
+    row_exclude_filters={"type": ["PRIVATE_MARKET_BUY"]},
+)
+
+
+@dataclass(frozen=True)
+class AccountSpec:
+    key: str
+    name: str
+    layout: CsvLayout
+
+
+ACCOUNTS = (
+    AccountSpec("giro", "Girokonto", BANK_DE),
+    AccountSpec("trade_republic", "Trade Republic", TRADE_REPUBLIC),
+)
+
+
+@dataclass(frozen=True)
+class CategorySpec:
+    name: str
+    parent: str | None = None
+    cost_type: str | None = None
+    budget: str | None = None
+    # "payee contains" rules applied on import
+    rule_values: tuple[str, ...] = ()
+
+
+CATEGORIES = (
+    CategorySpec("Wohnen", cost_type="fixed"),
+    CategorySpec("Miete", "Wohnen", "fixed", "1150.00", ("Hausverwaltung",)),
+    CategorySpec("Energie", "Wohnen", "fixed", "120.00", ("Stadtwerke",)),
+    CategorySpec(
+        "Lebensmittel", None, "variable", "450.00", ("REWE", "EDEKA", "ALDI", "LIDL")
+    ),
+    CategorySpec("Drogerie", None, "variable", "60.00", ("dm-drogerie", "ROSSMANN")),
+    CategorySpec(
+        "Mobilitaet", None, "variable", "150.00", ("DB Vertrieb", "Shell", "ARAL")
+    ),
+    CategorySpec("Freizeit", None, "variable", "200.00", ("Lieferando", "Kino")),
+    CategorySpec(
+        "Abos", None, "fixed", "70.00", ("Netflix", "Spotify", "Telekom Deutschland")
+    ),
+    CategorySpec("Versicherungen", None, "fixed", "90.00", ("Allianz",)),
+    CategorySpec("Einkommen", rule_values=("Arbeitgeber",)),
+    # No rules: left for the ML categorizer
+    CategorySpec("Online-Shopping", None, "variable", "150.00"),
+)
+
+
+@dataclass(frozen=True)
+class _Merchant:
+    payee: str  # ``{n}`` is replaced by a branch number
+    branches: int
+    weight: int
+    mean: float  # typical amount in EUR
+    sigma: float  # spread of log(amount)
+
+
+_MERCHANTS = (
+    _Merchant("REWE Markt GmbH {n} Berlin", 40, 30, 32.0, 0.7),
+    _Merchant("EDEKA Center {n}", 20, 15, 27.0, 0.7),
+    _Merchant("ALDI SUED {n}", 30, 15, 22.0, 0.6),
+    _Merchant("LIDL DIENSTL {n}", 30, 12, 19.0, 0.6),
+    _Merchant("dm-drogerie markt {n}", 15, 8, 14.0, 0.6),
+    _Merchant("ROSSMANN {n}", 10, 4, 11.0, 0.5),
+    _Merchant("DB Vertrieb GmbH", 1, 5, 38.0, 0.9),
+    _Merchant("Shell Station {n}", 12, 4, 62.0, 0.3),
+    _Merchant("ARAL Tankstelle {n}", 12, 4, 58.0, 0.3),
+    _Merchant("Lieferando.de", 1, 6, 26.0, 0.4),
+    _Merchant("Kino Cinemaxx {n}", 3, 2, 24.0, 0.3),
+    _Merchant("AMAZON EU S.A R.L., NIEDERLASSUNG DEUTSCHLAND", 1, 12, 35.0, 1.0),
+    _Merchant("Zalando SE", 1, 3, 70.0, 0.6),
+    _Merchant("OTTO GmbH", 1, 2, 85.0, 0.7),
+    _Merchant("Apotheke am Markt {n}", 4, 3, 17.0, 0.6),
+    _Merchant("Baeckerei Kamps {n}", 25, 10, 6.5, 0.4),
+)
+_MERCHANT_WEIGHTS = [m.weight for m in _MERCHANTS]
+
+
+@dataclass(frozen=True)
+class _Recurring:
+    payee: str
+    purpose: str  # ``{month}`` is replaced by the German month name
+    day: int
+    amount: str
+    jitter: float = 0.0  # relative amount variation, e.g. utilities
+    booking_text: str = "Lastschrift"
+
+
+_GIRO_RECURRING = (
+    _Recurring("Arbeitgeber GmbH", "Gehalt {month}", 1, "3450.00", 0.0, "Gutschrift"),
+    _Recurring("Hausverwaltung Schmidt", "Miete {month}", 3, "-1150.00"),
+    _Recurring("Stadtwerke Berlin", "Abschlag Strom/Gas", 5, "-104.00", 0.08),
+    _Recurring("Telekom Deutschland GmbH", "Mobilfunk Rechnung", 10, "-39.95"),
+    _Recurring("Netflix International B.V.", "Netflix Abo", 15, "-13.99"),
+    _Recurring("Spotify AB", "Spotify Premium", 17, "-10.99"),
+    _Recurring("Allianz Versicherungs-AG", "Haftpflicht/Hausrat", 20, "-45.20"),
+)
+_SAVINGS_TRANSFER = Decimal("500.00")
+_SAVINGS_DAY = 25
+_OWN_IBAN = "DE89370400440532013000"
+_TR_IBAN = "DE12500105170648489890"
+
+
+@dataclass(frozen=True)
+class GeneratedFile:
+    path: Path
+    account: str
+    layout: CsvLayout
+    rows: int
+
+
+@dataclass
+class Dataset:
+    size: int
+    seed: int
+    months: list[date]
+    files: list[GeneratedFile] = field(default_factory=list)
+
+    @property
+    def rows(self) -> int:
+        return sum(f.rows for f in self.files)
+
+    @property
+    def last_month(self) -> str:
+        return self.months[-1].strftime("%Y-%m")
+
+    @property
+    def last_full_year(self) -> int:
+        return self.months[-1].year - 1
+
+    def files_for(self, account: str) -> list[GeneratedFile]:
+        return [f for f in self.files if f.account == account]
+
+
+def parse_size(value: str) -> int:
+    """Parse ``10k``, ``1m`` or ``2500`` into a row count."""
+    raw = value.strip().lower()
+    factor = 1
+    if raw.endswith("k"):
+        raw, factor = raw[:-1], 1_000
+    elif raw.endswith("m"):
+        raw, factor = raw[:-1], 1_000_000
+    size = int(float(raw) * factor)
+    if size <= 0:
+        raise ValueError(f"Invalid dataset size: {value!r}")
+    return size
+
+
+def format_size(size: int) -> str:
+    if size % 1_000_000 == 0:
+        return f"{size // 1_000_000}m"
+    if size % 1_000 == 0:
+        return f"{size // 1_000}k"
+    return str(size)
+
+
+def _month_starts(count: int) -> list[date]:
+    months: list[date] = []
+    year, month = END_MONTH.year, END_MONTH.month
+    for _ in range(count):
+        months.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+
+def _month_days(month: date) -> int:
+    nxt = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return (nxt - month).days
+
+
+def _german_amount(amount: Decimal) -> str:
+    # 1234.5 -> "1.234,50"
+    return f"{amount:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+class _Writer:
+    """Rows of one account, split into one CSV file per year."""
+
+    def __init__(self, out_dir: Path, account: AccountSpec) -> None:
+        self._out_dir = out_dir
+        self._account = account
+        self._year: int | None = None
+        self._file: Any = None
+        self._writer: Any = None
+        self._rows = 0
+        self.files: list[GeneratedFile] = []
+
+    def write(self, booked: date, row: list[str]) -> None:
+        if booked.year != self._year:
+            self.close()
+            self._year = booked.year
+            path = self._out_dir / f"{self._account.layout.name}_{booked.year}.csv"
+            self._file = path.open("w", encoding="utf-8", newline="")
+            self._writer = csv.writer(
+                self._file,
+                delimiter=self._account.layout.delimiter,
+                quoting=(
+                    csv.QUOTE_ALL
+                    if self._account.layout is BANK_DE
+                    else csv.QUOTE_MINIMAL
+                ),
+                lineterminator="\n",
+            )
+            self._writer.writerow(self._account.layout.header)
+            self._rows = 0
+        self._writer.writerow(row)
+        self._rows += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self.files.append(
+            GeneratedFile(
+                path=Path(self._file.name),
+                account=self._account.key,
+                layout=self._account.layout,
+                rows=self._rows,
+            )
+        )
+        self._file = None
+
+
+class _Generator:
+    def __init__(self, size: int, seed: int) -> None:
+        self.rng = random.Random(f"{seed}:{size}")
+        self._seq = 0
+
+    def _ref(self) -> str:
+        self._seq += 1
+        return f"E2E{self._seq:010d}"
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _card_amount(self, merchant: _Merchant) -> Decimal:
+        value = self.rng.lognormvariate(0.0, merchant.sigma) * merchant.mean
+        return -Decimal(f"{max(value, 0.5):.2f}")
+
+    def _merchant_payee(self) -> tuple[_Merchant, str]:
+        merchant = self.rng.choices(_MERCHANTS, weights=_MERCHANT_WEIGHTS)[0]
+        branch = self.rng.randint(1000, 1000 + merchant.branches - 1)
+        return merchant, merchant.payee.format(n=branch)
+
+    # -- German current account -------------------------------------------
+
+    def _bank_row(
+        self,
+        booked: date,
+        *,
+        booking_text: str,
+        purpose: str,
+        payee: str,
+        amount: Decimal,
+        iban: str = "",
+        mandate: str = "",
+    ) -> list[str]:
+        short = booked.strftime("%d.%m.%y")
+        return [
+            _OWN_IBAN,
+            short,
+            short,
+            booking_text,
+            purpose,
+            "",
+            mandate,
+            self._ref(),
+            "",
+            "",
+            "",
+            payee,
+            iban,
+            "",
+            _german_amount(amount),
+            "EUR",
+            "",
+        ]
+
+    def bank_month(self, month: date, extra: int) -> Iterator[tuple[date, list[str]]]:
+        days = _month_days(month)
+        rows: list[tuple[date, list[str]]] = []
+        name = _GERMAN_MONTHS[month.month - 1]
+        for rec in _GIRO_RECURRING:
+            amount = Decimal(rec.amount)
+            if rec.jitter:
+                factor = 1 + self.rng.uniform(-rec.jitter, rec.jitter)
+                amount = (amount * Decimal(f"{factor:.4f}")).quantize(Decimal("0.01"))
+            booked = month.replace(day=min(rec.day, days))
+            rows.append(
+                (
+                    booked,
+                    self._bank_row(
+                        booked,
+                        booking_text=rec.booking_text,
+                        purpose=rec.purpose.format(month=name),
+                        payee=rec.payee,
+                        amount=amount,
+                        mandate=f"M-{rec.payee[:4].upper()}-001",
+                    ),
+                )
+            )
+        booked = month.replace(day=_SAVINGS_DAY)
+        rows.append(
+            (
+                booked,
+                self._bank_row(
+                    booked,
+                    booking_text="Ueberweisung",
+                    purpose="Sparen",
+                    payee="Trade Republic Bank GmbH",
+                    amount=-_SAVINGS_TRANSFER,
+                    iban=_TR_IBAN,
+                ),
+            )
+        )
+        for _ in range(extra):
+            merchant, payee = self._merchant_payee()
+            booked = month.replace(day=self.rng.randint(1, days))
+            rows.append(
+                (
+                    booked,
+                    self._bank_row(
+                        booked,
+                        booking_text="Kartenzahlung",
+                        purpose=f"VISA Debitkartenumsatz {booked:%Y-%m-%d}",
+                        payee=payee,
+                        amount=self._card_amount(merchant),
+                    ),
+                )
+            )
+        rows.sort(key=lambda r: r[0])
+        yield from rows
+
+    # -- Trade Republic -----------------------------------------------------
+
+    def _tr_row(
+        self,
+        booked: date,
+        *,
+        category: str,
+        type_: str,
+        amount: Decimal,
+        name: str = "",
+        counterparty: str = "",
+        iban: str = "",
+        asset: tuple[str, str, str, str] = ("", "", "", ""),
+        mcc: str = "",
+    ) -> list[str]:
+        ts = datetime.combine(
+            booked, time(self.rng.randint(6, 22), self.rng.randint(0, 59))
+        )
+        asset_class, symbol, shares, price = asset
+        return [
+            f"{ts.isoformat()}.{self.rng.randint(0, 999999):06d}Z",
+            booked.isoformat(),
+            "DEFAULT",
+            category,
+            type_,
+            asset_class,
+            name,
+            symbol,
+            shares,
+            price,
+            f"{amount:.2f}",
+            "",
+            "",
+            "EUR",
+            "",
+            "",
+            "",
+            "",
+            self._uuid(),
+            counterparty,
+            iban,
+            "",
+            mcc,
+        ]
+
+    def tr_month(self, month: date, extra: int) -> Iterator[tuple[date, list[str]]]:
+        days = _month_days(month)
+        rows: list[tuple[date, list[str]]] = []
+        booked = month.replace(day=_SAVINGS_DAY + self.rng.randint(0, 2))
+        rows.append(
+            (
+                booked,
+                self._tr_row(
+                    booked,
+                    category="CASH",
+                    type_="TRANSFER_INBOUND",
+                    amount=_SAVINGS_TRANSFER,
+                    counterparty="Girokonto",
+                    iban=_OWN_IBAN,
+                ),
+            )
+        )
+        booked = month.replace(day=1)
+        interest = Decimal(f"{self.rng.uniform(8, 40):.2f}")
+        rows.append(
+            (
+                booked,
+                self._tr_row(
+                    booked, category="CASH", type_="INTEREST_PAYMENT", amount=interest
+                ),
+            )
+        )
+        for _ in range(extra):
+            booked = month.replace(day=self.rng.randint(1, days))
+            if self.rng.random() < _TR_TRADE_SHARE:
+                price = Decimal(f"{self.rng.uniform(80, 120):.2f}")
+                shares = Decimal(f"{self.rng.uniform(0.5, 3):.4f}")
+                rows.append(
+                    (
+                        booked,
+                        self._tr_row(
+                            booked,
+                            category="TRADING",
+                            type_="BUY",
+                            amount=-(price * shares).quantize(Decimal("0.01")),
+                            name="iShares Core MSCI World",
+                            asset=("FUND", "IE00B4L5Y983", str(shares), str(price)),
+                        ),
+                    )
+                )
+                continue
+            merchant, payee = self._merchant_payee()
+            rows.append(
+                (
+                    booked,
+                    self._tr_row(
+                        booked,
+                        category="CASH",
+                        type_="CARD_TRANSACTION",
+                        amount=self._card_amount(merchant),
+                        name=payee,
+                        mcc=str(self.rng.choice((5411, 5912, 5541, 5814, 5942))),
+                    ),
+                )
+            )
+        rows.sort(key=lambda r: r[0])
+        yield from rows
+
+
+def generate_dataset(out_dir: Path, size: int, seed: int = 42) -> Dataset:
+    """Write about *size* CSV rows across all accounts to *out_dir*."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n_months = min(max(size // _ROWS_PER_MONTH, _MIN_MONTHS), _MAX_MONTHS)
+    months = _month_starts(n_months)
+    recurring = len(_GIRO_RECURRING) + 1 + 2  # giro + savings transfer + TR
+
+    gen = _Generator(size, seed)
+    bank, tr = (_Writer(out_dir, account) for account in ACCOUNTS)
+    for i, month in enumerate(months):
+        month_rows = size // n_months + (1 if i < size % n_months else 0)
+        extra = max(month_rows - recurring, 0)
+        bank_extra = round(extra * _BANK_DE_SHARE)
+        for booked, row in gen.bank_month(month, bank_extra):
+            bank.write(booked, row)
+        for booked, row in gen.tr_month(month, extra - bank_extra):
+            tr.write(booked, row)
+    bank.close()
+    tr.close()
+
+    return Dataset(size=size, seed=seed, months=months, files=bank.files + tr.files)
@@ -0,0 +1,364 @@
+"""Command line entry point of the benchmark suite.
+
+``run`` times every scenario per dataset size and writes a JSON report;
+with ``--baseline`` it compares the fresh report right away. ``compare``
+checks two stored reports. Both exit with 1 if a scenario regressed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import fnmatch
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import SQLModel
+
+from benchmarks.generator import Dataset, format_size, generate_dataset, parse_size
+from benchmarks.scenarios import SCENARIOS, BenchContext, setup
+from my_private_finances.db import (
+    build_sqlite_url,
+    create_engine,
+    create_read_engine,
+    create_session_factory,
+)
+from my_private_finances.main import create_app
+
+RESULTS_VERSION = 1
+
+# A scenario regresses when its median grows by more than this fraction ...
+DEFAULT_THRESHOLD = 0.2
+# ... and by more than this many seconds, so sub-millisecond jitter is ignored
+NOISE_FLOOR_SECONDS = 0.005
+
+
+def _summarize(runs: list[float], rows: int | None) -> dict[str, Any]:
+    median = statistics.median(runs)
+    summary: dict[str, Any] = {
+        "runs": len(runs),
+        "median_s": round(median, 6),
+        "min_s": round(min(runs), 6),
+        "max_s": round(max(runs), 6),
+    }
+    if rows is not None:
+        summary["rows"] = rows
+        summary["rows_per_s"] = round(rows / median) if median > 0 else None
+    return summary
+
+
+def _matches(name: str, patterns: list[str] | tuple[str, ...]) -> bool:
+    return any(fnmatch.fnmatch(name, p) for p in patterns)
+
+
+def _required(only: list[str]) -> set[str]:
+    """Names of unselected scenarios the selected ones depend on."""
+    if not only:
+        return set()
+    selected = [s for s in SCENARIOS if _matches(s.name, only)]
+    # Every scenario reads imported data
+    patterns = ["import.bank_de", "import.trade_republic"]
+    patterns += [p for s in selected for p in s.requires]
+    return {s.name for s in SCENARIOS if _matches(s.name, patterns)}
+
+
+async def _run_dataset(
+    dataset: Dataset, db_path: Path, repeat: int, only: list[str]
+) -> dict[str, dict[str, Any]]:
+    database_url = build_sqlite_url(db_path)
+    app = create_app(db_path)
+    engine = create_engine(database_url)
+    read_engine = create_read_engine(database_url)
+    app.state.engine = engine
+    app.state.session_factory = create_session_factory(engine)
+    app.state.read_engine = read_engine
+    app.state.read_session_factory = create_session_factory(read_engine)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    results: dict[str, dict[str, Any]] = {}
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench", timeout=None
+        ) as client:
+            ctx = BenchContext(client, app.state.session_factory, dataset)
+            await setup(ctx)
+            required = _required(only)
+            for scenario in SCENARIOS:
+                selected = not only or _matches(scenario.name, only)
+                if not selected and scenario.name not in required:
+                    continue
+                runs: list[float] = []
+                rows: int | None = None
+                for _ in range(repeat if scenario.repeatable and selected else 1):
+                    started = time.perf_counter()
+                    rows = await scenario.fn(ctx)
+                    runs.append(time.perf_counter() - started)
+                if not selected:
+                    continue
+                results[scenario.name] = summary = _summarize(runs, rows)
+                rate = (
+                    f", {summary['rows_per_s']:,} rows/s"
+                    if summary.get("rows_per_s")
+                    else ""
+                )
+                print(
+                    f"  {scenario.name:<32} {summary['median_s'] * 1000:>10.1f} ms"
+                    f"{rate}",
+                    file=sys.stderr,
+                )
+    finally:
+        await read_engine.dispose()
+        await engine.dispose()
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmarks(
+    sizes: list[int],
+    *,
+    seed: int = 42,
+    repeat: int = 3,
+    only: list[str] | None = None,
+    workdir: Path | None = None,
+) -> dict[str, Any]:
+    """Run all (or the *only*-matching) scenarios for each size."""
+    report: dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "sizes": {},
+    }
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(
+                stack.enter_context(tempfile.TemporaryDirectory(prefix="mpf-bench-"))
+            )
+        workdir = workdir.resolve()
+        for size in sizes:
+            label = format_size(size)
+            size_dir = workdir / label
+            print(f"[{label}] generating {size:,} rows", file=sys.stderr)
+            started = time.perf_counter()
+            dataset = generate_dataset(size_dir / "csv", size, seed)
+            generate_seconds = time.perf_counter() - started
+
+            db_path = size_dir / "bench.sqlite"
+            db_path.unlink(missing_ok=True)
+            # ML training saves its model relative to the working directory
+            with contextlib.chdir(size_dir):
+                scenarios = asyncio.run(
+                    _run_dataset(dataset, db_path, repeat, only or [])
+                )
+            report["sizes"][label] = {
+                "rows": dataset.rows,
+                "files": len(dataset.files),
+                "months": len(dataset.months),
+                "generate_s": round(generate_seconds, 3),
+                "scenarios": scenarios,
+            }
+    return report
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    noise_floor: float = NOISE_FLOOR_SECONDS,
+) -> list[dict[str, Any]]:
+    """Pair up scenarios of both reports and classify each change.
+
+    ``status`` is ``regression``, ``improvement``, ``ok``, ``new`` (not in
+    the baseline) or ``missing`` (not in the current report).
+    """
+    rows: list[dict[str, Any]] = []
+    base_sizes = baseline.get("sizes", {})
+    for label, size in current.get("sizes", {}).items():
+        base_scenarios = base_sizes.get(label, {}).get("scenarios", {})
+        scenarios = size.get("scenarios", {})
+        for name in [*scenarios, *(n for n in base_scenarios if n not in scenarios)]:
+            cur = scenarios.get(name)
+            base = base_scenarios.get(name)
+            row: dict[str, Any] = {
+                "size": label,
+                "scenario": name,
+                "baseline_s": base["median_s"] if base else None,
+                "current_s": cur["median_s"] if cur else None,
+                "change": None,
+            }
+            if base is None:
+                row["status"] = "new"
+            elif cur is None:
+                row["status"] = "missing"
+            else:
+                delta = cur["median_s"] - base["median_s"]
+                row["change"] = (
+                    delta / base["median_s"] if base["median_s"] > 0 else None
+                )
+                if abs(delta) <= noise_floor or row["change"] is None:
+                    row["status"] = "ok"
+                elif row["change"] > threshold:
+                    row["status"] = "regression"
+                elif row["change"] < -threshold / (1 + threshold):
+                    row["status"] = "improvement"
+                else:
+                    row["status"] = "ok"
+            rows.append(row)
+    return rows
+
+
+def _print_comparison(rows: list[dict[str, Any]], threshold: float) -> int:
+    def ms(value: float | None) -> str:
+        return "-" if value is None else f"{value * 1000:.1f}"
+
+    table = [
+        (
+            r["size"],
+            r["scenario"],
+            ms(r["baseline_s"]),
+            ms(r["current_s"]),
+            "-" if r["change"] is None else f"{r['change']:+.1%}",
+            r["status"].upper() if r["status"] == "regression" else r["status"],
+        )
+        for r in rows
+    ]
+    headers = ("size", "scenario", "base ms", "now ms", "change", "status")
+    widths = [
+        max(len(row[i]) for row in (headers, *table)) for i in range(len(headers))
+    ]
+    for row in (headers, *table):
+        print(
+            "  ".join(
+                cell.ljust(w) if i in (0, 1, 5) else cell.rjust(w)
+                for i, (cell, w) in enumerate(zip(row, widths))
+            )
+        )
+
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(
+            f"\n{len(regressions)} regression(s) above {threshold:.0%}: "
+            + ", ".join(f"{r['size']}/{r['scenario']}" for r in regressions)
+        )
+        return 1
+    print(f"\nNo regressions above {threshold:.0%}.")
+    return 0
+
+
+def _load(path: Path) -> dict[str, Any]:
+    report: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    if report.get("version") != RESULTS_VERSION:
+        raise SystemExit(f"{path}: unsupported report version {report.get('version')}")
+    return report
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks on synthetic bank exports.",
+    )
+    sub = p.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Generate data, run scenarios, write a report")
+    run.add_argument(
+        "--sizes",
+        default="10k",
+        help="Comma-separated row counts, e.g. 10k,100k,1m (default: 10k)",
+    )
+    run.add_argument("--seed", type=int, default=42, help="Generator seed")
+    run.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per read-only scenario; the median is reported (default: 3)",
+    )
+    run.add_argument(
+        "--only",
+        default="",
+        help="Comma-separated scenario patterns, e.g. 'import.*,reports.*'",
+    )
+    run.add_argument(
+        "--output", type=Path, default=None, help="Write the JSON report here"
+    )
+    run.add_argument(
+        "--baseline", type=Path, default=None, help="Compare against this report"
+    )
+    run.add_argument(
+        "--workdir",
+        type=Path,
+        default=None,
+        help="Keep generated CSVs and databases here (default: temporary)",
+    )
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    run.add_argument("--verbose", action="store_true", help="Keep INFO logging")
+
+    cmp = sub.add_parser("compare", help="Compare a report against a baseline")
+    cmp.add_argument("baseline", type=Path)
+    cmp.add_argument("current", type=Path)
+    cmp.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown as a fraction (default: 0.2)",
+    )
+    return p
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "compare":
+        rows = compare_reports(
+            _load(args.baseline), _load(args.current), threshold=args.threshold
+        )
+        raise SystemExit(_print_comparison(rows, args.threshold))
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    report = run_benchmarks(
+        [parse_size(s) for s in args.sizes.split(",") if s.strip()],
+        seed=args.seed,
+        repeat=max(1, args.repeat),
+        only=[p.strip() for p in args.only.split(",") if p.strip()],
+        workdir=args.workdir,
+    )
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.baseline is not None:
+        rows = compare_reports(_load(args.baseline), report, threshold=args.threshold)
+        raise SystemExit(_print_comparison(rows, args.threshold))
@@ -0,0 +1,297 @@
+"""Timed benchmark scenarios.
+
+Scenarios run in registration order against one database: the imports fill
+it, the detection and training jobs build on the imported rows, and the
+read-only endpoint scenarios come last. State-changing scenarios run once;
+read-only ones are repeated and reported by their median. When only some
+scenarios are selected, the imports and the scenarios listed in
+``requires`` still run first but are left out of the report.
+
+A scenario returns the number of rows it processed (for a rows/s figure)
+or None.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.generator import ACCOUNTS, CATEGORIES, Dataset
+from my_private_finances.services.csv_import import (
+    ImportResult,
+    import_transactions_from_csv_path,
+)
+
+API_PREFIX = "/api"
+
+
+class ScenarioError(RuntimeError):
+    """A scenario did not do the work it is meant to measure."""
+
+
+@dataclass
+class BenchContext:
+    client: AsyncClient
+    session_factory: async_sessionmaker[AsyncSession]
+    dataset: Dataset
+    account_ids: dict[str, int] = field(default_factory=dict)
+
+
+ScenarioFn = Callable[[BenchContext], Awaitable[int | None]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    fn: ScenarioFn
+    repeatable: bool = True
+    requires: tuple[str, ...] = ()
+
+
+SCENARIOS: list[Scenario] = []
+
+
+def scenario(
+    name: str, *, repeatable: bool = True, requires: tuple[str, ...] = ()
+) -> Callable[[ScenarioFn], ScenarioFn]:
+    def register(fn: ScenarioFn) -> ScenarioFn:
+        SCENARIOS.append(Scenario(name, fn, repeatable, requires))
+        return fn
+
+    return register
+
+
+async def _request(
+    ctx: BenchContext,
+    method: str,
+    path: str,
+    params: dict[str, Any] | None = None,
+    json: Any = None,
+    expected: int = 200,
+) -> Any:
+    response = await ctx.client.request(
+        method, f"{API_PREFIX}{path}", params=params, json=json
+    )
+    if response.status_code != expected:
+        raise ScenarioError(
+            f"{method} {path} returned {response.status_code}: {response.text[:200]}"
+        )
+    return response
+
+
+async def setup(ctx: BenchContext) -> None:
+    """Create accounts, categories, rules and budgets (not timed)."""
+    for account in ACCOUNTS:
+        res = await _request(
+            ctx,
+            "POST",
+            "/accounts",
+            json={"name": account.name, "currency": "EUR"},
+            expected=201,
+        )
+        ctx.account_ids[account.key] = res.json()["id"]
+
+    category_ids: dict[str, int] = {}
+    for spec in CATEGORIES:
+        payload: dict[str, Any] = {"name": spec.name, "cost_type": spec.cost_type}
+        if spec.parent is not None:
+            payload["parent_id"] = category_ids[spec.parent]
+        res = await _request(ctx, "POST", "/categories", json=payload, expected=201)
+        category_id = category_ids[spec.name] = res.json()["id"]
+        for value in spec.rule_values:
+            await _request(
+                ctx,
+                "POST",
+                "/categorization-rules",
+                json={
+                    "field": "payee",
+                    "operator": "contains",
+                    "value": value,
+                    "category_id": category_id,
+                },
+                expected=201,
+            )
+        if spec.budget is not None:
+            await _request(
+                ctx,
+                "POST",
+                "/budgets",
+                json={"category_id": category_id, "amount": spec.budget},
+                expected=201,
+            )
+
+
+async def _import_files(ctx: BenchContext, account: str) -> list[ImportResult]:
+    results: list[ImportResult] = []
+    for generated in ctx.dataset.files_for(account):
+        async with ctx.session_factory() as session:
+            result = await import_transactions_from_csv_path(
+                session=session,
+                account_id=ctx.account_ids[account],
+                csv_path=generated.path,
+                **generated.layout.import_options(),
+            )
+        if result.failed:
+            raise ScenarioError(
+                f"{generated.path.name}: {result.failed} rows failed, "
+                f"first error: {result.errors[0] if result.errors else '?'}"
+            )
+        results.append(result)
+    return results
+
+
+@scenario("import.bank_de", repeatable=False)
+async def import_bank_de(ctx: BenchContext) -> int:
+    return sum(r.total_rows for r in await _import_files(ctx, "giro"))
+
+
+@scenario("import.trade_republic", repeatable=False)
+async def import_trade_republic(ctx: BenchContext) -> int:
+    return sum(r.total_rows for r in await _import_files(ctx, "trade_republic"))
+
+
+@scenario("import.reimport_duplicates", repeatable=False, requires=("import.*",))
+async def reimport_duplicates(ctx: BenchContext) -> int:
+    total = 0
+    for account in ctx.account_ids:
+        for result in await _import_files(ctx, account):
+            if result.created:
+                raise ScenarioError(f"re-import created {result.created} rows")
+            total += result.total_rows
+    return total
+
+
+@scenario("detect.recurring", repeatable=False)
+async def detect_recurring(ctx: BenchContext) -> None:
+    for account_id in ctx.account_ids.values():
+        await _request(
+            ctx, "POST", "/recurring-patterns/detect", {"account_id": account_id}
+        )
+
+
+@scenario("detect.transfers", repeatable=False)
+async def detect_transfers(ctx: BenchContext) -> None:
+    await _request(ctx, "POST", "/transfers/detect")
+
+
+@scenario("detect.duplicates", repeatable=False)
+async def detect_duplicates(ctx: BenchContext) -> None:
+    await _request(ctx, "POST", "/duplicates/detect")
+
+
+@scenario("payees.cluster", repeatable=False)
+async def payees_cluster(ctx: BenchContext) -> int:
+    res = await _request(ctx, "POST", "/payees/clusters")
+    return int(res.json()["payees"])
+
+
+@scenario("ml.train", repeatable=False)
+async def ml_train(ctx: BenchContext) -> int:
+    res = await _request(ctx, "POST", "/ml/train")
+    return int(res.json()["num_samples"])
+
+
+@scenario("ml.suggest", requires=("ml.train",))
+async def ml_suggest(ctx: BenchContext) -> None:
+    await _request(ctx, "GET", "/ml/suggest")
+
+
+@scenario("transactions.first_page")
+async def transactions_first_page(ctx: BenchContext) -> None:
+    await _request(ctx, "GET", "/transactions", {"limit": 50})
+
+
+@scenario("transactions.deep_page")
+async def transactions_deep_page(ctx: BenchContext) -> None:
+    await _request(
+        ctx, "GET", "/transactions", {"limit": 50, "offset": ctx.dataset.rows // 2}
+    )
+
+
+@scenario("transactions.search")
+async def transactions_search(ctx: BenchContext) -> None:
+    await _request(ctx, "GET", "/transactions", {"limit": 50, "q": "rewe berlin"})
+
+
+@scenario("reports.monthly")
+async def reports_monthly(ctx: BenchContext) -> None:
+    await _request(ctx, "GET", "/reports/monthly", {"month": ctx.dataset.last_month})
+
+
+@scenario("reports.monthly_rollup")
+async def reports_monthly_rollup(ctx: BenchContext) -> None:
+    await _request(
+        ctx,
+        "GET",
+        "/reports/monthly",
+        {"month": ctx.dataset.last_month, "rollup": True},
+    )
+
+
+@scenario("reports.budget_vs_actual")
+async def reports_budget_vs_actual(ctx: BenchContext) -> None:
+    await _request(
+        ctx, "GET", "/reports/budget-vs-actual", {"month": ctx.dataset.last_month}
+    )
+
+
+@scenario("reports.fixed_vs_variable")
+async def reports_fixed_vs_variable(ctx: BenchContext) -> None:
+    await _request(
+        ctx, "GET", "/reports/fixed-vs-variable", {"month": ctx.dataset.last_month}
+    )
+
+
+@scenario("reports.spending_trend")
+async def reports_spending_trend(ctx: BenchContext) -> None:
+    await _request(
+        ctx,
+        "GET",
+        "/reports/spending-trend",
+        {"month": ctx.dataset.last_month, "lookback_months": 12},
+    )
+
+
+@scenario("reports.annual")
+async def reports_annual(ctx: BenchContext) -> None:
+    await _request(ctx, "GET", "/reports/annual", {"year": ctx.dataset.last_full_year})
+
+
+@scenario("reports.net_worth")
+async def reports_net_worth(ctx: BenchContext) -> None:
+    await _request(ctx, "GET", "/reports/net-worth", {"months": 60})
+
+
+@scenario("recurring.summary", requires=("detect.recurring",))
+async def recurring_summary(ctx: BenchContext) -> None:
+    for account_id in ctx.account_ids.values():
+        await _request(
+            ctx, "GET", "/recurring-patterns/summary", {"account_id": account_id}
+        )
+
+
+@scenario("transfers.candidates", requires=("detect.transfers",))
+async def transfers_candidates(ctx: BenchContext) -> None:
+    await _request(ctx, "GET", "/transfers/candidates")
+
+
+@scenario("duplicates.candidates", requires=("detect.duplicates",))
+async def duplicates_candidates(ctx: BenchContext) -> None:
+    await _request(ctx, "GET", "/duplicates/candidates")
+
+
+@scenario("export.json")
+async def export_json(ctx: BenchContext) -> None:
+    await _request(ctx, "GET", "/export/json")
+
+
+if importlib.util.find_spec("pyarrow") is not None:  # optional dependency
+
+    @scenario("export.parquet")
+    async def export_parquet(ctx: BenchContext) -> None:
+        await _request(ctx, "GET", "/export/parquet")
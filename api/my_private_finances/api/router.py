@@ -4,6 +4,9 @@ from my_private_finances.api.routes import reports
 from my_private_finances.api.routes.accounts import router as accounts_router
 from my_private_finances.api.routes.budgets import router as budgets_router
 from my_private_finances.api.routes.categories import router as categories_router
+from my_private_finances.api.routes.debug import router as debug_router
+from my_private_finances.api.routes.duplicates import router as duplicates_router
+from my_private_finances.api.routes.health import router as health_router
 from my_private_finances.api.routes.categorization_rules import (
     router as categorization_rules_router,
 )
@@ -21,19 +24,28 @@ from my_private_finances.api.routes.export import router as export_router
 from my_private_finances.api.routes.data_management import (
     router as data_management_router,
 )
+from my_private_finances.api.routes.metrics import router as metrics_router
 from my_private_finances.api.routes.ml import router as ml_router
+from my_private_finances.api.routes.payees import router as payees_router
+from my_private_finances.api.routes.post_import import router as post_import_router
 from my_private_finances.api.routes.watch_folder import router as watch_folder_router
 
 api_router = APIRouter()
+api_router.include_router(health_router)
+api_router.include_router(debug_router)
+api_router.include_router(metrics_router)
 api_router.include_router(accounts_router)
 api_router.include_router(budgets_router)
 api_router.include_router(categories_router)
 api_router.include_router(categorization_rules_router)
 api_router.include_router(transactions_router)
+api_router.include_router(payees_router)
 api_router.include_router(recurring_patterns_router)
 api_router.include_router(reports.router)
 api_router.include_router(imports_router)
+api_router.include_router(post_import_router)
 api_router.include_router(transfers_router)
+api_router.include_router(duplicates_router)
 api_router.include_router(net_worth_router)
 api_router.include_router(trends_router)
 api_router.include_router(annual_router)
@@ -5,7 +5,7 @@ from decimal import Decimal
 from typing import Annotated, Any, Optional, cast
 
 from fastapi import APIRouter, Query
-from sqlalchemy import select
+from sqlalchemy import case, extract, func, select
 
 from my_private_finances.api.routes.reports import _resolve_currency
 from my_private_finances.deps import SessionDep
@@ -41,23 +41,25 @@ async def get_annual_report(
     else:
         base_filter = date_filter & transfer_filter
 
-    stmt = select(tx.c.booking_date, tx.c.amount).where(base_filter)
+    # Integer SUMs per month, done by the database
+    month_col = extract("month", tx.c.booking_date).label("month")
+    stmt = (
+        select(
+            month_col,
+            func.sum(case((tx.c.amount > 0, tx.c.amount), else_=0)).label("income"),
+            func.sum(case((tx.c.amount < 0, -tx.c.amount), else_=0)).label("expenses"),
+        )
+        .where(base_filter)
+        .group_by(month_col)
+    )
     rows = (await session.execute(stmt)).all()
 
-    # Aggregate per month
     income_by_month: dict[str, Decimal] = {}
     expenses_by_month: dict[str, Decimal] = {}
-
     for row in rows:
-        bdate: date = row.booking_date
-        month_str = f"{bdate.year}-{bdate.month:02d}"
-        amount = Decimal(str(row.amount))
-        if amount > _ZERO:
-            income_by_month[month_str] = income_by_month.get(month_str, _ZERO) + amount
-        else:
-            expenses_by_month[month_str] = expenses_by_month.get(
-                month_str, _ZERO
-            ) + abs(amount)
+        month_str = f"{year}-{int(row.month):02d}"
+        income_by_month[month_str] = row.income
+        expenses_by_month[month_str] = row.expenses
 
     # Build all 12 months
     months: list[MonthSummary] = []
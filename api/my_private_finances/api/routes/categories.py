@@ -6,7 +6,7 @@ from fastapi import APIRouter, Body, HTTPException
 from sqlmodel import select
 
 from my_private_finances.deps import SessionDep
-from my_private_finances.models import Category, Transaction
+from my_private_finances.models import Category, CategoryClosure, Transaction
 from my_private_finances.schemas import CategoryCreate, CategoryRead, CategoryUpdate
 
 router = APIRouter(prefix="/categories", tags=["categories"])
@@ -69,6 +69,17 @@ async def update_category(
         parent = await session.get(Category, payload.parent_id)
         if parent is None:
             raise HTTPException(status_code=422, detail="parent_id does not exist")
+        below = await session.execute(
+            select(CategoryClosure.depth).where(
+                CategoryClosure.ancestor_id == category_id,  # type: ignore[arg-type]
+                CategoryClosure.descendant_id == payload.parent_id,  # type: ignore[arg-type]
+            )
+        )
+        if below.scalar_one_or_none() is not None:
+            raise HTTPException(
+                status_code=422,
+                detail="Category cannot be moved below one of its subcategories",
+            )
         db_obj.parent_id = payload.parent_id
 
     await session.commit()
@@ -92,5 +103,14 @@ async def delete_category(category_id: int, session: SessionDep):
             detail="Category is in use by transactions and cannot be deleted",
         )
 
+    result = await session.execute(
+        select(Category.id).where(Category.parent_id == category_id).limit(1)  # type: ignore[arg-type]
+    )
+    if result.scalar_one_or_none() is not None:
+        raise HTTPException(
+            status_code=409,
+            detail="Category has subcategories and cannot be deleted",
+        )
+
     await session.delete(db_obj)
     await session.commit()
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-import os
-import sqlite3
-import tempfile
+from collections.abc import AsyncIterator
+from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Request, UploadFile
 from sqlalchemy import delete, func, select
@@ -15,49 +15,83 @@ from my_private_finances.models import (
     CategorizationRule,
     Category,
     CsvProfile,
+    DuplicateCandidate,
+    MergedTransaction,
+    Payee,
+    ProcessedFile,
     RecurringPattern,
     Transaction,
     TransferCandidate,
 )
+from my_private_finances.services.json_restore import RestoreError, restore_json_export
+from my_private_finances.services.sqlite_restore import (
+    discard,
+    staging_path,
+    swap_database,
+    verify_backup,
+    write_upload,
+)
 
 router = APIRouter(tags=["data"])
 
 logger = logging.getLogger(__name__)
 
-_SQLITE_MAGIC = b"SQLite format 3\x00"
 _MAX_RESTORE_BYTES = 500 * 1024 * 1024  # 500 MB
+_UPLOAD_CHUNK_BYTES = 256 * 1024
 
 
 @router.post("/restore/sqlite", status_code=200)
 async def restore_sqlite(file: UploadFile, request: Request) -> dict:
-    data = await file.read()
-    if len(data) > _MAX_RESTORE_BYTES:
-        raise HTTPException(status_code=413, detail="File too large (max 500 MB)")
-    if data[:16] != _SQLITE_MAGIC:
-        raise HTTPException(status_code=400, detail="Not a valid SQLite file")
+    """Replace the database with an uploaded SQLite backup.
 
-    tmp_path: str | None = None
+    The backup is verified in a sibling file first; requests already running
+    finish on the old database and later ones see the restored one.
+    """
+    db_path = Path(request.app.state.db_path)
+    staged = staging_path(db_path)
     try:
-        with tempfile.NamedTemporaryFile(suffix=".sqlite", delete=False) as tmp:
-            tmp.write(data)
-            tmp_path = tmp.name
-
-        # Release all pooled async connections before writing
-        await request.app.state.engine.dispose()
-
-        src = sqlite3.connect(tmp_path)
-        dst = sqlite3.connect(str(request.app.state.db_path))
-        src.backup(dst)
-        dst.close()
-        src.close()
+        await write_upload(_upload_chunks(file), staged, _MAX_RESTORE_BYTES)
+        await asyncio.to_thread(verify_backup, staged, db_path)
+        engines = [request.app.state.engine]
+        read_engine = getattr(request.app.state, "read_engine", None)
+        if read_engine is not None:
+            engines.append(read_engine)
+        await swap_database(staged, db_path, request.app.state.session_factory, engines)
+    except RestoreError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Database is busy; restore not applied, try again",
+        ) from e
     finally:
-        if tmp_path is not None:
-            os.unlink(tmp_path)
+        await asyncio.to_thread(discard, staged)
 
     logger.info("Database restored from uploaded SQLite backup")
     return {"ok": True}
 
 
+async def _upload_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(_UPLOAD_CHUNK_BYTES):
+        yield chunk
+
+
+@router.post("/restore/json", status_code=200)
+async def restore_json(file: UploadFile, session: SessionDep) -> dict:
+    """Replace all data with an uploaded ``/export/json`` document (or .json.gz).
+
+    The document is parsed and inserted as it is read and committed only if
+    all of it restored cleanly.
+    """
+    try:
+        counts = await restore_json_export(session, _upload_chunks(file))
+    except RestoreError as e:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    await session.commit()
+    return {"ok": True, "restored": counts}
+
+
 async def _count(session: SessionDep, model: type) -> int:
     result = await session.execute(select(func.count()).select_from(model))  # type: ignore[arg-type]
     return int(result.scalar_one())
@@ -65,8 +99,19 @@ async def _count(session: SessionDep, model: type) -> int:
 
 @router.delete("/data/transactions", status_code=200)
 async def delete_transactions(session: SessionDep) -> dict:
-    """Delete all transactions, transfer candidates, and recurring patterns."""
-    models = [TransferCandidate, RecurringPattern, Transaction]
+    """Delete transactions with everything derived from them.
+
+    That is their candidates, merge records, recurring patterns and the
+    watch-folder ledger, so deleted exports can be imported again.
+    """
+    models = [
+        ProcessedFile,
+        DuplicateCandidate,
+        TransferCandidate,
+        RecurringPattern,
+        MergedTransaction,
+        Transaction,
+    ]
     deleted = sum([await _count(session, m) for m in models])
     for model in models:
         await session.execute(delete(model))
@@ -79,9 +124,13 @@ async def delete_transactions(session: SessionDep) -> dict:
 async def wipe_all_data(session: SessionDep) -> dict:
     """Delete all data from all tables in FK-safe order."""
     models = [
+        ProcessedFile,
+        DuplicateCandidate,
         TransferCandidate,
         RecurringPattern,
+        MergedTransaction,
         Transaction,
+        Payee,
         Budget,
         CategorizationRule,
         CsvProfile,
@@ -0,0 +1,14 @@
+from typing import Any
+
+from fastapi import APIRouter, Request
+
+from my_private_finances.instrumentation import SLOW_QUERY_MS, RouteTimings
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/metrics")
+async def debug_metrics(request: Request) -> dict[str, Any]:
+    """Rolling latency percentiles and DB time per route."""
+    timings: RouteTimings = request.app.state.route_timings
+    return {"slow_query_ms": SLOW_QUERY_MS, "routes": timings.summary()}
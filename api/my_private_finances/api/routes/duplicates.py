@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Annotated, Any, cast
+
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.params import Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.deps import SessionDep
+from my_private_finances.models import DuplicateCandidate, Transaction
+from my_private_finances.schemas import (
+    DuplicateBulkAction,
+    DuplicateBulkItemStatus,
+    DuplicateBulkResult,
+    DuplicateCandidateRead,
+    DuplicateLeg,
+)
+from my_private_finances.services.duplicate_detection import (
+    detect_duplicate_candidates,
+    dismiss_duplicate,
+    merge_duplicate,
+)
+
+router = APIRouter(prefix="/duplicates", tags=["duplicates"])
+
+
+def _leg(tx: Transaction) -> DuplicateLeg:
+    return DuplicateLeg(
+        transaction_id=tx.id,  # type: ignore[arg-type]
+        booking_date=tx.booking_date,
+        amount=tx.amount,
+        payee=tx.payee,
+        purpose=tx.purpose,
+        import_source=tx.import_source,
+    )
+
+
+def _build_candidate_read(
+    candidate: DuplicateCandidate, txs: dict[int, Transaction]
+) -> DuplicateCandidateRead:
+    assert candidate.id is not None
+    keep = txs.get(candidate.transaction_id)
+    duplicate = txs.get(candidate.duplicate_id)
+    if keep is None or duplicate is None:
+        raise HTTPException(
+            status_code=500, detail="Duplicate candidate references missing transaction"
+        )
+    return DuplicateCandidateRead(
+        id=candidate.id,
+        account_id=keep.account_id,
+        transaction=_leg(keep),
+        duplicate=_leg(duplicate),
+        score=candidate.score,
+        status=candidate.status,
+    )
+
+
+async def _to_reads(
+    session: AsyncSession, candidates: list[DuplicateCandidate]
+) -> list[DuplicateCandidateRead]:
+    """Batch-load the transactions of *candidates* and build their reads."""
+    tx_ids = {c.transaction_id for c in candidates} | {
+        c.duplicate_id for c in candidates
+    }
+    txs: dict[int, Transaction] = {}
+    if tx_ids:
+        rows = await session.execute(
+            select(Transaction).where(Transaction.id.in_(tx_ids))  # type: ignore[union-attr]
+        )
+        txs = {t.id: t for t in rows.scalars().all() if t.id is not None}
+    return [_build_candidate_read(c, txs) for c in candidates]
+
+
+@router.post("/detect", response_model=list[DuplicateCandidateRead], status_code=200)
+async def trigger_detection(
+    session: SessionDep,
+    window_days: Annotated[int, Query(ge=0, le=31)] = 3,
+) -> list[DuplicateCandidateRead]:
+    """Detect likely duplicate transactions within each account."""
+    new_candidates = await detect_duplicate_candidates(session, window_days)
+    await session.commit()
+    for candidate in new_candidates:
+        await session.refresh(candidate)
+    return await _to_reads(session, new_candidates)
+
+
+@router.get("/candidates", response_model=list[DuplicateCandidateRead])
+async def list_candidates(
+    session: SessionDep,
+    status: Annotated[str | None, Query()] = None,
+    account_id: Annotated[int | None, Query(ge=1)] = None,
+) -> list[DuplicateCandidateRead]:
+    """Review queue, best matches first. Defaults to pending candidates."""
+    filter_status = status if status is not None else "pending"
+    stmt = (
+        select(DuplicateCandidate)
+        .where(DuplicateCandidate.status == filter_status)  # type: ignore[arg-type]
+        .order_by(
+            DuplicateCandidate.score.desc(),  # type: ignore[attr-defined]
+            DuplicateCandidate.id,  # type: ignore[arg-type]
+        )
+    )
+    if account_id is not None:
+        stmt = stmt.join(
+            Transaction,
+            Transaction.id == DuplicateCandidate.transaction_id,  # type: ignore[arg-type]
+        ).where(Transaction.account_id == account_id)  # type: ignore[arg-type]
+    candidates = list((await session.execute(stmt)).scalars().all())
+    return await _to_reads(session, candidates)
+
+
+@router.post("/candidates/bulk", response_model=DuplicateBulkResult)
+async def bulk_resolve(
+    payload: Annotated[DuplicateBulkAction, Body()],
+    session: SessionDep,
+) -> DuplicateBulkResult:
+    """Merge or dismiss many pending candidates in one transaction.
+
+    Candidates are handled in the given order. Merging deletes every other
+    candidate that refers to the removed transaction; those report
+    ``not_found`` if they come up later in the same request.
+    """
+    dc = cast(Any, DuplicateCandidate).__table__
+    items: list[DuplicateBulkItemStatus] = []
+    for candidate_id in payload.candidate_ids:
+        # Query instead of session.get: the identity map does not know about
+        # candidates an earlier merge deleted
+        candidate = (
+            await session.execute(
+                select(DuplicateCandidate).where(dc.c.id == candidate_id)
+            )
+        ).scalar_one_or_none()
+        if candidate is None:
+            items.append(DuplicateBulkItemStatus(id=candidate_id, status="not_found"))
+        elif candidate.status != "pending":
+            items.append(DuplicateBulkItemStatus(id=candidate_id, status="not_pending"))
+        elif payload.action == "merge":
+            await merge_duplicate(session, candidate)
+            items.append(DuplicateBulkItemStatus(id=candidate_id, status="merged"))
+        else:
+            await dismiss_duplicate(session, candidate)
+            items.append(DuplicateBulkItemStatus(id=candidate_id, status="dismissed"))
+    await session.commit()
+    return DuplicateBulkResult(
+        merged=sum(1 for i in items if i.status == "merged"),
+        dismissed=sum(1 for i in items if i.status == "dismissed"),
+        items=items,
+    )
@@ -1,29 +1,32 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
-import sqlite3
 import tempfile
-from datetime import UTC, date, datetime
-from decimal import Decimal
-from typing import Any
+from datetime import date
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Request
-from fastapi.responses import FileResponse, Response
-from sqlmodel import select
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from starlette.background import BackgroundTask
 
-from my_private_finances.deps import SessionDep
-from my_private_finances.models import (
-    Account,
-    Budget,
-    CategorizationRule,
-    Category,
-    CsvProfile,
-    RecurringPattern,
-    Transaction,
-    TransferCandidate,
+from my_private_finances.db import database_gate
+from my_private_finances.schemas.backup import BackupStatusRead
+from my_private_finances.services.columnar_export import (
+    MEDIA_TYPES,
+    ColumnarExportUnavailable,
+    ColumnarFormat,
+    stream_transactions,
+    transaction_schema,
+)
+from my_private_finances.services.json_export import gzip_stream, stream_json_export
+from my_private_finances.services.sqlite_backup import (
+    BackupError,
+    BackupProgress,
+    differential_backup,
+    full_backup,
 )
 
 router = APIRouter(prefix="/export", tags=["export"])
@@ -31,70 +34,128 @@ router = APIRouter(prefix="/export", tags=["export"])
 logger = logging.getLogger(__name__)
 
 
-def _serialize(obj: Any) -> Any:
-    if isinstance(obj, Decimal):
-        return str(obj)
-    if isinstance(obj, (date, datetime)):
-        return obj.isoformat()
-    raise TypeError(f"Cannot JSON-serialize {type(obj)!r}")
+def _read_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    # Streamed bodies open their own session, closed once the body is sent
+    sf: async_sessionmaker[AsyncSession] = (
+        getattr(request.app.state, "read_session_factory", None)
+        or request.app.state.session_factory
+    )
+    return sf
 
 
 @router.get("/sqlite")
-async def export_sqlite(request: Request) -> FileResponse:
+async def export_sqlite(
+    request: Request,
+    since: Annotated[Optional[int], Query(ge=0)] = None,
+) -> FileResponse:
+    """Download a consistent copy of the database.
+
+    With ``since`` (the watermark of an earlier backup) only the rows changed
+    after it are exported. The new watermark is sent in ``X-Backup-Watermark``.
+    """
     db_path = request.app.state.db_path
+    progress = BackupProgress("full" if since is None else "differential")
+    request.app.state.sqlite_backup = progress
     tmp = tempfile.NamedTemporaryFile(suffix=".sqlite", delete=False)
     tmp.close()
 
-    src = sqlite3.connect(str(db_path))
-    dst = sqlite3.connect(tmp.name)
-    src.backup(dst)
-    dst.close()
-    src.close()
+    try:
+        # The backup reads the file directly; keep a restore from swapping it
+        async with database_gate(db_path).session():
+            if since is None:
+                watermark = await asyncio.to_thread(
+                    full_backup, db_path, tmp.name, progress
+                )
+            else:
+                watermark = await asyncio.to_thread(
+                    differential_backup, db_path, tmp.name, since, progress
+                )
+    except BackupError as e:
+        os.unlink(tmp.name)
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
 
     filename = f"my_private_finances_{date.today()}.sqlite"
+    if since is not None:
+        filename = f"my_private_finances_{date.today()}_since_{since}.sqlite"
     logger.info("SQLite export prepared: %s", tmp.name)
     return FileResponse(
         tmp.name,
         filename=filename,
         media_type="application/octet-stream",
+        headers={"X-Backup-Watermark": str(watermark)},
         background=BackgroundTask(os.unlink, tmp.name),
     )
 
 
+@router.get("/sqlite/status", response_model=BackupStatusRead)
+async def sqlite_export_status(request: Request) -> BackupStatusRead:
+    """Progress of the running (or last) SQLite export."""
+    progress: BackupProgress | None = getattr(request.app.state, "sqlite_backup", None)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No SQLite export has run yet")
+    return BackupStatusRead(
+        kind=progress.kind,
+        running=progress.running,
+        started_at=progress.started_at,
+        finished_at=progress.finished_at,
+        total=progress.total,
+        remaining=progress.remaining,
+        percent=progress.percent,
+        rows=progress.rows,
+        watermark=progress.watermark,
+        error=progress.error,
+    )
+
+
 @router.get("/json")
-async def export_json(session: SessionDep) -> Response:
-    # Query in FK-safe order (parents before children)
-    categories = (await session.execute(select(Category))).scalars().all()
-    accounts = (await session.execute(select(Account))).scalars().all()
-    csv_profiles = (await session.execute(select(CsvProfile))).scalars().all()
-    budgets = (await session.execute(select(Budget))).scalars().all()
-    rules = (await session.execute(select(CategorizationRule))).scalars().all()
-    transactions = (await session.execute(select(Transaction))).scalars().all()
-    patterns = (await session.execute(select(RecurringPattern))).scalars().all()
-    transfers = (await session.execute(select(TransferCandidate))).scalars().all()
-
-    payload: dict[str, Any] = {
-        "export_version": 1,
-        "exported_at": datetime.now(UTC).isoformat(),
-        "accounts": [m.model_dump() for m in accounts],
-        "categories": [m.model_dump() for m in categories],
-        "csv_profiles": [m.model_dump() for m in csv_profiles],
-        "budgets": [m.model_dump() for m in budgets],
-        "categorization_rules": [m.model_dump() for m in rules],
-        "transactions": [m.model_dump() for m in transactions],
-        "recurring_patterns": [m.model_dump() for m in patterns],
-        "transfer_candidates": [m.model_dump() for m in transfers],
-    }
-
-    content = json.dumps(payload, default=_serialize, indent=2)
+async def export_json(
+    request: Request,
+    gzip: Annotated[bool, Query()] = False,
+) -> StreamingResponse:
+    """Stream all data as one JSON document, optionally gzip-compressed."""
+    chunks = stream_json_export(_read_session_factory(request))
     filename = f"my_private_finances_{date.today()}.json"
-    logger.info(
-        "JSON export prepared: %d accounts, %d transactions",
-        len(accounts),
-        len(transactions),
+    media_type = "application/json"
+    if gzip:
+        chunks = gzip_stream(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/parquet")
+async def export_parquet(
+    request: Request,
+    account_id: Annotated[Optional[int], Query(ge=1)] = None,
+    date_from: Annotated[Optional[date], Query()] = None,
+    date_to: Annotated[Optional[date], Query()] = None,
+    fmt: Annotated[ColumnarFormat, Query(alias="format")] = "parquet",
+) -> StreamingResponse:
+    """Stream transactions as Parquet (or, with format=arrow, Arrow IPC)."""
+    try:
+        transaction_schema()
+    except ColumnarExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e)) from e
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(status_code=422, detail="date_from is after date_to")
+
+    chunks = stream_transactions(
+        _read_session_factory(request),
+        fmt,
+        account_id=account_id,
+        date_from=date_from,
+        date_to=date_to,
     )
-    return Response(
-        content=content.encode(),
-        media_type="application/json",
+    filename = f"my_private_finances_transactions_{date.today()}.{fmt}"
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -1,8 +1,17 @@
-from fastapi import APIRouter
+from typing import Any
+
+from fastapi import APIRouter, Request
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from my_private_finances.db import read_sqlite_settings
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
-async def health():
-    return {"status": "ok"}
+async def health(request: Request) -> dict[str, Any]:
+    engine: AsyncEngine = request.app.state.engine
+    database: dict[str, Any] = {"dialect": engine.dialect.name}
+    if engine.dialect.name == "sqlite":
+        database.update(await read_sqlite_settings(engine))
+    return {"status": "ok", "database": database}
@@ -5,7 +5,7 @@ import tempfile
 from pathlib import Path
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query, UploadFile
+from fastapi import APIRouter, HTTPException, Query, Request, UploadFile
 from my_private_finances.deps import SessionDep
 from my_private_finances.models import CsvProfile
 from my_private_finances.schemas import ImportResultResponse
@@ -13,7 +13,7 @@ from my_private_finances.services.csv_import import (
     ColumnMap,
     import_transactions_from_csv_path,
 )
-from my_private_finances.services.recurring_detection import run_detection
+from my_private_finances.services.post_import import post_import_scheduler
 
 router = APIRouter(prefix="/imports", tags=["imports"])
 
@@ -23,6 +23,7 @@ logger = logging.getLogger(__name__)
 @router.post("/csv", response_model=ImportResultResponse)
 async def import_csv(
     file: UploadFile,
+    request: Request,
     session: SessionDep,
     account_id: Annotated[int, Query()],
     delimiter: Annotated[str | None, Query()] = None,
@@ -96,14 +97,7 @@ async def import_csv(
             tmp_path.unlink(missing_ok=True)
 
     if result.created > 0:
-        try:
-            await run_detection(session, account_id)
-        except Exception:
-            logger.warning(
-                "Auto recurring-detection failed after CSV import for account_id=%d",
-                account_id,
-                exc_info=True,
-            )
+        post_import_scheduler(request.app.state.session_factory).notify(account_id)
 
     return ImportResultResponse(
         total_rows=result.total_rows,
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
 
-from my_private_finances.deps import SessionDep
+from my_private_finances.deps import ReadSessionDep, SessionDep
 from my_private_finances.schemas.ml import Suggestion, TrainResult
 from my_private_finances.services.ml_categorization import (
     ColdStartError,
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/ml", tags=["ml"])
 
 
 @router.post("/train", response_model=TrainResult)
-async def train_model(session: SessionDep) -> TrainResult:
+async def train_model(session: ReadSessionDep) -> TrainResult:
     try:
         return await train(session)
     except ColdStartError as e:
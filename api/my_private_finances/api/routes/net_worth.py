@@ -16,7 +16,7 @@ from typing import Annotated, Any, cast
 
 from fastapi import APIRouter
 from fastapi.params import Query
-from sqlalchemy import select
+from sqlalchemy import extract, func, select
 
 from my_private_finances.deps import SessionDep
 from my_private_finances.models import Account, Transaction
@@ -79,28 +79,37 @@ async def get_net_worth(
         )
 
     tx = cast(Any, Transaction).__table__
+    acc_t = cast(Any, Account).__table__
     target_month_ends = _target_months(months)
-    earliest_date = min(a.opening_balance_date for a in accounts)  # type: ignore[type-var]
 
-    # Fetch all relevant transactions for all accounts in one query
+    # Integer SUM per account and month, counting only transactions on or
+    # after the account's opening balance date
+    year_col = extract("year", tx.c.booking_date).label("year")
+    month_col = extract("month", tx.c.booking_date).label("month")
     stmt = (
-        select(tx.c.account_id, tx.c.booking_date, tx.c.amount)
+        select(
+            tx.c.account_id,
+            year_col,
+            month_col,
+            func.sum(tx.c.amount).label("total"),
+        )
+        .join(acc_t, tx.c.account_id == acc_t.c.id)
         .where(
             tx.c.account_id.in_([a.id for a in accounts])
-            & (tx.c.booking_date >= earliest_date)
+            & (tx.c.booking_date >= acc_t.c.opening_balance_date)
             & (tx.c.is_transfer == False)  # noqa: E712
         )
-        .order_by(tx.c.booking_date)
+        .group_by(tx.c.account_id, year_col, month_col)
     )
-    tx_rows = (await session.execute(stmt)).all()
+    month_rows = (await session.execute(stmt)).all()
 
-    # Group transactions by account_id
-    tx_by_account: dict[int, list[tuple[date, Decimal]]] = {
+    # Monthly totals per account, keyed by the month's last day
+    totals_by_account: dict[int, list[tuple[date, Decimal]]] = {
         a.id: [] for a in accounts if a.id is not None
-    }  # type: ignore[misc]
-    for row in tx_rows:
-        tx_by_account[row.account_id].append(
-            (row.booking_date, Decimal(str(row.amount)))
+    }
+    for row in month_rows:
+        totals_by_account[row.account_id].append(
+            (_month_end(int(row.year), int(row.month)), row.total)
         )
 
     # Build monthly balance series per account
@@ -112,13 +121,12 @@ async def get_net_worth(
         assert acc.opening_balance is not None
         assert acc.opening_balance_date is not None
 
-        txs = tx_by_account[acc.id]
+        monthly = totals_by_account[acc.id]
         balances: dict[date, Decimal] = {}
 
         for month_end in target_month_ends:
-            # Only include transactions from opening_balance_date up to month_end
             total = sum(
-                (amt for d, amt in txs if acc.opening_balance_date <= d <= month_end),
+                (amt for m_end, amt in monthly if m_end <= month_end),
                 Decimal("0"),
             )
             balances[month_end] = acc.opening_balance + total
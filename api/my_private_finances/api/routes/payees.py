@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.params import Query
+from sqlmodel import select
+
+from my_private_finances.deps import SessionDep
+from my_private_finances.models import Payee
+from my_private_finances.models.payee import normalize_payee
+from my_private_finances.schemas import PayeeClusterResult, PayeeRead, PayeeUpdate
+from my_private_finances.services.payee_clustering import cluster_payees
+
+router = APIRouter(prefix="/payees", tags=["payees"])
+
+
+def _to_read(payee: Payee) -> PayeeRead:
+    assert payee.id is not None
+    return PayeeRead(
+        id=payee.id,
+        name=payee.name,
+        normalized=payee.normalized,
+        alias=payee.alias,
+        cluster_id=payee.cluster_id,
+    )
+
+
+@router.get("", response_model=list[PayeeRead])
+async def list_payees(
+    session: SessionDep,
+    q: Annotated[Optional[str], Query(min_length=1, max_length=255)] = None,
+    cluster_id: Annotated[Optional[int], Query(ge=1)] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 100,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> list[PayeeRead]:
+    """Payees ordered by normalized name; ``q`` matches its beginning."""
+    stmt = select(Payee).order_by(Payee.normalized)  # type: ignore[arg-type]
+    if cluster_id is not None:
+        stmt = stmt.where(Payee.cluster_id == cluster_id)  # type: ignore[arg-type]
+    prefix = normalize_payee(q)
+    if prefix is not None:
+        # Range on the unique index instead of LIKE, which SQLite will not index
+        stmt = stmt.where(
+            Payee.normalized >= prefix,  # type: ignore[arg-type]
+            Payee.normalized < prefix + "\U0010ffff",  # type: ignore[arg-type]
+        )
+    res = await session.execute(stmt.offset(offset).limit(limit))
+    return [_to_read(p) for p in res.scalars().all()]
+
+
+@router.post("/clusters", response_model=PayeeClusterResult)
+async def rebuild_payee_clusters(session: SessionDep) -> PayeeClusterResult:
+    """Recompute payee clusters now instead of after the next import."""
+    result = await cluster_payees(session)
+    return PayeeClusterResult(
+        payees=result.payees,
+        clusters=result.clusters,
+        changed=result.changed,
+        seconds=result.seconds,
+    )
+
+
+@router.patch("/{payee_id}", response_model=PayeeRead)
+async def update_payee(
+    payee_id: int,
+    payload: Annotated[PayeeUpdate, Body()],
+    session: SessionDep,
+) -> PayeeRead:
+    """Set or clear the alias shown for the payee in reports.
+
+    Reports name a payee cluster after its first payee (``cluster_id``).
+    """
+    db_obj = await session.get(Payee, payee_id)
+    if db_obj is None:
+        raise HTTPException(status_code=404, detail="Payee not found")
+    if "alias" in payload.model_fields_set:
+        db_obj.alias = payload.alias
+    await session.commit()
+    await session.refresh(db_obj)
+    return _to_read(db_obj)
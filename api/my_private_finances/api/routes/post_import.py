@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Request
+
+from my_private_finances.schemas.post_import import PostImportStatusRead
+from my_private_finances.services.post_import import post_import_scheduler
+
+router = APIRouter(prefix="/post-import", tags=["post-import"])
+
+
+@router.get("/status", response_model=PostImportStatusRead)
+async def post_import_status(request: Request) -> PostImportStatusRead:
+    """Accounts waiting for detection/categorization after an import."""
+    return post_import_scheduler(request.app.state.session_factory).status()
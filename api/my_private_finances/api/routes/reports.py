@@ -10,7 +10,14 @@ from sqlalchemy import func, literal, select, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from my_private_finances.deps import SessionDep
-from my_private_finances.models import Account, Budget, Category, Transaction
+from my_private_finances.models import (
+    Account,
+    Budget,
+    Category,
+    CategoryClosure,
+    Payee,
+    Transaction,
+)
 from my_private_finances.schemas import (
     BudgetComparison,
     CategoryTotal,
@@ -56,7 +63,13 @@ async def get_monthly_report(
     month: Annotated[str, Query(min_length=7, max_length=7)],
     session: SessionDep,
     account_id: Annotated[Optional[int], Query(ge=1)] = None,
+    rollup: bool = False,
 ) -> MonthlyReport:
+    """Totals, top payees and spending per category for one month.
+
+    With ``rollup`` every category's total includes its subcategories, so
+    a parent and its children are all listed and their totals overlap.
+    """
     start, end = _parse_month(month)
     currency = await _resolve_currency(session, account_id)
 
@@ -84,37 +97,59 @@ async def get_monthly_report(
 
     totals_row = (await session.execute(stmt_totals)).one()
     tx_count = int(totals_row.tx_count)
-    net_total = Decimal(str(totals_row.net_total))
-    income_total = Decimal(str(totals_row.income_total))
-    expense_total = Decimal(str(totals_row.expense_total))
-
-    stmt_payees = (
+    net_total = totals_row.net_total
+    income_total = totals_row.income_total
+    expense_total = totals_row.expense_total
+
+    # Totals per payee cluster first; only the 15 winners are joined for names
+    payee = cast(Any, Payee).__table__
+    payee_key = func.coalesce(payee.c.cluster_id, tx.c.payee_id)
+    by_payee = (
         select(
-            tx.c.payee,
-            func.coalesce(func.sum(tx.c.amount), 0).label("total"),
+            payee_key.label("payee_id"),
+            func.sum(tx.c.amount).label("total"),
         )
+        .select_from(tx.outerjoin(payee, payee.c.id == tx.c.payee_id))
         .where(base_filter)
         .where(tx.c.amount < 0)
-        .group_by(tx.c.payee)
+        .group_by(payee_key)
         .order_by(func.sum(tx.c.amount).asc())
         .limit(15)
+        .subquery()
+    )
+    stmt_payees = (
+        select(
+            func.coalesce(payee.c.alias, payee.c.name).label("payee"),
+            by_payee.c.total,
+        )
+        .select_from(by_payee)
+        .outerjoin(payee, payee.c.id == by_payee.c.payee_id)
+        .order_by(by_payee.c.total.asc())
     )
 
     payees_rows = (await session.execute(stmt_payees)).all()
-    payees = [
-        PayeeTotal(payee=r.payee, total=Decimal(str(r.total))) for r in payees_rows
-    ]
+    payees = [PayeeTotal(payee=r.payee, total=r.total) for r in payees_rows]
 
     cat = cast(Any, Category).__table__
+    if rollup:
+        # Each transaction counts towards its category and every ancestor
+        closure = cast(Any, CategoryClosure).__table__
+        category_key = closure.c.ancestor_id
+        categorized = tx.outerjoin(
+            closure, closure.c.descendant_id == tx.c.category_id
+        ).outerjoin(cat, cat.c.id == closure.c.ancestor_id)
+    else:
+        category_key = tx.c.category_id
+        categorized = tx.outerjoin(cat, tx.c.category_id == cat.c.id)
     stmt_categories = (
         select(
             cat.c.name.label("category_name"),
             func.coalesce(func.sum(tx.c.amount), 0).label("total"),
         )
-        .select_from(tx.outerjoin(cat, tx.c.category_id == cat.c.id))
+        .select_from(categorized)
         .where(base_filter)
         .where(tx.c.amount < 0)
-        .group_by(tx.c.category_id)
+        .group_by(category_key)
         .order_by(func.sum(tx.c.amount).asc())
     )
 
@@ -122,7 +157,7 @@ async def get_monthly_report(
     categories = [
         CategoryTotal(
             category_name=r.category_name,
-            total=Decimal(str(r.total)),
+            total=r.total,
         )
         for r in cat_rows
     ]
@@ -148,7 +183,7 @@ async def get_monthly_report(
             booking_date=r.booking_date,
             payee=r.payee,
             purpose=r.purpose,
-            amount=Decimal(str(r.amount)),
+            amount=r.amount,
             category_name=r.category_name,
         )
         for r in spending_rows
@@ -173,7 +208,13 @@ async def get_budget_vs_actual(
     month: Annotated[str, Query(min_length=7, max_length=7)],
     session: SessionDep,
     account_id: Annotated[Optional[int], Query(ge=1)] = None,
+    rollup: bool = True,
 ) -> list[BudgetComparison]:
+    """Budgeted vs. actual spending per budgeted category.
+
+    A budget covers its category's subcategories as well unless ``rollup``
+    is turned off, in which case only the category's own transactions count.
+    """
     start, end = _parse_month(month)
 
     if account_id is not None:
@@ -210,16 +251,29 @@ async def get_budget_vs_actual(
     else:
         base_filter = date_filter & transfer_filter
 
-    stmt_actuals = (
-        select(
-            tx.c.category_id,
-            func.coalesce(func.sum(tx.c.amount), 0).label("actual"),
+    if rollup:
+        closure = cast(Any, CategoryClosure).__table__
+        stmt_actuals = (
+            select(
+                closure.c.ancestor_id.label("category_id"),
+                func.coalesce(func.sum(tx.c.amount), 0).label("actual"),
+            )
+            .select_from(tx.join(closure, closure.c.descendant_id == tx.c.category_id))
+            .where(base_filter)
+            .where(closure.c.ancestor_id.in_([r.category_id for r in budget_rows]))
+            .group_by(closure.c.ancestor_id)
+        )
+    else:
+        stmt_actuals = (
+            select(
+                tx.c.category_id,
+                func.coalesce(func.sum(tx.c.amount), 0).label("actual"),
+            )
+            .where(base_filter)
+            .group_by(tx.c.category_id)
         )
-        .where(base_filter)
-        .group_by(tx.c.category_id)
-    )
     actual_rows = (await session.execute(stmt_actuals)).all()
-    actuals = {r.category_id: Decimal(str(r.actual)) for r in actual_rows}
+    actuals: dict[int | None, Decimal] = {r.category_id: r.actual for r in actual_rows}
 
     result = []
     for row in budget_rows:
@@ -244,7 +298,13 @@ async def get_fixed_vs_variable(
     month: Annotated[str, Query(min_length=7, max_length=7)],
     session: SessionDep,
     account_id: Annotated[Optional[int], Query(ge=1)] = None,
+    rollup: bool = False,
 ) -> FixedVsVariableReport:
+    """Spending split by the categories' cost type.
+
+    With ``rollup`` a category without a cost type takes the one of its
+    nearest classified ancestor, so classifying a parent covers its subtree.
+    """
     start, end = _parse_month(month)
     currency = await _resolve_currency(session, account_id)
 
@@ -260,15 +320,31 @@ async def get_fixed_vs_variable(
     else:
         base_filter = date_filter & transfer_filter
 
+    classified = cat
+    if rollup:
+        closure = cast(Any, CategoryClosure).__table__
+        ancestor = cat.alias("ancestor")
+        inherited = (
+            select(ancestor.c.cost_type)
+            .select_from(closure.join(ancestor, ancestor.c.id == closure.c.ancestor_id))
+            .where(closure.c.descendant_id == cat.c.id)
+            .where(ancestor.c.cost_type.is_not(None))
+            .order_by(closure.c.depth)
+            .limit(1)
+            .scalar_subquery()
+        )
+        # One row per category, so the lookup runs per category, not per row
+        classified = select(cat.c.id, inherited.label("cost_type")).subquery()
+
     stmt = (
         select(
-            cat.c.cost_type,
+            classified.c.cost_type,
             func.coalesce(func.sum(tx.c.amount), 0).label("total"),
-            func.count(func.distinct(cat.c.id)).label("category_count"),
+            func.count(func.distinct(classified.c.id)).label("category_count"),
         )
-        .select_from(tx.outerjoin(cat, tx.c.category_id == cat.c.id))
+        .select_from(tx.outerjoin(classified, tx.c.category_id == classified.c.id))
         .where(base_filter)
-        .group_by(cat.c.cost_type)
+        .group_by(classified.c.cost_type)
     )
 
     rows = (await session.execute(stmt)).all()
@@ -276,7 +352,7 @@ async def get_fixed_vs_variable(
     totals: dict[str | None, Decimal] = {}
     breakdown: list[CostTypeBreakdown] = []
     for r in rows:
-        total = abs(Decimal(str(r.total)))
+        total = abs(r.total)
         totals[r.cost_type] = total
         breakdown.append(
             CostTypeBreakdown(
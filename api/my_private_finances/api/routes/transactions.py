@@ -1,14 +1,23 @@
+import logging
 from datetime import date
 from decimal import Decimal
 
 from fastapi import APIRouter, HTTPException
 from fastapi.params import Query
-from typing import Annotated, Any, Optional
-from sqlalchemy import func, or_, select
+from typing import Annotated, Any, Literal, Optional, cast
+from sqlalchemy import CursorResult, Subquery, func, literal, select, tuple_, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from my_private_finances.models import Transaction, Category
+from my_private_finances.models import Category, MergedTransaction, Transaction
 from my_private_finances.schemas import (
+    BulkItemStatus,
+    TransactionBulkItem,
+    TransactionBulkUpdate,
+    TransactionBatchCreate,
+    TransactionBatchResult,
+    TransactionBulkUpdateResult,
+    TransactionFilter,
     TransactionRead,
     TransactionCreate,
     TransactionListResponse,
@@ -16,11 +25,61 @@ from my_private_finances.schemas import (
 )
 
 from my_private_finances.deps import SessionDep
+from my_private_finances.services.transaction_batch import create_transactions_batch
 from my_private_finances.services.transaction_hash import compute_import_hash, HashInput
+from my_private_finances.services.transaction_search import (
+    ranked_matches,
+    search_filter,
+)
 from my_private_finances.utils.db_helpers import get_account_or_404
+from my_private_finances.utils.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
+logger = logging.getLogger(__name__)
+
+
+def _to_read(tx: Transaction) -> TransactionRead:
+    assert tx.id is not None
+    return TransactionRead(
+        id=tx.id,
+        account_id=tx.account_id,
+        booking_date=tx.booking_date,
+        amount=tx.amount,
+        currency=tx.currency,
+        payee=tx.payee,
+        purpose=tx.purpose,
+        notes=tx.notes,
+        category_id=tx.category_id,
+        external_id=tx.external_id,
+        import_source=tx.import_source,
+        import_hash=tx.import_hash,
+        is_transfer=tx.is_transfer,
+    )
+
+
+def _build_filters(session: AsyncSession, flt: TransactionFilter) -> list[Any]:
+    filters: list[Any] = []
+    if flt.account_id is not None:
+        filters.append(Transaction.account_id == flt.account_id)  # type: ignore[arg-type]
+    if flt.date_from is not None:
+        filters.append(Transaction.booking_date >= flt.date_from)  # type: ignore[arg-type]
+    if flt.date_to is not None:
+        filters.append(Transaction.booking_date <= flt.date_to)  # type: ignore[arg-type]
+    if flt.category_filter == "uncategorized":
+        filters.append(Transaction.category_id.is_(None))  # type: ignore[union-attr]
+    if flt.q is not None:
+        filters.append(search_filter(session, flt.q))
+    if flt.amount_min is not None:
+        filters.append(Transaction.amount >= flt.amount_min)  # type: ignore[arg-type]
+    if flt.amount_max is not None:
+        filters.append(Transaction.amount <= flt.amount_max)  # type: ignore[arg-type]
+    return filters
+
 
 @router.post("", response_model=TransactionRead, status_code=201)
 async def create_transaction(
@@ -41,6 +100,16 @@ async def create_transaction(
             import_source=tx.import_source,
         )
     )
+    mt = cast(Any, MergedTransaction).__table__
+    merged = await session.execute(
+        select(mt.c.id).where(
+            mt.c.account_id == tx.account_id, mt.c.import_hash == import_hash
+        )
+    )
+    if merged.first() is not None:
+        raise HTTPException(
+            status_code=409, detail="Duplicate transaction (merged duplicate)"
+        )
 
     db_obj = Transaction(
         account_id=tx.account_id,
@@ -49,6 +118,7 @@ async def create_transaction(
         currency=tx.currency,
         payee=tx.payee,
         purpose=tx.purpose,
+        notes=tx.notes,
         category_id=tx.category_id,
         external_id=tx.external_id,
         import_source=tx.import_source,
@@ -70,22 +140,125 @@ async def create_transaction(
     if db_obj.id is None:
         raise HTTPException(status_code=500, detail="Transaction ID not assigned")
 
-    return TransactionRead(
-        id=db_obj.id,
-        account_id=db_obj.account_id,
-        booking_date=db_obj.booking_date,
-        amount=db_obj.amount,
-        currency=db_obj.currency,
-        payee=db_obj.payee,
-        purpose=db_obj.purpose,
-        category_id=db_obj.category_id,
-        external_id=db_obj.external_id,
-        import_source=db_obj.import_source,
-        import_hash=db_obj.import_hash,
-        is_transfer=db_obj.is_transfer,
+    return _to_read(db_obj)
+
+
+@router.post("/batch", response_model=TransactionBatchResult)
+async def create_transaction_batch(
+    payload: TransactionBatchCreate,
+    session: SessionDep,
+) -> TransactionBatchResult:
+    """Create many transactions in one commit.
+
+    Items referencing unknown accounts or categories are reported as
+    ``error``; items whose import hash already exists (in the database or
+    earlier in the batch) as ``duplicate``. Categorization rules are applied
+    to items sent without a category.
+    """
+    results = await create_transactions_batch(session, payload.items)
+    return TransactionBatchResult(
+        created=sum(1 for r in results if r.status == "created"),
+        duplicates=sum(1 for r in results if r.status == "duplicate"),
+        failed=sum(1 for r in results if r.status == "error"),
+        items=results,
     )
 
 
+@router.patch("/bulk", response_model=TransactionBulkUpdateResult)
+async def bulk_update_transactions(
+    payload: TransactionBulkUpdate,
+    session: SessionDep,
+) -> TransactionBulkUpdateResult:
+    """Update many transactions in one database transaction.
+
+    ``items`` applies per-transaction changes (only the fields sent in each
+    item are written) and reports a status per item; unknown ids and unknown
+    categories are skipped, the rest is still applied. ``filter`` plus
+    ``category_id`` re-categorizes every matching transaction in a single
+    UPDATE statement.
+    """
+    if payload.filter is not None:
+        return await _bulk_update_by_filter(
+            session, payload.filter, payload.category_id
+        )
+    assert payload.items is not None
+    return await _bulk_update_items(session, payload.items)
+
+
+async def _bulk_update_by_filter(
+    session: AsyncSession, flt: TransactionFilter, category_id: int | None
+) -> TransactionBulkUpdateResult:
+    if flt.is_empty():
+        raise HTTPException(
+            status_code=422, detail="filter must contain at least one criterion"
+        )
+    if category_id is not None:
+        if await session.get(Category, category_id) is None:
+            raise HTTPException(status_code=422, detail="Category not found")
+
+    stmt = (
+        update(Transaction)
+        .where(*_build_filters(session, flt))  # type: ignore[arg-type]
+        .values(category_id=category_id)
+        .execution_options(synchronize_session=False)
+    )
+    result = cast(CursorResult[Any], await session.execute(stmt))
+    await session.commit()
+
+    logger.info(
+        "Bulk re-categorized %d transactions to category_id=%s",
+        result.rowcount,
+        category_id,
+    )
+    return TransactionBulkUpdateResult(updated=result.rowcount)
+
+
+async def _bulk_update_items(
+    session: AsyncSession, items: list[TransactionBulkItem]
+) -> TransactionBulkUpdateResult:
+    tx_ids = {item.id for item in items}
+    existing_ids: set[int] = set()
+    if tx_ids:
+        res = await session.execute(
+            select(Transaction.id).where(Transaction.id.in_(tx_ids))  # type: ignore[call-overload, union-attr]
+        )
+        existing_ids = set(res.scalars().all())  # type: ignore[arg-type]
+
+    cat_ids = {item.category_id for item in items if item.category_id is not None}
+    valid_cat_ids: set[int] = set()
+    if cat_ids:
+        res = await session.execute(
+            select(Category.id).where(Category.id.in_(cat_ids))  # type: ignore[call-overload, union-attr]
+        )
+        valid_cat_ids = set(res.scalars().all())  # type: ignore[arg-type]
+
+    statuses: list[BulkItemStatus] = []
+    params: list[dict[str, Any]] = []
+    for item in items:
+        if item.id not in existing_ids:
+            statuses.append(BulkItemStatus(id=item.id, status="not_found"))
+            continue
+        if item.category_id is not None and item.category_id not in valid_cat_ids:
+            statuses.append(BulkItemStatus(id=item.id, status="invalid_category"))
+            continue
+        values = item.model_dump(
+            include={"id", "category_id", "notes", "is_transfer"},
+            exclude_unset=True,
+        )
+        if len(values) > 1:
+            params.append(values)
+        statuses.append(BulkItemStatus(id=item.id, status="updated"))
+
+    if params:
+        # ORM bulk UPDATE by primary key: one executemany per distinct key set
+        await session.execute(update(Transaction), params)
+    await session.commit()
+
+    updated = sum(1 for s in statuses if s.status == "updated")
+    logger.info("Bulk updated %d of %d transactions", updated, len(items))
+    return TransactionBulkUpdateResult(updated=updated, items=statuses)
+
+
 @router.patch("/{transaction_id}", response_model=TransactionRead)
 async def update_transaction(
     transaction_id: int,
@@ -105,21 +278,7 @@ async def update_transaction(
     await session.commit()
     await session.refresh(db_obj)
 
-    assert db_obj.id is not None
-    return TransactionRead(
-        id=db_obj.id,
-        account_id=db_obj.account_id,
-        booking_date=db_obj.booking_date,
-        amount=db_obj.amount,
-        currency=db_obj.currency,
-        payee=db_obj.payee,
-        purpose=db_obj.purpose,
-        category_id=db_obj.category_id,
-        external_id=db_obj.external_id,
-        import_source=db_obj.import_source,
-        import_hash=db_obj.import_hash,
-        is_transfer=db_obj.is_transfer,
-    )
+    return _to_read(db_obj)
 
 
 @router.get("", response_model=TransactionListResponse)
@@ -130,68 +289,112 @@ async def list_transactions(
     account_id: Annotated[Optional[int], Query(ge=1)] = None,
     date_from: date | None = None,
     date_to: date | None = None,
-    category_filter: str | None = None,
+    category_filter: Literal["uncategorized"] | None = None,
     q: str | None = None,
     amount_min: Decimal | None = None,
     amount_max: Decimal | None = None,
+    cursor: str | None = None,
+    include_total: bool | None = None,
+    sort: Literal["date", "relevance"] = "date",
 ) -> TransactionListResponse:
-    filters: list[Any] = []
-    if account_id is not None:
-        filters.append(Transaction.account_id == account_id)  # type: ignore[arg-type]
-    if date_from is not None:
-        filters.append(Transaction.booking_date >= date_from)  # type: ignore[arg-type]
-    if date_to is not None:
-        filters.append(Transaction.booking_date <= date_to)  # type: ignore[arg-type]
-    if category_filter == "uncategorized":
-        filters.append(Transaction.category_id.is_(None))  # type: ignore[union-attr]
-    if q is not None:
-        filters.append(
-            or_(
-                Transaction.payee.ilike(f"%{q}%"),  # type: ignore[union-attr]
-                Transaction.purpose.ilike(f"%{q}%"),  # type: ignore[union-attr]
-            )
+    """List transactions newest first.
+
+    Pages can be addressed either by ``offset`` or by the opaque ``cursor``
+    returned as ``next_cursor`` from the previous page. Cursor pages seek
+    directly to ``(booking_date, id)`` instead of skipping rows, so deep pages
+    cost the same as the first one.
+
+    ``total`` is only counted on the first page unless ``include_total`` is
+    given explicitly; cursor pages return ``total=None`` by default.
+
+    ``q`` matches word prefixes in payee, purpose and notes. With
+    ``sort=relevance`` results are ordered by match quality instead of date;
+    those pages are addressed by ``offset`` only.
+    """
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=422, detail="cursor and offset cannot be combined"
         )
-    if amount_min is not None:
-        filters.append(Transaction.amount >= amount_min)  # type: ignore[arg-type]
-    if amount_max is not None:
-        filters.append(Transaction.amount <= amount_max)  # type: ignore[arg-type]
+    if cursor is not None and sort == "relevance":
+        raise HTTPException(
+            status_code=422, detail="cursor pagination requires sort=date"
+        )
+    if include_total is None:
+        include_total = cursor is None
 
-    count_stmt = select(func.count()).select_from(Transaction).where(*filters)  # type: ignore[arg-type]
-    total = (await session.execute(count_stmt)).scalar_one()
+    ranked: Subquery | None = None
+    if q is not None and sort == "relevance":
+        ranked = ranked_matches(session, q)
+
+    filters = _build_filters(
+        session,
+        TransactionFilter(
+            account_id=account_id,
+            date_from=date_from,
+            date_to=date_to,
+            category_filter=category_filter,
+            # The ranked join already restricts rows to search matches
+            q=q if ranked is None else None,
+            amount_min=amount_min,
+            amount_max=amount_max,
+        ),
+    )
+
+    def _from_clause() -> Any:
+        if ranked is None:
+            return Transaction
+        return cast(Any, Transaction).__table__.join(
+            ranked, ranked.c.rowid == Transaction.id
+        )
+
+    total: int | None = None
+    if include_total:
+        count_stmt = select(func.count()).select_from(_from_clause()).where(*filters)  # type: ignore[arg-type]
+        total = (await session.execute(count_stmt)).scalar_one()
+
+    page_filters = list(filters)
+    if cursor is not None:
+        try:
+            cursor_date, cursor_id = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        # Row-value comparison lets SQLite seek on ix_tx_account_date /
+        # ix_transaction_booking_date; both already carry the rowid (id) as
+        # their implicit last column, so the (booking_date, id) order is served
+        # straight from the index.
+        page_filters.append(
+            tuple_(Transaction.booking_date, Transaction.id)  # type: ignore[arg-type]
+            < tuple_(literal(cursor_date), literal(cursor_id))
+        )
+
+    # Fetch one extra row to learn whether another page follows
+    order_by: list[Any] = [
+        Transaction.booking_date.desc(),  # type: ignore[attr-defined]
+        Transaction.id.desc(),  # type: ignore[union-attr]
+    ]
+    if ranked is not None:
+        order_by.insert(0, ranked.c.rank)
 
     stmt = (
         select(Transaction)
-        .where(*filters)  # type: ignore[arg-type]
-        .order_by(
-            Transaction.booking_date.desc(),  # type: ignore[attr-defined]
-            Transaction.id.desc(),  # type: ignore[union-attr]
-        )
-        .limit(limit)
+        .select_from(_from_clause())
+        .where(*page_filters)  # type: ignore[arg-type]
+        .order_by(*order_by)
+        .limit(limit + 1)
         .offset(offset)
     )
 
     res = await session.execute(stmt)
     rows = list(res.scalars().all())
 
-    items: list[TransactionRead] = []
-    for row in rows:
-        if row.id is None:
-            continue
-        items.append(
-            TransactionRead(
-                id=row.id,
-                account_id=row.account_id,
-                booking_date=row.booking_date,
-                amount=row.amount,
-                currency=row.currency,
-                payee=row.payee,
-                purpose=row.purpose,
-                category_id=row.category_id,
-                external_id=row.external_id,
-                import_source=row.import_source,
-                import_hash=row.import_hash,
-                is_transfer=row.is_transfer,
-            )
-        )
+    next_cursor: str | None = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        assert last.id is not None
+        if ranked is None:
+            next_cursor = encode_cursor(last.booking_date, last.id)
 
-    return TransactionListResponse(items=items, total=total)
+    return TransactionListResponse(
+        items=[_to_read(row) for row in rows], total=total, next_cursor=next_cursor
+    )
@@ -6,11 +6,11 @@ from decimal import Decimal
 from typing import Annotated, Any, Optional, cast
 
 from fastapi import APIRouter, Query
-from sqlalchemy import select
+from sqlalchemy import case, func, select
 
 from my_private_finances.api.routes.reports import _parse_month, _resolve_currency
 from my_private_finances.deps import SessionDep
-from my_private_finances.models import Category, Transaction
+from my_private_finances.models import Category, CategoryClosure, Transaction
 from my_private_finances.schemas import CategoryTrendItem, SpendingTrendReport
 
 router = APIRouter(prefix="/reports", tags=["reports"])
@@ -22,7 +22,13 @@ async def get_spending_trend(
     session: SessionDep,
     lookback_months: Annotated[int, Query(ge=1, le=24)] = 3,
     account_id: Annotated[Optional[int], Query(ge=1)] = None,
+    rollup: bool = False,
 ) -> SpendingTrendReport:
+    """Current-month spending per category against the lookback average.
+
+    With ``rollup`` every category's figures include its subcategories, so
+    the per-category rows overlap; the totals still count each row once.
+    """
     month_start, month_end = _parse_month(month)
     currency = await _resolve_currency(session, account_id)
 
@@ -56,49 +62,47 @@ async def get_spending_trend(
     else:
         base_filter = date_filter & transfer_filter & expense_filter
 
+    # Per-category integer SUMs for the lookback window and the current month
+    in_lookback = tx.c.booking_date < lookback_end
+    in_current = tx.c.booking_date >= lookback_end
+    if rollup:
+        # Each transaction counts towards its category and every ancestor
+        closure = cast(Any, CategoryClosure).__table__
+        category_key = closure.c.ancestor_id
+        categorized = tx.outerjoin(
+            closure, closure.c.descendant_id == tx.c.category_id
+        ).outerjoin(cat, cat.c.id == closure.c.ancestor_id)
+    else:
+        category_key = tx.c.category_id
+        categorized = tx.outerjoin(cat, tx.c.category_id == cat.c.id)
     stmt = (
         select(
-            tx.c.booking_date,
-            tx.c.category_id,
+            category_key.label("category_id"),
             cat.c.name.label("category_name"),
-            tx.c.amount,
+            cat.c.parent_id,
+            func.sum(case((in_lookback, tx.c.amount), else_=0)).label("lookback"),
+            func.sum(case((in_current, tx.c.amount), else_=0)).label("current"),
         )
-        .select_from(tx.outerjoin(cat, tx.c.category_id == cat.c.id))
+        .select_from(categorized)
         .where(base_filter)
+        .group_by(category_key, cat.c.name, cat.c.parent_id)
     )
 
     rows = (await session.execute(stmt)).all()
 
-    # Separate into lookback months vs current month
-    # Aggregate: per-category, per-month totals for lookback; per-category total for current
-    lookback_by_cat: dict[
-        int | None, dict[str, Decimal]
-    ] = {}  # cat_id -> month_str -> total
+    lookback_by_cat: dict[int | None, Decimal] = {}
     current_by_cat: dict[int | None, Decimal] = {}
     cat_names: dict[int | None, str | None] = {}
-
+    # Rows the report totals add up; rolled-up children are in their parents
+    counted: set[int | None] = set()
     for row in rows:
-        bdate: date = row.booking_date
-        cat_id: int | None = row.category_id
-        cat_name: str | None = row.category_name
-        amount = Decimal(str(row.amount))
-
-        cat_names[cat_id] = cat_name
-
-        if bdate < lookback_end:
-            # lookback month
-            month_str = f"{bdate.year}-{bdate.month:02d}"
-            if cat_id not in lookback_by_cat:
-                lookback_by_cat[cat_id] = {}
-            lookback_by_cat[cat_id][month_str] = (
-                lookback_by_cat[cat_id].get(month_str, Decimal("0")) + amount
-            )
-        else:
-            # current month
-            current_by_cat[cat_id] = current_by_cat.get(cat_id, Decimal("0")) + amount
-
-    # Gather all category IDs
-    all_cat_ids = set(lookback_by_cat.keys()) | set(current_by_cat.keys())
+        cat_names[row.category_id] = row.category_name
+        if not rollup or row.parent_id is None:
+            counted.add(row.category_id)
+        lookback_by_cat[row.category_id] = row.lookback
+        current_by_cat[row.category_id] = row.current
+
+    all_cat_ids = set(cat_names)
 
     # Compute projection factor
     today = date.today()
@@ -111,12 +115,12 @@ async def get_spending_trend(
     projection_factor = Decimal(days_in_month) / Decimal(days_elapsed)
 
     categories: list[CategoryTrendItem] = []
+    counted_items: list[CategoryTrendItem] = []
     for cat_id in all_cat_ids:
         name = cat_names.get(cat_id)
 
-        # avg_monthly: sum of monthly totals in lookback / N (as positive)
-        monthly_totals = lookback_by_cat.get(cat_id, {})
-        lookback_sum = sum(monthly_totals.values(), Decimal("0"))
+        # avg_monthly: lookback total / N (as positive)
+        lookback_sum = lookback_by_cat.get(cat_id, Decimal("0"))
         avg_monthly = abs(lookback_sum) / Decimal(lookback_months)
 
         # current_month: actual this month (positive)
@@ -126,21 +130,22 @@ async def get_spending_trend(
         # projected: current * factor
         projected = (current_month * projection_factor).quantize(Decimal("0.01"))
 
-        categories.append(
-            CategoryTrendItem(
-                category_name=name,
-                avg_monthly=avg_monthly.quantize(Decimal("0.01")),
-                current_month=current_month.quantize(Decimal("0.01")),
-                projected=projected,
-            )
+        item = CategoryTrendItem(
+            category_name=name,
+            avg_monthly=avg_monthly.quantize(Decimal("0.01")),
+            current_month=current_month.quantize(Decimal("0.01")),
+            projected=projected,
         )
+        categories.append(item)
+        if cat_id in counted:
+            counted_items.append(item)
 
     # Sort by avg_monthly descending (biggest spenders first)
     categories.sort(key=lambda c: c.avg_monthly, reverse=True)
 
-    total_avg = sum((c.avg_monthly for c in categories), Decimal("0"))
-    total_current = sum((c.current_month for c in categories), Decimal("0"))
-    total_projected = sum((c.projected for c in categories), Decimal("0"))
+    total_avg = sum((c.avg_monthly for c in counted_items), Decimal("0"))
+    total_current = sum((c.current_month for c in counted_items), Decimal("0"))
+    total_projected = sum((c.projected for c in counted_items), Decimal("0"))
 
     return SpendingTrendReport(
         account_id=account_id,
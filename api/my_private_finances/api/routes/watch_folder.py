@@ -8,7 +8,7 @@ from fastapi import APIRouter, HTTPException, Request
 from sqlalchemy import select
 from sqlmodel import delete
 
-from my_private_finances.deps import SessionDep
+from my_private_finances.deps import SessionDep, WriteSessionDep
 from my_private_finances.models.watch_folder_config import (
     WatchFolderConfig,
     WatchSettings,
@@ -19,8 +19,12 @@ from my_private_finances.schemas.watch_folder import (
     WatchFolderConfigUpdate,
     WatchSettingsRead,
     WatchSettingsUpdate,
+    WatchStatusRead,
+)
+from my_private_finances.services.watch_folder import (
+    WatchWorkerPool,
+    watch_folder_task,
 )
-from my_private_finances.services.watch_folder import watch_folder_task
 
 router = APIRouter(prefix="/watch-folder", tags=["watch-folder"])
 
@@ -40,7 +44,7 @@ async def _get_or_create_settings(session: SessionDep) -> WatchSettings:
 
 
 @router.get("/settings", response_model=WatchSettingsRead)
-async def get_watch_settings(session: SessionDep) -> WatchSettings:
+async def get_watch_settings(session: WriteSessionDep) -> WatchSettings:
     return await _get_or_create_settings(session)
 
 
@@ -51,12 +55,14 @@ async def update_watch_settings(
     session: SessionDep,
 ) -> WatchSettings:
     settings = await _get_or_create_settings(session)
-    settings.root_path = body.root_path
+    for field, value in body.model_dump(exclude_unset=True).items():
+        if value is not None:
+            setattr(settings, field, value)
     session.add(settings)
     await session.commit()
     await session.refresh(settings)
 
-    # Restart the background watcher with the new path
+    # Restart the background watcher with the new path and worker count
     old_task: asyncio.Task[None] | None = getattr(
         request.app.state, "watcher_task", None
     )
@@ -67,18 +73,43 @@ async def update_watch_settings(
         except asyncio.CancelledError:
             pass
 
+    pool = WatchWorkerPool(
+        request.app.state.session_factory,
+        concurrency=settings.concurrency,
+        read_session_factory=getattr(request.app.state, "read_session_factory", None),
+    )
+    request.app.state.watch_pool = pool
     new_task = asyncio.create_task(
         watch_folder_task(
             request.app.state.session_factory,
             Path(settings.root_path),
+            pool,
         )
     )
     request.app.state.watcher_task = new_task
-    logger.info("Watch folder restarted at: %s", settings.root_path)
+    logger.info(
+        "Watch folder restarted at: %s (concurrency=%d)",
+        settings.root_path,
+        settings.concurrency,
+    )
 
     return settings
 
 
+@router.get("/status", response_model=WatchStatusRead)
+async def get_watch_status(request: Request, session: SessionDep) -> WatchStatusRead:
+    pool: WatchWorkerPool | None = getattr(request.app.state, "watch_pool", None)
+    if pool is not None:
+        return pool.status()
+    settings = await session.get(WatchSettings, _SETTINGS_ID)
+    return WatchStatusRead(
+        running=False,
+        concurrency=settings.concurrency if settings else WatchSettings().concurrency,
+        queue_depth=0,
+        in_flight=[],
+    )
+
+
 @router.get("/configs", response_model=list[WatchFolderConfigRead])
 async def list_watch_configs(session: SessionDep) -> list[WatchFolderConfig]:
     result = await session.execute(select(WatchFolderConfig))
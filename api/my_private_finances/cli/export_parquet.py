@@ -0,0 +1,133 @@
+"""Export transactions to a Parquet file (or an Arrow IPC stream).
+
+    python -m my_private_finances.cli.export_parquet transactions.parquet \\
+        --db sqlite+aiosqlite:///./data/my_private_finances.sqlite \\
+        --account-id 1 --from 2025-01-01 --to 2025-12-31
+
+The file loads straight into pandas with typed columns:
+
+    pandas.read_parquet("transactions.parquet")
+
+Needs the optional ``pyarrow`` package.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import get_args
+
+from my_private_finances.db import create_engine, create_session_factory
+from my_private_finances.services.columnar_export import (
+    ColumnarExportUnavailable,
+    ColumnarFormat,
+    stream_transactions,
+    transaction_schema,
+)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        description="Export transactions to Parquet or Arrow IPC."
+    )
+    p.add_argument("output", type=Path, help="Output file path")
+    p.add_argument(
+        "--db",
+        dest="database_url",
+        type=str,
+        required=True,
+        help="SQLAlchemy database URL",
+    )
+    p.add_argument(
+        "--account-id",
+        dest="account_id",
+        type=int,
+        default=None,
+        help="Only this account",
+    )
+    p.add_argument(
+        "--from",
+        dest="date_from",
+        type=date.fromisoformat,
+        default=None,
+        help="First booking date (YYYY-MM-DD)",
+    )
+    p.add_argument(
+        "--to",
+        dest="date_to",
+        type=date.fromisoformat,
+        default=None,
+        help="Last booking date (YYYY-MM-DD)",
+    )
+    p.add_argument(
+        "--format",
+        dest="fmt",
+        choices=get_args(ColumnarFormat),
+        default=None,
+        help="parquet or arrow (default: from the file extension, else parquet)",
+    )
+    return p
+
+
+async def _run(
+    database_url: str,
+    output: Path,
+    fmt: ColumnarFormat,
+    account_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> int:
+    try:
+        transaction_schema()
+    except ColumnarExportUnavailable as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+
+    engine = create_engine(database_url)
+    session_factory = create_session_factory(engine)
+    started = time.perf_counter()
+    tmp = output.with_name(f".{output.name}.partial")
+    try:
+        with tmp.open("wb") as f:
+            async for chunk in stream_transactions(
+                session_factory,
+                fmt,
+                account_id=account_id,
+                date_from=date_from,
+                date_to=date_to,
+            ):
+                f.write(chunk)
+        tmp.replace(output)
+    finally:
+        tmp.unlink(missing_ok=True)
+        await engine.dispose()
+
+    print(
+        f"Wrote {output} ({output.stat().st_size:,} bytes) "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _build_parser().parse_args(argv)
+    fmt: ColumnarFormat = args.fmt or (
+        "arrow" if args.output.suffix in (".arrow", ".arrows") else "parquet"
+    )
+    exit_code = asyncio.run(
+        _run(
+            database_url=args.database_url,
+            output=args.output,
+            fmt=fmt,
+            account_id=args.account_id,
+            date_from=args.date_from,
+            date_to=args.date_to,
+        )
+    )
+    raise SystemExit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
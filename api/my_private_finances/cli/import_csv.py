@@ -1,14 +1,50 @@
+"""Import transactions from one or more CSV files into one account.
+
+    python -m my_private_finances.cli.import_csv 'exports/**/*.csv' \\
+        --db sqlite+aiosqlite:///./data/my_private_finances.sqlite \\
+        --account-id 1 --profile "DKB Giro" --jobs 4
+
+Files are parsed in a pool of worker processes; their rows are inserted by a
+single writer session, one commit per file, in the order parsing finishes.
+The exit code is 0 when every row of every file was imported, deduplicated
+or filtered out, and 1 otherwise.
+"""
+
 import argparse
 import asyncio
+import functools
+import glob
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select
 
 from my_private_finances.db import create_engine, create_session_factory
-from my_private_finances.services.csv_import import import_transactions_from_csv_path
+from my_private_finances.models import Account, CsvProfile
+from my_private_finances.services.categorization import load_rules_ordered
+from my_private_finances.services.csv_import import (
+    ImportResult,
+    ParsedCsv,
+    parse_csv_file,
+    store_parsed_csv,
+)
 
 
 def _build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(description="Import transaction from a generic CSV.")
-    p.add_argument("csv_path", type=Path, help="Path to the CSV file.")
+    p = argparse.ArgumentParser(
+        description="Import transactions from generic CSV files."
+    )
+    p.add_argument(
+        "inputs",
+        nargs="+",
+        metavar="CSV",
+        help="CSV file paths or glob patterns (quote them; ** recurses)",
+    )
     p.add_argument(
         "--db",
         dest="database_url",
@@ -28,75 +64,283 @@ def _build_parser() -> argparse.ArgumentParser:
         dest="max_errors",
         type=int,
         default=50,
-        help="Max errors to print/store",
+        help="Max errors to print/store per file",
+    )
+    p.add_argument(
+        "--profile",
+        default=None,
+        help="Name of a saved CSV profile (format, column map, row filters)",
     )
-    p.add_argument("--delimiter", default=",", help="CSV delimiter (default: ,)")
+    p.add_argument("--delimiter", default=None, help="CSV delimiter (default: ,)")
     p.add_argument(
         "--date-format",
         choices=["iso", "dmy"],
-        default="iso",
+        default=None,
         help="Date format: iso=YYYY-MM-DD, dmy=DD.MM.YYYY",
     )
     p.add_argument(
         "--decimal-comma",
         action="store_true",
+        default=None,
         help="Use decimal comma (e.g. 1.234,56)",
     )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Parser processes (default: up to 4)",
+    )
 
     return p
 
 
+def _expand_inputs(inputs: list[str]) -> list[Path]:
+    """Expand glob patterns; plain paths are kept even if they do not exist."""
+    files: list[Path] = []
+    seen: set[Path] = set()
+    for pattern in inputs:
+        if any(c in pattern for c in "*?["):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            path = Path(match)
+            if path.is_dir() or path in seen:
+                continue
+            seen.add(path)
+            files.append(path)
+    return files
+
+
+@dataclass
+class _FileReport:
+    path: Path
+    result: ImportResult | None = None
+    error: str | None = None
+    parse_seconds: float = 0.0
+    store_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.result is not None and not self.result.failed
+
+
+def _parse(path: Path, options: dict[str, Any]) -> ParsedCsv:
+    # Module-level so worker processes can unpickle it
+    return parse_csv_file(path, **options)
+
+
+async def _parse_one(
+    executor: Executor, path: Path, options: dict[str, Any]
+) -> tuple[Path, ParsedCsv | Exception]:
+    loop = asyncio.get_running_loop()
+    try:
+        parsed = await loop.run_in_executor(
+            executor, functools.partial(_parse, path, options)
+        )
+    except Exception as exc:
+        return path, exc
+    return path, parsed
+
+
+def _print_progress(done: int, total: int, report: _FileReport) -> None:
+    if report.result is not None:
+        detail = (
+            f"{report.result.total_rows} rows, {report.result.created} created, "
+            f"parse {report.parse_seconds:.2f}s, store {report.store_seconds:.2f}s"
+        )
+    else:
+        detail = f"error: {report.error}"
+    print(
+        f"[{done:>{len(str(total))}}/{total}] {report.path}: {detail}", file=sys.stderr
+    )
+
+
+def _print_summary(reports: list[_FileReport], wall_seconds: float, jobs: int) -> None:
+    headers = (
+        "file",
+        "rows",
+        "created",
+        "dup",
+        "skipped",
+        "failed",
+        "parse s",
+        "store s",
+    )
+    table: list[tuple[str, ...]] = []
+    for r in reports:
+        res = r.result
+        counts = (
+            (res.total_rows, res.created, res.duplicates, res.skipped, res.failed)
+            if res is not None
+            else ("-", "-", "-", "-", "error")
+        )
+        table.append(
+            (
+                str(r.path),
+                *(str(c) for c in counts),
+                f"{r.parse_seconds:.2f}",
+                f"{r.store_seconds:.2f}",
+            )
+        )
+    results = [r.result for r in reports if r.result is not None]
+    total_rows = sum(res.total_rows for res in results)
+    parse_total = sum(r.parse_seconds for r in reports)
+    store_total = sum(r.store_seconds for r in reports)
+    table.append(
+        (
+            "total",
+            str(total_rows),
+            str(sum(res.created for res in results)),
+            str(sum(res.duplicates for res in results)),
+            str(sum(res.skipped for res in results)),
+            str(sum(res.failed for res in results)),
+            f"{parse_total:.2f}",
+            f"{store_total:.2f}",
+        )
+    )
+
+    widths = [
+        max(len(row[i]) for row in (headers, *table)) for i in range(len(headers))
+    ]
+
+    def fmt(row: tuple[str, ...]) -> str:
+        first = row[0].ljust(widths[0])
+        rest = (cell.rjust(w) for cell, w in zip(row[1:], widths[1:]))
+        return "  ".join((first, *rest))
+
+    print(fmt(headers))
+    for row in table[:-1]:
+        print(fmt(row))
+    print("  ".join("-" * w for w in widths))
+    print(fmt(table[-1]))
+
+    rate = total_rows / wall_seconds if wall_seconds > 0 else 0.0
+    print(
+        f"\n{len(reports)} files, {total_rows} rows in {wall_seconds:.2f}s "
+        f"({rate:,.0f} rows/s); parse {parse_total:.2f}s across {jobs} jobs, "
+        f"store {store_total:.2f}s"
+    )
+
+    for r in reports:
+        if r.error is not None:
+            print(f"\n{r.path}: {r.error}")
+        elif r.result is not None and r.result.errors:
+            print(f"\nerrors in {r.path}:")
+            for error in r.result.errors:
+                print(f"- {error}")
+            if r.result.errors_truncated:
+                print(f"- ... {r.result.failed - len(r.result.errors)} more")
+
+
 async def _run(
     database_url: str,
     account_id: int,
-    csv_path: Path,
+    inputs: list[str],
     max_errors: int,
-    delimiter: str,
-    date_format: str,
-    decimal_comma: bool,
+    delimiter: str | None = None,
+    date_format: str | None = None,
+    decimal_comma: bool | None = None,
+    profile_name: str | None = None,
+    jobs: int = 1,
 ) -> int:
+    files = _expand_inputs(inputs)
+    if not files:
+        print(f"No CSV files match: {' '.join(inputs)}", file=sys.stderr)
+        return 1
+
     engine = create_engine(database_url)
     session_factory = create_session_factory(engine)
 
     try:
         async with session_factory() as session:
-            result = await import_transactions_from_csv_path(
-                session=session,
-                account_id=account_id,
-                csv_path=csv_path,
-                max_errors=max_errors,
-                delimiter=delimiter,
-                date_format=date_format,
-                decimal_comma=decimal_comma,
-            )
+            if await session.get(Account, account_id) is None:
+                print(f"Account {account_id} not found", file=sys.stderr)
+                return 1
 
-        print(f"total rows: {result.total_rows}")
-        print(f"created: {result.created}")
-        print(f"duplicates: {result.duplicates}")
-        print(f"failed: {result.failed}")
+            # Explicit option → profile → service default
+            options: dict[str, Any] = {
+                "account_id": account_id,
+                "max_errors": max_errors,
+            }
+            if profile_name is not None:
+                res = await session.execute(
+                    select(CsvProfile).where(CsvProfile.name == profile_name)  # type: ignore[arg-type]
+                )
+                profile = res.scalars().first()
+                if profile is None:
+                    print(f"CSV profile {profile_name!r} not found", file=sys.stderr)
+                    return 1
+                options.update(
+                    delimiter=profile.delimiter,
+                    date_format=profile.date_format,
+                    decimal_comma=profile.decimal_comma,
+                    column_map=profile.column_map or None,
+                    row_filters=profile.row_filters,
+                    row_exclude_filters=profile.row_exclude_filters,
+                )
+            for key, value in (
+                ("delimiter", delimiter),
+                ("date_format", date_format),
+                ("decimal_comma", decimal_comma),
+            ):
+                if value is not None:
+                    options[key] = value
 
-        if result.errors:
-            print("\nerrors:")
-            for error in result.errors:
-                print(f"- {error}")
+            rules = await load_rules_ordered(session)
+
+            started = time.perf_counter()
+            reports: dict[Path, _FileReport] = {}
+            executor: Executor = (
+                ProcessPoolExecutor(max_workers=jobs)
+                if jobs > 1
+                else ThreadPoolExecutor(max_workers=1)
+            )
+            with executor:
+                pending = [_parse_one(executor, path, options) for path in files]
+                for done, next_parsed in enumerate(asyncio.as_completed(pending), 1):
+                    path, parsed = await next_parsed
+                    report = reports[path] = _FileReport(path)
+                    if isinstance(parsed, Exception):
+                        report.error = f"{type(parsed).__name__}: {parsed}"
+                    else:
+                        report.parse_seconds = parsed.parse_seconds
+                        store_started = time.perf_counter()
+                        try:
+                            report.result = await store_parsed_csv(
+                                session,
+                                account_id=account_id,
+                                parsed=parsed,
+                                rules=rules,
+                            )
+                        except Exception as exc:
+                            await session.rollback()
+                            report.error = f"{type(exc).__name__}: {exc}"
+                        report.store_seconds = time.perf_counter() - store_started
+                    _print_progress(done, len(files), report)
+            wall_seconds = time.perf_counter() - started
 
-        return 1 if result.failed else 0
+        ordered = [reports[path] for path in files]
+        _print_summary(ordered, wall_seconds, jobs)
+        return 0 if all(r.ok for r in ordered) else 1
 
     finally:
         await engine.dispose()
 
 
-def main() -> None:
-    args = _build_parser().parse_args()
+def main(argv: list[str] | None = None) -> None:
+    args = _build_parser().parse_args(argv)
     exit_code = asyncio.run(
         _run(
             database_url=args.database_url,
             account_id=args.account_id,
-            csv_path=args.csv_path,
+            inputs=args.inputs,
             max_errors=args.max_errors,
             delimiter=args.delimiter,
             date_format=args.date_format,
             decimal_comma=args.decimal_comma,
+            profile_name=args.profile,
+            jobs=max(1, args.jobs),
         )
     )
     raise SystemExit(exit_code)
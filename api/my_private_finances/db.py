@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-from collections.abc import AsyncGenerator
+import weakref
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Any, Self
 
+from sqlalchemy import event, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -11,8 +18,67 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_DB_PATH = Path("data") / "my_private_finances.sqlite"
 
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+@dataclass(frozen=True)
+class SqliteProfile:
+    """Connection PRAGMAs applied to every new SQLite connection.
+
+    The defaults favour concurrent readers during long writes (WAL) and
+    trade the last committed transaction on power loss for far fewer
+    fsyncs (synchronous=NORMAL), which is the usual setting for WAL.
+    Each value can be overridden through a ``SQLITE_*`` environment variable.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -64_000  # negative = KiB, i.e. ~64 MB page cache
+    mmap_size: int = 256 * 1024 * 1024
+    temp_store: str = "MEMORY"
+    busy_timeout_ms: int = 5_000
+
+    def __post_init__(self) -> None:
+        # Values are interpolated into PRAGMA statements, so only allow
+        # the documented keywords.
+        if self.journal_mode.upper() not in _JOURNAL_MODES:
+            raise ValueError(f"Invalid SQLite journal_mode: {self.journal_mode!r}")
+        if self.synchronous.upper() not in _SYNCHRONOUS:
+            raise ValueError(f"Invalid SQLite synchronous: {self.synchronous!r}")
+        if self.temp_store.upper() not in _TEMP_STORES:
+            raise ValueError(f"Invalid SQLite temp_store: {self.temp_store!r}")
+
+    @classmethod
+    def from_env(cls) -> SqliteProfile:
+        defaults = cls()
+        env = os.environ
+        return cls(
+            journal_mode=env.get("SQLITE_JOURNAL_MODE", defaults.journal_mode),
+            synchronous=env.get("SQLITE_SYNCHRONOUS", defaults.synchronous),
+            cache_size=int(env.get("SQLITE_CACHE_SIZE", defaults.cache_size)),
+            mmap_size=int(env.get("SQLITE_MMAP_SIZE", defaults.mmap_size)),
+            temp_store=env.get("SQLITE_TEMP_STORE", defaults.temp_store),
+            busy_timeout_ms=int(
+                env.get("SQLITE_BUSY_TIMEOUT_MS", defaults.busy_timeout_ms)
+            ),
+        )
+
+    def pragmas(self) -> list[str]:
+        return [
+            f"PRAGMA journal_mode={self.journal_mode.upper()}",
+            f"PRAGMA synchronous={self.synchronous.upper()}",
+            f"PRAGMA cache_size={int(self.cache_size)}",
+            f"PRAGMA mmap_size={int(self.mmap_size)}",
+            f"PRAGMA temp_store={self.temp_store.upper()}",
+            f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}",
+        ]
+
 
 def build_sqlite_url(db_path: Path) -> str:
     return f"sqlite+aiosqlite:///{db_path.as_posix()}"
@@ -34,14 +100,264 @@ def ensure_sqlite_dir(database_url: str) -> None:
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def create_engine(database_url: str | None = None) -> AsyncEngine:
+def is_sqlite_url(database_url: str) -> bool:
+    return database_url.startswith("sqlite")
+
+
+def _is_sqlite_file_url(database_url: str) -> bool:
+    if not is_sqlite_url(database_url):
+        return False
+    database = make_url(database_url).database
+    return bool(database) and database != ":memory:"
+
+
+def apply_sqlite_profile(
+    engine: AsyncEngine, profile: SqliteProfile, read_only: bool = False
+) -> None:
+    """Run the profile's PRAGMAs on every connection the pool opens.
+
+    With *read_only* the connection is additionally switched to
+    ``query_only`` so any write through it fails instead of taking the
+    database write lock.
+    """
+    pragmas = profile.pragmas()
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    logger.debug(
+        "SQLite profile applied (read_only=%s): %s", read_only, asdict(profile)
+    )
+
+
+def create_engine(
+    database_url: str | None = None,
+    profile: SqliteProfile | None = None,
+    read_only: bool = False,
+) -> AsyncEngine:
+    """Create the async engine for *database_url*.
+
+    For SQLite files the default (writer) engine holds a single pooled
+    connection, since SQLite only ever allows one writer; ``read_only``
+    engines keep a regular pool of ``query_only`` connections that read
+    from the WAL snapshot without waiting for the writer.
+    """
     url = database_url or get_database_url()
     ensure_sqlite_dir(url)
-    return create_async_engine(url, echo=False, future=True)
+    kwargs: dict[str, Any] = {}
+    if _is_sqlite_file_url(url) and not read_only:
+        kwargs.update(pool_size=1, max_overflow=0)
+    engine = create_async_engine(url, echo=False, future=True, **kwargs)
+    if is_sqlite_url(url):
+        apply_sqlite_profile(engine, profile or SqliteProfile.from_env(), read_only)
+    return engine
+
+
+def create_read_engine(
+    database_url: str | None = None,
+    profile: SqliteProfile | None = None,
+) -> AsyncEngine:
+    return create_engine(database_url, profile, read_only=True)
+
+
+_SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+_TEMP_STORE_NAMES = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+
+async def read_sqlite_settings(engine: AsyncEngine) -> dict[str, Any]:
+    """Return the PRAGMA values a pooled connection is actually running with."""
+    async with engine.connect() as conn:
+
+        async def _pragma(name: str) -> Any:
+            return (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+
+        synchronous = await _pragma("synchronous")
+        temp_store = await _pragma("temp_store")
+        return {
+            "journal_mode": str(await _pragma("journal_mode")).upper(),
+            "synchronous": _SYNCHRONOUS_NAMES.get(synchronous, str(synchronous)),
+            "cache_size": await _pragma("cache_size"),
+            "mmap_size": await _pragma("mmap_size"),
+            "temp_store": _TEMP_STORE_NAMES.get(temp_store, str(temp_store)),
+            "busy_timeout_ms": await _pragma("busy_timeout"),
+        }
+
+
+async def optimize_sqlite(engine: AsyncEngine) -> None:
+    """Let SQLite refresh query-planner statistics where they are stale."""
+    if engine.dialect.name != "sqlite":
+        return
+    async with _engine_gate(engine).session(), engine.connect() as conn:
+        await conn.exec_driver_sql("PRAGMA optimize")
+    logger.info("SQLite PRAGMA optimize completed")
+
+
+async def optimize_sqlite_periodically(
+    engine: AsyncEngine, interval_seconds: float
+) -> None:
+    """Long-running task: run :func:`optimize_sqlite` every *interval_seconds*."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await optimize_sqlite(engine)
+        except Exception:
+            logger.warning("Scheduled PRAGMA optimize failed", exc_info=True)
+
+
+class DatabaseGate:
+    """Counts the sessions open on one database file, so it can be swapped.
+
+    Sessions from :func:`create_session_factory` pass the gate of their
+    database while open. :meth:`closed` holds new sessions back and waits
+    for the open ones to finish; a restore replaces the file in that window,
+    so no connection ever sees both the old file and the new one. Callers
+    of :meth:`closed` serialize through the :class:`WriteQueue`.
+    """
+
+    def __init__(self) -> None:
+        self._active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._open = asyncio.Event()
+        self._open.set()
+
+    @property
+    def active(self) -> int:
+        """Number of sessions currently open on the database."""
+        return self._active
+
+    async def enter(self) -> None:
+        while not self._open.is_set():
+            await self._open.wait()
+        self._active += 1
+        self._idle.clear()
+
+    def leave(self) -> None:
+        self._active -= 1
+        if self._active == 0:
+            self._idle.set()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        """Hold the database open for work outside an ORM session."""
+        await self.enter()
+        try:
+            yield
+        finally:
+            self.leave()
+
+    @asynccontextmanager
+    async def closed(self, timeout: float | None = None) -> AsyncIterator[None]:
+        """Hold back new sessions until exit, once the open ones are done.
+
+        Raises :class:`TimeoutError` if they take longer than *timeout*.
+        """
+        self._open.clear()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            yield
+        finally:
+            self._open.set()
+
+
+_database_gates: dict[str, DatabaseGate] = {}
+
+
+def database_gate(db_path: str | Path) -> DatabaseGate:
+    """Return the (shared) gate for the SQLite file at *db_path*."""
+    key = os.path.abspath(db_path)
+    gate = _database_gates.get(key)
+    if gate is None:
+        gate = _database_gates[key] = DatabaseGate()
+    return gate
+
+
+def _engine_gate(engine: AsyncEngine) -> DatabaseGate:
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or not database or database == ":memory:":
+        return DatabaseGate()  # nothing to swap; a private gate never closes
+    return database_gate(database)
+
+
+class _GatedSession(AsyncSession):
+    """AsyncSession that passes its database's gate while used as a context."""
+
+    _gate: DatabaseGate | None = None
+
+    async def __aenter__(self) -> Self:
+        if isinstance(self.bind, AsyncEngine):
+            gate = _engine_gate(self.bind)
+            await gate.enter()
+            self._gate = gate
+        return self
+
+    async def __aexit__(self, type_: Any, value: Any, traceback: Any) -> None:
+        try:
+            await super().__aexit__(type_, value, traceback)
+        finally:
+            if self._gate is not None:
+                self._gate.leave()
+                self._gate = None
 
 
 def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
-    return async_sessionmaker(engine, expire_on_commit=False)
+    return async_sessionmaker(engine, class_=_GatedSession, expire_on_commit=False)
+
+
+class WriteQueue:
+    """FIFO queue in front of the writer connection.
+
+    Every mutating unit of work (request, watched-file import, restore)
+    runs inside :meth:`session` or :meth:`exclusive`, so writes are applied
+    one after another instead of racing for SQLite's write lock and failing
+    with "database is locked".
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._session_factory = session_factory
+        self._lock = asyncio.Lock()
+        self._pending = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of units of work running or waiting for their turn."""
+        return self._pending
+
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncIterator[None]:
+        self._pending += 1
+        try:
+            async with self._lock:
+                yield
+        finally:
+            self._pending -= 1
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        async with self.exclusive():
+            async with self._session_factory() as session:
+                yield session
+
+
+_write_queues: weakref.WeakKeyDictionary[
+    async_sessionmaker[AsyncSession], WriteQueue
+] = weakref.WeakKeyDictionary()
+
+
+def write_queue(session_factory: async_sessionmaker[AsyncSession]) -> WriteQueue:
+    """Return the (shared) write queue for the writer *session_factory*."""
+    queue = _write_queues.get(session_factory)
+    if queue is None:
+        queue = _write_queues[session_factory] = WriteQueue(session_factory)
+    return queue
 
 
 async def get_session(
@@ -1,16 +1,53 @@
 from __future__ import annotations
 
 from collections.abc import AsyncGenerator
+from contextlib import AbstractAsyncContextManager
 from typing import Annotated
 
 from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from my_private_finances.db import write_queue
 
-async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _read_session(request: Request) -> AbstractAsyncContextManager[AsyncSession]:
+    # Falls back to the writer factory when no read pool is configured
+    sf: async_sessionmaker[AsyncSession] = (
+        getattr(request.app.state, "read_session_factory", None)
+        or request.app.state.session_factory
+    )
+    return sf()
+
+
+def _write_session(request: Request) -> AbstractAsyncContextManager[AsyncSession]:
     sf: async_sessionmaker[AsyncSession] = request.app.state.session_factory
-    async with sf() as session:
+    return write_queue(sf).session()
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the read-only pool; never waits for a running write."""
+    async with _read_session(request) as session:
+        yield session
+
+
+async def get_write_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the writer connection, queued behind other writes."""
+    async with _write_session(request) as session:
+        yield session
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Read session for safe HTTP methods, queued write session otherwise."""
+    if request.method in _READ_METHODS:
+        cm = _read_session(request)
+    else:
+        cm = _write_session(request)
+    async with cm as session:
         yield session
 
 
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
+WriteSessionDep = Annotated[AsyncSession, Depends(get_write_session)]
@@ -0,0 +1,241 @@
+"""Per-request query instrumentation.
+
+Every SQL statement run while a request is being handled is counted and
+timed through SQLAlchemy cursor events. The ASGI middleware reports the
+totals in a ``Server-Timing`` response header and keeps a rolling window of
+timings per route, which ``GET /api/debug/metrics`` summarises.
+
+Statements slower than ``SLOW_QUERY_MS`` (default 200 ms) are logged with the
+*shape* of their bound parameters (types, not values), so the log never
+contains transaction data.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from my_private_finances.metrics import HTTP_REQUEST_DURATION
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+
+# Samples kept per route for the percentile summary
+WINDOW_SIZE = 1000
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    serialize_seconds: float = 0.0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def current_stats() -> RequestStats | None:
+    """Stats of the request being handled, or None outside a request."""
+    return _current.get()
+
+
+def param_shape(parameters: Any) -> str:
+    """Describe bound parameters by type only, e.g. ``{amount: Decimal}``."""
+    if (
+        isinstance(parameters, (list, tuple))
+        and parameters
+        and not _is_scalar(parameters[0])
+    ):
+        # executemany: one parameter set per row
+        return f"{len(parameters)} x {param_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        inner = ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items())
+        return f"{{{inner}}}"
+    if isinstance(parameters, (list, tuple)):
+        return f"({', '.join(type(v).__name__ for v in parameters)})"
+    return type(parameters).__name__
+
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (list, tuple, dict))
+
+
+def _fetched_rows(cursor: Any) -> int:
+    # The aiosqlite adapter buffers the whole result on execute, so the
+    # number of fetched rows is known here; DML reports it via rowcount.
+    buffered = getattr(cursor, "_rows", None)
+    if buffered is not None and cursor.description is not None:
+        return len(buffered)
+    return max(cursor.rowcount or 0, 0)
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        stats.rows += _fetched_rows(cursor)
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s | params: %s",
+            elapsed * 1000,
+            " ".join(statement.split()),
+            param_shape(parameters),
+        )
+
+
+def install_query_hooks() -> None:
+    """Attach the cursor hooks to all engines (idempotent)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response that books its rendering time on the current request."""
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = super().render(content)
+        stats = _current.get()
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - start
+        return body
+
+
+@dataclass(frozen=True)
+class _Sample:
+    total_ms: float
+    db_ms: float
+    queries: int
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    # Nearest-rank percentile; the window is small enough to sort on read
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return round(sorted_values[index], 3)
+
+
+class RouteTimings:
+    """Rolling window of the last ``WINDOW_SIZE`` requests per route."""
+
+    def __init__(self, window_size: int = WINDOW_SIZE) -> None:
+        self._window_size = window_size
+        self._samples: dict[str, deque[_Sample]] = {}
+        self._counts: dict[str, int] = {}
+
+    def record(self, route: str, total_ms: float, stats: RequestStats) -> None:
+        window = self._samples.get(route)
+        if window is None:
+            window = self._samples[route] = deque(maxlen=self._window_size)
+        window.append(_Sample(total_ms, stats.db_seconds * 1000, stats.queries))
+        self._counts[route] = self._counts.get(route, 0) + 1
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        result: dict[str, dict[str, Any]] = {}
+        for route, window in sorted(self._samples.items()):
+            totals = sorted(s.total_ms for s in window)
+            db = sorted(s.db_ms for s in window)
+            result[route] = {
+                "count": self._counts[route],
+                "window": len(window),
+                "p50_ms": _percentile(totals, 50),
+                "p90_ms": _percentile(totals, 90),
+                "p99_ms": _percentile(totals, 99),
+                "max_ms": round(totals[-1], 3),
+                "db_p50_ms": _percentile(db, 50),
+                "db_p90_ms": _percentile(db, 90),
+                "avg_queries": round(sum(s.queries for s in window) / len(window), 2),
+            }
+        return result
+
+
+def server_timing_header(stats: RequestStats, total_seconds: float) -> str:
+    return ", ".join(
+        (
+            f"db;dur={stats.db_seconds * 1000:.2f}",
+            f"queries;desc={stats.queries}",
+            f"rows;desc={stats.rows}",
+            f"ser;dur={stats.serialize_seconds * 1000:.2f}",
+            f"total;dur={total_seconds * 1000:.2f}",
+        )
+    )
+
+
+class QueryTimingMiddleware:
+    """Collect query stats per HTTP request and expose them as Server-Timing."""
+
+    def __init__(self, app: ASGIApp, timings: RouteTimings) -> None:
+        self.app = app
+        self.timings = timings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = server_timing_header(stats, time.perf_counter() - start)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", header.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            # Unmatched paths (404s) are not recorded to keep label sets bounded
+            if route is not None:
+                self.timings.record(
+                    f"{scope['method']} {route.path}", elapsed * 1000, stats
+                )
+                HTTP_REQUEST_DURATION.labels(
+                    method=scope["method"], route=route.path, status=str(status)
+                ).observe(elapsed)
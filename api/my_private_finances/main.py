@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import AsyncGenerator
@@ -12,40 +13,77 @@ from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from my_private_finances.db import (
     DEFAULT_DB_PATH,
     create_engine,
+    create_read_engine,
     create_session_factory,
+    optimize_sqlite,
+    optimize_sqlite_periodically,
 )
 from my_private_finances.api.router import api_router
+from my_private_finances.instrumentation import (
+    QueryTimingMiddleware,
+    RouteTimings,
+    TimedJSONResponse,
+    install_query_hooks,
+)
 from my_private_finances.logging_config import setup_logging
 from my_private_finances.models.watch_folder_config import WatchSettings
-from my_private_finances.services.watch_folder import watch_folder_task
+from my_private_finances.services.post_import import post_import_scheduler
+from my_private_finances.services.watch_folder import (
+    WatchWorkerPool,
+    watch_folder_task,
+)
 
 setup_logging()
 
 logger = logging.getLogger(__name__)
 
+# Refresh SQLite planner statistics this often while the app runs (and once
+# on shutdown).
+_OPTIMIZE_INTERVAL_SECONDS = float(
+    os.environ.get("SQLITE_OPTIMIZE_INTERVAL_SECONDS", 6 * 60 * 60)
+)
+
 
 @asynccontextmanager
 async def _lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     session_factory: async_sessionmaker[AsyncSession] = app.state.session_factory
 
-    # Resolve watch root from DB (or use default)
-    root_path: Path
+    # Resolve watch settings from DB (or use defaults)
+    settings: WatchSettings | None = None
     try:
         async with session_factory() as session:
             settings = await session.get(WatchSettings, 1)
-            root_path = Path(settings.root_path) if settings else Path("data/watch")
     except Exception:
-        root_path = Path("data/watch")
         logger.warning(
             "Could not read watch settings from DB, using default", exc_info=True
         )
-
-    task = asyncio.create_task(watch_folder_task(session_factory, root_path))
+    if settings is None:
+        settings = WatchSettings()
+    root_path = Path(settings.root_path)
+
+    pool = WatchWorkerPool(
+        session_factory,
+        concurrency=settings.concurrency,
+        read_session_factory=app.state.read_session_factory,
+    )
+    app.state.watch_pool = pool
+    post_import_scheduler(session_factory, app.state.read_session_factory)
+    task = asyncio.create_task(watch_folder_task(session_factory, root_path, pool))
     app.state.watcher_task = task
     logger.info("Watch folder task started")
 
+    engine: AsyncEngine = app.state.engine
+    optimize_task = asyncio.create_task(
+        optimize_sqlite_periodically(engine, _OPTIMIZE_INTERVAL_SECONDS)
+    )
+
     yield
 
+    optimize_task.cancel()
+    try:
+        await optimize_task
+    except asyncio.CancelledError:
+        pass
     task.cancel()
     try:
         await task
@@ -53,17 +91,40 @@ async def _lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         pass
     logger.info("Watch folder task stopped")
 
+    # Run detection for imports still inside their quiet period
+    try:
+        await post_import_scheduler(session_factory).shutdown()
+    except Exception:
+        logger.warning("Post-import jobs on shutdown failed", exc_info=True)
+
+    try:
+        await optimize_sqlite(engine)
+    except Exception:
+        logger.warning("PRAGMA optimize on shutdown failed", exc_info=True)
+
 
 def create_app(db_path: Path = DEFAULT_DB_PATH) -> FastAPI:
     logger.info("Starting My Private Finances, database: %s", db_path)
 
-    app = FastAPI(title="My Private Finances", lifespan=_lifespan)
+    app = FastAPI(
+        title="My Private Finances",
+        lifespan=_lifespan,
+        default_response_class=TimedJSONResponse,
+    )
+
+    install_query_hooks()
+    route_timings = RouteTimings()
+    app.state.route_timings = route_timings
+    app.add_middleware(QueryTimingMiddleware, timings=route_timings)
 
     engine: AsyncEngine = create_engine()
     session_factory: async_sessionmaker[AsyncSession] = create_session_factory(engine)
+    read_engine: AsyncEngine = create_read_engine()
 
     app.state.engine = engine
     app.state.session_factory = session_factory
+    app.state.read_engine = read_engine
+    app.state.read_session_factory = create_session_factory(read_engine)
     app.state.db_path = db_path
     app.include_router(api_router, prefix="/api")
 
@@ -2,18 +2,30 @@ from .account import Account
 from .budget import Budget
 from .categorization_rule import CategorizationRule
 from .category import Category
+from .category_closure import CategoryClosure
 from .csv_profile import CsvProfile
+from .duplicate_candidate import DuplicateCandidate
+from .merged_transaction import MergedTransaction
+from .payee import Payee
+from .processed_file import ProcessedFile
 from .recurring_pattern import RecurringPattern
 from .transaction import Transaction
+from . import transaction_fts  # noqa: F401  (registers FTS5 DDL on Transaction)
 from .transfer_candidate import TransferCandidate
 from .watch_folder_config import WatchFolderConfig, WatchSettings
+from . import change_log  # noqa: F401  (registers change-log DDL on all tables)
 
 __all__ = [
     "Account",
     "Budget",
     "CategorizationRule",
     "Category",
+    "CategoryClosure",
     "CsvProfile",
+    "DuplicateCandidate",
+    "MergedTransaction",
+    "Payee",
+    "ProcessedFile",
     "RecurringPattern",
     "Transaction",
     "TransferCandidate",
@@ -0,0 +1,88 @@
+"""Closure table of the category hierarchy.
+
+``category_closure`` holds one row per (ancestor, descendant) pair of the
+category tree, including each category paired with itself at depth 0.
+Reports roll totals up to parent categories with a single join on
+``descendant_id = transaction.category_id`` instead of walking the tree.
+
+Triggers on ``category`` keep the table in sync with every insert,
+``parent_id`` update and delete, so routes, the JSON restore and the
+differential backup replay need no extra work. Inserts also link already
+present children of the new row, so rows may arrive in any order (a
+restore inserts by id, and a child can be older than its parent). Like the
+FTS index the triggers are plain SQLite DDL: ``metadata.create_all`` sets
+them up for tests and fresh databases, existing databases get them through
+the Alembic migration. The table is derived data and is neither exported
+nor tracked in the change log.
+"""
+
+from __future__ import annotations
+
+from typing import Any, cast
+
+from sqlalchemy import DDL, Column, Integer, event
+from sqlmodel import Field, SQLModel
+
+CLOSURE_TABLE = "category_closure"
+
+
+class CategoryClosure(SQLModel, table=True):
+    __tablename__ = CLOSURE_TABLE
+
+    ancestor_id: int = Field(foreign_key="category.id", primary_key=True)
+    descendant_id: int = Field(foreign_key="category.id", primary_key=True, index=True)
+    # 0 for the category itself, 1 for its children, ...
+    depth: int = Field(sa_column=Column(Integer, nullable=False))
+
+
+CLOSURE_TRIGGERS: tuple[str, ...] = (
+    f"""CREATE TRIGGER IF NOT EXISTS {CLOSURE_TABLE}_ai AFTER INSERT ON category
+    BEGIN
+        INSERT INTO {CLOSURE_TABLE}(ancestor_id, descendant_id, depth)
+        VALUES (new.id, new.id, 0);
+        INSERT INTO {CLOSURE_TABLE}(ancestor_id, descendant_id, depth)
+        SELECT new.id, sub.descendant_id, sub.depth + 1
+        FROM category AS child
+        JOIN {CLOSURE_TABLE} AS sub ON sub.ancestor_id = child.id
+        WHERE child.parent_id = new.id AND child.id != new.id;
+        INSERT INTO {CLOSURE_TABLE}(ancestor_id, descendant_id, depth)
+        SELECT up.ancestor_id, sub.descendant_id, up.depth + sub.depth + 1
+        FROM {CLOSURE_TABLE} AS up, {CLOSURE_TABLE} AS sub
+        WHERE up.descendant_id = new.parent_id AND sub.ancestor_id = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {CLOSURE_TABLE}_au
+    AFTER UPDATE OF parent_id ON category
+    WHEN old.parent_id IS NOT new.parent_id
+    BEGIN
+        DELETE FROM {CLOSURE_TABLE}
+        WHERE descendant_id IN (
+            SELECT descendant_id FROM {CLOSURE_TABLE} WHERE ancestor_id = new.id
+        )
+        AND ancestor_id IN (
+            SELECT ancestor_id FROM {CLOSURE_TABLE}
+            WHERE descendant_id = new.id AND ancestor_id != new.id
+        );
+        INSERT INTO {CLOSURE_TABLE}(ancestor_id, descendant_id, depth)
+        SELECT up.ancestor_id, sub.descendant_id, up.depth + sub.depth + 1
+        FROM {CLOSURE_TABLE} AS up, {CLOSURE_TABLE} AS sub
+        WHERE up.descendant_id = new.parent_id AND sub.ancestor_id = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {CLOSURE_TABLE}_ad AFTER DELETE ON category
+    BEGIN
+        DELETE FROM {CLOSURE_TABLE}
+        WHERE ancestor_id IN (
+            SELECT ancestor_id FROM {CLOSURE_TABLE} WHERE descendant_id = old.id
+        )
+        AND descendant_id IN (
+            SELECT descendant_id FROM {CLOSURE_TABLE} WHERE ancestor_id = old.id
+        );
+    END""",
+)
+
+_closure_table = cast(Any, CategoryClosure).__table__
+
+# Attached to the closure table, which is created after "category"
+for _stmt in CLOSURE_TRIGGERS:
+    event.listen(
+        _closure_table, "after_create", DDL(_stmt).execute_if(dialect="sqlite")
+    )
@@ -0,0 +1,109 @@
+"""Row-level change log used by differential SQLite backups.
+
+``change_log`` holds one entry per (table, row id) that was ever inserted,
+updated or deleted, stamped with a database-wide sequence number. Triggers
+on every tracked table bump the entry to ``max(seq) + 1`` on each change,
+so the log stays as large as the number of rows ever written rather than
+growing with every update. Deletions leave a tombstone (``deleted = 1``).
+
+The largest ``seq`` is the backup watermark: a differential backup taken
+"since W" copies exactly the rows whose entry has ``seq > W``.
+
+Like the FTS index, the table and triggers are plain SQLite DDL attached to
+the tracked tables, so ``metadata.create_all`` sets them up for tests and
+fresh databases, and existing databases get them through the Alembic
+migration. A migration that rebuilds a tracked table in batch mode drops
+its triggers and has to recreate them; new tables need their own triggers.
+"""
+
+from __future__ import annotations
+
+from typing import Any, cast
+
+from sqlalchemy import DDL, event
+from sqlmodel import SQLModel
+
+from .account import Account
+from .budget import Budget
+from .categorization_rule import CategorizationRule
+from .category import Category
+from .csv_profile import CsvProfile
+from .duplicate_candidate import DuplicateCandidate
+from .merged_transaction import MergedTransaction
+from .payee import Payee
+from .processed_file import ProcessedFile
+from .recurring_pattern import RecurringPattern
+from .transaction import Transaction
+from .transfer_candidate import TransferCandidate
+from .watch_folder_config import WatchFolderConfig, WatchSettings
+
+CHANGE_LOG_TABLE = "change_log"
+
+TRACKED_MODELS: tuple[type[SQLModel], ...] = (
+    Account,
+    Budget,
+    CategorizationRule,
+    Category,
+    CsvProfile,
+    DuplicateCandidate,
+    MergedTransaction,
+    Payee,
+    ProcessedFile,
+    RecurringPattern,
+    Transaction,
+    TransferCandidate,
+    WatchFolderConfig,
+    WatchSettings,
+)
+
+CHANGE_LOG_DDL: tuple[str, ...] = (
+    f"""CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        deleted INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (table_name, row_id)
+    ) WITHOUT ROWID""",
+    f"CREATE INDEX IF NOT EXISTS ix_{CHANGE_LOG_TABLE}_seq ON {CHANGE_LOG_TABLE}(seq)",
+)
+
+
+def _log_change(table: str, ref: str, deleted: int) -> str:
+    return f"""INSERT INTO {CHANGE_LOG_TABLE}(table_name, row_id, seq, deleted)
+        VALUES ('{table}', {ref}.id,
+                (SELECT coalesce(max(seq), 0) + 1 FROM {CHANGE_LOG_TABLE}), {deleted})
+        ON CONFLICT(table_name, row_id)
+        DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted;"""
+
+
+def change_log_triggers(table: str) -> tuple[str, ...]:
+    """CREATE TRIGGER statements that log changes to *table*."""
+    return (
+        f"""CREATE TRIGGER IF NOT EXISTS {CHANGE_LOG_TABLE}_{table}_ai
+        AFTER INSERT ON "{table}"
+        BEGIN
+            {_log_change(table, "new", 0)}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {CHANGE_LOG_TABLE}_{table}_au
+        AFTER UPDATE ON "{table}"
+        BEGIN
+            {_log_change(table, "new", 0)}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {CHANGE_LOG_TABLE}_{table}_ad
+        AFTER DELETE ON "{table}"
+        BEGIN
+            {_log_change(table, "old", 1)}
+        END""",
+    )
+
+
+for _model in TRACKED_MODELS:
+    _table = cast(Any, _model).__table__
+    for _stmt in (*CHANGE_LOG_DDL, *change_log_triggers(_table.name)):
+        event.listen(_table, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+
+event.listen(
+    cast(Any, Account).__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {CHANGE_LOG_TABLE}").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Column, Numeric, String, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class DuplicateCandidate(SQLModel, table=True):
+    __tablename__ = "duplicate_candidate"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    # Older row of the pair; kept when the candidate is merged
+    transaction_id: int = Field(foreign_key="transaction.id", index=True)
+    # Newer row; deleted when the candidate is merged
+    duplicate_id: int = Field(foreign_key="transaction.id", index=True)
+
+    # Text and date similarity of the two rows, 0..1
+    score: Decimal = Field(sa_column=Column(Numeric(3, 2), nullable=False))
+
+    # "pending" | "dismissed" (merged candidates go with their duplicate)
+    status: str = Field(default="pending", sa_column=Column(String(16), nullable=False))
+
+    __table_args__ = (
+        UniqueConstraint(
+            "transaction_id", "duplicate_id", name="uq_duplicate_candidate_pair"
+        ),
+    )
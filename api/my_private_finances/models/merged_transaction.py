@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import Column, String, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class MergedTransaction(SQLModel, table=True):
+    """Import hash of a transaction deleted by a duplicate merge.
+
+    Imports treat these hashes like those of stored rows, so re-importing
+    the same export does not bring a merged duplicate back.
+    """
+
+    __tablename__ = "merged_transaction"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    account_id: int = Field(foreign_key="account.id")
+    import_hash: str = Field(sa_column=Column(String(64), nullable=False))
+
+    __table_args__ = (
+        UniqueConstraint(
+            "account_id", "import_hash", name="uq_merged_tx_account_import_hash"
+        ),
+    )
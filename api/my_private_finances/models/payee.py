@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Any, Optional, cast
+
+from sqlalchemy import Column, Connection, String, event, insert, inspect, select
+from sqlmodel import Field, SQLModel
+
+from .transaction import Transaction
+
+_MAX_LENGTH = 255
+
+
+class Payee(SQLModel, table=True):
+    """One distinct payee; transactions point at it through ``payee_id``."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Spelling of the first transaction seen with this payee
+    name: str = Field(sa_column=Column(String(_MAX_LENGTH), nullable=False))
+    # Case-folded, whitespace-collapsed form: the dictionary key
+    normalized: str = Field(
+        sa_column=Column(String(_MAX_LENGTH), nullable=False, unique=True, index=True)
+    )
+    # User-chosen display name, shown in reports instead of ``name``
+    alias: Optional[str] = Field(default=None, sa_column=Column(String(_MAX_LENGTH)))
+    # Smallest payee id of its fuzzy cluster; see services/payee_clustering.py
+    cluster_id: Optional[int] = Field(default=None, foreign_key="payee.id", index=True)
+
+
+def normalize_payee(raw: str | None) -> str | None:
+    """Dictionary key for *raw*: whitespace collapsed, case folded."""
+    if raw is None:
+        return None
+    normalized = " ".join(raw.split()).casefold()[:_MAX_LENGTH]
+    return normalized or None
+
+
+def display_spelling(raw: str) -> str:
+    """*raw* as stored in ``Payee.name``."""
+    return " ".join(raw.split())[:_MAX_LENGTH]
+
+
+def _assign_payee_id(connection: Connection, target: Transaction) -> None:
+    key = normalize_payee(target.payee)
+    if key is None:
+        target.payee_id = None
+        return
+    table = cast(Any, Payee).__table__
+    payee_id = connection.execute(
+        select(table.c.id).where(table.c.normalized == key)
+    ).scalar()
+    if payee_id is None:
+        payee_id = connection.execute(
+            insert(table)
+            .values(name=display_spelling(cast(str, target.payee)), normalized=key)
+            .returning(table.c.id)
+        ).scalar_one()
+    target.payee_id = payee_id
+
+
+# Bulk writers resolve ids up front (services/payees.py); these cover
+# transactions added or changed one at a time through the ORM
+@event.listens_for(Transaction, "before_insert")
+def _payee_id_on_insert(
+    mapper: Any, connection: Connection, target: Transaction
+) -> None:
+    if target.payee_id is None:
+        _assign_payee_id(connection, target)
+
+
+@event.listens_for(Transaction, "before_update")
+def _payee_id_on_update(
+    mapper: Any, connection: Connection, target: Transaction
+) -> None:
+    if cast(Any, inspect(target)).attrs.payee.history.has_changes():
+        _assign_payee_id(connection, target)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import BigInteger, Column, Index, String
+from sqlmodel import Field, SQLModel
+
+
+class ProcessedFile(SQLModel, table=True):
+    """Ledger entry for a CSV file the watch folder has imported."""
+
+    __tablename__ = "processed_file"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    account_id: int = Field(foreign_key="account.id")
+    profile_id: Optional[int] = Field(default=None, foreign_key="csv_profile.id")
+
+    # SHA-256 (hex) and byte size of the whole file
+    content_hash: str = Field(sa_column=Column(String(64), nullable=False))
+    size: int = Field(sa_column=Column(BigInteger, nullable=False))
+
+    file_name: str
+    rows_created: int = Field(default=0)
+    processed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (Index("ix_processed_file_account_size", "account_id", "size"),)
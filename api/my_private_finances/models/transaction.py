@@ -4,16 +4,21 @@ from datetime import date
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import Column, Date, Index, Numeric, String, Text, UniqueConstraint
+from sqlalchemy import Column, Date, Index, String, Text, UniqueConstraint
 from sqlmodel import Field, SQLModel
 
+from my_private_finances.utils.money import Money
+
 
 class TransactionBase(SQLModel):
     account_id: int = Field(foreign_key="account.id", index=True)
 
     booking_date: date = Field(sa_column=Column(Date, nullable=False, index=True))
 
-    amount: Decimal = Field(sa_column=Column(Numeric(14, 2), nullable=False))
+    # Stored as integer cents in ``amount_minor``; ``tx.c.amount`` still works
+    amount: Decimal = Field(
+        sa_column=Column("amount_minor", Money(), key="amount", nullable=False)
+    )
     currency: str = Field(default="EUR", sa_column=Column(String(3), nullable=False))
 
     payee: Optional[str] = Field(default=None, sa_column=Column(String(255)))
@@ -31,8 +36,13 @@ class TransactionBase(SQLModel):
 class Transaction(TransactionBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     is_transfer: bool = Field(default=False)
+    # Set from ``payee`` on insert; see services/payees.py
+    payee_id: Optional[int] = Field(default=None, foreign_key="payee.id")
 
     __table_args__ = (
         UniqueConstraint("account_id", "import_hash", name="uq_tx_account_import_hash"),
         Index("ix_tx_account_date", "account_id", "booking_date"),
+        Index("ix_tx_account_payee_date", "account_id", "payee_id", "booking_date"),
+        # Blocking index of duplicate detection (services/duplicate_detection.py)
+        Index("ix_tx_account_amount_date", "account_id", "amount", "booking_date"),
     )
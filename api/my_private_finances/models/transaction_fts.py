@@ -0,0 +1,58 @@
+"""SQLite FTS5 index over transaction text columns.
+
+``transaction_fts`` is an external-content FTS5 table: it stores only the
+token index and reads payee/purpose/notes back from ``transaction`` by rowid.
+Triggers keep it in sync with every insert, delete and text update, so the
+import pipeline and API routes need no extra work.
+
+The DDL is attached to the ``transaction`` table so ``metadata.create_all``
+(tests, fresh databases) creates the index as well; existing databases get it
+through the Alembic migration. Other dialects are skipped and fall back to
+LIKE search.
+"""
+
+from __future__ import annotations
+
+from typing import Any, cast
+
+from sqlalchemy import DDL, event
+
+from .transaction import Transaction
+
+FTS_TABLE = "transaction_fts"
+
+FTS_DDL: tuple[str, ...] = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        payee, purpose, notes,
+        content='transaction', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON "transaction"
+    BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, payee, purpose, notes)
+        VALUES (new.id, new.payee, new.purpose, new.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON "transaction"
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, payee, purpose, notes)
+        VALUES ('delete', old.id, old.payee, old.purpose, old.notes);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF payee, purpose, notes ON "transaction"
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, payee, purpose, notes)
+        VALUES ('delete', old.id, old.payee, old.purpose, old.notes);
+        INSERT INTO {FTS_TABLE}(rowid, payee, purpose, notes)
+        VALUES (new.id, new.payee, new.purpose, new.notes);
+    END""",
+)
+
+_tx_table = cast(Any, Transaction).__table__
+
+for _stmt in FTS_DDL:
+    event.listen(_tx_table, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+event.listen(
+    _tx_table,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"),
+)
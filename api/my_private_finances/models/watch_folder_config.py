@@ -10,6 +10,8 @@ class WatchSettings(SQLModel, table=True):
 
     id: Optional[int] = Field(default=None, primary_key=True)
     root_path: str = Field(default="data/watch")
+    # Files of different accounts are imported by up to this many workers
+    concurrency: int = Field(default=4, sa_column_kwargs={"server_default": "4"})
 
 
 class WatchFolderConfig(SQLModel, table=True):
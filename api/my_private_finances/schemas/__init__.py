@@ -12,6 +12,18 @@ from .transaction_create import TransactionCreate
 from .transaction_read import TransactionRead
 from .transaction_update import TransactionUpdate
 from .transaction_list import TransactionListResponse
+from .transaction_batch import (
+    BatchItemResult,
+    TransactionBatchCreate,
+    TransactionBatchResult,
+)
+from .transaction_bulk import (
+    BulkItemStatus,
+    TransactionBulkItem,
+    TransactionBulkUpdate,
+    TransactionBulkUpdateResult,
+    TransactionFilter,
+)
 from .base import StrictSchema
 from .recurring_pattern import (
     FrequencyTotal,
@@ -24,6 +36,13 @@ from .report_cost_type import CostTypeBreakdown, FixedVsVariableReport
 from .report_monthly import CategoryTotal, MonthlyReport, PayeeTotal, TopSpending
 from .import_result import ImportResultResponse
 from .transfer import TransferCandidateRead, TransferLeg
+from .duplicate import (
+    DuplicateBulkAction,
+    DuplicateBulkItemStatus,
+    DuplicateBulkResult,
+    DuplicateCandidateRead,
+    DuplicateLeg,
+)
 from .net_worth import (
     AccountBalancePoint,
     AccountNetWorthSummary,
@@ -34,6 +53,7 @@ from .report_trend import CategoryTrendItem, SpendingTrendReport
 from .csv_profile import CsvProfileCreate, CsvProfileRead, CsvProfileUpdate
 from .report_annual import MonthSummary, AnnualReport
 from .ml import Suggestion, TrainResult
+from .payee import PayeeClusterResult, PayeeRead, PayeeUpdate
 from .watch_folder import (
     WatchFolderConfigCreate,
     WatchFolderConfigRead,
@@ -64,10 +84,21 @@ __all__ = [
     "RuleRead",
     "RuleReorder",
     "RuleUpdate",
+    "PayeeClusterResult",
+    "PayeeRead",
+    "PayeeUpdate",
     "TransactionCreate",
     "TransactionRead",
     "TransactionUpdate",
     "TransactionListResponse",
+    "BatchItemResult",
+    "TransactionBatchCreate",
+    "TransactionBatchResult",
+    "BulkItemStatus",
+    "TransactionBulkItem",
+    "TransactionBulkUpdate",
+    "TransactionBulkUpdateResult",
+    "TransactionFilter",
     "StrictSchema",
     "MonthlyReport",
     "PayeeTotal",
@@ -79,6 +110,11 @@ __all__ = [
     "ImportResultResponse",
     "TransferCandidateRead",
     "TransferLeg",
+    "DuplicateBulkAction",
+    "DuplicateBulkItemStatus",
+    "DuplicateBulkResult",
+    "DuplicateCandidateRead",
+    "DuplicateLeg",
     "AccountBalancePoint",
     "AccountNetWorthSummary",
     "NetWorthPoint",
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel
+
+
+class BackupStatusRead(SQLModel):
+    kind: str
+    running: bool
+    started_at: datetime
+    finished_at: Optional[datetime]
+    total: int
+    remaining: int
+    percent: float
+    rows: int
+    watermark: Optional[int]
+    error: Optional[str]
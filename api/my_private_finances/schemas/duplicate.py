@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from my_private_finances.schemas.base import StrictSchema
+
+MAX_BULK_CANDIDATES = 1000
+
+
+class DuplicateLeg(StrictSchema):
+    transaction_id: int
+    booking_date: date
+    amount: Decimal
+    payee: Optional[str] = None
+    purpose: Optional[str] = None
+    import_source: Optional[str] = None
+
+
+class DuplicateCandidateRead(StrictSchema):
+    id: int
+    account_id: int
+    transaction: DuplicateLeg  # older row, kept on merge
+    duplicate: DuplicateLeg  # newer row, deleted on merge
+    score: Decimal
+    status: str  # "pending" | "dismissed"
+
+
+class DuplicateBulkAction(StrictSchema):
+    candidate_ids: list[int] = Field(min_length=1, max_length=MAX_BULK_CANDIDATES)
+    action: Literal["merge", "dismiss"]
+
+
+class DuplicateBulkItemStatus(BaseModel):
+    id: int
+    status: Literal["merged", "dismissed", "not_found", "not_pending"]
+
+
+class DuplicateBulkResult(BaseModel):
+    merged: int
+    dismissed: int
+    items: list[DuplicateBulkItemStatus] = []
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from my_private_finances.schemas.base import StrictSchema
+
+
+class PayeeRead(BaseModel):
+    id: int
+    name: str
+    normalized: str
+    alias: Optional[str] = None
+    cluster_id: Optional[int] = None
+
+
+class PayeeUpdate(StrictSchema):
+    # null clears the alias
+    alias: Optional[str] = Field(default=None, min_length=1, max_length=255)
+
+
+class PayeeClusterResult(BaseModel):
+    payees: int
+    clusters: int
+    changed: int
+    seconds: float
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlmodel import SQLModel
+
+
+class PostImportPendingRead(SQLModel):
+    account_id: int
+    events: int
+    first_event_at: datetime
+    due_in_seconds: float
+
+
+class PostImportRunRead(SQLModel):
+    account_ids: list[int]
+    started_at: datetime
+    duration_seconds: float
+    failed_jobs: list[str]
+
+
+class PostImportStatusRead(SQLModel):
+    quiet_period_seconds: float
+    pending: list[PostImportPendingRead]
+    running: list[int]
+    last_run: PostImportRunRead | None
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from my_private_finances.schemas.base import StrictSchema
+from my_private_finances.schemas.transaction_create import TransactionCreate
+
+MAX_BATCH_ITEMS = 5000
+
+
+class TransactionBatchCreate(StrictSchema):
+    items: list[TransactionCreate] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    status: Literal["created", "duplicate", "error"]
+    id: int | None = None
+    detail: str | None = None
+
+
+class TransactionBatchResult(BaseModel):
+    created: int
+    duplicates: int
+    failed: int
+    items: list[BatchItemResult]
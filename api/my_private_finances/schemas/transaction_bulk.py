@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from my_private_finances.schemas.base import StrictSchema
+
+MAX_BULK_ITEMS = 5000
+
+
+class TransactionFilter(StrictSchema):
+    """Same criteria as the query parameters of ``GET /api/transactions``."""
+
+    account_id: Optional[int] = Field(default=None, ge=1)
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    category_filter: Optional[Literal["uncategorized"]] = None
+    q: Optional[str] = None
+    amount_min: Optional[Decimal] = None
+    amount_max: Optional[Decimal] = None
+
+    @field_validator("q")
+    @classmethod
+    def _blank_q_is_unset(cls, value: Optional[str]) -> Optional[str]:
+        # A blank search matches everything; it must not count as a criterion
+        return value if value is not None and value.strip() else None
+
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
+
+class TransactionBulkItem(StrictSchema):
+    """One per-transaction change. Only fields that are sent are written."""
+
+    id: int
+    category_id: Optional[int] = None
+    notes: Optional[str] = None
+    is_transfer: Optional[bool] = None
+
+    @field_validator("is_transfer")
+    @classmethod
+    def _is_transfer_not_null(cls, value: Optional[bool]) -> bool:
+        # The column is NOT NULL; omit the field to leave it unchanged
+        if value is None:
+            raise ValueError("is_transfer cannot be null")
+        return value
+
+
+class TransactionBulkUpdate(StrictSchema):
+    """Either a list of per-transaction changes, or a filter plus target category."""
+
+    items: Optional[list[TransactionBulkItem]] = Field(
+        default=None, max_length=MAX_BULK_ITEMS
+    )
+    filter: Optional[TransactionFilter] = None
+    category_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def _check_mode(self) -> TransactionBulkUpdate:
+        if (self.items is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'items' or 'filter'")
+        if self.filter is not None and "category_id" not in self.model_fields_set:
+            raise ValueError("'category_id' is required together with 'filter'")
+        if self.items is not None and "category_id" in self.model_fields_set:
+            raise ValueError("'category_id' is only allowed together with 'filter'")
+        return self
+
+
+class BulkItemStatus(BaseModel):
+    id: int
+    status: Literal["updated", "not_found", "invalid_category"]
+
+
+class TransactionBulkUpdateResult(BaseModel):
+    updated: int
+    items: list[BulkItemStatus] = []
@@ -5,4 +5,5 @@ from .transaction_read import TransactionRead
 
 class TransactionListResponse(BaseModel):
     items: list[TransactionRead]
-    total: int
+    total: int | None = None
+    next_cursor: str | None = None
@@ -1,16 +1,34 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
+
+MAX_WATCH_CONCURRENCY = 16
 
 
 class WatchSettingsRead(SQLModel):
     root_path: str
+    concurrency: int
 
 
 class WatchSettingsUpdate(SQLModel):
-    root_path: str
+    root_path: Optional[str] = None
+    concurrency: Optional[int] = Field(default=None, ge=1, le=MAX_WATCH_CONCURRENCY)
+
+
+class WatchInFlightFile(SQLModel):
+    path: str
+    account_id: Optional[int]
+    started_at: datetime
+
+
+class WatchStatusRead(SQLModel):
+    running: bool
+    concurrency: int
+    queue_depth: int
+    in_flight: list[WatchInFlightFile]
 
 
 class WatchFolderConfigCreate(SQLModel):
@@ -0,0 +1,209 @@
+"""Columnar (Parquet / Arrow IPC) export of transactions.
+
+Transactions are read through a server-side cursor in batches of
+``BATCH_ROWS`` and turned into Arrow record batches. Each batch is written
+as its own Parquet row group (or IPC message) and the encoded bytes are
+handed out before the next batch is fetched, so memory stays bounded by
+the batch size.
+
+Amounts come straight from the integer ``amount_minor`` column into a
+``decimal128(18, 2)`` column, and dates are ``date32``, so the file loads
+into pandas or Polars with proper types and no parsing.
+
+``pyarrow`` is an optional dependency (the ``parquet`` extra): it is
+imported on first use, and :class:`ColumnarExportUnavailable` is raised
+when it is not installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from datetime import date
+from typing import Any, Literal, cast
+
+from sqlalchemy import BigInteger, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from my_private_finances.models import Account, Category, Transaction
+
+logger = logging.getLogger(__name__)
+
+ColumnarFormat = Literal["parquet", "arrow"]
+
+MEDIA_TYPES: dict[ColumnarFormat, str] = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+BATCH_ROWS = 50_000
+
+# (column, Arrow type name); the types are resolved once pyarrow is loaded
+_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("id", "int64"),
+    ("account_id", "int64"),
+    ("account_name", "string"),
+    ("booking_date", "date32"),
+    ("amount", "decimal"),
+    ("currency", "string"),
+    ("payee", "string"),
+    ("purpose", "string"),
+    ("notes", "string"),
+    ("category_id", "int64"),
+    ("category_name", "string"),
+    ("parent_category_name", "string"),
+    ("cost_type", "string"),
+    ("is_transfer", "bool"),
+    ("external_id", "string"),
+    ("import_source", "string"),
+)
+
+
+class ColumnarExportUnavailable(RuntimeError):
+    """Raised when the optional pyarrow dependency is not installed."""
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow as pa  # type: ignore[import-not-found,import-untyped,unused-ignore]
+    except ImportError as exc:
+        raise ColumnarExportUnavailable(
+            "Parquet/Arrow export needs the optional 'pyarrow' package; "
+            "install the 'parquet' extra (poetry install -E parquet)"
+        ) from exc
+    return pa
+
+
+def transaction_schema() -> Any:
+    pa = _pyarrow()
+    types = {
+        "int64": pa.int64(),
+        "string": pa.string(),
+        "date32": pa.date32(),
+        "decimal": pa.decimal128(18, 2),
+        "bool": pa.bool_(),
+    }
+    return pa.schema([pa.field(name, types[kind]) for name, kind in _COLUMNS])
+
+
+def _query(account_id: int | None, date_from: date | None, date_to: date | None) -> Any:
+    tx = cast(Any, Transaction).__table__
+    acc = cast(Any, Account).__table__
+    cat = cast(Any, Category).__table__
+    parent = cat.alias("parent_category")
+    stmt = (
+        select(
+            tx.c.id,
+            tx.c.account_id,
+            acc.c.name.label("account_name"),
+            tx.c.booking_date,
+            # Integer cents; turned into decimals column-wise, not per row
+            type_coerce(tx.c.amount, BigInteger).label("amount"),
+            tx.c.currency,
+            tx.c.payee,
+            tx.c.purpose,
+            tx.c.notes,
+            tx.c.category_id,
+            cat.c.name.label("category_name"),
+            parent.c.name.label("parent_category_name"),
+            cat.c.cost_type,
+            tx.c.is_transfer,
+            tx.c.external_id,
+            tx.c.import_source,
+        )
+        .select_from(
+            tx.join(acc, tx.c.account_id == acc.c.id)
+            .outerjoin(cat, tx.c.category_id == cat.c.id)
+            .outerjoin(parent, cat.c.parent_id == parent.c.id)
+        )
+        .order_by(tx.c.booking_date, tx.c.id)
+    )
+    if account_id is not None:
+        stmt = stmt.where(tx.c.account_id == account_id)
+    if date_from is not None:
+        stmt = stmt.where(tx.c.booking_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(tx.c.booking_date <= date_to)
+    return stmt
+
+
+def _record_batch(pa: Any, schema: Any, rows: list[Any]) -> Any:
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = []
+    for field, values in zip(schema, columns):
+        if field.name == "amount":
+            # Minor units are the unscaled decimal value
+            arrays.append(
+                pa.array(values, pa.int64()).cast(pa.decimal128(19, 0)).view(field.type)
+            )
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _Sink:
+    """Write-only file object that hands out what was written since last time."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _open_writer(pa: Any, fmt: ColumnarFormat, sink: _Sink, schema: Any) -> Any:
+    if fmt == "parquet":
+        import pyarrow.parquet as pq  # type: ignore[import-not-found,import-untyped,unused-ignore]
+
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    return pa.ipc.new_stream(sink, schema)
+
+
+async def stream_transactions(
+    session_factory: async_sessionmaker[AsyncSession],
+    fmt: ColumnarFormat = "parquet",
+    *,
+    account_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    batch_rows: int = BATCH_ROWS,
+) -> AsyncIterator[bytes]:
+    """Yield a Parquet file or Arrow IPC stream of the matching transactions."""
+    pa = _pyarrow()
+    schema = transaction_schema()
+    sink = _Sink()
+    writer = _open_writer(pa, fmt, sink, schema)
+    total = 0
+    try:
+        async with session_factory() as session:
+            result = await session.stream(
+                _query(account_id, date_from, date_to).execution_options(
+                    yield_per=batch_rows
+                )
+            )
+            async for rows in result.partitions():
+                batch = _record_batch(pa, schema, list(rows))
+                # Encoding and compression release the GIL; keep them off the loop
+                await asyncio.to_thread(writer.write_batch, batch)
+                total += batch.num_rows
+                data = sink.drain()
+                if data:
+                    yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+    logger.info("%s export streamed: %d transactions", fmt.capitalize(), total)
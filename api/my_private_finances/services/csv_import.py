@@ -2,27 +2,42 @@ import csv
 import hashlib
 import io
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import Any, TypedDict, cast
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from my_private_finances.models import Account, Transaction
+from my_private_finances.metrics import (
+    IMPORT_DURATION,
+    IMPORT_ROWS,
+    IMPORT_THROUGHPUT,
+)
+from my_private_finances.models import (
+    Account,
+    CategorizationRule,
+    MergedTransaction,
+    Transaction,
+)
 from my_private_finances.schemas.import_result import ImportErrorDetail
 from my_private_finances.services.categorization import (
     load_rules_ordered,
     match_transaction,
 )
+from my_private_finances.services.payees import PayeeInterner
 from my_private_finances.services.transaction_hash import compute_import_hash, HashInput
 
 logger = logging.getLogger(__name__)
 
 IMPORT_SOURCE = "csv"
 
+# Hashes per IN (...) lookup, well below SQLite's bound-parameter limit
+_HASH_LOOKUP_CHUNK = 10_000
+
 
 class ColumnMap(TypedDict, total=False):
     booking_date: list[str]
@@ -115,11 +130,36 @@ def _first_present(row: dict[str, Any], keys: list[str]) -> str | None:
     return None
 
 
-async def import_transactions_from_csv_path(
+def record_import_metrics(result: ImportResult, seconds: float) -> None:
+    IMPORT_ROWS.labels(result="created").inc(result.created)
+    IMPORT_ROWS.labels(result="duplicate").inc(result.duplicates)
+    IMPORT_ROWS.labels(result="skipped").inc(result.skipped)
+    IMPORT_ROWS.labels(result="failed").inc(result.failed)
+    IMPORT_DURATION.observe(seconds)
+    if seconds > 0:
+        IMPORT_THROUGHPUT.set(result.total_rows / seconds)
+
+
+@dataclass(slots=True)
+class ParsedCsv:
+    """Rows of one CSV file, validated and hashed but not yet stored.
+
+    Plain values only, so it can be produced in a worker process.
+    """
+
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    total_rows: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[ImportErrorDetail] = field(default_factory=list)
+    parse_seconds: float = 0.0
+
+
+def parse_csv_file(
+    csv_path: Path,
     *,
-    session: AsyncSession,
     account_id: int,
-    csv_path: Path,
     max_errors: int = 50,
     delimiter: str = ",",
     date_format: str = "iso",
@@ -127,22 +167,16 @@ async def import_transactions_from_csv_path(
     column_map: ColumnMap | None = None,
     row_filters: dict[str, list[str]] | None = None,
     row_exclude_filters: dict[str, list[str]] | None = None,
-) -> ImportResult:
-    col: ColumnMap = {**DEFAULT_COLUMN_MAP, **(column_map or {})}
-    res = await session.execute(select(Account).where(Account.id == account_id))  # type: ignore[arg-type]
-    if res.scalar_one_or_none() is None:
-        raise ValueError(f"Account {account_id} not found")
-
-    rules = await load_rules_ordered(session)
-    logger.info(
-        "CSV import started: account_id=%d, file=%s, rules=%d",
-        account_id,
-        csv_path.name,
-        len(rules),
-    )
+    start_offset: int = 0,
+) -> ParsedCsv:
+    """Read, validate and hash the rows of *csv_path* without touching the DB.
 
+    With *start_offset*, only rows starting at that byte offset (which must
+    begin a line) are parsed; the header line is always read.
+    """
+    started = time.perf_counter()
+    col: ColumnMap = {**DEFAULT_COLUMN_MAP, **(column_map or {})}
     total_rows = 0
-    created = 0
     skipped = 0
     duplicates = 0
     failed = 0
@@ -150,6 +184,12 @@ async def import_transactions_from_csv_path(
 
     _ENCODINGS = ("utf-8-sig", "cp1252")
     raw = csv_path.read_bytes()
+    first_row = 2
+    if start_offset > 0:
+        header_end = raw.find(b"\n") + 1
+        if 0 < header_end <= start_offset:
+            first_row += raw.count(b"\n", header_end, start_offset)
+            raw = raw[:header_end] + raw[start_offset:]
     text: str | None = None
     used_encoding: str | None = None
     for enc in _ENCODINGS:
@@ -166,8 +206,8 @@ async def import_transactions_from_csv_path(
         )
     logger.debug("CSV encoding detected: %s", used_encoding)
 
-    # Phase 1: parse all rows into Transaction objects; count parse errors
-    pending: list[Transaction] = []
+    # Parse all rows into column values; count parse errors
+    pending: list[dict[str, Any]] = []
     seen_hashes: set[str] = set()
 
     def _record_error(err: ImportErrorDetail) -> None:
@@ -185,7 +225,7 @@ async def import_transactions_from_csv_path(
         if reader.fieldnames is None:
             raise ValueError("CSV has no header row")
 
-        for idx, row in enumerate(reader, start=2):
+        for idx, row in enumerate(reader, start=first_row):
             total_rows += 1
 
             if row_filters and any(
@@ -324,64 +364,148 @@ async def import_transactions_from_csv_path(
                 continue
             seen_hashes.add(import_hash)
 
-            db_obj = Transaction(
-                account_id=account_id,
-                booking_date=booking_date,
-                amount=amount,
-                currency=currency,
-                payee=payee,
-                purpose=purpose,
-                notes=notes,
-                category_id=None,
-                external_id=external_id,
-                import_source=IMPORT_SOURCE,
-                import_hash=import_hash,
+            pending.append(
+                {
+                    "booking_date": booking_date,
+                    "amount": amount,
+                    "currency": currency,
+                    "payee": payee,
+                    "purpose": purpose,
+                    "notes": notes,
+                    "external_id": external_id,
+                    "import_hash": import_hash,
+                }
             )
 
-            if rules:
-                matched_cat = match_transaction(db_obj, rules)
-                if matched_cat is not None:
-                    db_obj.category_id = matched_cat
+    return ParsedCsv(
+        rows=pending,
+        total_rows=total_rows,
+        skipped=skipped,
+        duplicates=duplicates,
+        failed=failed,
+        errors=all_errors,
+        parse_seconds=time.perf_counter() - started,
+    )
 
-            pending.append(db_obj)
 
-    # Phase 2: filter out rows already in DB, then batch-insert the rest
-    if pending:
-        pending_hashes = {tx.import_hash for tx in pending}
-        existing_result = await session.execute(
-            select(Transaction.import_hash).where(  # type: ignore[call-overload]
-                Transaction.account_id == account_id,  # type: ignore[arg-type]
-                Transaction.import_hash.in_(pending_hashes),  # type: ignore[attr-defined]
+async def store_parsed_csv(
+    session: AsyncSession,
+    *,
+    account_id: int,
+    parsed: ParsedCsv,
+    rules: list[CategorizationRule],
+) -> ImportResult:
+    """Categorize *parsed* rows, drop those already in the DB, insert the rest."""
+    rows: list[dict[str, Any]] = []
+    for row in parsed.rows:
+        category_id = None
+        if rules:
+            category_id = match_transaction(
+                Transaction(account_id=account_id, import_source=IMPORT_SOURCE, **row),
+                rules,
             )
+        rows.append(
+            {
+                **row,
+                "account_id": account_id,
+                "import_source": IMPORT_SOURCE,
+                "category_id": category_id,
+            }
         )
-        existing_hashes = {row[0] for row in existing_result}
+
+    created = 0
+    duplicates = parsed.duplicates
+    # Filter out rows already in DB, then insert the rest in one executemany
+    if rows:
+        tx = cast(Any, Transaction).__table__
+        hashes = [r["import_hash"] for r in rows]
+        existing_hashes: set[str] = set()
+        # Rows deleted by a duplicate merge count as already imported
+        for table in (tx, cast(Any, MergedTransaction).__table__):
+            for i in range(0, len(hashes), _HASH_LOOKUP_CHUNK):
+                existing_result = await session.execute(
+                    select(table.c.import_hash).where(
+                        table.c.account_id == account_id,
+                        table.c.import_hash.in_(hashes[i : i + _HASH_LOOKUP_CHUNK]),
+                    )
+                )
+                existing_hashes.update(existing_result.scalars())
         duplicates += len(existing_hashes)
 
-        new_transactions = [
-            tx for tx in pending if tx.import_hash not in existing_hashes
-        ]
-        if new_transactions:
-            session.add_all(new_transactions)
+        new_rows = [r for r in rows if r["import_hash"] not in existing_hashes]
+        if new_rows:
+            payee_ids = await PayeeInterner().ids(
+                session, [r["payee"] for r in new_rows]
+            )
+            for r, payee_id in zip(new_rows, payee_ids):
+                r["payee_id"] = payee_id
+            await session.execute(insert(tx), new_rows)
             await session.commit()
-        created = len(new_transactions)
+        created = len(new_rows)
 
     logger.info(
         "CSV import complete: account_id=%d, total=%d, created=%d, skipped=%d, duplicates=%d, failed=%d",
         account_id,
-        total_rows,
+        parsed.total_rows,
         created,
-        skipped,
+        parsed.skipped,
         duplicates,
-        failed,
+        parsed.failed,
     )
 
-    errors_truncated = failed > len(all_errors)
     return ImportResult(
-        total_rows=total_rows,
+        total_rows=parsed.total_rows,
         created=created,
-        skipped=skipped,
+        skipped=parsed.skipped,
         duplicates=duplicates,
-        failed=failed,
-        errors=all_errors,
-        errors_truncated=errors_truncated,
+        failed=parsed.failed,
+        errors=parsed.errors,
+        errors_truncated=parsed.failed > len(parsed.errors),
+    )
+
+
+async def import_transactions_from_csv_path(
+    *,
+    session: AsyncSession,
+    account_id: int,
+    csv_path: Path,
+    max_errors: int = 50,
+    delimiter: str = ",",
+    date_format: str = "iso",
+    decimal_comma: bool = False,
+    column_map: ColumnMap | None = None,
+    row_filters: dict[str, list[str]] | None = None,
+    row_exclude_filters: dict[str, list[str]] | None = None,
+    start_offset: int = 0,
+) -> ImportResult:
+    """Import *csv_path* into *account_id*; see :func:`parse_csv_file`."""
+    started = time.perf_counter()
+    res = await session.execute(select(Account).where(Account.id == account_id))  # type: ignore[arg-type]
+    if res.scalar_one_or_none() is None:
+        raise ValueError(f"Account {account_id} not found")
+
+    rules = await load_rules_ordered(session)
+    logger.info(
+        "CSV import started: account_id=%d, file=%s, rules=%d",
+        account_id,
+        csv_path.name,
+        len(rules),
+    )
+
+    parsed = parse_csv_file(
+        csv_path,
+        account_id=account_id,
+        max_errors=max_errors,
+        delimiter=delimiter,
+        date_format=date_format,
+        decimal_comma=decimal_comma,
+        column_map=column_map,
+        row_filters=row_filters,
+        row_exclude_filters=row_exclude_filters,
+        start_offset=start_offset,
+    )
+    result = await store_parsed_csv(
+        session, account_id=account_id, parsed=parsed, rules=rules
     )
+    record_import_metrics(result, time.perf_counter() - started)
+    return result
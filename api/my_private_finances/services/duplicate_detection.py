@@ -0,0 +1,233 @@
+"""Near-duplicate transaction detection.
+
+The import hash only catches rows that agree in every hashed field. The
+same payment arriving once from a CSV and once through the API, or from two
+exports that format ``purpose`` or ``external_id`` differently, is stored
+twice and counted twice. This service finds such pairs:
+
+  - same account and the same amount (exactly, in cents)
+  - booking dates at most ``window_days`` (default 3) apart
+  - scored by payee and purpose similarity and by the date gap; pairs
+    scoring at least ``min_score`` become pending :class:`DuplicateCandidate`
+    rows, which the user merges or dismisses
+  - pairs already tracked (any status) are never suggested again
+
+Blocking happens in SQL: a self-join of ``transaction`` on
+``ix_tx_account_amount_date`` (account, amount, date range) returns only the
+pairs that share all three, so no two transactions with different amounts
+or accounts are ever compared. Text similarity is computed for those pairs
+alone. Payees of the same cluster (see
+:mod:`~my_private_finances.services.payee_clustering`) count as identical.
+"""
+
+from __future__ import annotations
+
+import logging
+from decimal import Decimal
+from typing import Any, cast
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.metrics import DETECTION_DURATION
+from my_private_finances.models import (
+    DuplicateCandidate,
+    MergedTransaction,
+    Payee,
+    Transaction,
+)
+from my_private_finances.models.payee import normalize_payee
+from my_private_finances.models.transfer_candidate import TransferCandidate
+from my_private_finances.services.payee_clustering import payee_key, trigrams
+
+logger = logging.getLogger(__name__)
+
+# Weights of the score components; they add up to 1
+_PAYEE_WEIGHT = Decimal("0.55")
+_PURPOSE_WEIGHT = Decimal("0.25")
+_DATE_WEIGHT = Decimal("0.20")
+# Similarity assumed when either side has no text to compare
+_UNKNOWN_SIMILARITY = 0.5
+
+
+def _similarity(a: str | None, b: str | None) -> float:
+    if not a or not b:
+        return _UNKNOWN_SIMILARITY
+    if a == b:
+        return 1.0
+    x, y = trigrams(a), trigrams(b)
+    return len(x & y) / len(x | y)
+
+
+def score_pair(row: Any, window_days: int) -> Decimal:
+    """Score a blocked pair from :func:`detect_duplicate_candidates`' query."""
+    if row.first_payee is not None and row.first_payee == row.second_payee:
+        payee = 1.0
+    else:
+        first, second = (
+            normalize_payee(row.first_payee_text),
+            normalize_payee(row.second_payee_text),
+        )
+        payee = _similarity(first and payee_key(first), second and payee_key(second))
+    purpose = _similarity(
+        normalize_payee(row.first_purpose), normalize_payee(row.second_purpose)
+    )
+    gap = abs((row.second_date - row.first_date).days)
+    closeness = 1 - gap / (window_days + 1)
+    score = (
+        _PAYEE_WEIGHT * Decimal(str(payee))
+        + _PURPOSE_WEIGHT * Decimal(str(purpose))
+        + _DATE_WEIGHT * Decimal(str(closeness))
+    )
+    return score.quantize(Decimal("0.01"))
+
+
+@DETECTION_DURATION.labels(kind="duplicate").time()
+async def detect_duplicate_candidates(
+    session: AsyncSession,
+    window_days: int = 3,
+    min_score: Decimal = Decimal("0.60"),
+) -> list[DuplicateCandidate]:
+    """Detect likely duplicate transactions within each account.
+
+    Skips pairs that are already in DuplicateCandidate (any status).
+    Returns newly created DuplicateCandidate rows (status='pending').
+    """
+    tx = cast(Any, Transaction).__table__
+    payee = cast(Any, Payee).__table__
+    first, second = tx.alias("first"), tx.alias("second")
+    first_payee, second_payee = payee.alias("first_payee"), payee.alias("second_payee")
+
+    # Each pair once (older row first); the join condition matches the
+    # index prefix, so every row costs one range seek on the other side
+    blocked = (
+        first.join(
+            second,
+            (second.c.account_id == first.c.account_id)
+            & (second.c.amount == first.c.amount)
+            & (
+                second.c.booking_date
+                >= func.date(first.c.booking_date, f"-{window_days} days")
+            )
+            & (
+                second.c.booking_date
+                <= func.date(first.c.booking_date, f"+{window_days} days")
+            )
+            & (second.c.id > first.c.id),
+        )
+        .outerjoin(first_payee, first_payee.c.id == first.c.payee_id)
+        .outerjoin(second_payee, second_payee.c.id == second.c.payee_id)
+    )
+    stmt = select(
+        first.c.id.label("first_id"),
+        second.c.id.label("second_id"),
+        first.c.booking_date.label("first_date"),
+        second.c.booking_date.label("second_date"),
+        func.coalesce(first_payee.c.cluster_id, first.c.payee_id).label("first_payee"),
+        func.coalesce(second_payee.c.cluster_id, second.c.payee_id).label(
+            "second_payee"
+        ),
+        first.c.payee.label("first_payee_text"),
+        second.c.payee.label("second_payee_text"),
+        first.c.purpose.label("first_purpose"),
+        second.c.purpose.label("second_purpose"),
+    ).select_from(blocked)
+    rows = (await session.execute(stmt)).all()
+    logger.info(
+        "Duplicate detection started: window_days=%d, blocked pairs=%d",
+        window_days,
+        len(rows),
+    )
+
+    dc = cast(Any, DuplicateCandidate).__table__
+    existing_rows = (
+        await session.execute(select(dc.c.transaction_id, dc.c.duplicate_id))
+    ).all()
+    existing_pairs: set[tuple[int, int]] = {
+        (r.transaction_id, r.duplicate_id) for r in existing_rows
+    }
+
+    new_candidates: list[DuplicateCandidate] = []
+    for row in rows:
+        pair = (row.first_id, row.second_id)
+        if pair in existing_pairs:
+            continue
+        score = score_pair(row, window_days)
+        if score < min_score:
+            continue
+        candidate = DuplicateCandidate(
+            transaction_id=row.first_id,
+            duplicate_id=row.second_id,
+            score=score,
+            status="pending",
+        )
+        session.add(candidate)
+        new_candidates.append(candidate)
+        existing_pairs.add(pair)
+
+    await session.flush()
+    logger.info(
+        "Duplicate detection complete: %d new candidates found", len(new_candidates)
+    )
+    return new_candidates
+
+
+async def merge_duplicate(session: AsyncSession, candidate: DuplicateCandidate) -> None:
+    """Delete the candidate's newer transaction, keeping the older one.
+
+    Category, notes and the transfer flag set on the deleted row carry over
+    where the kept row has none. Candidates of either kind that refer to the
+    deleted row, this one included, are removed with it. Its import hash is
+    kept as a :class:`MergedTransaction` so imports do not recreate it.
+    """
+    keep = await session.get(Transaction, candidate.transaction_id)
+    duplicate = await session.get(Transaction, candidate.duplicate_id)
+    if keep is None or duplicate is None:
+        raise ValueError("Duplicate candidate references a missing transaction")
+
+    if keep.category_id is None:
+        keep.category_id = duplicate.category_id
+    if not keep.notes:
+        keep.notes = duplicate.notes
+    keep.is_transfer = keep.is_transfer or duplicate.is_transfer
+
+    dup_id = duplicate.id
+    dc = cast(Any, DuplicateCandidate).__table__
+    tc = cast(Any, TransferCandidate).__table__
+    await session.execute(
+        delete(dc).where(
+            or_(dc.c.transaction_id == dup_id, dc.c.duplicate_id == dup_id)
+        )
+    )
+    await session.execute(
+        delete(tc).where(
+            or_(tc.c.from_transaction_id == dup_id, tc.c.to_transaction_id == dup_id)
+        )
+    )
+    session.add(
+        MergedTransaction(
+            account_id=duplicate.account_id, import_hash=duplicate.import_hash
+        )
+    )
+    await session.delete(duplicate)
+    await session.flush()
+    logger.info(
+        "Duplicate merged: candidate_id=%s (tx %s kept, tx %s deleted)",
+        candidate.id,
+        candidate.transaction_id,
+        dup_id,
+    )
+
+
+async def dismiss_duplicate(
+    session: AsyncSession, candidate: DuplicateCandidate
+) -> None:
+    """Mark candidate as dismissed so it won't be re-suggested."""
+    candidate.status = "dismissed"
+    await session.flush()
+    logger.info(
+        "Duplicate dismissed: candidate_id=%s (tx %s, tx %s)",
+        candidate.id,
+        candidate.transaction_id,
+        candidate.duplicate_id,
+    )
@@ -0,0 +1,130 @@
+"""Ledger of CSV files already imported by the watch folder.
+
+Each imported file is recorded with the SHA-256 of its content, its size,
+the target account and the CSV profile used. A new file is hashed in a
+single streaming pass, which also snapshots the digest at the sizes of
+earlier files for the same account and profile. That answers two questions
+without parsing anything:
+
+* is this file byte-identical to one already imported, and
+* does it start with an earlier export (a bank export covering a longer
+  period), so that only the bytes after that prefix need parsing?
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.models import ProcessedFile
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Earlier files considered as a prefix; the largest ones are the likeliest
+_MAX_PREFIX_CANDIDATES = 32
+
+Ledger = dict[int, set[str]]
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    size: int
+    digest: str
+    # offset -> digest of the first ``offset`` bytes, for offsets that end a line
+    prefix_digests: dict[int, str] = field(default_factory=dict)
+
+
+def fingerprint_file(
+    path: Path, prefix_sizes: list[int] | None = None
+) -> FileFingerprint:
+    """Hash *path* in one pass, also recording the digest at *prefix_sizes*.
+
+    A prefix digest is only kept if the prefix ends with a newline, so a
+    match always leaves whole rows after it.
+    """
+    hasher = hashlib.sha256()
+    prefixes: dict[int, str] = {}
+    pos = 0
+    last = b""
+    with path.open("rb") as f:
+        for boundary in sorted(set(prefix_sizes or ())):
+            while pos < boundary:
+                chunk = f.read(min(_CHUNK_SIZE, boundary - pos))
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                pos += len(chunk)
+                last = chunk[-1:]
+            if pos < boundary:
+                break
+            if boundary > 0 and last == b"\n":
+                prefixes[boundary] = hasher.hexdigest()
+        while chunk := f.read(_CHUNK_SIZE):
+            hasher.update(chunk)
+            pos += len(chunk)
+    return FileFingerprint(size=pos, digest=hasher.hexdigest(), prefix_digests=prefixes)
+
+
+async def load_ledger(
+    session: AsyncSession,
+    *,
+    account_id: int,
+    profile_id: int | None,
+    max_size: int,
+) -> Ledger:
+    """Sizes and hashes of earlier files for this account/profile, up to *max_size*."""
+    pf = cast(Any, ProcessedFile).__table__
+    result = await session.execute(
+        select(pf.c.size, pf.c.content_hash)
+        .where(
+            pf.c.account_id == account_id,
+            pf.c.profile_id.is_not_distinct_from(profile_id),
+            pf.c.size <= max_size,
+        )
+        .order_by(pf.c.size.desc())
+        .limit(_MAX_PREFIX_CANDIDATES)
+    )
+    ledger: Ledger = {}
+    for size, content_hash in result:
+        ledger.setdefault(size, set()).add(content_hash)
+    return ledger
+
+
+def is_duplicate(fingerprint: FileFingerprint, ledger: Ledger) -> bool:
+    return fingerprint.digest in ledger.get(fingerprint.size, set())
+
+
+def appended_from(fingerprint: FileFingerprint, ledger: Ledger) -> int:
+    """Byte offset after the longest already-imported prefix, or 0."""
+    for size in sorted(fingerprint.prefix_digests, reverse=True):
+        digest = fingerprint.prefix_digests[size]
+        if size < fingerprint.size and digest in ledger.get(size, set()):
+            return size
+    return 0
+
+
+def record_file(
+    session: AsyncSession,
+    *,
+    account_id: int,
+    profile_id: int | None,
+    fingerprint: FileFingerprint,
+    file_name: str,
+    rows_created: int,
+) -> None:
+    """Add a ledger entry to *session*; the caller commits."""
+    session.add(
+        ProcessedFile(
+            account_id=account_id,
+            profile_id=profile_id,
+            content_hash=fingerprint.digest,
+            size=fingerprint.size,
+            file_name=file_name,
+            rows_created=rows_created,
+        )
+    )
@@ -0,0 +1,140 @@
+"""Streaming JSON export of the whole database.
+
+The document has the ``export_version`` layout the export endpoint always
+produced: one top-level key per table, each holding a list of rows as
+``model_dump()`` would render them (decimals as strings, dates in ISO
+format). Tables are written in foreign-key order, parents first, so the
+document can be restored front to back.
+
+Rows are read through a server-side cursor and encoded one by one into
+chunks of about ``_CHUNK_BYTES``, so memory use does not grow with the
+size of the database. All tables are read in one transaction and form a
+consistent snapshot.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import zlib
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from typing import Any, cast
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import SQLModel
+
+from my_private_finances.models import (
+    Account,
+    Budget,
+    CategorizationRule,
+    Category,
+    CsvProfile,
+    DuplicateCandidate,
+    MergedTransaction,
+    Payee,
+    RecurringPattern,
+    Transaction,
+    TransferCandidate,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_VERSION = 1
+
+# Document key and model per exported table, parents before children
+EXPORT_TABLES: tuple[tuple[str, type[SQLModel]], ...] = (
+    ("categories", Category),
+    ("accounts", Account),
+    ("csv_profiles", CsvProfile),
+    ("budgets", Budget),
+    ("categorization_rules", CategorizationRule),
+    ("payees", Payee),
+    ("transactions", Transaction),
+    ("recurring_patterns", RecurringPattern),
+    ("transfer_candidates", TransferCandidate),
+    ("duplicate_candidates", DuplicateCandidate),
+    ("merged_transactions", MergedTransaction),
+)
+
+# Rows fetched per cursor round trip
+_YIELD_PER = 2_000
+# Encoded output is flushed to the client in pieces of about this size
+_CHUNK_BYTES = 64 * 1024
+
+
+def _serialize(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Cannot JSON-serialize {type(obj)!r}")
+
+
+_encoder = json.JSONEncoder(default=_serialize, ensure_ascii=False)
+
+
+def _columns(model: type[SQLModel]) -> list[Any]:
+    # Field names of model_dump(); labelled because a column's
+    # attribute key may differ from its SQL name (amount -> amount_minor)
+    table = cast(Any, model).__table__
+    return [table.c[name].label(name) for name in model.model_fields]
+
+
+async def stream_json_export(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[bytes]:
+    """Yield the UTF-8 encoded export document in chunks."""
+    counts: dict[str, int] = {}
+    async with session_factory() as session:
+        if session.get_bind().dialect.name == "sqlite":
+            # pysqlite issues no BEGIN before a SELECT; without one every
+            # table would be read in its own implicit transaction
+            await (await session.connection()).exec_driver_sql("BEGIN")
+        buffer: list[str] = [
+            f'{{"export_version": {EXPORT_VERSION}, '
+            f'"exported_at": "{datetime.now(UTC).isoformat()}"'
+        ]
+        size = len(buffer[0])
+        for key, model in EXPORT_TABLES:
+            buffer.append(f',\n"{key}": [')
+            table = cast(Any, model).__table__
+            result = await session.stream(
+                select(*_columns(model))
+                .order_by(table.c.id)
+                .execution_options(yield_per=_YIELD_PER)
+            )
+            count = 0
+            async for row in result.mappings():
+                item = _encoder.encode(dict(row))
+                buffer.append(f"\n{item}" if count == 0 else f",\n{item}")
+                size += len(item) + 2
+                count += 1
+                if size >= _CHUNK_BYTES:
+                    yield "".join(buffer).encode()
+                    buffer.clear()
+                    size = 0
+            buffer.append("\n]" if count else "]")
+            counts[key] = count
+        buffer.append("\n}\n")
+        yield "".join(buffer).encode()
+
+    logger.info(
+        "JSON export streamed: %d accounts, %d transactions",
+        counts["accounts"],
+        counts["transactions"],
+    )
+
+
+async def gzip_stream(
+    chunks: AsyncIterator[bytes], level: int = 6
+) -> AsyncIterator[bytes]:
+    """Compress *chunks* into a gzip stream as they arrive."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,273 @@
+"""Streaming restore of a JSON export.
+
+The counterpart of :mod:`my_private_finances.services.json_export`: the
+document is parsed incrementally as it is read, one row at a time, so a
+multi-hundred-MB export never sits in memory as a whole. Rows are validated
+against their model's field types and inserted through ``executemany`` in
+batches of ``_BATCH_ROWS``, keeping their ``id`` so references between
+tables survive.
+
+Everything runs in the caller's transaction: existing data in the exported
+tables is deleted first, and the caller commits only if the whole document
+restored cleanly. Gzip-compressed documents (``/export/json?gzip=true``)
+are detected and decompressed on the fly.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import logging
+import zlib
+from collections.abc import AsyncIterator
+from typing import Any, cast
+
+from pydantic import BaseModel, Field, ValidationError, create_model
+from sqlalchemy import delete, insert, text
+from sqlalchemy.exc import DBAPIError, IntegrityError, StatementError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel
+
+from my_private_finances.models import ProcessedFile
+from my_private_finances.services.json_export import EXPORT_TABLES, EXPORT_VERSION
+from my_private_finances.services.payees import backfill_payee_ids
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany round trip
+_BATCH_ROWS = 2_000
+# A single JSON value (one row) larger than this is rejected
+_MAX_VALUE_CHARS = 16 * 1024 * 1024
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+_MODELS: dict[str, type[SQLModel]] = dict(EXPORT_TABLES)
+
+
+class RestoreError(ValueError):
+    """Raised when the uploaded document cannot be restored."""
+
+
+def _row_model(model: type[SQLModel]) -> type[BaseModel]:
+    # A plain pydantic model with the table's field types validates an
+    # order of magnitude faster than instantiating the table model itself
+    fields: dict[str, Any] = {}
+    for name, info in model.model_fields.items():
+        if info.default_factory is not None:
+            fields[name] = (
+                info.annotation,
+                Field(default_factory=info.default_factory),
+            )
+        else:
+            fields[name] = (
+                info.annotation,
+                ... if info.is_required() else info.default,
+            )
+    return create_model(f"{model.__name__}Row", **fields)
+
+
+_ROW_MODELS: dict[str, type[BaseModel]] = {
+    key: _row_model(model) for key, model in EXPORT_TABLES
+}
+
+
+async def gunzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Pass *chunks* through, decompressing them if they form a gzip stream."""
+    decompressor: Any = None
+    async for chunk in chunks:
+        if decompressor is None:
+            decompressor = (
+                zlib.decompressobj(16 + zlib.MAX_WBITS)
+                if chunk.startswith(_GZIP_MAGIC)
+                else False
+            )
+        if decompressor:
+            try:
+                chunk = decompressor.decompress(chunk)
+            except zlib.error as exc:
+                raise RestoreError(f"Invalid gzip data: {exc}") from exc
+        if chunk:
+            yield chunk
+    if decompressor:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+class _JsonReader:
+    """Pull parser for one JSON document arriving in byte chunks."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    async def _fill(self) -> bool:
+        if self._eof:
+            return False
+        try:
+            chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            self._eof = True
+            chunk = b""
+        try:
+            data = self._text.decode(chunk, final=self._eof)
+        except UnicodeDecodeError as exc:
+            raise RestoreError("Document is not valid UTF-8") from exc
+        # Drop what has been consumed so the buffer stays small
+        self._buf = self._buf[self._pos :] + data
+        self._pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """Return the next non-whitespace character ("" at the end)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not await self._fill():
+                return ""
+
+    async def expect(self, char: str) -> None:
+        found = await self.peek()
+        if found != char:
+            raise RestoreError(f"Invalid export document: expected {char!r}")
+        self._pos += 1
+
+    async def value(self) -> Any:
+        await self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                end = -1
+            # A number or literal at the very end may continue in the next chunk
+            if end != -1 and (end < len(self._buf) or self._eof):
+                self._pos = end
+                return obj
+            if len(self._buf) - self._pos > _MAX_VALUE_CHARS:
+                raise RestoreError("Invalid export document: value too large")
+            if not await self._fill():
+                raise RestoreError("Invalid export document: truncated or malformed")
+
+
+async def _iter_document(
+    reader: _JsonReader, header: dict[str, Any]
+) -> AsyncIterator[tuple[str, Any]]:
+    """Yield ``(table key, row)`` pairs; other top-level keys go to *header*."""
+    await reader.expect("{")
+    first = True
+    while await reader.peek() != "}":
+        if not first:
+            await reader.expect(",")
+        first = False
+        key = await reader.value()
+        if not isinstance(key, str):
+            raise RestoreError("Invalid export document: expected a key")
+        await reader.expect(":")
+        if key not in _MODELS:
+            header[key] = await reader.value()
+            continue
+        if key in header:
+            raise RestoreError(f"Table {key!r} appears twice")
+        header[key] = None
+        await reader.expect("[")
+        first_row = True
+        while await reader.peek() != "]":
+            if not first_row:
+                await reader.expect(",")
+            first_row = False
+            yield key, await reader.value()
+        await reader.expect("]")
+    await reader.expect("}")
+    if await reader.peek():
+        raise RestoreError("Invalid export document: data after the end")
+
+
+async def restore_json_export(
+    session: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    batch_rows: int = _BATCH_ROWS,
+) -> dict[str, int]:
+    """Replace the exported tables with the document streamed from *chunks*.
+
+    Returns the number of restored rows per table. Does not commit; raises
+    :class:`RestoreError` for anything that does not restore cleanly, after
+    which the caller must roll back.
+    """
+    # Ledger entries describe imports of the data being replaced
+    await session.execute(delete(ProcessedFile))
+    for _, model in reversed(EXPORT_TABLES):
+        await session.execute(delete(model))
+
+    header: dict[str, Any] = {}
+    counts = {key: 0 for key in _MODELS}
+    batch: list[dict[str, Any]] = []
+    batch_key: str | None = None
+
+    async def flush() -> None:
+        if batch and batch_key is not None:
+            table = cast(Any, _MODELS[batch_key]).__table__
+            await session.execute(insert(table), batch)
+            batch.clear()
+
+    reader = _JsonReader(gunzip_stream(chunks))
+    try:
+        async for key, row in _iter_document(reader, header):
+            if header.get("export_version") != EXPORT_VERSION:
+                raise RestoreError(
+                    f"Unsupported export_version {header.get('export_version')!r} "
+                    f"(expected {EXPORT_VERSION} before the first table)"
+                )
+            if key != batch_key:
+                await flush()
+                batch_key = key
+            try:
+                values = _ROW_MODELS[key].model_validate(row).__dict__
+            except ValidationError as exc:
+                raise RestoreError(
+                    f"Invalid row {counts[key] + 1} in {key!r}: {exc}"
+                ) from exc
+            if values.get("id") is None:
+                raise RestoreError(f"Row {counts[key] + 1} in {key!r} has no id")
+            batch.append(values)
+            counts[key] += 1
+            if len(batch) >= batch_rows:
+                await flush()
+        await flush()
+    except RestoreError:
+        raise
+    except IntegrityError as exc:
+        raise RestoreError(f"Conflicting rows in {batch_key!r}: {exc.orig}") from exc
+    except DBAPIError:
+        raise
+    except (ValueError, StatementError) as exc:
+        # Values the column types reject when binding (e.g. sub-cent amounts)
+        raise RestoreError(f"Invalid value in {batch_key!r}: {exc}") from exc
+
+    if header.get("export_version") != EXPORT_VERSION:
+        raise RestoreError("Missing or unsupported export_version")
+
+    # Documents exported before the payee dictionary carry no payee_id
+    await backfill_payee_ids(session)
+
+    if session.get_bind().dialect.name == "sqlite":
+        for key, model in EXPORT_TABLES:
+            name = cast(Any, model).__table__.name
+            result = await session.execute(text(f'PRAGMA foreign_key_check("{name}")'))
+            broken = result.first()
+            if broken is not None:
+                raise RestoreError(
+                    f"Row {broken[1]} in {key!r} references a missing {broken[2]!r} row"
+                )
+
+    logger.info(
+        "JSON restore: %d accounts, %d transactions",
+        counts["accounts"],
+        counts["transactions"],
+    )
+    return counts
@@ -1,19 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
 
-import joblib  # type: ignore[import-untyped]
-from sklearn.calibration import CalibratedClassifierCV  # type: ignore[import-untyped]
-from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore[import-untyped]
-from sklearn.pipeline import Pipeline  # type: ignore[import-untyped]
-from sklearn.svm import LinearSVC  # type: ignore[import-untyped]
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from my_private_finances.metrics import ML_DURATION
 from my_private_finances.models import Category, Transaction
 from my_private_finances.schemas.ml import Suggestion, TrainResult
 
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline  # type: ignore[import-untyped]
+
 logger = logging.getLogger(__name__)
 
 MIN_SAMPLES = 10
@@ -27,28 +28,19 @@ def _model_path() -> Path:
     return Path("data/ml_model.joblib")
 
 
-def _feature_text(tx: Transaction) -> str:
-    parts = [tx.payee or "", tx.purpose or ""]
-    return " ".join(parts).strip()
-
+def has_trained_model() -> bool:
+    return _model_path().exists()
 
-async def train(session: AsyncSession) -> TrainResult:
-    """Query categorized transactions, fit ML pipeline, persist to disk."""
-    result = await session.execute(
-        select(Transaction).where(Transaction.category_id.isnot(None))  # type: ignore[union-attr]
-    )
-    transactions = list(result.scalars().all())
-
-    if len(transactions) < MIN_SAMPLES:
-        raise ColdStartError(
-            f"Need at least {MIN_SAMPLES} categorized transactions to train "
-            f"(found {len(transactions)})"
-        )
 
-    texts = [_feature_text(tx) for tx in transactions]
-    labels = [tx.category_id for tx in transactions]
+def _build_pipeline() -> Pipeline:
+    # scikit-learn (with scipy, joblib and pandas behind it) takes seconds to
+    # import, so it is loaded on first training run instead of at startup.
+    from sklearn.calibration import CalibratedClassifierCV  # type: ignore[import-untyped]
+    from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore[import-untyped]
+    from sklearn.pipeline import Pipeline  # type: ignore[import-untyped]
+    from sklearn.svm import LinearSVC  # type: ignore[import-untyped]
 
-    pipeline: Pipeline = Pipeline(
+    return Pipeline(
         [
             (
                 "tfidf",
@@ -59,27 +51,74 @@ async def train(session: AsyncSession) -> TrainResult:
             ("clf", CalibratedClassifierCV(LinearSVC())),
         ]
     )
+
+
+def _feature_text(tx: Transaction) -> str:
+    return _text(tx.payee, tx.purpose)
+
+
+def _text(payee: str | None, purpose: str | None) -> str:
+    return " ".join([payee or "", purpose or ""]).strip()
+
+
+def _fit_and_save(texts: list[str], labels: list[int]) -> None:
+    import joblib  # type: ignore[import-untyped]
+
+    pipeline = _build_pipeline()
     pipeline.fit(texts, labels)
 
     model_path = _model_path()
     model_path.parent.mkdir(parents=True, exist_ok=True)
     joblib.dump(pipeline, model_path)
 
+
+@ML_DURATION.labels(operation="train").time()
+async def train(session: AsyncSession) -> TrainResult:
+    """Query categorized transactions, fit ML pipeline, persist to disk.
+
+    Only the query uses *session*, whose connection is released before
+    fitting. Fitting takes seconds on larger tables and runs in a worker
+    thread, so the event loop keeps serving requests.
+    """
+    tx = cast(Any, Transaction).__table__
+    result = await session.execute(
+        select(tx.c.payee, tx.c.purpose, tx.c.category_id).where(
+            tx.c.category_id.is_not(None)
+        )
+    )
+    rows = result.all()
+    # Hand the connection back to the pool; it may be the only writer one
+    await session.rollback()
+
+    if len(rows) < MIN_SAMPLES:
+        raise ColdStartError(
+            f"Need at least {MIN_SAMPLES} categorized transactions to train "
+            f"(found {len(rows)})"
+        )
+
+    texts = [_text(r.payee, r.purpose) for r in rows]
+    labels = [r.category_id for r in rows]
+
+    await asyncio.to_thread(_fit_and_save, texts, labels)
+
     num_categories = len(set(labels))
     logger.info(
         "ml_categorization.train: trained on %d samples, %d categories",
-        len(transactions),
+        len(rows),
         num_categories,
     )
-    return TrainResult(num_samples=len(transactions), num_categories=num_categories)
+    return TrainResult(num_samples=len(rows), num_categories=num_categories)
 
 
+@ML_DURATION.labels(operation="suggest").time()
 async def suggest(session: AsyncSession) -> list[Suggestion]:
     """Load trained model and return category suggestions for uncategorized transactions."""
     model_path = _model_path()
     if not model_path.exists():
         raise ColdStartError("No trained model found. Run /ml/train first.")
 
+    import joblib  # type: ignore[import-untyped]
+
     pipeline: Pipeline = joblib.load(model_path)
 
     # Load uncategorized transactions
@@ -0,0 +1,275 @@
+"""Fuzzy clustering of payees.
+
+Banks spell one merchant many ways: "NETFLIX.COM 1234", "Netflix
+International" and "PAYPAL *NETFLIX" are three payees in the dictionary
+but one subscription. This module assigns every payee a ``cluster_id``
+(the smallest payee id in its cluster) that recurring detection and the
+top-payee reports group on.
+
+Clustering runs in two steps, neither of which compares all pairs:
+
+1. Each normalized payee is reduced to a *key*: letters only, without
+   reference numbers, legal forms and payment-processor prefixes. Payees
+   with equal keys join the same cluster directly.
+2. Distinct keys are compared fuzzily through MinHash/LSH blocking. Every
+   key gets a MinHash signature over its character trigrams; signatures are
+   cut into ``_BANDS`` bands, and only keys that agree on a whole band land
+   in the same bucket. The exact trigram Jaccard similarity is computed only
+   within buckets, and pairs above ``CLUSTER_SIMILARITY`` are merged.
+
+Signatures are computed with numpy in blocks of keys, so tens of thousands
+of payees cluster in about a second. The whole run is recomputed from the
+dictionary each time (:func:`cluster_payees`); payees added since the last
+run have no ``cluster_id`` yet and count as clusters of their own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+import time
+import zlib
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any, cast
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.models import Payee
+
+logger = logging.getLogger(__name__)
+
+# Minimum trigram Jaccard similarity for two keys to be merged
+CLUSTER_SIMILARITY = float(os.environ.get("PAYEE_CLUSTER_SIMILARITY", 0.6))
+
+# 16 bands of 4 hashes: keys with similarity s share a bucket with
+# probability 1 - (1 - s^4)^16, i.e. ~0.9 at s = 0.6 and ~0.02 at s = 0.2
+_BANDS = 16
+_ROWS = 4
+_NUM_PERM = _BANDS * _ROWS
+_PRIME = (1 << 31) - 1
+# Keys per numpy block (bounds the temporary arrays to a few MB)
+_BLOCK_KEYS = 2_000
+# Buckets larger than this are checked against one member instead of pairwise
+_MAX_PAIRWISE_BUCKET = 32
+_UPDATE_ROWS = 2_000
+
+# Tokens that say nothing about the merchant
+_NOISE_TOKENS = frozenset(
+    {
+        # payment processors and wallets, as in "PAYPAL *NETFLIX"
+        "paypal",
+        "pp",
+        "klarna",
+        "sumup",
+        "zettle",
+        "sq",
+        "stripe",
+        "googlepay",
+        "applepay",
+        # legal forms
+        "ag",
+        "bv",
+        "co",
+        "corp",
+        "gmbh",
+        "inc",
+        "kg",
+        "llc",
+        "ltd",
+        "limited",
+        "nv",
+        "ohg",
+        "plc",
+        "sa",
+        "sarl",
+        "se",
+        "ug",
+        # domains and regions
+        "com",
+        "de",
+        "eu",
+        "europe",
+        "int",
+        "international",
+        "intl",
+        "net",
+        "org",
+        "www",
+        # bank boilerplate
+        "danke",
+        "sagt",
+        "lastschrift",
+        "sepa",
+    }
+)
+
+_TOKEN = re.compile(r"[^\W\d_]{2,}")
+
+
+@dataclass
+class ClusterResult:
+    payees: int
+    clusters: int
+    changed: int
+    seconds: float
+
+
+def payee_key(normalized: str) -> str:
+    """The part of a normalized payee name that identifies the merchant."""
+    tokens = _TOKEN.findall(normalized)
+    kept = [t for t in tokens if t not in _NOISE_TOKENS]
+    # A payee that is nothing but noise ("PayPal") stays itself
+    return " ".join(kept or tokens) or normalized
+
+
+def trigrams(key: str) -> set[int]:
+    """Hashed character trigrams of *key*, padded at both ends."""
+    padded = f" {key} "
+    return {
+        zlib.crc32(padded[i : i + 3].encode()) for i in range(max(len(padded) - 2, 1))
+    }
+
+
+def _signatures(shingles: Sequence[set[int]]) -> Any:
+    import numpy as np
+
+    rng = np.random.default_rng(0x5EED)
+    a = rng.integers(1, _PRIME, size=(_NUM_PERM, 1), dtype=np.int64)
+    b = rng.integers(0, _PRIME, size=(_NUM_PERM, 1), dtype=np.int64)
+    out = np.empty((len(shingles), _NUM_PERM), dtype=np.int64)
+    for start in range(0, len(shingles), _BLOCK_KEYS):
+        block = shingles[start : start + _BLOCK_KEYS]
+        sizes = np.fromiter((len(s) for s in block), dtype=np.int64, count=len(block))
+        hashes = np.fromiter(
+            (h for s in block for h in s), dtype=np.int64, count=int(sizes.sum())
+        )
+        # (a * h + b) mod p for every permutation and trigram; h < 2^32 and
+        # a < 2^31, so the product stays inside int64
+        permuted = (a * (hashes % _PRIME) + b) % _PRIME
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        out[start : start + len(block)] = np.minimum.reduceat(
+            permuted, offsets, axis=1
+        ).T
+    return out
+
+
+def _candidate_pairs(signatures: Any) -> Iterable[tuple[int, int]]:
+    """Pairs of key indexes that share at least one LSH bucket."""
+    for band in range(_BANDS):
+        buckets: dict[bytes, list[int]] = defaultdict(list)
+        rows = signatures[:, band * _ROWS : (band + 1) * _ROWS]
+        for idx, row in enumerate(rows):
+            buckets[row.tobytes()].append(idx)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) <= _MAX_PAIRWISE_BUCKET:
+                for i, first in enumerate(members):
+                    for second in members[i + 1 :]:
+                        yield first, second
+            else:
+                head = members[0]
+                for other in members[1:]:
+                    yield head, other
+
+
+class _UnionFind:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> None:
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+def compute_clusters(
+    payees: Sequence[tuple[int, str]],
+    similarity: float = CLUSTER_SIMILARITY,
+) -> dict[int, int]:
+    """Map each ``(payee id, normalized name)`` to its cluster's smallest id."""
+    if not payees:
+        return {}
+    by_key: dict[str, list[int]] = defaultdict(list)
+    for payee_id, normalized in payees:
+        by_key[payee_key(normalized)].append(payee_id)
+    keys = list(by_key)
+
+    uf = _UnionFind(len(keys))
+    if len(keys) > 1:
+        shingles = [trigrams(k) for k in keys]
+        seen: set[tuple[int, int]] = set()
+        for pair in _candidate_pairs(_signatures(shingles)):
+            if pair in seen:
+                continue
+            seen.add(pair)
+            x, y = shingles[pair[0]], shingles[pair[1]]
+            if len(x & y) >= similarity * len(x | y):
+                uf.union(*pair)
+
+    root_min: dict[int, int] = {}
+    for idx, key in enumerate(keys):
+        root = uf.find(idx)
+        smallest = min(by_key[key])
+        root_min[root] = min(root_min.get(root, smallest), smallest)
+    return {
+        payee_id: root_min[uf.find(idx)]
+        for idx, key in enumerate(keys)
+        for payee_id in by_key[key]
+    }
+
+
+async def cluster_payees(session: AsyncSession) -> ClusterResult:
+    """Recompute ``Payee.cluster_id`` for the whole dictionary and commit."""
+    started = time.perf_counter()
+    table = cast(Any, Payee).__table__
+    rows = (
+        await session.execute(
+            select(table.c.id, table.c.normalized, table.c.cluster_id)
+        )
+    ).all()
+    current = {r.id: r.cluster_id for r in rows}
+    clusters = await asyncio.to_thread(
+        compute_clusters, [(r.id, r.normalized) for r in rows]
+    )
+
+    changes = [
+        {"payee_id": payee_id, "new_cluster_id": cluster_id}
+        for payee_id, cluster_id in clusters.items()
+        if current[payee_id] != cluster_id
+    ]
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("payee_id"))
+        .values(cluster_id=bindparam("new_cluster_id"))
+    )
+    for i in range(0, len(changes), _UPDATE_ROWS):
+        await session.execute(stmt, changes[i : i + _UPDATE_ROWS])
+    await session.commit()
+
+    result = ClusterResult(
+        payees=len(rows),
+        clusters=len(set(clusters.values())),
+        changed=len(changes),
+        seconds=round(time.perf_counter() - started, 3),
+    )
+    logger.info(
+        "Payee clustering: %d payees in %d clusters, %d changed (%.2fs)",
+        result.payees,
+        result.clusters,
+        result.changed,
+        result.seconds,
+    )
+    return result
@@ -0,0 +1,139 @@
+"""Payee dictionary: normalization and interning of payee strings.
+
+Transactions keep the payee as the bank wrote it and point, through
+``payee_id``, at one :class:`~my_private_finances.models.Payee` row per
+normalized spelling ("REWE  Markt" and "rewe markt" share one). Recurring
+detection and the top-payee reports group on that integer and its index
+instead of running ``lower(trim(payee))`` over the whole table.
+
+:class:`PayeeInterner` resolves payee strings to ids for one import run:
+every distinct spelling costs at most one lookup, and payees not seen
+before are inserted in bulk. It is created per run rather than kept for the
+process, so no cached id can outlive a wipe or restore of the data.
+Transactions written one at a time through the ORM get their ``payee_id``
+from a mapper hook in :mod:`my_private_finances.models.payee` instead.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import Any, cast
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.models import Payee, Transaction
+from my_private_finances.models.payee import display_spelling, normalize_payee
+
+logger = logging.getLogger(__name__)
+
+# Names per IN (...) lookup, below SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+# Transactions per round trip when backfilling payee_id
+_BACKFILL_ROWS = 2_000
+
+
+class PayeeInterner:
+    """Maps payee strings to ``payee`` ids, creating missing entries."""
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+
+    async def ids(
+        self, session: AsyncSession, names: Iterable[str | None]
+    ) -> list[int | None]:
+        """Return the payee id for each of *names* (None for no payee)."""
+        names = list(names)
+        keys = [normalize_payee(name) for name in names]
+        missing: dict[str, str] = {}
+        for key, name in zip(keys, names):
+            if key is not None and key not in self._ids and key not in missing:
+                # The first spelling seen becomes the payee's name
+                missing[key] = display_spelling(cast(str, name))
+        if missing:
+            await self._load(session, missing)
+        return [None if key is None else self._ids[key] for key in keys]
+
+    async def _load(self, session: AsyncSession, missing: dict[str, str]) -> None:
+        table = cast(Any, Payee).__table__
+        await self._select(session, list(missing))
+        rows = [
+            {"name": name, "normalized": key}
+            for key, name in missing.items()
+            if key not in self._ids
+        ]
+        if not rows:
+            return
+        returning = (table.c.normalized, table.c.id)
+        if session.get_bind().dialect.name == "sqlite":
+            # A concurrent import may have added some of them meanwhile
+            stmt = (
+                sqlite_insert(table)
+                .on_conflict_do_nothing(index_elements=["normalized"])
+                .returning(*returning)
+            )
+        else:
+            stmt = insert(table).returning(*returning)
+        res = await session.execute(stmt, rows)
+        self._ids.update((r.normalized, r.id) for r in res)
+        await self._select(
+            session, [r["normalized"] for r in rows if r["normalized"] not in self._ids]
+        )
+        logger.debug("Added %d payees", len(rows))
+
+    async def _select(self, session: AsyncSession, keys: list[str]) -> None:
+        table = cast(Any, Payee).__table__
+        for i in range(0, len(keys), _LOOKUP_CHUNK):
+            res = await session.execute(
+                select(table.c.normalized, table.c.id).where(
+                    table.c.normalized.in_(keys[i : i + _LOOKUP_CHUNK])
+                )
+            )
+            self._ids.update((r.normalized, r.id) for r in res)
+
+
+async def backfill_payee_ids(session: AsyncSession) -> int:
+    """Set ``payee_id`` on transactions that have a payee but no id yet.
+
+    Covers rows written without the interner, e.g. restored from an export
+    made before the payee dictionary existed. Does not commit.
+    """
+    tx = cast(Any, Transaction).__table__
+    interner = PayeeInterner()
+    updated = 0
+    last_id = 0
+    while True:
+        rows = (
+            await session.execute(
+                select(tx.c.id, tx.c.payee)
+                .where(
+                    tx.c.payee.isnot(None)
+                    & tx.c.payee_id.is_(None)
+                    & (tx.c.id > last_id)
+                )
+                .order_by(tx.c.id)
+                .limit(_BACKFILL_ROWS)
+            )
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        payee_ids = await interner.ids(session, [r.payee for r in rows])
+        params = [
+            {"row_id": r.id, "new_payee_id": payee_id}
+            for r, payee_id in zip(rows, payee_ids)
+            if payee_id is not None
+        ]
+        if params:
+            await session.execute(
+                update(tx)
+                .where(tx.c.id == bindparam("row_id"))
+                .values(payee_id=bindparam("new_payee_id")),
+                params,
+            )
+            updated += len(params)
+    if updated:
+        logger.info("Backfilled payee_id on %d transactions", updated)
+    return updated
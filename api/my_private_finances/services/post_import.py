@@ -0,0 +1,254 @@
+"""Debounced post-import jobs.
+
+Imports only report "account X changed" to the scheduler. Once no new
+change for an account has arrived for ``POST_IMPORT_QUIET_SECONDS``
+(default 10 s), the scheduler runs, for all accounts that are due at once:
+
+* payee clustering (recurring detection groups by its clusters),
+* recurring-payment detection per account,
+* transfer detection (across accounts, so once per batch),
+* duplicate detection (the same payment imported twice),
+* categorization rules for still-uncategorized transactions,
+* retraining of the ML categorizer, if a model has been trained before
+  (on the read pool, outside the write queue; the model is fitted in a
+  worker thread).
+
+Dropping twelve monthly statements for one account therefore triggers one
+detection run instead of twelve. A steady stream of changes cannot delay
+an account by more than ``max_delay`` (six quiet periods by default).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import weakref
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from my_private_finances.db import write_queue
+from my_private_finances.schemas.post_import import (
+    PostImportPendingRead,
+    PostImportRunRead,
+    PostImportStatusRead,
+)
+from my_private_finances.services import ml_categorization
+from my_private_finances.services.categorization import apply_rules_to_uncategorized
+from my_private_finances.services.duplicate_detection import (
+    detect_duplicate_candidates,
+)
+from my_private_finances.services.payee_clustering import cluster_payees
+from my_private_finances.services.recurring_detection import run_detection
+from my_private_finances.services.transfer_detection import detect_transfer_candidates
+
+logger = logging.getLogger(__name__)
+
+POST_IMPORT_QUIET_SECONDS = float(os.environ.get("POST_IMPORT_QUIET_SECONDS", 10))
+
+
+@dataclass
+class _Pending:
+    first_event_at: datetime
+    first_event: float  # loop time
+    last_event: float  # loop time
+    events: int = 1
+
+
+class PostImportScheduler:
+    """Coalesces account-changed events and runs post-import jobs once."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        quiet_period: float = POST_IMPORT_QUIET_SECONDS,
+        max_delay: float | None = None,
+        read_session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay if max_delay is not None else 6 * quiet_period
+        self._session_factory = session_factory
+        # Jobs that only read (ML retraining) run here, off the writer pool
+        self.read_session_factory = read_session_factory or session_factory
+        self._pending: dict[int, _Pending] = {}
+        self._running: list[int] = []
+        self._task: asyncio.Task[None] | None = None
+        self.last_run: PostImportRunRead | None = None
+
+    def _due(self, pending: _Pending) -> float:
+        return min(
+            pending.last_event + self.quiet_period,
+            pending.first_event + self.max_delay,
+        )
+
+    def notify(self, account_id: int) -> None:
+        """Record that *account_id* received new transactions."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        pending = self._pending.get(account_id)
+        if pending is None:
+            self._pending[account_id] = _Pending(
+                first_event_at=datetime.now(timezone.utc),
+                first_event=now,
+                last_event=now,
+            )
+        else:
+            pending.last_event = now
+            pending.events += 1
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._loop())
+
+    def status(self) -> PostImportStatusRead:
+        now = asyncio.get_running_loop().time()
+        return PostImportStatusRead(
+            quiet_period_seconds=self.quiet_period,
+            pending=[
+                PostImportPendingRead(
+                    account_id=account_id,
+                    events=p.events,
+                    first_event_at=p.first_event_at,
+                    due_in_seconds=round(max(self._due(p) - now, 0.0), 3),
+                )
+                for account_id, p in sorted(self._pending.items())
+            ],
+            running=list(self._running),
+            last_run=self.last_run,
+        )
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            now = loop.time()
+            due = [a for a, p in self._pending.items() if self._due(p) <= now]
+            if not due:
+                # Deadlines only move later, so sleeping to the earliest is safe
+                await asyncio.sleep(
+                    min(self._due(p) for p in self._pending.values()) - now
+                )
+                continue
+            for account_id in due:
+                del self._pending[account_id]
+            await self.run_now(sorted(due))
+
+    async def run_now(self, account_ids: list[int]) -> PostImportRunRead:
+        """Run the post-import jobs for *account_ids* immediately."""
+        started_at = datetime.now(timezone.utc)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self._running = account_ids
+        failed: list[str] = []
+        try:
+            jobs: list[tuple[str, Callable[[AsyncSession], Awaitable[Any]]]] = [
+                ("payees", cluster_payees)
+            ]
+            jobs += [
+                (f"recurring:{a}", functools.partial(run_detection, account_id=a))
+                for a in account_ids
+            ]
+            jobs += [
+                ("transfers", _detect_transfers),
+                ("duplicates", _detect_duplicates),
+                ("rules", apply_rules_to_uncategorized),
+            ]
+            for name, job in jobs:
+                if not await self._job(name, job):
+                    failed.append(name)
+            # Retraining only reads; it must not hold the write queue while
+            # the model is fitted
+            if not await self._job("ml", _retrain_if_trained, write=False):
+                failed.append("ml")
+        finally:
+            self._running = []
+        run = PostImportRunRead(
+            account_ids=account_ids,
+            started_at=started_at,
+            duration_seconds=round(loop.time() - start, 3),
+            failed_jobs=failed,
+        )
+        self.last_run = run
+        logger.info(
+            "Post-import jobs for accounts %s done in %.2fs (failed: %s)",
+            account_ids,
+            run.duration_seconds,
+            ", ".join(failed) or "none",
+        )
+        return run
+
+    async def _job(
+        self,
+        name: str,
+        job: Callable[[AsyncSession], Awaitable[Any]],
+        write: bool = True,
+    ) -> bool:
+        # One write-queue turn per job, so imports can slip in between
+        try:
+            if write:
+                async with write_queue(self._session_factory).session() as session:
+                    await job(session)
+            else:
+                async with self.read_session_factory() as session:
+                    await job(session)
+            return True
+        except Exception:
+            logger.warning("Post-import job %s failed", name, exc_info=True)
+            return False
+
+    async def shutdown(self, flush: bool = True) -> None:
+        """Stop the scheduler, running still-pending jobs first if *flush*."""
+        interrupted = list(self._running)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        account_ids = sorted(set(self._pending) | set(interrupted))
+        if flush and account_ids:
+            self._pending.clear()
+            await self.run_now(account_ids)
+        self._pending.clear()
+
+
+async def _detect_transfers(session: AsyncSession) -> None:
+    await detect_transfer_candidates(session)
+    await session.commit()
+
+
+async def _detect_duplicates(session: AsyncSession) -> None:
+    await detect_duplicate_candidates(session)
+    await session.commit()
+
+
+async def _retrain_if_trained(session: AsyncSession) -> None:
+    # Suggestions come from the saved model; keep it current once a user
+    # has opted in by training it, but never cold-start it here. Fitting
+    # runs in a worker thread (see ml_categorization.train).
+    if ml_categorization.has_trained_model():
+        await ml_categorization.train(session)
+
+
+_schedulers: weakref.WeakKeyDictionary[
+    async_sessionmaker[AsyncSession], PostImportScheduler
+] = weakref.WeakKeyDictionary()
+
+
+def post_import_scheduler(
+    session_factory: async_sessionmaker[AsyncSession],
+    read_session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> PostImportScheduler:
+    """Return the (shared) post-import scheduler for *session_factory*.
+
+    A *read_session_factory*, if given, replaces the one for read-only jobs.
+    """
+    scheduler = _schedulers.get(session_factory)
+    if scheduler is None:
+        scheduler = _schedulers[session_factory] = PostImportScheduler(session_factory)
+    if read_session_factory is not None:
+        scheduler.read_session_factory = read_session_factory
+    return scheduler
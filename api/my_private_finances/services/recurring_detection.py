@@ -11,7 +11,9 @@ from typing import Any, cast
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from my_private_finances.models import RecurringPattern, Transaction
+from my_private_finances.metrics import DETECTION_DURATION
+from my_private_finances.models import Payee, RecurringPattern, Transaction
+from my_private_finances.models.payee import normalize_payee
 
 logger = logging.getLogger(__name__)
 
@@ -149,22 +151,24 @@ async def fetch_transaction_groups(
     session: AsyncSession,
     account_id: int,
 ) -> dict[str, list[tuple[date, Decimal, int | None]]]:
-    """Fetch and group expense transactions by normalized payee."""
+    """Fetch and group expense transactions by payee cluster."""
     tx = cast(Any, Transaction).__table__
+    payee = cast(Any, Payee).__table__
+    cluster = payee.alias("cluster")
 
+    # Grouped on the integer payee_id (ix_tx_account_payee_date) and merged
+    # per payee cluster, keyed by the cluster's first payee
     stmt = (
         select(
-            func.lower(func.trim(tx.c.payee)).label("norm_payee"),
+            cluster.c.normalized.label("norm_payee"),
             tx.c.booking_date,
             tx.c.amount,
             tx.c.category_id,
         )
-        .where(
-            (tx.c.account_id == account_id)
-            & (tx.c.amount < 0)
-            & (tx.c.payee.isnot(None))
-        )
-        .order_by(tx.c.payee, tx.c.booking_date)
+        .join(payee, payee.c.id == tx.c.payee_id)
+        .join(cluster, cluster.c.id == func.coalesce(payee.c.cluster_id, payee.c.id))
+        .where((tx.c.account_id == account_id) & (tx.c.amount < 0))
+        .order_by(tx.c.payee_id, tx.c.booking_date)
     )
 
     rows = (await session.execute(stmt)).all()
@@ -172,12 +176,13 @@ async def fetch_transaction_groups(
     groups: dict[str, list[tuple[date, Decimal, int | None]]] = {}
     for r in rows:
         payee = str(r.norm_payee)
-        entry = (r.booking_date, Decimal(str(r.amount)), r.category_id)
+        entry = (r.booking_date, r.amount, r.category_id)
         groups.setdefault(payee, []).append(entry)
 
     return groups
 
 
+@DETECTION_DURATION.labels(kind="recurring").time()
 async def run_detection(
     session: AsyncSession,
     account_id: int,
@@ -206,7 +211,7 @@ async def run_detection(
     )
     existing_rows = (await session.execute(existing_stmt)).scalars().all()
     existing_map: dict[tuple[str, str], RecurringPattern] = {
-        (p.payee.lower().strip(), p.frequency): p for p in existing_rows
+        (normalize_payee(p.payee) or "", p.frequency): p for p in existing_rows
     }
 
     # Track which patterns we've seen in this run
@@ -0,0 +1,173 @@
+"""Safe replacement of the live SQLite file with an uploaded backup.
+
+The upload is written to a sibling of the live file and checked there
+(``PRAGMA integrity_check`` and the Alembic schema revision) before anything
+touches the live database, so a corrupt or mismatched backup is rejected
+with the old data intact.
+
+The swap itself waits for queued writes, then closes the database gate
+(:class:`~my_private_finances.db.DatabaseGate`): new sessions wait, open
+ones finish on the old file. Once none are left, both pools are emptied,
+the old WAL is checkpointed away and the sibling is renamed over the live
+file in one ``os.replace``. Requests held at the gate then open the
+restored database. A SQLite database must never be renamed while a
+connection has it open (its ``-wal`` and ``-shm`` files are found by name),
+which is why the swap drains every session first instead of swapping under
+running ones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import secrets
+import sqlite3
+from collections.abc import AsyncIterator, Iterable
+from functools import lru_cache
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from my_private_finances.db import database_gate, write_queue
+from my_private_finances.services.json_restore import RestoreError
+
+logger = logging.getLogger(__name__)
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+
+# How long a restore waits for open sessions before giving up
+RESTORE_DRAIN_TIMEOUT_SECONDS = float(
+    os.environ.get("RESTORE_DRAIN_TIMEOUT_SECONDS", 30)
+)
+
+_ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+_SIDE_FILES = ("-wal", "-shm", "-journal")
+
+
+def staging_path(db_path: Path) -> Path:
+    """A fresh sibling of *db_path* to restore into (same directory, same fs)."""
+    return db_path.with_name(f".{db_path.name}.restore-{secrets.token_hex(4)}")
+
+
+def discard(path: Path) -> None:
+    for suffix in ("", *_SIDE_FILES):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+
+async def write_upload(chunks: AsyncIterator[bytes], dest: Path, max_bytes: int) -> int:
+    """Write *chunks* to *dest*, checking the SQLite header and the size."""
+    size = 0
+    with dest.open("wb") as f:
+        async for chunk in chunks:
+            if size == 0 and not chunk.startswith(SQLITE_MAGIC[: len(chunk)]):
+                raise RestoreError("Not a valid SQLite file")
+            size += len(chunk)
+            if size > max_bytes:
+                raise RestoreError(f"File too large (max {max_bytes // 2**20} MB)")
+            await asyncio.to_thread(f.write, chunk)
+        if size < len(SQLITE_MAGIC):
+            raise RestoreError("Not a valid SQLite file")
+        f.flush()
+        os.fsync(f.fileno())
+    return size
+
+
+@lru_cache(maxsize=1)
+def alembic_head() -> str | None:
+    """The newest migration, or None when the scripts are not shipped."""
+    if not _ALEMBIC_DIR.is_dir():
+        return None
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory(str(_ALEMBIC_DIR)).get_current_head()
+
+
+def _revision(conn: sqlite3.Connection) -> str | None:
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'alembic_version'"
+    ).fetchone()
+    if not has_table:
+        return None
+    row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+    return row[0] if row else None
+
+
+def _live_revision(db_path: Path) -> str | None:
+    if not db_path.exists():
+        return None
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return _revision(conn)
+    finally:
+        conn.close()
+
+
+def verify_backup(staged: Path, db_path: Path) -> None:
+    """Check the database at *staged* before it may replace *db_path*."""
+    conn = sqlite3.connect(str(staged))
+    try:
+        try:
+            problems = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+            revision = _revision(conn)
+        except sqlite3.DatabaseError as exc:
+            raise RestoreError(f"Not a usable SQLite database: {exc}") from exc
+    finally:
+        conn.close()
+    if problems != ["ok"]:
+        raise RestoreError("Integrity check failed: " + "; ".join(problems[:5]))
+
+    expected = alembic_head() or _live_revision(db_path)
+    # Databases created without Alembic (tests, scratch setups) carry no
+    # revision on either side and are accepted as they are
+    if revision != expected and not (
+        revision is None and _live_revision(db_path) is None
+    ):
+        raise RestoreError(
+            f"Backup is at schema revision {revision or 'none'}, this version "
+            f"expects {expected}; migrate it with 'alembic upgrade head' first"
+        )
+
+
+def _swap_files(staged: Path, db_path: Path) -> None:
+    if db_path.exists():
+        # Fold the WAL into the old file (kept intact should the rename
+        # fail) so no frame of it can be replayed onto the new one
+        conn = sqlite3.connect(str(db_path))
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+    for suffix in _SIDE_FILES:
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    os.replace(staged, db_path)
+    dir_fd = os.open(db_path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+async def swap_database(
+    staged: Path,
+    db_path: Path,
+    session_factory: async_sessionmaker[AsyncSession],
+    engines: Iterable[AsyncEngine],
+    drain_timeout: float | None = None,
+) -> None:
+    """Atomically replace *db_path* with the verified database at *staged*.
+
+    Raises :class:`TimeoutError` if open sessions do not finish within
+    *drain_timeout* (default ``RESTORE_DRAIN_TIMEOUT_SECONDS``); the live
+    database is then left untouched.
+    """
+    if drain_timeout is None:
+        drain_timeout = RESTORE_DRAIN_TIMEOUT_SECONDS
+    async with write_queue(session_factory).exclusive():
+        async with database_gate(db_path).closed(drain_timeout):
+            # Every session is closed, so the pools only hold idle connections
+            for engine in engines:
+                await engine.dispose()
+            await asyncio.to_thread(_swap_files, staged, db_path)
+    logger.info("Database file swapped: %s", db_path)
@@ -0,0 +1,189 @@
+"""Batch creation of transactions from non-CSV sources.
+
+All items are validated against the database with one query per referenced
+table, hashed, run through the categorization rules and written with a
+single multi-row INSERT that skips rows colliding with
+``uq_tx_account_import_hash`` or with the hash of a merged duplicate. The
+whole batch is committed once.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, cast
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.models import (
+    Account,
+    Category,
+    MergedTransaction,
+    Transaction,
+)
+from my_private_finances.schemas.transaction_batch import BatchItemResult
+from my_private_finances.schemas.transaction_create import TransactionCreate
+from my_private_finances.services.categorization import (
+    load_rules_ordered,
+    match_transaction,
+)
+from my_private_finances.services.payees import PayeeInterner
+from my_private_finances.services.transaction_hash import compute_import_hash, HashInput
+
+logger = logging.getLogger(__name__)
+
+
+async def _existing_ids(session: AsyncSession, model: Any, ids: set[int]) -> set[int]:
+    if not ids:
+        return set()
+    table = cast(Any, model).__table__
+    res = await session.execute(select(table.c.id).where(table.c.id.in_(ids)))
+    return set(res.scalars().all())
+
+
+async def _known_keys(
+    session: AsyncSession, model: Any, rows: list[dict[str, Any]]
+) -> set[tuple[int, str]]:
+    """``(account_id, import_hash)`` pairs of *rows* already present in *model*."""
+    table = cast(Any, model).__table__
+    account_ids = {r["account_id"] for r in rows}
+    hashes = {r["import_hash"] for r in rows}
+    res = await session.execute(
+        select(table.c.account_id, table.c.import_hash).where(
+            table.c.account_id.in_(account_ids) & table.c.import_hash.in_(hashes)
+        )
+    )
+    return {(r.account_id, r.import_hash) for r in res}
+
+
+async def _insert_ignoring_duplicates(
+    session: AsyncSession, rows: list[dict[str, Any]]
+) -> dict[tuple[int, str], int]:
+    """Insert *rows*, skipping import-hash collisions.
+
+    Hashes of rows deleted by a duplicate merge collide like stored ones.
+    Returns ``(account_id, import_hash) -> id`` for the rows actually inserted.
+    """
+    tx = cast(Any, Transaction).__table__
+    returning = (tx.c.id, tx.c.account_id, tx.c.import_hash)
+
+    merged = await _known_keys(session, MergedTransaction, rows)
+    rows = [r for r in rows if (r["account_id"], r["import_hash"]) not in merged]
+    if not rows:
+        return {}
+
+    if session.get_bind().dialect.name == "sqlite":
+        stmt = (
+            sqlite_insert(tx)
+            .on_conflict_do_nothing(index_elements=["account_id", "import_hash"])
+            .returning(*returning)
+        )
+    else:
+        # No portable ON CONFLICT: drop known hashes up front instead
+        known = await _known_keys(session, Transaction, rows)
+        rows = [r for r in rows if (r["account_id"], r["import_hash"]) not in known]
+        if not rows:
+            return {}
+        stmt = insert(tx).returning(*returning)
+
+    res = await session.execute(stmt, rows)
+    return {(r.account_id, r.import_hash): r.id for r in res}
+
+
+async def create_transactions_batch(
+    session: AsyncSession,
+    items: list[TransactionCreate],
+) -> list[BatchItemResult]:
+    """Create *items* in one transaction and return a result per item, in order."""
+    valid_accounts = await _existing_ids(
+        session, Account, {item.account_id for item in items}
+    )
+    valid_categories = await _existing_ids(
+        session,
+        Category,
+        {item.category_id for item in items if item.category_id is not None},
+    )
+    rules = await load_rules_ordered(session)
+
+    results: list[BatchItemResult | None] = [None] * len(items)
+    keys: list[tuple[int, str] | None] = [None] * len(items)
+    rows: list[dict[str, Any]] = []
+    seen: set[tuple[int, str]] = set()
+
+    for idx, item in enumerate(items):
+        if item.account_id not in valid_accounts:
+            results[idx] = BatchItemResult(
+                index=idx, status="error", detail="Account not found"
+            )
+            continue
+        if item.category_id is not None and item.category_id not in valid_categories:
+            results[idx] = BatchItemResult(
+                index=idx, status="error", detail="Category not found"
+            )
+            continue
+
+        import_hash = compute_import_hash(
+            HashInput(
+                account_id=item.account_id,
+                booking_date=item.booking_date,
+                amount=item.amount,
+                currency=item.currency,
+                payee=item.payee,
+                purpose=item.purpose,
+                external_id=item.external_id,
+                import_source=item.import_source,
+            )
+        )
+        key = (item.account_id, import_hash)
+        keys[idx] = key
+        if key in seen:
+            # Same transaction twice in one batch: the first occurrence wins
+            continue
+        seen.add(key)
+
+        db_obj = Transaction(
+            account_id=item.account_id,
+            booking_date=item.booking_date,
+            amount=item.amount,
+            currency=item.currency,
+            payee=item.payee,
+            purpose=item.purpose,
+            notes=item.notes,
+            category_id=item.category_id,
+            external_id=item.external_id,
+            import_source=item.import_source,
+            import_hash=import_hash,
+        )
+        if db_obj.category_id is None and rules:
+            db_obj.category_id = match_transaction(db_obj, rules)
+
+        rows.append(db_obj.model_dump(exclude={"id"}))
+
+    payee_ids = await PayeeInterner().ids(session, [r["payee"] for r in rows])
+    for row, payee_id in zip(rows, payee_ids):
+        row["payee_id"] = payee_id
+
+    inserted = await _insert_ignoring_duplicates(session, rows) if rows else {}
+    await session.commit()
+
+    claimed: set[tuple[int, str]] = set()
+    for idx, row_key in enumerate(keys):
+        if row_key is None:
+            continue
+        new_id = inserted.get(row_key)
+        if new_id is not None and row_key not in claimed:
+            claimed.add(row_key)
+            results[idx] = BatchItemResult(index=idx, status="created", id=new_id)
+        else:
+            results[idx] = BatchItemResult(index=idx, status="duplicate")
+
+    final = [r for r in results if r is not None]
+    logger.info(
+        "Batch create: %d items, created=%d, duplicates=%d, failed=%d",
+        len(items),
+        sum(1 for r in final if r.status == "created"),
+        sum(1 for r in final if r.status == "duplicate"),
+        sum(1 for r in final if r.status == "error"),
+    )
+    return final
@@ -0,0 +1,75 @@
+"""Free-text transaction search.
+
+On SQLite the query goes through the ``transaction_fts`` FTS5 index: every
+word in the search string becomes a prefix token and all tokens must match
+(in payee, purpose or notes). Other databases fall back to a case-insensitive
+substring match.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from sqlalchemy import Select, Subquery, column, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.models import Transaction
+from my_private_finances.models.transaction_fts import FTS_TABLE
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+
+def build_match_expression(q: str) -> str | None:
+    """Turn user input into an FTS5 query of AND-ed prefix tokens.
+
+    Each token is quoted so FTS5 operators and punctuation in the input are
+    treated as plain text. Returns None if *q* contains no word characters.
+    """
+    tokens = _TOKEN_RE.findall(q)
+    if not tokens:
+        return None
+    return " AND ".join(f'"{token}"*' for token in tokens)
+
+
+def uses_fts(session: AsyncSession) -> bool:
+    return session.get_bind().dialect.name == "sqlite"
+
+
+def fts_matches(match_expr: str) -> Select[Any]:
+    """Select ``(rowid, rank)`` of all transactions matching *match_expr*."""
+    return select(_fts.c.rowid, _fts.c.rank).where(
+        text(f"{FTS_TABLE} MATCH :match_expr").bindparams(match_expr=match_expr)
+    )
+
+
+def _like_filter(q: str) -> Any:
+    pattern = f"%{q}%"
+    return or_(
+        Transaction.payee.ilike(pattern),  # type: ignore[union-attr]
+        Transaction.purpose.ilike(pattern),  # type: ignore[union-attr]
+        Transaction.notes.ilike(pattern),  # type: ignore[union-attr]
+    )
+
+
+def search_filter(session: AsyncSession, q: str) -> Any:
+    """Return a WHERE clause restricting transactions to those matching *q*."""
+    match_expr = build_match_expression(q) if uses_fts(session) else None
+    if match_expr is None:
+        return _like_filter(q)
+    sub = fts_matches(match_expr).subquery()
+    return Transaction.id.in_(select(sub.c.rowid))  # type: ignore[union-attr]
+
+
+def ranked_matches(session: AsyncSession, q: str) -> Subquery | None:
+    """Return a ``(rowid, rank)`` subquery to join for relevance ordering.
+
+    Lower ``rank`` (FTS5 bm25) means a better match. Returns None when the
+    database has no FTS index or *q* has no searchable tokens.
+    """
+    match_expr = build_match_expression(q) if uses_fts(session) else None
+    if match_expr is None:
+        return None
+    return fts_matches(match_expr).subquery()
@@ -15,15 +15,17 @@ from datetime import timedelta
 from decimal import Decimal
 from typing import Any, cast
 
-from sqlalchemy import select
+from sqlalchemy import BigInteger, select, type_coerce
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from my_private_finances.metrics import DETECTION_DURATION
 from my_private_finances.models import Account, Transaction
 from my_private_finances.models.transfer_candidate import TransferCandidate
 
 logger = logging.getLogger(__name__)
 
 
+@DETECTION_DURATION.labels(kind="transfer").time()
 async def detect_transfer_candidates(
     session: AsyncSession,
     window_days: int = 3,
@@ -42,7 +44,8 @@ async def detect_transfer_candidates(
             tx.c.id,
             tx.c.account_id,
             tx.c.booking_date,
-            tx.c.amount,
+            # Raw integer cents: matching compares ints, not Decimals
+            type_coerce(tx.c.amount, BigInteger).label("amount_minor"),
             tx.c.payee,
         )
         .select_from(tx.join(acc, tx.c.account_id == acc.c.id))
@@ -55,9 +58,12 @@ async def detect_transfer_candidates(
         len(rows),
     )
 
-    # Split into negative (outgoing) and positive (incoming) buckets
-    outgoing = [r for r in rows if r.amount < 0]
-    incoming = [r for r in rows if r.amount > 0]
+    # Outgoing legs, and incoming legs bucketed by amount (in date order)
+    outgoing = [r for r in rows if r.amount_minor < 0]
+    incoming_by_amount: dict[int, list[Any]] = {}
+    for r in rows:
+        if r.amount_minor > 0:
+            incoming_by_amount.setdefault(r.amount_minor, []).append(r)
 
     # Load already-tracked pairs to avoid duplicates
     tc = cast(Any, TransferCandidate).__table__
@@ -71,18 +77,12 @@ async def detect_transfer_candidates(
     window = timedelta(days=window_days)
 
     for out_tx in outgoing:
-        out_abs = abs(Decimal(str(out_tx.amount)))
-
-        for in_tx in incoming:
+        # Amount must match exactly
+        for in_tx in incoming_by_amount.get(-out_tx.amount_minor, ()):
             # Must be different accounts
             if out_tx.account_id == in_tx.account_id:
                 continue
 
-            # Amount must match exactly
-            in_abs = Decimal(str(in_tx.amount))
-            if out_abs != in_abs:
-                continue
-
             # Date must be within window
             date_diff = abs(out_tx.booking_date - in_tx.booking_date)
             if date_diff > window:
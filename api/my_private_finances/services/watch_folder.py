@@ -2,45 +2,122 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import date
+import os
+import time
+from collections import deque
+from datetime import date, datetime, timezone
 from pathlib import Path
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from watchdog.events import FileCreatedEvent, FileSystemEventHandler  # type: ignore[import-untyped]
-from watchdog.observers import Observer  # type: ignore[import-untyped]
 
+from my_private_finances.db import write_queue
+from my_private_finances.metrics import (
+    WATCH_FILE_DURATION,
+    WATCH_IN_FLIGHT,
+    WATCH_QUEUE_DEPTH,
+)
 from my_private_finances.models import CsvProfile
 from my_private_finances.models.watch_folder_config import WatchFolderConfig
-from my_private_finances.services.csv_import import import_transactions_from_csv_path
-from my_private_finances.services.recurring_detection import run_detection
+from my_private_finances.schemas.watch_folder import (
+    WatchInFlightFile,
+    WatchStatusRead,
+)
+from my_private_finances.services.categorization import load_rules_ordered
+from my_private_finances.services.csv_import import (
+    parse_csv_file,
+    record_import_metrics,
+    store_parsed_csv,
+)
+from my_private_finances.services.file_ledger import (
+    appended_from,
+    fingerprint_file,
+    is_duplicate,
+    load_ledger,
+    record_file,
+)
+from my_private_finances.services.post_import import post_import_scheduler
 
 logger = logging.getLogger(__name__)
 
+# Readiness polling: a file is imported once its size and mtime have stayed
+# unchanged for WATCH_SETTLE_QUIET_SECONDS and at least _SETTLE_CHECKS
+# consecutive polls. The interval doubles while the file keeps changing, and
+# a file that never settles is left for a later event.
+WATCH_SETTLE_QUIET_SECONDS = float(os.environ.get("WATCH_SETTLE_QUIET_SECONDS", 2))
+_SETTLE_CHECKS = 2
+_SETTLE_INITIAL_DELAY = 0.25
+_SETTLE_MAX_DELAY = 5.0
+_SETTLE_TIMEOUT = 600.0
 
-class _QueueHandler(FileSystemEventHandler):
-    """Watchdog event handler that forwards file-creation events to an asyncio queue."""
+# Files queued or in flight at once; the observer and the startup scan wait
+# for room beyond this.
+_MAX_BACKLOG = 1000
 
-    def __init__(
-        self, queue: asyncio.Queue[Path], loop: asyncio.AbstractEventLoop
-    ) -> None:
-        super().__init__()
-        self._queue = queue
-        self._loop = loop
 
-    def on_created(self, event: FileCreatedEvent) -> None:  # type: ignore[override]
-        if event.is_directory:
-            return
-        path = Path(str(event.src_path))
-        if path.suffix.lower() == ".csv":
-            asyncio.run_coroutine_threadsafe(self._queue.put(path), self._loop)
+def _file_state(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+async def wait_until_stable(
+    path: Path,
+    *,
+    initial_delay: float = _SETTLE_INITIAL_DELAY,
+    max_delay: float = _SETTLE_MAX_DELAY,
+    quiet_period: float = WATCH_SETTLE_QUIET_SECONDS,
+    timeout: float = _SETTLE_TIMEOUT,
+) -> bool:
+    """Wait until *path* has stopped changing.
+
+    The file counts as stable once it looked the same in ``_SETTLE_CHECKS``
+    consecutive polls spanning at least *quiet_period* seconds, so a writer
+    pausing for a single interval is not mistaken for a finished one.
+
+    Returns False if the file disappeared or was still changing after
+    *timeout* seconds.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    try:
+        previous = _file_state(path)
+    except FileNotFoundError:
+        return False
+    quiet_since = time.monotonic()
+    unchanged = 0
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            current = _file_state(path)
+        except FileNotFoundError:
+            return False
+        now = time.monotonic()
+        if current == previous:
+            unchanged += 1
+            if unchanged >= _SETTLE_CHECKS and now - quiet_since >= quiet_period:
+                return True
+        else:
+            previous = current
+            quiet_since = now
+            unchanged = 0
+            delay = min(delay * 2, max_delay)
+        if now >= deadline:
+            return False
 
 
 async def _process_file(
     path: Path,
     session_factory: async_sessionmaker[AsyncSession],
-) -> None:
-    """Import a single watched file into the database."""
+) -> str:
+    """Import a single watched file into the database.
+
+    Files already in the processed-file ledger are moved to ``processed``
+    without parsing; files extending an earlier export only have their new
+    tail imported.
+
+    Returns the outcome: ``"processed"``, ``"duplicate"``, ``"failed"`` or
+    ``"rejected"``.
+    """
     subfolder_name = path.parent.name
     watch_root = path.parent.parent  # e.g. data/watch
     data_root = watch_root.parent
@@ -52,9 +129,10 @@ async def _process_file(
         path.resolve().relative_to(data_root.resolve())
     except ValueError:
         logger.error("Rejected file outside watch root: %s", path)
-        return
+        return "rejected"
 
-    async with session_factory() as session:
+    queue = write_queue(session_factory)
+    async with queue.session() as session:
         db_result = await session.execute(
             select(WatchFolderConfig).where(
                 WatchFolderConfig.subfolder_name == subfolder_name  # type: ignore[arg-type]
@@ -66,50 +144,100 @@ async def _process_file(
             msg = f"No watch folder config for subfolder '{subfolder_name}'"
             logger.warning(msg)
             _move_to_failed(path, failed_dir, msg)
-            return
+            return "failed"
+
+        account_id = config.account_id
+        profile_id = config.profile_id
+        try:
+            ledger = await load_ledger(
+                session,
+                account_id=account_id,
+                profile_id=profile_id,
+                max_size=path.stat().st_size,
+            )
+        except Exception as exc:
+            logger.error("Watch import failed for %s: %s", path.name, exc)
+            _move_to_failed(path, failed_dir, str(exc))
+            return "failed"
+        profile = None
+        if profile_id is not None:
+            profile = await session.get(CsvProfile, profile_id)
+
+    # Hash outside the write queue so other accounts' imports keep going
+    try:
+        fingerprint = await asyncio.to_thread(fingerprint_file, path, list(ledger))
+    except OSError as exc:
+        logger.error("Watch import failed for %s: %s", path.name, exc)
+        _move_to_failed(path, failed_dir, str(exc))
+        return "failed"
 
+    if is_duplicate(fingerprint, ledger):
+        _move_to_processed(path, processed_dir)
+        logger.info("Watch import: %s already imported, skipped", path.name)
+        return "duplicate"
+    start_offset = appended_from(fingerprint, ledger)
+
+    kwargs: dict[str, object] = {}
+    if profile is not None:
+        kwargs["delimiter"] = profile.delimiter
+        kwargs["date_format"] = profile.date_format
+        kwargs["decimal_comma"] = profile.decimal_comma
+        if profile.column_map:
+            kwargs["column_map"] = profile.column_map
+    if start_offset:
+        kwargs["start_offset"] = start_offset
+
+    # Parse outside the write queue too; only storing the rows needs it
+    started = time.perf_counter()
+    try:
+        parsed = await asyncio.to_thread(
+            parse_csv_file,
+            path,
+            account_id=account_id,
+            **kwargs,  # type: ignore[arg-type]
+        )
+    except Exception as exc:
+        logger.error("Watch import failed for %s: %s", path.name, exc, exc_info=True)
+        _move_to_failed(path, failed_dir, str(exc))
+        return "failed"
+
+    async with queue.session() as session:
         try:
-            profile = None
-            if config.profile_id is not None:
-                profile = await session.get(CsvProfile, config.profile_id)
-
-            kwargs: dict[str, object] = {}
-            if profile is not None:
-                kwargs["delimiter"] = profile.delimiter
-                kwargs["date_format"] = profile.date_format
-                kwargs["decimal_comma"] = profile.decimal_comma
-                if profile.column_map:
-                    kwargs["column_map"] = profile.column_map
-
-            import_result = await import_transactions_from_csv_path(
-                session=session,
-                account_id=config.account_id,
-                csv_path=path,
-                **kwargs,  # type: ignore[arg-type]
+            rules = await load_rules_ordered(session)
+            import_result = await store_parsed_csv(
+                session, account_id=account_id, parsed=parsed, rules=rules
             )
+            record_import_metrics(import_result, time.perf_counter() - started)
 
             if import_result.created > 0:
-                try:
-                    await run_detection(session, config.account_id)
-                except Exception:
-                    logger.warning(
-                        "Auto recurring-detection failed for watch import",
-                        exc_info=True,
-                    )
+                post_import_scheduler(session_factory).notify(account_id)
+
+            record_file(
+                session,
+                account_id=account_id,
+                profile_id=profile_id,
+                fingerprint=fingerprint,
+                file_name=path.name,
+                rows_created=import_result.created,
+            )
+            await session.commit()
 
             _move_to_processed(path, processed_dir)
             logger.info(
-                "Watch import: %s → created=%d duplicates=%d failed=%d",
+                "Watch import: %s → created=%d duplicates=%d failed=%d%s",
                 path.name,
                 import_result.created,
                 import_result.duplicates,
                 import_result.failed,
+                f" (appended rows from byte {start_offset})" if start_offset else "",
             )
+            return "processed"
         except Exception as exc:
             logger.error(
                 "Watch import failed for %s: %s", path.name, exc, exc_info=True
             )
             _move_to_failed(path, failed_dir, str(exc))
+            return "failed"
 
 
 def _move_to_processed(path: Path, processed_dir: Path) -> None:
@@ -136,30 +264,216 @@ def _move_to_failed(path: Path, failed_dir: Path, error: str) -> None:
         logger.warning("Failed to move %s to failed dir", path.name, exc_info=True)
 
 
+class WatchWorkerPool:
+    """Imports watched files with up to *concurrency* concurrent workers.
+
+    Files are grouped by the account their subfolder is configured for
+    (unconfigured subfolders form their own group). A group is owned by at
+    most one worker at a time, so files of one account are imported in the
+    order they arrived while different accounts proceed in parallel. After
+    each file the group goes to the back of the ready queue, so a large
+    backlog for one account does not starve the others.
+
+    Database writes still go through the application's single write queue,
+    held only while a file's parsed rows are stored; the parallelism covers
+    waiting for files, hashing and parsing them, moving them and everything
+    else around the write itself.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int = 1,
+        read_session_factory: async_sessionmaker[AsyncSession] | None = None,
+        max_backlog: int = _MAX_BACKLOG,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.max_backlog = max_backlog
+        self._capacity = asyncio.Semaphore(max_backlog)
+        self._session_factory = session_factory
+        self.read_session_factory = read_session_factory or session_factory
+        self._intake: asyncio.Queue[Path] | None = None
+        # group key -> files waiting; a key is present while queued or owned
+        self._pending: dict[str, deque[tuple[Path, int | None]]] = {}
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+        self._in_flight: dict[Path, WatchInFlightFile] = {}
+        # Paths queued or in flight; repeated events for them are dropped
+        self._known: set[Path] = set()
+        self.running = False
+
+    @property
+    def queue_depth(self) -> int:
+        intake = self._intake.qsize() if self._intake is not None else 0
+        return intake + sum(len(group) for group in self._pending.values())
+
+    def status(self) -> WatchStatusRead:
+        return WatchStatusRead(
+            running=self.running,
+            concurrency=self.concurrency,
+            queue_depth=self.queue_depth,
+            in_flight=sorted(self._in_flight.values(), key=lambda f: f.started_at),
+        )
+
+    def _update_gauges(self) -> None:
+        WATCH_QUEUE_DEPTH.set(self.queue_depth)
+        WATCH_IN_FLIGHT.set(len(self._in_flight))
+
+    async def _account_for(self, path: Path) -> int | None:
+        try:
+            async with self.read_session_factory() as session:
+                return await session.scalar(
+                    select(WatchFolderConfig.account_id).where(  # type: ignore[call-overload]
+                        WatchFolderConfig.subfolder_name == path.parent.name  # type: ignore[arg-type]
+                    )
+                )
+        except Exception:
+            logger.warning("Could not resolve account for %s", path, exc_info=True)
+            return None
+
+    async def submit(self, path: Path) -> None:
+        """Queue *path* behind earlier files of the same account.
+
+        Each call must hold one unit of backlog capacity, which is returned
+        once the file is done (or straight away for a repeated path).
+        """
+        if path in self._known:
+            self._capacity.release()
+            return
+        self._known.add(path)
+        account_id = await self._account_for(path)
+        key = (
+            f"account:{account_id}"
+            if account_id is not None
+            else f"subfolder:{path.parent.name}"
+        )
+        group = self._pending.get(key)
+        if group is None:
+            group = self._pending[key] = deque()
+            self._ready.put_nowait(key)
+        group.append((path, account_id))
+        self._update_gauges()
+
+    async def _handle(self, path: Path) -> None:
+        if not await wait_until_stable(
+            path,
+            initial_delay=_SETTLE_INITIAL_DELAY,
+            max_delay=_SETTLE_MAX_DELAY,
+            quiet_period=WATCH_SETTLE_QUIET_SECONDS,
+            timeout=_SETTLE_TIMEOUT,
+        ):
+            if path.exists():
+                logger.warning("Skipping %s: still being written", path.name)
+            return
+        started = time.perf_counter()
+        outcome = await _process_file(path, self._session_factory)
+        WATCH_FILE_DURATION.labels(outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._ready.get()
+            group = self._pending[key]
+            path, account_id = group.popleft()
+            self._in_flight[path] = WatchInFlightFile(
+                path=str(path),
+                account_id=account_id,
+                started_at=datetime.now(timezone.utc),
+            )
+            self._update_gauges()
+            try:
+                await self._handle(path)
+            except Exception:
+                logger.error("Watch worker failed on %s", path, exc_info=True)
+            finally:
+                del self._in_flight[path]
+                self._known.discard(path)
+                self._capacity.release()
+                if group:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._pending[key]
+                self._update_gauges()
+
+    async def run(self, queue: asyncio.Queue[Path]) -> None:
+        """Dispatch files from *queue* to the workers until cancelled."""
+        self._intake = queue
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self.running = True
+        try:
+            while True:
+                await self._capacity.acquire()
+                await self.submit(await queue.get())
+        finally:
+            self.running = False
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def catch_up_scan(
+    watch_path: Path,
+    queue: asyncio.Queue[Path],
+    session_factory: async_sessionmaker[AsyncSession],
+) -> int:
+    """Queue CSV files already lying in configured subfolders, oldest first.
+
+    Picks up files dropped while the app was not running. Blocks while
+    *queue* is full, so a large backlog is fed in as workers free up.
+    """
+    async with session_factory() as session:
+        result = await session.execute(select(WatchFolderConfig.subfolder_name))  # type: ignore[call-overload]
+        subfolders = [row[0] for row in result]
+
+    found: list[tuple[int, Path]] = []
+    for name in subfolders:
+        folder = watch_path / name
+        if not folder.is_dir():
+            continue
+        for path in folder.iterdir():
+            if path.is_file() and path.suffix.lower() == ".csv":
+                try:
+                    found.append((path.stat().st_mtime_ns, path))
+                except FileNotFoundError:
+                    continue
+
+    found.sort()
+    for _, path in found:
+        await queue.put(path)
+    if found:
+        logger.info("Watch folder catch-up: queued %d existing file(s)", len(found))
+    return len(found)
+
+
 async def watch_folder_task(
     session_factory: async_sessionmaker[AsyncSession],
     watch_path: Path,
+    pool: WatchWorkerPool | None = None,
 ) -> None:
     """Long-running asyncio task that watches *watch_path* and auto-imports files."""
     watch_path.mkdir(parents=True, exist_ok=True)
-    queue: asyncio.Queue[Path] = asyncio.Queue()
+    if pool is None:
+        pool = WatchWorkerPool(session_factory)
+    queue: asyncio.Queue[Path] = asyncio.Queue(maxsize=pool.max_backlog)
     loop = asyncio.get_running_loop()
 
-    handler = _QueueHandler(queue, loop)
-    observer = Observer()
-    observer.schedule(handler, str(watch_path), recursive=True)
-    observer.start()
-    logger.info("Watch folder started: %s", watch_path)
+    from my_private_finances.services.watch_observer import start_observer
 
+    observer = start_observer(watch_path, queue, loop)
+    logger.info(
+        "Watch folder started: %s (concurrency=%d)", watch_path, pool.concurrency
+    )
+
+    # Scan after the observer is up so nothing falls between the two; the
+    # pool drops paths reported by both.
+    scan = asyncio.create_task(
+        catch_up_scan(watch_path, queue, pool.read_session_factory)
+    )
     try:
-        while True:
-            path = await queue.get()
-            await asyncio.sleep(0.5)  # debounce — wait for file write to finish
-            if not path.exists():
-                continue
-            await _process_file(path, session_factory)
+        await pool.run(queue)
     except asyncio.CancelledError:
         logger.info("Watch folder task cancelled, stopping observer")
+        scan.cancel()
         observer.stop()
         observer.join()
         raise
@@ -0,0 +1,68 @@
+"""Watchdog glue for the watch folder.
+
+Kept separate from :mod:`my_private_finances.services.watch_folder` so that
+watchdog (and its platform observer backends) is only imported once a
+watcher is actually started, not by every module that imports the service.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from watchdog.events import (  # type: ignore[import-untyped]
+    FileCreatedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileSystemEventHandler,
+)
+from watchdog.observers import Observer  # type: ignore[import-untyped]
+from watchdog.observers.api import BaseObserver  # type: ignore[import-untyped]
+
+from my_private_finances.metrics import WATCH_QUEUE_DEPTH
+
+
+class QueueHandler(FileSystemEventHandler):
+    """Watchdog event handler that forwards CSV files to an asyncio queue.
+
+    Created, modified and moved-in files are all forwarded; the worker pool
+    drops repeats and waits for the file to stop changing before importing.
+    """
+
+    def __init__(
+        self, queue: asyncio.Queue[Path], loop: asyncio.AbstractEventLoop
+    ) -> None:
+        super().__init__()
+        self._queue = queue
+        self._loop = loop
+
+    def on_created(self, event: FileCreatedEvent) -> None:  # type: ignore[override]
+        if not event.is_directory:
+            self._forward(Path(str(event.src_path)))
+
+    def on_modified(self, event: FileModifiedEvent) -> None:  # type: ignore[override]
+        if not event.is_directory:
+            self._forward(Path(str(event.src_path)))
+
+    def on_moved(self, event: FileMovedEvent) -> None:  # type: ignore[override]
+        # Covers files renamed into place after a temp-name download
+        if not event.is_directory:
+            self._forward(Path(str(event.dest_path)))
+
+    def _forward(self, path: Path) -> None:
+        if path.suffix.lower() == ".csv":
+            asyncio.run_coroutine_threadsafe(self._enqueue(path), self._loop)
+
+    async def _enqueue(self, path: Path) -> None:
+        await self._queue.put(path)
+        WATCH_QUEUE_DEPTH.set(self._queue.qsize())
+
+
+def start_observer(
+    watch_path: Path, queue: asyncio.Queue[Path], loop: asyncio.AbstractEventLoop
+) -> BaseObserver:
+    """Start a recursive observer on *watch_path* feeding *queue*."""
+    observer = Observer()
+    observer.schedule(QueueHandler(queue, loop), str(watch_path), recursive=True)
+    observer.start()
+    return observer
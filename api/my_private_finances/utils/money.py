@@ -0,0 +1,62 @@
+"""Money stored as integer minor units (cents).
+
+Amounts live in the database as exact integers, so sums, comparisons and
+sorting run on integers in SQL, and there is no REAL/NUMERIC rounding on
+SQLite. Application code keeps working with two-place ``Decimal`` values:
+:class:`Money` converts on the way in and out of the database, and
+:func:`to_minor` / :func:`from_minor` do the same for code that works with raw
+integers (e.g. detection loops comparing thousands of amounts).
+"""
+
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+from sqlalchemy import BigInteger
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+MINOR_DIGITS = 2
+_QUANTUM = Decimal(1).scaleb(-MINOR_DIGITS)
+
+
+def to_minor(amount: Decimal | int | str) -> int:
+    """Convert an amount in major units to integer minor units.
+
+    Amounts with more than two decimal places are rounded half-up.
+    """
+    return int(
+        Decimal(amount).quantize(_QUANTUM, rounding=ROUND_HALF_UP).scaleb(MINOR_DIGITS)
+    )
+
+
+def from_minor(minor: int) -> Decimal:
+    """Convert integer minor units back to a two-place ``Decimal``."""
+    return Decimal(int(minor)).scaleb(-MINOR_DIGITS)
+
+
+class Money(TypeDecorator[Decimal]):
+    """``Decimal`` in Python, ``BIGINT`` minor units in the database.
+
+    Aggregates that keep the column type (``sum``, ``min``, ``max``,
+    ``coalesce``, ``case``) are converted back automatically. Select the
+    column through ``type_coerce(col, BigInteger)`` to get the raw integers.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> int | None:
+        if value is None:
+            return None
+        return to_minor(value)
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Decimal | None:
+        if value is None:
+            return None
+        return from_minor(value)
+
+    def coerce_compared_value(self, op: Any, value: Any) -> Any:
+        # Literals compared with or added to an amount are amounts too
+        return self
@@ -7,8 +7,13 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlmodel import SQLModel
 
-from my_private_finances.db import create_engine, create_session_factory
+from my_private_finances.db import (
+    create_engine,
+    create_read_engine,
+    create_session_factory,
+)
 from my_private_finances.main import create_app
+from my_private_finances.services.post_import import post_import_scheduler
 
 
 @pytest_asyncio.fixture
@@ -23,6 +28,9 @@ async def test_app() -> AsyncGenerator[AsyncClient, None]:
         session_factory = create_session_factory(engine)
         app.state.engine = engine
         app.state.session_factory = session_factory
+        read_engine: AsyncEngine = create_read_engine(database_url)
+        app.state.read_engine = read_engine
+        app.state.read_session_factory = create_session_factory(read_engine)
         app.state.db_path = db_path
 
         async with engine.connect() as conn:
@@ -33,6 +41,8 @@ async def test_app() -> AsyncGenerator[AsyncClient, None]:
         async with AsyncClient(transport=transport, base_url="http://test") as client:
             yield client
 
+        await post_import_scheduler(session_factory).shutdown(flush=False)
+        await read_engine.dispose()
         await engine.dispose()
 
 
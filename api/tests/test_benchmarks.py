@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+from benchmarks.generator import generate_dataset, parse_size
+from benchmarks.runner import compare_reports
+from benchmarks.scenarios import (
+    BenchContext,
+    import_bank_de,
+    import_trade_republic,
+    setup,
+)
+
+
+def test_generator_is_deterministic(tmp_path: Path) -> None:
+    first = generate_dataset(tmp_path / "a", 2_000, seed=7)
+    second = generate_dataset(tmp_path / "b", 2_000, seed=7)
+
+    assert first.rows == 2_000
+    assert [f.path.name for f in first.files] == [f.path.name for f in second.files]
+    for a, b in zip(first.files, second.files):
+        assert a.path.read_bytes() == b.path.read_bytes()
+
+    other = generate_dataset(tmp_path / "c", 2_000, seed=8)
+    assert first.files[0].path.read_bytes() != other.files[0].path.read_bytes()
+
+
+def test_parse_size() -> None:
+    assert parse_size("10k") == 10_000
+    assert parse_size("1M") == 1_000_000
+    assert parse_size("2500") == 2_500
+    with pytest.raises(ValueError):
+        parse_size("0")
+
+
+@pytest.mark.asyncio
+async def test_generated_exports_import_without_errors(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    dataset = generate_dataset(tmp_path, 1_500)
+    session_factory = test_app._transport.app.state.session_factory  # type: ignore[attr-defined]
+    ctx = BenchContext(test_app, session_factory, dataset)
+    await setup(ctx)
+
+    bank_rows = await import_bank_de(ctx)
+    tr_rows = await import_trade_republic(ctx)
+    assert bank_rows + tr_rows == dataset.rows
+
+
+def _report(**medians: float) -> dict[str, Any]:
+    return {
+        "version": 1,
+        "sizes": {
+            "10k": {
+                "scenarios": {
+                    name.replace("_", "."): {"median_s": s}
+                    for name, s in medians.items()
+                }
+            }
+        },
+    }
+
+
+def test_compare_flags_regressions_above_threshold() -> None:
+    baseline = _report(import_csv=1.0, reports_monthly=0.010, ml_train=2.0)
+    current = _report(import_csv=1.5, reports_monthly=0.013, export_json=0.2)
+
+    rows = {
+        r["scenario"]: r["status"]
+        for r in compare_reports(baseline, current, threshold=0.2)
+    }
+
+    assert rows == {
+        "import.csv": "regression",
+        # +30%, but only 3 ms: below the noise floor
+        "reports.monthly": "ok",
+        "export.json": "new",
+        "ml.train": "missing",
+    }
+
+
+def test_compare_reports_improvements() -> None:
+    rows = compare_reports(_report(import_csv=1.0), _report(import_csv=0.5))
+    assert rows[0]["status"] == "improvement"
+    assert rows[0]["change"] == pytest.approx(-0.5)
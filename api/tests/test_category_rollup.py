@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from my_private_finances.models import CategoryClosure
+from tests.helpers import (
+    create_account,
+    create_budget,
+    create_category,
+    create_transaction,
+)
+
+
+async def _closure(client: AsyncClient) -> set[tuple[int, int, int]]:
+    sf = client._transport.app.state.session_factory  # type: ignore[union-attr]
+    async with sf() as session:
+        rows = await session.execute(
+            select(
+                CategoryClosure.ancestor_id,
+                CategoryClosure.descendant_id,
+                CategoryClosure.depth,
+            )
+        )
+        return {(r.ancestor_id, r.descendant_id, r.depth) for r in rows}
+
+
+async def _seed_tree(client: AsyncClient) -> dict[str, Any]:
+    """Food > Groceries > Organic, Food > Restaurants, Rent; one month of spending."""
+    acc = await create_account(client)
+    food = await create_category(client, name="Food")
+    groceries = await create_category(client, name="Groceries", parent_id=food["id"])
+    organic = await create_category(client, name="Organic", parent_id=groceries["id"])
+    restaurants = await create_category(
+        client, name="Restaurants", parent_id=food["id"]
+    )
+    rent = await create_category(client, name="Rent")
+    spending = (
+        (food, "-5.00"),
+        (groceries, "-40.00"),
+        (organic, "-15.00"),
+        (restaurants, "-30.00"),
+        (rent, "-700.00"),
+    )
+    for i, (cat, amount) in enumerate(spending):
+        tx = await create_transaction(
+            client,
+            account_id=acc["id"],
+            booking_date="2026-04-10",
+            amount=amount,
+            external_id=f"r-{i}",
+        )
+        resp = await client.patch(
+            f"/api/transactions/{tx['id']}", json={"category_id": cat["id"]}
+        )
+        assert resp.status_code == 200, resp.text
+    return {
+        "account": acc,
+        "food": food,
+        "groceries": groceries,
+        "organic": organic,
+        "restaurants": restaurants,
+        "rent": rent,
+    }
+
+
+@pytest.mark.asyncio
+async def test_closure_follows_create_move_and_delete(test_app: AsyncClient) -> None:
+    food = await create_category(test_app, name="Food")
+    groceries = await create_category(test_app, name="Groceries", parent_id=food["id"])
+    organic = await create_category(test_app, name="Organic", parent_id=groceries["id"])
+    household = await create_category(test_app, name="Household")
+    f, g, o, h = food["id"], groceries["id"], organic["id"], household["id"]
+    assert await _closure(test_app) == {
+        (f, f, 0),
+        (g, g, 0),
+        (o, o, 0),
+        (h, h, 0),
+        (f, g, 1),
+        (g, o, 1),
+        (f, o, 2),
+    }
+
+    # Moving a subtree re-links all of it
+    resp = await test_app.patch(f"/api/categories/{g}", json={"parent_id": h})
+    assert resp.status_code == 200, resp.text
+    assert {r for r in await _closure(test_app) if r[0] != r[1]} == {
+        (h, g, 1),
+        (g, o, 1),
+        (h, o, 2),
+    }
+
+    # A category cannot move below its own subtree
+    resp = await test_app.patch(f"/api/categories/{h}", json={"parent_id": o})
+    assert resp.status_code == 422
+
+    # Parents are kept while they have subcategories
+    assert (await test_app.delete(f"/api/categories/{g}")).status_code == 409
+    assert (await test_app.delete(f"/api/categories/{o}")).status_code == 204
+    assert (await test_app.delete(f"/api/categories/{f}")).status_code == 204
+    assert await _closure(test_app) == {(h, h, 0), (g, g, 0), (h, g, 1)}
+
+
+@pytest.mark.asyncio
+async def test_monthly_breakdown_rollup(test_app: AsyncClient) -> None:
+    await _seed_tree(test_app)
+    params: dict[str, Any] = {"month": "2026-04"}
+
+    flat = (await test_app.get("/api/reports/monthly", params=params)).json()
+    assert {c["category_name"]: c["total"] for c in flat["category_breakdown"]} == {
+        "Rent": "-700.00",
+        "Groceries": "-40.00",
+        "Restaurants": "-30.00",
+        "Organic": "-15.00",
+        "Food": "-5.00",
+    }
+
+    params["rollup"] = True
+    rolled = (await test_app.get("/api/reports/monthly", params=params)).json()
+    assert [(c["category_name"], c["total"]) for c in rolled["category_breakdown"]] == [
+        ("Rent", "-700.00"),
+        ("Food", "-90.00"),
+        ("Groceries", "-55.00"),
+        ("Restaurants", "-30.00"),
+        ("Organic", "-15.00"),
+    ]
+    assert rolled["expense_total"] == flat["expense_total"] == "-790.00"
+
+
+@pytest.mark.asyncio
+async def test_parent_budget_includes_descendants(test_app: AsyncClient) -> None:
+    tree = await _seed_tree(test_app)
+    await create_budget(test_app, category_id=tree["food"]["id"], amount="100.00")
+    await create_budget(test_app, category_id=tree["organic"]["id"], amount="20.00")
+    url = "/api/reports/budget-vs-actual"
+
+    report = (await test_app.get(url, params={"month": "2026-04"})).json()
+    assert [(b["category_name"], b["actual"], b["remaining"]) for b in report] == [
+        ("Food", "90.00", "10.00"),
+        ("Organic", "15.00", "5.00"),
+    ]
+
+    params = {"month": "2026-04", "rollup": False}
+    own_only = (await test_app.get(url, params=params)).json()
+    assert [b["actual"] for b in own_only] == ["5.00", "15.00"]
+
+
+@pytest.mark.asyncio
+async def test_spending_trend_rollup_counts_totals_once(test_app: AsyncClient) -> None:
+    await _seed_tree(test_app)
+    params: dict[str, Any] = {"month": "2026-04", "lookback_months": 1}
+    flat = (await test_app.get("/api/reports/spending-trend", params=params)).json()
+
+    params["rollup"] = True
+    rolled = (await test_app.get("/api/reports/spending-trend", params=params)).json()
+    current = {c["category_name"]: c["current_month"] for c in rolled["categories"]}
+    assert current["Food"] == "90.00"
+    assert current["Groceries"] == "55.00"
+    assert current["Organic"] == "15.00"
+    assert rolled["total_current_month"] == flat["total_current_month"] == "790.00"
+
+
+@pytest.mark.asyncio
+async def test_fixed_vs_variable_rollup_inherits_cost_type(
+    test_app: AsyncClient,
+) -> None:
+    tree = await _seed_tree(test_app)
+    for name, cost_type in (("food", "variable"), ("rent", "fixed")):
+        resp = await test_app.patch(
+            f"/api/categories/{tree[name]['id']}", json={"cost_type": cost_type}
+        )
+        assert resp.status_code == 200, resp.text
+    url = "/api/reports/fixed-vs-variable"
+
+    flat = (await test_app.get(url, params={"month": "2026-04"})).json()
+    assert (flat["variable_total"], flat["unclassified_total"]) == ("5.00", "85.00")
+
+    params = {"month": "2026-04", "rollup": True}
+    rolled = (await test_app.get(url, params=params)).json()
+    assert rolled["fixed_total"] == "700.00"
+    assert rolled["variable_total"] == "90.00"
+    assert rolled["unclassified_total"] == "0"
+    variable = next(b for b in rolled["breakdown"] if b["cost_type"] == "variable")
+    assert variable["category_count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_restore_keeps_closure_for_any_row_order(
+    test_app: AsyncClient,
+) -> None:
+    parent = await create_category(test_app, name="Food")
+    child = await create_category(test_app, name="Groceries")
+    # The parent is now newer than its child, so a restore inserts the child first
+    top = await create_category(test_app, name="Household")
+    await test_app.patch(
+        f"/api/categories/{parent['id']}", json={"parent_id": top["id"]}
+    )
+    await test_app.patch(
+        f"/api/categories/{child['id']}", json={"parent_id": parent["id"]}
+    )
+    before = await _closure(test_app)
+    assert (top["id"], child["id"], 2) in before
+
+    doc = (await test_app.get("/api/export/json")).content
+    resp = await test_app.post(
+        "/api/restore/json",
+        files={"file": ("backup.json", doc, "application/json")},
+    )
+    assert resp.status_code == 200, resp.text
+    assert await _closure(test_app) == before
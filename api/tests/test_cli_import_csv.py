@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlmodel import SQLModel
+
+from my_private_finances.cli.import_csv import _expand_inputs, _run
+from my_private_finances.db import (
+    build_sqlite_url,
+    create_engine,
+    create_session_factory,
+)
+from my_private_finances.models import Account, CsvProfile, Transaction
+
+DMY_CSV = (
+    "Buchungstag;Betrag;Waehrung;Beguenstigter/Zahlungspflichtiger;Verwendungszweck\n"
+    "{day}.01.2026;-1.234,50;EUR;Vermieter;Miete\n"
+    "{day}.02.2026;-12,00;EUR;Rewe;Einkauf\n"
+)
+
+
+async def _setup_db(tmp_path: Path) -> str:
+    url = build_sqlite_url(tmp_path / "cli.sqlite")
+    engine = create_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with create_session_factory(engine)() as session:
+        session.add(Account(id=1, name="Giro", currency="EUR"))
+        session.add(
+            CsvProfile(
+                name="bank-de", delimiter=";", date_format="dmy", decimal_comma=True
+            )
+        )
+        await session.commit()
+    await engine.dispose()
+    return url
+
+
+async def _count_transactions(url: str) -> int:
+    engine = create_engine(url)
+    async with create_session_factory(engine)() as session:
+        count = await session.scalar(select(func.count()).select_from(Transaction))
+    await engine.dispose()
+    return int(count or 0)
+
+
+def test_expand_inputs_globs_recursively(tmp_path: Path) -> None:
+    (tmp_path / "2025").mkdir()
+    a = tmp_path / "a.csv"
+    b = tmp_path / "2025" / "b.csv"
+    a.write_text("x")
+    b.write_text("x")
+
+    files = _expand_inputs([str(tmp_path / "**" / "*.csv"), str(a)])
+
+    assert sorted(files) == sorted([a, b])
+    assert _expand_inputs(["missing.csv"]) == [Path("missing.csv")]
+
+
+@pytest.mark.asyncio
+async def test_batch_import_with_profile_and_process_pool(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    url = await _setup_db(tmp_path)
+    exports = tmp_path / "exports"
+    (exports / "2026").mkdir(parents=True)
+    for i, name in enumerate(("jan.csv", "2026/feb.csv", "2026/mar.csv"), start=1):
+        (exports / name).write_text(DMY_CSV.format(day=f"0{i}"), encoding="utf-8")
+
+    code = await _run(
+        database_url=url,
+        account_id=1,
+        inputs=[str(exports / "**" / "*.csv")],
+        max_errors=50,
+        profile_name="bank-de",
+        jobs=2,
+    )
+
+    assert code == 0
+    assert await _count_transactions(url) == 6
+    out = capsys.readouterr()
+    assert "rows/s" in out.out
+    assert out.out.count(".csv") == 3
+    assert "[3/3]" in out.err
+
+
+@pytest.mark.asyncio
+async def test_batch_import_exit_codes(tmp_path: Path) -> None:
+    url = await _setup_db(tmp_path)
+    good = tmp_path / "good.csv"
+    good.write_text(
+        "booking_date,amount,currency\n2026-01-01,1.00,EUR\n", encoding="utf-8"
+    )
+    bad = tmp_path / "bad.csv"
+    bad.write_text(
+        "booking_date,amount,currency\nnot-a-date,1.00,EUR\n", encoding="utf-8"
+    )
+
+    assert await _run(url, 1, [str(good)], max_errors=50) == 0
+    assert await _run(url, 1, [str(good), str(bad)], max_errors=50) == 1
+    assert await _run(url, 1, [str(tmp_path / "nope.csv")], max_errors=50) == 1
+    assert await _run(url, 99, [str(good)], max_errors=50) == 1
+    assert await _run(url, 1, [str(tmp_path / "*.tsv")], max_errors=50) == 1
@@ -1,9 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import sqlite3
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
 import pytest
 from httpx import AsyncClient
+from sqlmodel import select
 
-from tests.helpers import create_account, create_category, create_transaction
+from my_private_finances.models import Account
+from my_private_finances.services import sqlite_restore
+from my_private_finances.services.json_restore import (
+    RestoreError,
+    restore_json_export,
+)
+from tests.helpers import (
+    create_account,
+    create_budget,
+    create_category,
+    create_rule,
+    create_transaction,
+)
 
 
 @pytest.mark.asyncio
@@ -54,6 +74,215 @@ async def test_restore_sqlite_replaces_data(test_app: AsyncClient) -> None:
     assert "NewAccount" not in names_after
 
 
+def _sqlite_upload(data: bytes) -> dict[str, Any]:
+    return {"file": ("backup.sqlite", data, "application/octet-stream")}
+
+
+async def _account_names(client: AsyncClient) -> set[str]:
+    return {a["name"] for a in (await client.get("/api/accounts")).json()}
+
+
+async def _backup_with(client: AsyncClient, name: str) -> bytes:
+    acc = await create_account(client, name=name)
+    backup = (await client.get("/api/export/sqlite")).content
+    resp = await client.delete("/api/data")
+    assert resp.status_code == 200
+    await create_account(client, name=f"Live {acc['id']}")
+    return backup
+
+
+@pytest.mark.asyncio
+async def test_restore_sqlite_rejects_corrupt_backup(test_app: AsyncClient) -> None:
+    backup = bytearray(await _backup_with(test_app, "Old"))
+    page_size = int.from_bytes(backup[16:18], "big")
+    # Scribble over every page after the schema page
+    for offset in range(page_size, len(backup), page_size):
+        backup[offset : offset + 64] = b"\xff" * 64
+
+    resp = await test_app.post("/api/restore/sqlite", files=_sqlite_upload(backup))
+
+    assert resp.status_code == 400
+    assert await _account_names(test_app) == {"Live 1"}
+    db_path = test_app._transport.app.state.db_path  # type: ignore[union-attr]
+    assert not list(Path(db_path).parent.glob("*.restore-*"))
+
+
+@pytest.mark.asyncio
+async def test_restore_sqlite_checks_schema_revision(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    path = tmp_path / "backup.sqlite"
+    path.write_bytes(await _backup_with(test_app, "Old"))
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE alembic_version (version_num VARCHAR(32))")
+    conn.execute("INSERT INTO alembic_version VALUES ('0123456789ab')")
+    conn.commit()
+    conn.close()
+
+    resp = await test_app.post(
+        "/api/restore/sqlite", files=_sqlite_upload(path.read_bytes())
+    )
+
+    assert resp.status_code == 400
+    assert "0123456789ab" in resp.json()["detail"]
+    assert await _account_names(test_app) == {"Live 1"}
+
+
+@pytest.mark.asyncio
+async def test_restore_sqlite_lets_open_sessions_finish_on_old_file(
+    test_app: AsyncClient,
+) -> None:
+    backup = await _backup_with(test_app, "Old")
+    state = test_app._transport.app.state  # type: ignore[union-attr]
+
+    async with state.read_session_factory() as session:
+        restore = asyncio.create_task(
+            test_app.post("/api/restore/sqlite", files=_sqlite_upload(backup))
+        )
+        await asyncio.sleep(0.2)
+        assert not restore.done()
+        names = (await session.execute(select(Account.name))).scalars().all()
+        assert names == ["Live 1"]
+
+    resp = await restore
+    assert resp.status_code == 200, resp.text
+    assert await _account_names(test_app) == {"Old"}
+
+
+@pytest.mark.asyncio
+async def test_restore_sqlite_gives_up_when_sessions_stay_open(
+    test_app: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(sqlite_restore, "RESTORE_DRAIN_TIMEOUT_SECONDS", 0.1)
+    backup = await _backup_with(test_app, "Old")
+    state = test_app._transport.app.state  # type: ignore[union-attr]
+
+    async with state.read_session_factory():
+        resp = await test_app.post("/api/restore/sqlite", files=_sqlite_upload(backup))
+
+    assert resp.status_code == 503
+    assert await _account_names(test_app) == {"Live 1"}
+
+
+async def _seed(client: AsyncClient) -> None:
+    acc = await create_account(client, name="Giro")
+    parent = await create_category(client, name="Living")
+    child = await create_category(client, name="Groceries", parent_id=parent["id"])
+    await create_rule(client, value="Rewe", category_id=child["id"])
+    await create_budget(client, category_id=child["id"], amount="250.00")
+    await create_transaction(
+        client, account_id=acc["id"], payee="Rewe", amount="-12.34", external_id="a"
+    )
+    await create_transaction(
+        client, account_id=acc["id"], payee="Employer", amount="2500", external_id="b"
+    )
+
+
+def _without_timestamp(doc: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in doc.items() if k != "exported_at"}
+
+
+def _upload(data: bytes, name: str = "export.json") -> dict[str, Any]:
+    return {"file": (name, data, "application/json")}
+
+
+@pytest.mark.asyncio
+async def test_restore_json_round_trip(test_app: AsyncClient) -> None:
+    await _seed(test_app)
+    exported = (await test_app.get("/api/export/json")).content
+
+    await test_app.delete("/api/data")
+    await create_account(test_app, name="Unrelated")
+
+    resp = await test_app.post("/api/restore/json", files=_upload(exported))
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["restored"]["transactions"] == 2
+
+    again = json.loads((await test_app.get("/api/export/json")).content)
+    assert _without_timestamp(again) == _without_timestamp(json.loads(exported))
+
+    # Ids continue after the restored ones
+    acc = await create_account(test_app, name="Later")
+    assert acc["id"] == max(a["id"] for a in again["accounts"]) + 1
+
+
+@pytest.mark.asyncio
+async def test_restore_json_gzip(test_app: AsyncClient) -> None:
+    await _seed(test_app)
+    exported = (await test_app.get("/api/export/json", params={"gzip": True})).content
+    await test_app.delete("/api/data")
+
+    resp = await test_app.post(
+        "/api/restore/json", files=_upload(exported, "export.json.gz")
+    )
+    assert resp.status_code == 200, resp.text
+    assert {a["name"] for a in (await test_app.get("/api/accounts")).json()} == {"Giro"}
+
+
+@pytest.mark.asyncio
+async def test_restore_json_is_atomic(test_app: AsyncClient) -> None:
+    await _seed(test_app)
+    doc = json.loads((await test_app.get("/api/export/json")).content)
+    doc["transactions"][1]["booking_date"] = "not a date"
+    await create_account(test_app, name="Kept")
+
+    resp = await test_app.post(
+        "/api/restore/json", files=_upload(json.dumps(doc).encode())
+    )
+    assert resp.status_code == 400
+    assert "transactions" in resp.json()["detail"]
+
+    # Nothing was deleted or half-restored
+    names = {a["name"] for a in (await test_app.get("/api/accounts")).json()}
+    assert names == {"Giro", "Kept"}
+
+
+@pytest.mark.asyncio
+async def test_restore_json_rejects_dangling_references(test_app: AsyncClient) -> None:
+    await _seed(test_app)
+    doc = json.loads((await test_app.get("/api/export/json")).content)
+    doc["accounts"] = []
+
+    resp = await test_app.post(
+        "/api/restore/json", files=_upload(json.dumps(doc).encode())
+    )
+    assert resp.status_code == 400
+    assert "missing" in resp.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_restore_json_rejects_unknown_version(test_app: AsyncClient) -> None:
+    resp = await test_app.post(
+        "/api/restore/json",
+        files=_upload(b'{"export_version": 99, "accounts": [{"id": 1}]}'),
+    )
+    assert resp.status_code == 400
+    assert "export_version" in resp.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_restore_json_parses_across_tiny_chunks(test_app: AsyncClient) -> None:
+    await _seed(test_app)
+    doc = json.loads((await test_app.get("/api/export/json")).content)
+    # Any JSON layout works, not just the exporter's one row per line
+    data = json.dumps(doc, indent=2, ensure_ascii=True).encode()
+
+    async def chunks(size: int, end: int = len(data)) -> AsyncIterator[bytes]:
+        for i in range(0, end, size):
+            yield data[i : min(i + size, end)]
+
+    session_factory = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+    async with session_factory() as session:
+        counts = await restore_json_export(session, chunks(7), batch_rows=1)
+        await session.commit()
+    assert counts["categories"] == 2
+    assert counts["transactions"] == 2
+
+    async with session_factory() as session:
+        with pytest.raises(RestoreError, match="truncated"):
+            await restore_json_export(session, chunks(1024, end=len(data) - 3))
+
+
 @pytest.mark.asyncio
 async def test_delete_transactions_keeps_accounts_and_categories(
     test_app: AsyncClient,
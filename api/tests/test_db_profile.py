@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from my_private_finances.db import (
+    SqliteProfile,
+    build_sqlite_url,
+    create_engine,
+    optimize_sqlite,
+    read_sqlite_settings,
+)
+
+
+@pytest.mark.asyncio
+async def test_default_profile_applied_on_connect() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(build_sqlite_url(Path(tmpdir) / "p.sqlite"))
+        try:
+            settings = await read_sqlite_settings(engine)
+        finally:
+            await engine.dispose()
+
+    assert settings == {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout_ms": 5_000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_custom_profile_applied_on_connect() -> None:
+    profile = SqliteProfile(
+        journal_mode="delete",
+        synchronous="full",
+        cache_size=-2000,
+        mmap_size=0,
+        temp_store="file",
+        busy_timeout_ms=100,
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(
+            build_sqlite_url(Path(tmpdir) / "p.sqlite"), profile=profile
+        )
+        try:
+            settings = await read_sqlite_settings(engine)
+            await optimize_sqlite(engine)
+        finally:
+            await engine.dispose()
+
+    assert settings["journal_mode"] == "DELETE"
+    assert settings["synchronous"] == "FULL"
+    assert settings["temp_store"] == "FILE"
+    assert settings["busy_timeout_ms"] == 100
+
+
+def test_profile_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "FULL")
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "250")
+
+    profile = SqliteProfile.from_env()
+
+    assert profile.synchronous == "FULL"
+    assert profile.busy_timeout_ms == 250
+    assert profile.journal_mode == "WAL"
+
+
+def test_profile_rejects_unknown_keywords() -> None:
+    with pytest.raises(ValueError):
+        SqliteProfile(journal_mode="WAL; DROP TABLE account")
+
+
+@pytest.mark.asyncio
+async def test_health_reports_effective_settings(test_app: AsyncClient) -> None:
+    res = await test_app.get("/api/health")
+    assert res.status_code == 200
+    body = res.json()
+    assert body["status"] == "ok"
+    assert body["database"]["dialect"] == "sqlite"
+    assert body["database"]["journal_mode"] == "WAL"
+    assert body["database"]["synchronous"] == "NORMAL"
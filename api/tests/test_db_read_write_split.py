@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel
+
+from my_private_finances.db import (
+    build_sqlite_url,
+    create_engine,
+    create_read_engine,
+    create_session_factory,
+    write_queue,
+)
+
+
+@pytest_asyncio.fixture
+async def engines() -> AsyncGenerator[tuple[AsyncEngine, AsyncEngine], None]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        url = build_sqlite_url(Path(tmpdir) / "rw.sqlite")
+        writer = create_engine(url)
+        reader = create_read_engine(url)
+        async with writer.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        yield writer, reader
+        await reader.dispose()
+        await writer.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_engine_rejects_writes(
+    engines: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    _, reader = engines
+    async with reader.connect() as conn:
+        with pytest.raises(OperationalError, match="readonly"):
+            await conn.execute(
+                text("INSERT INTO account (name, currency) VALUES ('x', 'EUR')")
+            )
+
+
+@pytest.mark.asyncio
+async def test_reads_do_not_wait_for_running_write(
+    engines: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    writer, reader = engines
+    write_sf = create_session_factory(writer)
+    read_sf = create_session_factory(reader)
+
+    async with write_queue(write_sf).session() as session:
+        # Uncommitted write holds SQLite's write lock
+        await session.execute(
+            text("INSERT INTO account (name, currency) VALUES ('open', 'EUR')")
+        )
+
+        async with read_sf() as read_session:
+            count = await asyncio.wait_for(
+                read_session.scalar(text("SELECT count(*) FROM account")),
+                timeout=1,
+            )
+        assert count == 0
+
+        await session.commit()
+
+    async with read_sf() as read_session:
+        assert await read_session.scalar(text("SELECT count(*) FROM account")) == 1
+
+
+@pytest.mark.asyncio
+async def test_write_queue_runs_writes_one_at_a_time(
+    engines: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    writer, _ = engines
+    queue = write_queue(create_session_factory(writer))
+    events: list[str] = []
+
+    async def work(name: str) -> None:
+        async with queue.session() as session:
+            events.append(f"start {name}")
+            await session.execute(
+                text("INSERT INTO account (name, currency) VALUES (:n, 'EUR')"),
+                {"n": name},
+            )
+            await asyncio.sleep(0.01)
+            await session.commit()
+            events.append(f"end {name}")
+
+    await asyncio.gather(work("a"), work("b"), work("c"))
+
+    assert events == ["start a", "end a", "start b", "end b", "start c", "end c"]
+    assert queue.depth == 0
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from tests.helpers import create_account, create_category, create_transaction
+
+CSV = (
+    "booking_date,amount,currency,payee,purpose,external_id\n"
+    "2026-03-02,-42.10,EUR,REWE Markt GmbH,Einkauf 0815,csv-1\n"
+    "2026-03-10,-9.99,EUR,Spotify,Abo,csv-2\n"
+)
+
+
+async def _detect(client: AsyncClient, **params: Any) -> list[dict[str, Any]]:
+    resp = await client.post("/api/duplicates/detect", params=params)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+async def _bulk(client: AsyncClient, ids: list[int], action: str) -> dict[str, Any]:
+    resp = await client.post(
+        "/api/duplicates/candidates/bulk",
+        json={"candidate_ids": ids, "action": action},
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+@pytest.mark.asyncio
+async def test_detects_payment_imported_by_csv_and_api(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    resp = await test_app.post(
+        "/api/imports/csv",
+        params={"account_id": acc["id"]},
+        files={"file": ("import.csv", CSV, "text/csv")},
+    )
+    assert resp.json()["created"] == 2, resp.text
+    # Same payment a day later via the API, spelled differently
+    api_tx = await create_transaction(
+        test_app,
+        account_id=acc["id"],
+        booking_date="2026-03-03",
+        amount="-42.10",
+        payee="REWE MARKT",
+        purpose="Einkauf",
+        import_source="api",
+        external_id="api-1",
+    )
+    # Same amount and date but a different merchant
+    await create_transaction(
+        test_app,
+        account_id=acc["id"],
+        booking_date="2026-03-03",
+        amount="-9.99",
+        payee="Netflix",
+        purpose="Film",
+        external_id="api-2",
+    )
+
+    found = await _detect(test_app)
+    assert len(found) == 1
+    assert found[0]["duplicate"]["transaction_id"] == api_tx["id"]
+    assert found[0]["transaction"]["payee"] == "REWE Markt GmbH"
+    assert found[0]["account_id"] == acc["id"]
+    assert found[0]["status"] == "pending"
+
+    # Known pairs are not suggested twice
+    assert await _detect(test_app) == []
+    queue = (await test_app.get("/api/duplicates/candidates")).json()
+    assert [c["id"] for c in queue] == [found[0]["id"]]
+
+
+@pytest.mark.asyncio
+async def test_blocks_on_account_amount_and_window(test_app: AsyncClient) -> None:
+    checking = await create_account(test_app, name="Checking")
+    savings = await create_account(test_app, name="Savings")
+    base: dict[str, Any] = {"amount": "-20.00", "payee": "Aldi", "purpose": "Food"}
+    await create_transaction(
+        test_app,
+        account_id=checking["id"],
+        booking_date="2026-03-01",
+        external_id="a",
+        **base,
+    )
+    # Other account, other amount, and outside the window
+    await create_transaction(
+        test_app,
+        account_id=savings["id"],
+        booking_date="2026-03-01",
+        external_id="b",
+        **base,
+    )
+    await create_transaction(
+        test_app,
+        account_id=checking["id"],
+        booking_date="2026-03-01",
+        amount="-20.01",
+        payee="Aldi",
+        purpose="Food",
+        external_id="c",
+    )
+    await create_transaction(
+        test_app,
+        account_id=checking["id"],
+        booking_date="2026-03-05",
+        external_id="d",
+        **base,
+    )
+    assert await _detect(test_app) == []
+    assert len(await _detect(test_app, window_days=4)) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_merge_keeps_older_row(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    cat = await create_category(test_app)
+    kept = await create_transaction(
+        test_app, account_id=acc["id"], amount="-5.00", external_id="x-1"
+    )
+    dup = await create_transaction(
+        test_app, account_id=acc["id"], amount="-5.00", external_id="x-2"
+    )
+    third = await create_transaction(
+        test_app, account_id=acc["id"], amount="-5.00", external_id="x-3"
+    )
+    resp = await test_app.patch(
+        "/api/transactions/bulk",
+        json={"items": [{"id": dup["id"], "category_id": cat["id"], "notes": "lunch"}]},
+    )
+    assert resp.json()["updated"] == 1, resp.text
+
+    found = await _detect(test_app)
+    pairs = {
+        (c["transaction"]["transaction_id"], c["duplicate"]["transaction_id"])
+        for c in found
+    }
+    assert pairs == {
+        (kept["id"], dup["id"]),
+        (kept["id"], third["id"]),
+        (dup["id"], third["id"]),
+    }
+    by_pair = {
+        (c["transaction"]["transaction_id"], c["duplicate"]["transaction_id"]): c["id"]
+        for c in found
+    }
+
+    result = await _bulk(
+        test_app,
+        [
+            by_pair[(kept["id"], dup["id"])],
+            by_pair[(dup["id"], third["id"])],
+            by_pair[(kept["id"], third["id"])],
+        ],
+        "merge",
+    )
+    assert result["merged"] == 2
+    assert [i["status"] for i in result["items"]] == ["merged", "not_found", "merged"]
+
+    listed = (await test_app.get("/api/transactions")).json()["items"]
+    assert [t["id"] for t in listed] == [kept["id"]]
+    assert listed[0]["category_id"] == cat["id"]
+    assert listed[0]["notes"] == "lunch"
+    assert (await test_app.get("/api/duplicates/candidates")).json() == []
+
+    # Merged rows leave no dangling references behind
+    sf = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+    async with sf() as session:
+        assert (await session.execute(text("PRAGMA foreign_key_check"))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_dismissed_pairs_are_not_suggested_again(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    for ext in ("s-1", "s-2"):
+        await create_transaction(
+            test_app, account_id=acc["id"], amount="-3.50", external_id=ext
+        )
+    found = await _detect(test_app)
+    result = await _bulk(test_app, [found[0]["id"], found[0]["id"], 999], "dismiss")
+    assert result["dismissed"] == 1
+    assert [i["status"] for i in result["items"]] == [
+        "dismissed",
+        "not_pending",
+        "not_found",
+    ]
+
+    assert await _detect(test_app) == []
+    assert (await test_app.get("/api/duplicates/candidates")).json() == []
+    dismissed = await test_app.get(
+        "/api/duplicates/candidates", params={"status": "dismissed"}
+    )
+    assert [c["id"] for c in dismissed.json()] == [found[0]["id"]]
+    assert len((await test_app.get("/api/transactions")).json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_merged_duplicate_is_not_imported_again(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    # A second bank export that spells the first payment differently
+    other_export = CSV.replace("Einkauf 0815", "EINKAUF 0815 KARTE")
+    api_item = {
+        "account_id": acc["id"],
+        "booking_date": "2026-03-03",
+        "amount": "-42.10",
+        "payee": "REWE MARKT",
+        "purpose": "Einkauf",
+        "import_source": "api",
+        "external_id": "api-1",
+    }
+
+    async def import_csv(doc: str) -> dict[str, Any]:
+        resp = await test_app.post(
+            "/api/imports/csv",
+            params={"account_id": acc["id"]},
+            files={"file": ("import.csv", doc, "text/csv")},
+        )
+        assert resp.status_code == 200, resp.text
+        return resp.json()
+
+    async def post_batch() -> str:
+        resp = await test_app.post(
+            "/api/transactions/batch", json={"items": [api_item]}
+        )
+        assert resp.status_code == 200, resp.text
+        return resp.json()["items"][0]["status"]
+
+    assert (await import_csv(CSV))["created"] == 2
+    assert (await import_csv(other_export))["created"] == 1
+    assert await post_batch() == "created"
+    found = await _detect(test_app)
+    assert len(found) == 3
+    assert (await _bulk(test_app, [c["id"] for c in found], "merge"))["merged"] == 2
+    before = (await test_app.get("/api/transactions")).json()["items"]
+    assert len(before) == 2
+
+    # Re-importing brings neither merged row back, nor queues the pairs again
+    result = await import_csv(other_export)
+    assert (result["created"], result["duplicates"]) == (0, 2)
+    assert await post_batch() == "duplicate"
+    resp = await test_app.post("/api/transactions", json=api_item)
+    assert resp.status_code == 409, resp.text
+    assert (await test_app.get("/api/transactions")).json()["items"] == before
+    assert await _detect(test_app) == []
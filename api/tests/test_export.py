@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import gzip
 import json
+import sqlite3
+from pathlib import Path
 
 import pytest
 from httpx import AsyncClient
+from sqlmodel import select
 
+from my_private_finances.models import Transaction
+from my_private_finances.services import json_export
+from my_private_finances.services.sqlite_backup import (
+    BackupProgress,
+    apply_differential,
+    full_backup,
+)
 from tests.helpers import create_account, create_transaction
 
 _SQLITE_MAGIC = b"SQLite format 3\x00"
@@ -19,6 +30,131 @@ async def test_export_sqlite_returns_valid_file(test_app: AsyncClient) -> None:
     assert resp.content[:16] == _SQLITE_MAGIC
 
 
+def _rows(db_path: Path | str) -> list[tuple]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(
+            'SELECT id, payee, amount_minor FROM "transaction" ORDER BY id'
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_export_sqlite_reports_progress_and_watermark(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    acc = await create_account(test_app)
+    await create_transaction(test_app, account_id=acc["id"], payee="Rewe")
+
+    resp = await test_app.get("/api/export/sqlite")
+    assert resp.status_code == 200
+    watermark = int(resp.headers["x-backup-watermark"])
+    assert watermark >= 2  # account and transaction inserts
+
+    status = (await test_app.get("/api/export/sqlite/status")).json()
+    assert status["kind"] == "full"
+    assert status["running"] is False
+    assert status["percent"] == 100.0
+    assert status["total"] > 0
+    assert status["watermark"] == watermark
+
+    backup = tmp_path / "full.sqlite"
+    backup.write_bytes(resp.content)
+    assert [r[1] for r in _rows(backup)] == ["Rewe"]
+
+
+@pytest.mark.asyncio
+async def test_export_sqlite_status_before_first_export(test_app: AsyncClient) -> None:
+    resp = await test_app.get("/api/export/sqlite/status")
+    assert resp.status_code == 404
+
+
+def test_full_backup_copies_in_steps(tmp_path: Path) -> None:
+    src = tmp_path / "src.sqlite"
+    conn = sqlite3.connect(src)
+    conn.execute("CREATE TABLE change_log (seq INTEGER)")
+    conn.execute("CREATE TABLE t (v TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?)", [("x" * 500,)] * 200)
+    conn.commit()
+    conn.close()
+
+    progress = BackupProgress("full")
+    watermark = full_backup(src, tmp_path / "dst.sqlite", progress, pages=2)
+
+    assert watermark == 0
+    assert progress.total > 2
+    assert progress.remaining == 0
+    assert progress.finished_at is not None
+    dst = sqlite3.connect(tmp_path / "dst.sqlite")
+    assert dst.execute("SELECT count(*) FROM t").fetchone() == (200,)
+    dst.close()
+
+
+@pytest.mark.asyncio
+async def test_export_sqlite_differential(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    acc = await create_account(test_app)
+    kept = await create_transaction(
+        test_app, account_id=acc["id"], payee="Rewe", external_id="a"
+    )
+    renamed = await create_transaction(
+        test_app, account_id=acc["id"], payee="Aldi", external_id="b"
+    )
+    removed = await create_transaction(
+        test_app, account_id=acc["id"], payee="Lidl", external_id="c"
+    )
+
+    full = await test_app.get("/api/export/sqlite")
+    base = tmp_path / "base.sqlite"
+    base.write_bytes(full.content)
+    since = int(full.headers["x-backup-watermark"])
+
+    await create_transaction(
+        test_app, account_id=acc["id"], payee="Edeka", external_id="d"
+    )
+    session_factory = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+    async with session_factory() as session:
+        tx = await session.get(Transaction, renamed["id"])
+        assert tx is not None
+        tx.payee = "Aldi Süd"
+        await session.delete(await session.get(Transaction, removed["id"]))
+        await session.commit()
+
+    resp = await test_app.get("/api/export/sqlite", params={"since": since})
+    assert resp.status_code == 200
+    assert "since" in resp.headers["content-disposition"]
+    diff = tmp_path / "diff.sqlite"
+    diff.write_bytes(resp.content)
+
+    # Only the changed rows travel; the untouched one stays behind
+    payees = {r[1] for r in _rows(diff)}
+    assert payees == {"Aldi Süd", "Edeka"}
+    assert kept["id"] not in {r[0] for r in _rows(diff)}
+
+    watermark = apply_differential(base, diff)
+
+    assert watermark == int(resp.headers["x-backup-watermark"])
+    live = test_app._transport.app.state.db_path  # type: ignore[union-attr]
+    assert _rows(base) == _rows(live)
+
+    # Nothing changed since: the next differential is empty
+    resp = await test_app.get("/api/export/sqlite", params={"since": watermark})
+    empty = tmp_path / "empty.sqlite"
+    empty.write_bytes(resp.content)
+    assert _rows(empty) == []
+
+
+@pytest.mark.asyncio
+async def test_export_sqlite_differential_rejects_future_watermark(
+    test_app: AsyncClient,
+) -> None:
+    resp = await test_app.get("/api/export/sqlite", params={"since": 10_000})
+    assert resp.status_code == 409
+    assert "ahead" in resp.json()["detail"]
+
+
 @pytest.mark.asyncio
 async def test_export_json_structure(test_app: AsyncClient) -> None:
     acc = await create_account(test_app, name="Checking")
@@ -61,3 +197,78 @@ async def test_export_json_decimal_as_string(test_app: AsyncClient) -> None:
     tx = data["transactions"][0]
     assert isinstance(tx["amount"], str)
     assert tx["amount"] == "42.99"
+
+
+@pytest.mark.asyncio
+async def test_export_json_streams_in_chunks(
+    test_app: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(json_export, "_CHUNK_BYTES", 256)
+    monkeypatch.setattr(json_export, "_YIELD_PER", 3)
+    acc = await create_account(test_app)
+    for i in range(25):
+        await create_transaction(
+            test_app, account_id=acc["id"], payee=f"Payee {i}", external_id=f"x-{i}"
+        )
+
+    session_factory = test_app._transport.app.state.read_session_factory  # type: ignore[union-attr]
+    chunks = [chunk async for chunk in json_export.stream_json_export(session_factory)]
+
+    assert len(chunks) > 1
+    data = json.loads(b"".join(chunks))
+    assert [t["payee"] for t in data["transactions"]] == [
+        f"Payee {i}" for i in range(25)
+    ]
+    assert data["categories"] == []
+
+
+@pytest.mark.asyncio
+async def test_export_json_is_a_snapshot(
+    test_app: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(json_export, "_CHUNK_BYTES", 1)
+    acc = await create_account(test_app)
+    await create_transaction(test_app, account_id=acc["id"], payee="Before")
+
+    session_factory = test_app._transport.app.state.read_session_factory  # type: ignore[union-attr]
+    chunks: list[bytes] = []
+    async for chunk in json_export.stream_json_export(session_factory):
+        if not chunks:
+            # Commits a new payee and transaction while accounts are read
+            await create_transaction(
+                test_app, account_id=acc["id"], payee="During", external_id="late"
+            )
+        chunks.append(chunk)
+
+    data = json.loads(b"".join(chunks))
+    assert [p["name"] for p in data["payees"]] == ["Before"]
+    assert [t["payee"] for t in data["transactions"]] == ["Before"]
+
+
+@pytest.mark.asyncio
+async def test_export_json_rows_match_model_dump(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app, name="Checking")
+    await create_transaction(test_app, account_id=acc["id"], amount="-1234.50")
+
+    data = json.loads((await test_app.get("/api/export/json")).content)
+
+    session_factory = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+    async with session_factory() as session:
+        tx = (await session.execute(select(Transaction))).scalars().one()
+    expected = json.loads(json.dumps(tx.model_dump(), default=str))
+    assert data["transactions"] == [expected]
+
+
+@pytest.mark.asyncio
+async def test_export_json_gzip(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app, name="Checking")
+    await create_transaction(test_app, account_id=acc["id"], payee="Rewe")
+
+    resp = await test_app.get("/api/export/json", params={"gzip": True})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/gzip"
+    assert ".json.gz" in resp.headers["content-disposition"]
+
+    data = json.loads(gzip.decompress(resp.content))
+    assert data["export_version"] == 1
+    assert [t["payee"] for t in data["transactions"]] == ["Rewe"]
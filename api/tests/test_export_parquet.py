@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import io
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from my_private_finances.cli.export_parquet import _run
+from my_private_finances.db import build_sqlite_url
+from my_private_finances.services import columnar_export
+from tests.helpers import create_account, create_category, create_transaction
+
+
+async def _seed(client: AsyncClient) -> tuple[int, int]:
+    giro = await create_account(client, name="Giro")
+    savings = await create_account(client, name="Savings")
+    parent = await create_category(client, name="Living")
+    child = await create_category(client, name="Groceries", parent_id=parent["id"])
+    tx = await create_transaction(
+        client,
+        account_id=giro["id"],
+        booking_date="2025-03-01",
+        amount="-1234.56",
+        payee="Rewe",
+        external_id="a",
+    )
+    res = await client.patch(
+        f"/api/transactions/{tx['id']}", json={"category_id": child["id"]}
+    )
+    assert res.status_code == 200, res.text
+    await create_transaction(
+        client,
+        account_id=giro["id"],
+        booking_date="2025-07-15",
+        amount="2500.00",
+        payee="Employer",
+        external_id="b",
+    )
+    await create_transaction(
+        client,
+        account_id=savings["id"],
+        booking_date="2025-05-01",
+        amount="0.05",
+        payee="Interest",
+        external_id="c",
+    )
+    return giro["id"], savings["id"]
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_typed_columns(test_app: AsyncClient) -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    await _seed(test_app)
+
+    resp = await test_app.get("/api/export/parquet")
+    assert resp.status_code == 200, resp.text
+    assert ".parquet" in resp.headers["content-disposition"]
+
+    table = pq.read_table(io.BytesIO(resp.content))
+    assert table.schema.field("amount").type == pa.decimal128(18, 2)
+    assert table.schema.field("booking_date").type == pa.date32()
+
+    rows = table.to_pylist()
+    assert [r["payee"] for r in rows] == ["Rewe", "Interest", "Employer"]
+    first = rows[0]
+    assert first["amount"] == Decimal("-1234.56")
+    assert first["booking_date"] == date(2025, 3, 1)
+    assert first["account_name"] == "Giro"
+    assert first["category_name"] == "Groceries"
+    assert first["parent_category_name"] == "Living"
+    assert rows[1]["amount"] == Decimal("0.05")
+    assert rows[1]["category_name"] is None
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_filters(test_app: AsyncClient) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    giro_id, _ = await _seed(test_app)
+
+    resp = await test_app.get(
+        "/api/export/parquet",
+        params={"account_id": giro_id, "date_from": "2025-06-01"},
+    )
+    assert resp.status_code == 200, resp.text
+    rows = pq.read_table(io.BytesIO(resp.content)).to_pylist()
+    assert [r["payee"] for r in rows] == ["Employer"]
+
+    resp = await test_app.get(
+        "/api/export/parquet",
+        params={"date_from": "2025-06-01", "date_to": "2025-01-01"},
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_arrow_stream(test_app: AsyncClient) -> None:
+    pa = pytest.importorskip("pyarrow")
+    await _seed(test_app)
+
+    resp = await test_app.get("/api/export/parquet", params={"format": "arrow"})
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+    table = pa.ipc.open_stream(resp.content).read_all()
+    assert table.num_rows == 3
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_writes_one_row_group_per_batch(
+    test_app: AsyncClient,
+) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    await _seed(test_app)
+
+    session_factory = test_app._transport.app.state.read_session_factory  # type: ignore[union-attr]
+    chunks = [
+        chunk
+        async for chunk in columnar_export.stream_transactions(
+            session_factory, batch_rows=2
+        )
+    ]
+
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_rows == 3
+    assert parquet.metadata.num_row_groups == 2
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_without_pyarrow(
+    test_app: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # A None entry makes "import pyarrow" raise ImportError
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    resp = await test_app.get("/api/export/parquet")
+    assert resp.status_code == 501
+    detail = resp.json()["detail"]
+    assert "pyarrow" in detail
+    assert "'parquet' extra" in detail
+
+
+@pytest.mark.asyncio
+async def test_cli_export_parquet(test_app: AsyncClient, tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    giro_id, _ = await _seed(test_app)
+    db_path = test_app._transport.app.state.db_path  # type: ignore[union-attr]
+    out = tmp_path / "tx.parquet"
+
+    code = await _run(build_sqlite_url(db_path), out, "parquet", account_id=giro_id)
+
+    assert code == 0
+    assert [r["payee"] for r in pq.read_table(out).to_pylist()] == [
+        "Rewe",
+        "Employer",
+    ]
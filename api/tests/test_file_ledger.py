@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from my_private_finances.services import csv_import
+from my_private_finances.services.csv_import import import_transactions_from_csv_path
+from my_private_finances.services.file_ledger import (
+    appended_from,
+    fingerprint_file,
+    is_duplicate,
+)
+from my_private_finances.services.watch_folder import _process_file
+from tests.helpers import create_account
+
+HEADER = "booking_date,amount,currency,payee,purpose\n"
+JAN = "2026-01-02,-10.00,EUR,Rewe,Groceries\n2026-01-15,2500.00,EUR,ACME,Salary\n"
+FEB = "2026-02-02,-12.00,EUR,Rewe,Groceries\n"
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_fingerprint_records_prefix_digests_at_line_ends(tmp_path: Path) -> None:
+    data = (HEADER + JAN + FEB).encode()
+    path = tmp_path / "export.csv"
+    path.write_bytes(data)
+    line_end = len((HEADER + JAN).encode())
+
+    fp = fingerprint_file(path, [line_end, line_end - 5, len(data) + 10])
+
+    assert fp.size == len(data)
+    assert fp.digest == _sha(data)
+    # Mid-line and past-the-end boundaries are not usable prefixes
+    assert fp.prefix_digests == {line_end: _sha(data[:line_end])}
+    assert is_duplicate(fp, {len(data): {_sha(data)}})
+    assert appended_from(fp, {line_end: {_sha(data[:line_end])}}) == line_end
+    assert appended_from(fp, {line_end: {"other"}}) == 0
+
+
+@pytest.mark.asyncio
+async def test_import_start_offset_parses_only_tail(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    acc = await create_account(test_app)
+    path = tmp_path / "export.csv"
+    path.write_text(HEADER + JAN + "not-a-date,-1.00,EUR,X,Y\n", encoding="utf-8")
+
+    session_factory = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+    async with session_factory() as session:
+        result = await import_transactions_from_csv_path(
+            session=session,
+            account_id=acc["id"],
+            csv_path=path,
+            start_offset=len((HEADER + JAN).encode()),
+        )
+
+    assert result.total_rows == 1
+    assert result.failed == 1
+    # Row numbers still refer to the full file
+    assert result.errors[0].row == 4
+
+
+async def _drop(watch: Path, name: str, content: str) -> Path:
+    path = watch / "giro" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+@pytest.mark.asyncio
+async def test_watch_skips_identical_and_imports_appended_tail(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    account = await create_account(test_app)
+    await test_app.post(
+        "/api/watch-folder/configs",
+        json={"subfolder_name": "giro", "account_id": account["id"]},
+    )
+    session_factory = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+    watch = tmp_path / "watch"
+
+    first = await _drop(watch, "jan.csv", HEADER + JAN)
+    assert await _process_file(first, session_factory) == "processed"
+
+    with patch(
+        "my_private_finances.services.watch_folder.parse_csv_file",
+        wraps=csv_import.parse_csv_file,
+    ) as spy:
+        again = await _drop(watch, "jan (1).csv", HEADER + JAN)
+        assert await _process_file(again, session_factory) == "duplicate"
+        assert not again.exists()
+        spy.assert_not_called()
+
+        extended = await _drop(watch, "jan-feb.csv", HEADER + JAN + FEB)
+        assert await _process_file(extended, session_factory) == "processed"
+        assert spy.call_args.kwargs["start_offset"] == len((HEADER + JAN).encode())
+
+    resp = await test_app.get("/api/transactions", params={"account_id": account["id"]})
+    assert len(resp.json()) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint", ["/api/data/transactions", "/api/data"])
+async def test_deleted_data_can_be_imported_again(
+    test_app: AsyncClient, tmp_path: Path, endpoint: str
+) -> None:
+    account_id = (await create_account(test_app))["id"]
+    await test_app.post(
+        "/api/watch-folder/configs",
+        json={"subfolder_name": "giro", "account_id": account_id},
+    )
+    session_factory = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+    watch = tmp_path / "watch"
+    first = await _drop(watch, "jan.csv", HEADER + JAN)
+    assert await _process_file(first, session_factory) == "processed"
+
+    assert (await test_app.delete(endpoint)).status_code == 200
+    if endpoint == "/api/data":
+        # Ids restart, so a stale ledger would match the new account
+        assert (await create_account(test_app))["id"] == account_id
+
+    again = await _drop(watch, "jan.csv", HEADER + JAN)
+    assert await _process_file(again, session_factory) == "processed"
+    resp = await test_app.get("/api/transactions", params={"account_id": account_id})
+    assert len(resp.json()["items"]) == 2
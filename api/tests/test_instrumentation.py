@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+
+from my_private_finances import instrumentation
+from my_private_finances.instrumentation import RequestStats, RouteTimings, param_shape
+
+from tests.helpers import create_account, create_transaction
+
+
+def _server_timing(res_headers: dict[str, str]) -> dict[str, str]:
+    metrics = {}
+    for part in res_headers["server-timing"].split(", "):
+        name, *params = part.split(";")
+        metrics[name] = ";".join(params)
+    return metrics
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header_counts_queries(test_app: AsyncClient) -> None:
+    account_id = (await create_account(test_app))["id"]
+    for i in range(3):
+        await create_transaction(
+            test_app, account_id=account_id, payee=f"Shop {i}", external_id=str(i)
+        )
+
+    res = await test_app.get("/api/transactions", params={"account_id": account_id})
+    assert res.status_code == 200
+
+    metrics = _server_timing(dict(res.headers))
+    assert set(metrics) == {"db", "queries", "rows", "ser", "total"}
+    assert metrics["db"].startswith("dur=")
+    assert int(metrics["queries"].removeprefix("desc=")) >= 1
+    assert int(metrics["rows"].removeprefix("desc=")) >= 3
+
+
+@pytest.mark.asyncio
+async def test_debug_metrics_reports_route_percentiles(test_app: AsyncClient) -> None:
+    for _ in range(3):
+        await test_app.get("/api/accounts")
+
+    res = await test_app.get("/api/debug/metrics")
+    assert res.status_code == 200
+    routes = res.json()["routes"]
+    stats = routes["GET /api/accounts"]
+    assert stats["count"] == 3
+    assert stats["p50_ms"] <= stats["p90_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    assert stats["avg_queries"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_logged_with_parameter_shapes(
+    test_app: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_MS", 0.0)
+    with caplog.at_level(logging.WARNING, logger="my_private_finances.instrumentation"):
+        await create_account(test_app, name="Secret Bank")
+
+    slow = [r.getMessage() for r in caplog.records if "Slow query" in r.getMessage()]
+    assert any("INSERT INTO account" in msg for msg in slow)
+    assert not any("Secret Bank" in msg for msg in slow)
+
+
+def test_param_shape() -> None:
+    assert param_shape({"a": 1, "b": Decimal("1.00")}) == "{a: int, b: Decimal}"
+    assert param_shape((1, "x", date(2026, 1, 1))) == "(int, str, date)"
+    assert param_shape([(1, "x"), (2, "y")]) == "2 x (int, str)"
+
+
+def test_route_timings_window_is_bounded() -> None:
+    timings = RouteTimings(window_size=5)
+    for ms in range(1, 11):
+        timings.record("GET /x", float(ms), RequestStats(queries=2))
+
+    summary = timings.summary()["GET /x"]
+    assert summary["count"] == 10
+    assert summary["window"] == 5
+    assert summary["p50_ms"] == 8.0
+    assert summary["max_ms"] == 10.0
+    assert summary["avg_queries"] == 2
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from my_private_finances.metrics import (
+    CONTENT_TYPE,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    _Metric,
+)
+
+from tests.helpers import create_account
+
+CSV = (
+    "booking_date,amount,currency,payee,purpose,external_id\n"
+    "2026-01-18,-12.34,EUR,Rewe,Groceries,abc-1\n"
+    "2026-01-19,-4.50,EUR,Baecker,Bread,abc-2\n"
+)
+
+
+def _sample(body: str, name: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_registry_renders_text_exposition() -> None:
+    registry = Registry()
+    requests = Counter("req_total", "Requests.", ["code"], registry=registry)
+    depth = Gauge("depth", "Queue depth.", registry=registry)
+    latency = Histogram(
+        "latency_seconds", "Latency.", buckets=(0.1, 1.0), registry=registry
+    )
+
+    requests.labels(code="200").inc()
+    requests.labels(code="200").inc(2)
+    requests.labels(code='5"0').inc()
+    depth.set(4)
+    depth.dec()
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3)
+
+    assert registry.render().splitlines() == [
+        "# HELP req_total Requests.",
+        "# TYPE req_total counter",
+        'req_total{code="200"} 3.0',
+        'req_total{code="5\\"0"} 1.0',
+        "# HELP depth Queue depth.",
+        "# TYPE depth gauge",
+        "depth 3.0",
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 3.55",
+        "latency_seconds_count 3",
+    ]
+
+
+def test_counter_rejects_decrease_and_missing_labels() -> None:
+    registry = Registry()
+    counter = Counter("c_total", "C.", ["kind"], registry=registry)
+    with pytest.raises(ValueError):
+        counter.labels(kind="x").inc(-1)
+    with pytest.raises(ValueError):
+        counter.inc()
+    with pytest.raises(ValueError):
+        Counter("c_total", "Duplicate.", registry=registry)
+
+
+def test_metric_subclasses_must_render_samples() -> None:
+    class Incomplete(_Metric[float]):
+        def _new_child(self) -> float:
+            return 0.0
+
+    with pytest.raises(TypeError, match="samples"):
+        Incomplete("incomplete", "Missing samples().", registry=None)  # type: ignore[abstract]
+
+
+@pytest.mark.asyncio
+async def test_histogram_timer_decorates_coroutines() -> None:
+    hist = Histogram("t_seconds", "T.", registry=None)
+
+    @hist.time()
+    async def work() -> str:
+        await asyncio.sleep(0.01)
+        return "done"
+
+    assert await work() == "done"
+    child = hist.labels()
+    assert child.count == 1
+    assert child.sum >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_import_and_route_metrics(
+    test_app: AsyncClient,
+) -> None:
+    before = (await test_app.get("/api/metrics")).text
+    acc = await create_account(test_app)
+
+    res = await test_app.post(
+        "/api/imports/csv",
+        params={"account_id": acc["id"]},
+        files={"file": ("import.csv", CSV, "text/csv")},
+    )
+    assert res.status_code == 200
+
+    res = await test_app.get("/api/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"] == CONTENT_TYPE
+    body = res.text
+
+    created = 'mpf_import_rows_total{result="created"}'
+    assert _sample(body, created) - _sample(before, created) == 2
+    assert _sample(body, "mpf_import_duration_seconds_count") >= 1
+    assert (
+        'mpf_http_request_duration_seconds_count{method="POST",'
+        'route="/api/imports/csv",status="200"}' in body
+    )
+    assert "# TYPE mpf_watch_queue_depth gauge" in body
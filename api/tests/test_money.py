@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, cast
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.models import Account, Transaction
+from my_private_finances.utils.money import from_minor, to_minor
+
+
+def test_to_minor_and_back() -> None:
+    assert to_minor(Decimal("12.34")) == 1234
+    assert to_minor(Decimal("-0.07")) == -7
+    assert to_minor("1.005") == 101  # half-up
+    assert to_minor(3) == 300
+    assert from_minor(1230) == Decimal("12.30")
+    assert str(from_minor(0)) == "0.00"
+    assert str(from_minor(-5)) == "-0.05"
+
+
+@pytest.mark.asyncio
+async def test_amounts_stored_as_integer_cents(db_session: AsyncSession) -> None:
+    account = Account(name="Main")
+    db_session.add(account)
+    await db_session.flush()
+    assert account.id is not None
+
+    for i, amount in enumerate(["0.10", "0.20", "-12345678.91"]):
+        db_session.add(
+            Transaction(
+                account_id=account.id,
+                booking_date=date(2026, 1, 1),
+                amount=Decimal(amount),
+                import_hash=f"h{i}",
+            )
+        )
+    await db_session.commit()
+
+    raw = await db_session.execute(
+        text('SELECT amount_minor, typeof(amount_minor) FROM "transaction" ORDER BY id')
+    )
+    assert raw.all() == [(10, "integer"), (20, "integer"), (-1234567891, "integer")]
+
+    tx = cast(Any, Transaction).__table__
+    small_total = await db_session.scalar(
+        select(func.sum(tx.c.amount)).where(tx.c.amount > 0)
+    )
+    assert small_total == Decimal("0.30")
+
+    fetched = (await db_session.execute(select(Transaction))).scalars().all()
+    assert [t.amount for t in fetched] == [
+        Decimal("0.10"),
+        Decimal("0.20"),
+        Decimal("-12345678.91"),
+    ]
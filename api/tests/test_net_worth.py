@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from tests.helpers import create_account, create_transaction
+
+API_PREFIX = "/api"
+
+
+def _month_start(d: date, back: int = 0) -> date:
+    year, month = d.year, d.month - back
+    while month <= 0:
+        month += 12
+        year -= 1
+    return date(year, month, 1)
+
+
+@pytest.mark.asyncio
+async def test_net_worth_sums_transactions_since_opening_balance(
+    test_app: AsyncClient,
+) -> None:
+    today = date.today()
+    this_month = _month_start(today)
+    last_month = _month_start(today, back=1)
+
+    acc = await create_account(test_app)
+    res = await test_app.patch(
+        f"{API_PREFIX}/accounts/{acc['id']}",
+        json={"opening_balance": "1000.00", "opening_balance_date": str(last_month)},
+    )
+    assert res.status_code == 200, res.text
+
+    rows = [
+        (last_month - timedelta(days=1), "-999.99"),  # before opening date
+        (last_month, "-100.10"),
+        (last_month + timedelta(days=3), "50.05"),
+        (this_month, "-0.01"),
+    ]
+    for i, (booking_date, amount) in enumerate(rows):
+        await create_transaction(
+            test_app,
+            account_id=acc["id"],
+            booking_date=str(booking_date),
+            amount=amount,
+            external_id=f"nw-{i}",
+        )
+
+    res = await test_app.get(f"{API_PREFIX}/reports/net-worth", params={"months": 3})
+    assert res.status_code == 200, res.text
+    body = res.json()
+
+    history = {point["month"]: point for point in body["history"]}
+    assert len(history) == 3
+    # Month before the opening date is not part of the history totals
+    assert history[f"{last_month.year}-{last_month.month:02d}"]["total"] == "949.95"
+    assert history[f"{this_month.year}-{this_month.month:02d}"]["total"] == "949.94"
+    assert body["current_total"] == "949.94"
+    assert body["month_over_month_change"] == "-0.01"
+    assert body["accounts"][0]["current_balance"] == "949.94"
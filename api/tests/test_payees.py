@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import json
+import random
+import string
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Any, cast
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.models import Account, Payee, Transaction
+from my_private_finances.models.payee import normalize_payee
+from my_private_finances.services.payee_clustering import compute_clusters, payee_key
+from my_private_finances.services.payees import PayeeInterner
+from tests.helpers import create_account, create_transaction
+
+CSV = (
+    "booking_date,amount,currency,payee,purpose,external_id\n"
+    "2026-02-01,-10.00,EUR,REWE  Markt,Groceries,a\n"
+    "2026-02-02,-20.00,EUR,rewe markt,Groceries,b\n"
+    "2026-02-03,-5.00,EUR,Baecker,Bread,c\n"
+    "2026-02-04,-1.00,EUR,,Fee,d\n"
+)
+
+
+async def _payee_ids(client: AsyncClient) -> dict[str | None, int | None]:
+    sf = client._transport.app.state.session_factory  # type: ignore[union-attr]
+    tx = cast(Any, Transaction).__table__
+    async with sf() as session:
+        rows = await session.execute(select(tx.c.payee, tx.c.payee_id))
+        return {r.payee: r.payee_id for r in rows}
+
+
+def test_normalize_payee() -> None:
+    assert normalize_payee("  REWE \t Markt ") == "rewe markt"
+    assert normalize_payee("Straße") == "strasse"
+    assert normalize_payee("   ") is None
+    assert normalize_payee(None) is None
+
+
+@pytest.mark.asyncio
+async def test_csv_import_interns_payees(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    resp = await test_app.post(
+        "/api/imports/csv",
+        params={"account_id": acc["id"]},
+        files={"file": ("import.csv", CSV, "text/csv")},
+    )
+    assert resp.json()["created"] == 4, resp.text
+
+    ids = await _payee_ids(test_app)
+    assert ids["REWE  Markt"] == ids["rewe markt"] is not None
+    assert ids["Baecker"] not in (None, ids["rewe markt"])
+    assert ids[None] is None
+
+    payees = (await test_app.get("/api/payees")).json()
+    assert [(p["name"], p["normalized"]) for p in payees] == [
+        ("Baecker", "baecker"),
+        ("REWE Markt", "rewe markt"),
+    ]
+    found = (await test_app.get("/api/payees", params={"q": "REWE"})).json()
+    assert [p["normalized"] for p in found] == ["rewe markt"]
+
+
+@pytest.mark.asyncio
+async def test_batch_and_single_create_share_payees(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    await create_transaction(test_app, account_id=acc["id"], payee="Netflix")
+    item = {
+        "account_id": acc["id"],
+        "booking_date": "2026-02-01",
+        "amount": "-12.99",
+        "currency": "EUR",
+        "payee": " NETFLIX",
+        "import_source": "api",
+        "external_id": "n-2",
+    }
+    resp = await test_app.post("/api/transactions/batch", json={"items": [item]})
+    assert resp.json()["created"] == 1, resp.text
+
+    ids = await _payee_ids(test_app)
+    assert ids["Netflix"] == ids[" NETFLIX"] is not None
+    assert len((await test_app.get("/api/payees")).json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_orm_writes_keep_payee_id_in_sync(db_session: AsyncSession) -> None:
+    acc = Account(name="Giro", currency="EUR")
+    db_session.add(acc)
+    await db_session.commit()
+    assert acc.id is not None
+
+    tx = Transaction(
+        account_id=acc.id,
+        booking_date=date(2026, 1, 1),
+        amount=Decimal("-1.00"),
+        payee="Spotify",
+        import_hash="h1",
+    )
+    db_session.add(tx)
+    await db_session.commit()
+    spotify = tx.payee_id
+    assert spotify is not None
+
+    tx.payee = "Apple"
+    await db_session.commit()
+    assert tx.payee_id not in (None, spotify)
+
+    tx.payee = None
+    await db_session.commit()
+    assert tx.payee_id is None
+
+
+@pytest.mark.asyncio
+async def test_interner_reuses_ids(db_session: AsyncSession) -> None:
+    interner = PayeeInterner()
+    first = await interner.ids(db_session, ["A", "a ", None, "B"])
+    assert first[0] == first[1] and first[2] is None and first[3] != first[0]
+    # A fresh interner finds the rows the first one created
+    again = await PayeeInterner().ids(db_session, ["b", "A"])
+    assert again == [first[3], first[0]]
+    count = (await db_session.execute(select(Payee))).scalars().all()
+    assert len(count) == 2
+
+
+@pytest.mark.asyncio
+async def test_monthly_top_payees_group_by_payee_and_use_alias(
+    test_app: AsyncClient,
+) -> None:
+    acc = await create_account(test_app)
+    for ext, payee, amount in (
+        ("a", "REWE", "-10.00"),
+        ("b", "rewe ", "-15.00"),
+        ("c", "Aldi", "-20.00"),
+    ):
+        await create_transaction(
+            test_app,
+            account_id=acc["id"],
+            booking_date="2026-02-10",
+            amount=amount,
+            payee=payee,
+            external_id=ext,
+        )
+
+    params = {"month": "2026-02", "account_id": acc["id"]}
+    report = (await test_app.get("/api/reports/monthly", params=params)).json()
+    assert [(p["payee"], p["total"]) for p in report["top_payees"]] == [
+        ("REWE", "-25.00"),
+        ("Aldi", "-20.00"),
+    ]
+
+    rewe = (await test_app.get("/api/payees", params={"q": "rewe"})).json()[0]
+    resp = await test_app.patch(
+        f"/api/payees/{rewe['id']}", json={"alias": "Rewe Supermarkt"}
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["alias"] == "Rewe Supermarkt"
+
+    report = (await test_app.get("/api/reports/monthly", params=params)).json()
+    assert report["top_payees"][0]["payee"] == "Rewe Supermarkt"
+
+    resp = await test_app.patch(f"/api/payees/{rewe['id']}", json={"alias": None})
+    assert resp.json()["alias"] is None
+    assert (await test_app.patch("/api/payees/999", json={})).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_restore_backfills_payee_ids_of_older_exports(
+    test_app: AsyncClient,
+) -> None:
+    acc = await create_account(test_app)
+    await create_transaction(test_app, account_id=acc["id"], payee="Rewe")
+    doc = json.loads((await test_app.get("/api/export/json")).content)
+    # As exported before the payee dictionary existed
+    del doc["payees"]
+    for row in doc["transactions"]:
+        del row["payee_id"]
+
+    resp = await test_app.post(
+        "/api/restore/json",
+        files={"file": ("backup.json", json.dumps(doc).encode(), "application/json")},
+    )
+    assert resp.status_code == 200, resp.text
+    ids = await _payee_ids(test_app)
+    assert ids["Rewe"] is not None
+    payees = (await test_app.get("/api/payees")).json()
+    assert [p["id"] for p in payees] == [ids["Rewe"]]
+
+
+def test_payee_key_drops_noise() -> None:
+    assert payee_key("netflix.com 1234") == "netflix"
+    assert payee_key("paypal *netflix") == "netflix"
+    assert payee_key("rewe sagt danke 0815") == "rewe"
+    assert payee_key("paypal") == "paypal"
+
+
+def test_compute_clusters_merges_spellings_only() -> None:
+    clusters = compute_clusters(
+        [
+            (1, "netflix.com 1234"),
+            (2, "netflix international"),
+            (3, "paypal *netflix"),
+            (4, "paypal *spotify"),
+            (5, "spotify ab"),
+            (6, "rewe markt"),
+            (7, "rewe  markt 0815"),
+            (8, "aldi sued"),
+        ]
+    )
+    assert clusters == {1: 1, 2: 1, 3: 1, 4: 4, 5: 4, 6: 6, 7: 6, 8: 8}
+
+
+def test_compute_clusters_scales_without_all_pairs() -> None:
+    rng = random.Random(7)
+    names = {
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 14)))
+        for _ in range(20_000)
+    }
+    payees = [(i, f"{n} {rng.randint(1, 9999)}") for i, n in enumerate(names, 1)]
+    payees += [
+        (len(payees) + i, f"PAYPAL *{n}".casefold())
+        for i, (_, n) in enumerate(payees[:1000], 1)
+    ]
+
+    started = time.perf_counter()
+    clusters = compute_clusters(payees)
+    assert time.perf_counter() - started < 15
+
+    # Every PayPal copy joins its original; unrelated names stay apart
+    for i, (payee_id, _) in enumerate(payees[:1000]):
+        assert clusters[payees[len(names) + i][0]] == payee_id
+    assert len(set(clusters.values())) > 0.95 * len(names)
+
+
+@pytest.mark.asyncio
+async def test_clusters_merge_recurring_payments_and_report_totals(
+    test_app: AsyncClient,
+) -> None:
+    acc = await create_account(test_app)
+    detect = "/api/recurring-patterns/detect"
+    spellings = ["NETFLIX.COM 1234", "Netflix International", "PAYPAL *NETFLIX"]
+    for month in range(1, 7):
+        await create_transaction(
+            test_app,
+            account_id=acc["id"],
+            booking_date=f"2026-{month:02d}-05",
+            amount="-12.99",
+            payee=spellings[month % 3],
+            external_id=f"n-{month}",
+        )
+
+    detected = (await test_app.post(detect, params={"account_id": acc["id"]})).json()
+    # Two payments per spelling are too few on their own
+    assert detected == []
+
+    resp = await test_app.post("/api/payees/clusters")
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["payees"] == 3
+    assert resp.json()["clusters"] == 1
+
+    payees = (await test_app.get("/api/payees")).json()
+    first = min(p["id"] for p in payees)
+    assert {p["cluster_id"] for p in payees} == {first}
+    members = (await test_app.get("/api/payees", params={"cluster_id": first})).json()
+    assert len(members) == 3
+
+    detected = (await test_app.post(detect, params={"account_id": acc["id"]})).json()
+    assert [(p["frequency"], p["occurrence_count"]) for p in detected] == [
+        ("monthly", 6)
+    ]
+
+    params = {"month": "2026-03", "account_id": acc["id"]}
+    await test_app.patch(f"/api/payees/{first}", json={"alias": "Netflix"})
+    report = (await test_app.get("/api/reports/monthly", params=params)).json()
+    assert [p["payee"] for p in report["top_payees"]] == ["Netflix"]
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from my_private_finances.db import write_queue
+from my_private_finances.services import recurring_detection
+from my_private_finances.services.post_import import (
+    PostImportScheduler,
+    post_import_scheduler,
+)
+from tests.helpers import create_account, create_category, create_transaction
+
+CSV = (
+    "booking_date,amount,currency,payee,purpose\n2026-01-18,-12.34,EUR,Rewe,Groceries\n"
+)
+
+
+def _session_factory(test_app: AsyncClient) -> async_sessionmaker[AsyncSession]:
+    return test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+
+
+class _SlowPipeline:
+    """Stands in for the sklearn pipeline; fitting blocks its thread."""
+
+    def fit(self, texts: list[str], labels: list[Any]) -> None:
+        time.sleep(0.3)
+
+
+async def _wait_for_run(scheduler: PostImportScheduler, timeout: float = 2) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if scheduler.last_run is not None and not scheduler.status().pending:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("post-import jobs did not run")
+
+
+@pytest.mark.asyncio
+async def test_events_for_one_account_coalesce_into_one_run(
+    test_app: AsyncClient,
+) -> None:
+    giro = await create_account(test_app, name="Giro")
+    savings = await create_account(test_app, name="Savings")
+    scheduler = PostImportScheduler(_session_factory(test_app), quiet_period=0.05)
+
+    with patch(
+        "my_private_finances.services.post_import.run_detection",
+        wraps=recurring_detection.run_detection,
+    ) as spy:
+        for _ in range(12):
+            scheduler.notify(giro["id"])
+        scheduler.notify(savings["id"])
+        status = scheduler.status()
+        assert [(p.account_id, p.events) for p in status.pending] == [
+            (giro["id"], 12),
+            (savings["id"], 1),
+        ]
+
+        await _wait_for_run(scheduler)
+
+    assert sorted(c.kwargs["account_id"] for c in spy.call_args_list) == [
+        giro["id"],
+        savings["id"],
+    ]
+    assert scheduler.last_run is not None
+    assert scheduler.last_run.account_ids == [giro["id"], savings["id"]]
+    assert scheduler.last_run.failed_jobs == []
+
+
+@pytest.mark.asyncio
+async def test_max_delay_bounds_a_steady_stream(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    scheduler = PostImportScheduler(
+        _session_factory(test_app), quiet_period=0.05, max_delay=0.1
+    )
+
+    for _ in range(15):
+        scheduler.notify(acc["id"])
+        await asyncio.sleep(0.02)
+        if scheduler.last_run is not None:
+            break
+
+    assert scheduler.last_run is not None
+    await scheduler.shutdown(flush=False)
+
+
+@pytest.mark.asyncio
+async def test_import_defers_detection_and_status_reports_it(
+    test_app: AsyncClient,
+) -> None:
+    acc = await create_account(test_app)
+    resp = await test_app.post(
+        "/api/imports/csv",
+        params={"account_id": acc["id"]},
+        files={"file": ("import.csv", CSV, "text/csv")},
+    )
+    assert resp.status_code == 200, resp.text
+
+    status = (await test_app.get("/api/post-import/status")).json()
+    assert [p["account_id"] for p in status["pending"]] == [acc["id"]]
+    assert status["last_run"] is None
+
+    await post_import_scheduler(_session_factory(test_app)).shutdown()
+
+    status = (await test_app.get("/api/post-import/status")).json()
+    assert status["pending"] == []
+    assert status["last_run"]["account_ids"] == [acc["id"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("read_pool", [True, False])
+async def test_ml_retrain_keeps_loop_and_write_queue_free(
+    test_app: AsyncClient, tmp_path: Path, read_pool: bool
+) -> None:
+    acc = await create_account(test_app)
+    cat = await create_category(test_app)
+    items = []
+    for i in range(12):
+        tx = await create_transaction(
+            test_app, account_id=acc["id"], external_id=f"ml-{i}"
+        )
+        items.append({"id": tx["id"], "category_id": cat["id"]})
+    resp = await test_app.patch("/api/transactions/bulk", json={"items": items})
+    assert resp.json()["updated"] == 12, resp.text
+
+    model_path = tmp_path / "ml_model.joblib"
+    model_path.touch()
+    sf = _session_factory(test_app)
+    # Without a read pool the job shares the single writer connection
+    read_sf = test_app._transport.app.state.read_session_factory  # type: ignore[union-attr]
+    scheduler = PostImportScheduler(
+        sf, read_session_factory=read_sf if read_pool else None
+    )
+    stalls: list[float] = []
+    write_waits: list[float] = []
+
+    async def probe() -> None:
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            stalls.append(now - last)
+            async with write_queue(sf).session() as session:
+                await session.execute(text("SELECT 1"))
+                write_waits.append(time.perf_counter() - now)
+            last = time.perf_counter()
+
+    with (
+        patch(
+            "my_private_finances.services.ml_categorization._model_path",
+            return_value=model_path,
+        ),
+        patch(
+            "my_private_finances.services.ml_categorization._build_pipeline",
+            return_value=_SlowPipeline(),
+        ),
+    ):
+        ticker = asyncio.create_task(probe())
+        started = time.perf_counter()
+        run = await scheduler.run_now([acc["id"]])
+        elapsed = time.perf_counter() - started
+        ticker.cancel()
+
+    assert run.failed_jobs == []
+    assert elapsed >= 0.3
+    assert model_path.stat().st_size > 0
+    # The loop kept ticking and writers got their turn while the model fitted
+    assert max(stalls) < 0.2
+    assert max(write_waits) < 0.2
+    # A probe stuck behind the write queue would stop counting
+    assert len(write_waits) > 10
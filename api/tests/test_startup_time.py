@@ -0,0 +1,62 @@
+"""Startup-time budget for the app and the CSV import CLI.
+
+Each module is imported in a fresh interpreter, so nothing cached by the test
+session skews the result. The budget is generous enough for slow CI machines
+but fails if a heavy dependency (scikit-learn, pandas, watchdog) slips back
+onto the import path. Override it with ``STARTUP_BUDGET_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+API_ROOT = Path(__file__).resolve().parents[1]
+
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", 2.5))
+
+LAZY_MODULES = ("sklearn", "scipy", "pandas", "joblib", "watchdog")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {lazy!r} if m in sys.modules],
+}}))
+"""
+
+
+def _probe_import(module: str, cwd: Path) -> dict[str, object]:
+    env = {**os.environ, "PYTHONPATH": str(API_ROOT), "LOG_LEVEL": "WARNING"}
+    env.pop("DATABASE_URL", None)
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, lazy=LAZY_MODULES)],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result: dict[str, object] = json.loads(out.stdout.strip().splitlines()[-1])
+    return result
+
+
+@pytest.mark.parametrize(
+    "module", ["my_private_finances.main", "my_private_finances.cli.import_csv"]
+)
+def test_import_stays_within_startup_budget(module: str, tmp_path: Path) -> None:
+    result = _probe_import(module, tmp_path)
+
+    assert result["loaded"] == [], f"{module} eagerly imports {result['loaded']}"
+    seconds = float(str(result["seconds"]))
+    assert seconds < STARTUP_BUDGET_SECONDS, (
+        f"Importing {module} took {seconds:.2f}s (budget {STARTUP_BUDGET_SECONDS:.2f}s)"
+    )
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from my_private_finances.models import Account, Transaction
+from my_private_finances.services.transaction_search import (
+    build_match_expression,
+    search_filter,
+)
+
+
+def test_match_expression_quotes_prefix_tokens() -> None:
+    assert build_match_expression("Rewe markt") == '"Rewe"* AND "markt"*'
+
+
+def test_match_expression_strips_fts_syntax() -> None:
+    assert build_match_expression('"a" OR b*') == '"a"* AND "OR"* AND "b"*'
+
+
+def test_match_expression_none_without_words() -> None:
+    assert build_match_expression("*** ---") is None
+
+
+async def _add_tx(session: AsyncSession, **kwargs: object) -> Transaction:
+    acc = Account(name="Main")
+    session.add(acc)
+    await session.flush()
+    assert acc.id is not None
+    tx = Transaction(
+        account_id=acc.id,
+        booking_date=date(2026, 1, 1),
+        amount=Decimal("-1.00"),
+        import_hash=f"h-{kwargs}",
+        **kwargs,  # type: ignore[arg-type]
+    )
+    session.add(tx)
+    await session.commit()
+    return tx
+
+
+async def _search(session: AsyncSession, q: str) -> list[int | None]:
+    res = await session.execute(select(Transaction.id).where(search_filter(session, q)))
+    return list(res.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_search_covers_notes(db_session: AsyncSession) -> None:
+    tx = await _add_tx(db_session, payee="Amazon", notes="birthday present")
+    assert await _search(db_session, "birthday") == [tx.id]
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_updates(db_session: AsyncSession) -> None:
+    tx = await _add_tx(db_session, payee="Old Name")
+    tx.payee = "New Name"
+    await db_session.commit()
+
+    assert await _search(db_session, "old") == []
+    assert await _search(db_session, "new") == [tx.id]
+
+
+@pytest.mark.asyncio
+async def test_search_without_tokens_falls_back_to_like(
+    db_session: AsyncSession,
+) -> None:
+    tx = await _add_tx(db_session, payee="C&A")
+    assert await _search(db_session, "&") == [tx.id]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+from tests.helpers import (
+    create_account,
+    create_category,
+    create_rule,
+    create_transaction,
+)
+
+
+def _item(account_id: int, external_id: str, **overrides: Any) -> dict[str, Any]:
+    item: dict[str, Any] = {
+        "account_id": account_id,
+        "booking_date": "2026-01-18",
+        "amount": "-12.34",
+        "currency": "EUR",
+        "payee": "Rewe",
+        "purpose": "Groceries",
+        "import_source": "script",
+        "external_id": external_id,
+    }
+    item.update(overrides)
+    return item
+
+
+@pytest.mark.asyncio
+async def test_batch_create_inserts_all_items(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+
+    res = await test_app.post(
+        "/api/transactions/batch",
+        json={"items": [_item(acc["id"], f"x-{i}") for i in range(3)]},
+    )
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["created"] == 3
+    assert body["duplicates"] == 0
+    assert body["failed"] == 0
+    assert [i["status"] for i in body["items"]] == ["created"] * 3
+    assert all(isinstance(i["id"], int) for i in body["items"])
+
+    listed = await test_app.get("/api/transactions", params={"account_id": acc["id"]})
+    assert listed.json()["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_create_reports_duplicates(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    existing = await create_transaction(
+        test_app,
+        account_id=acc["id"],
+        amount="-12.34",
+        import_source="script",
+        external_id="dup-db",
+    )
+
+    res = await test_app.post(
+        "/api/transactions/batch",
+        json={
+            "items": [
+                _item(acc["id"], "dup-db"),
+                _item(acc["id"], "new"),
+                _item(acc["id"], "new"),
+            ]
+        },
+    )
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert [i["status"] for i in body["items"]] == [
+        "duplicate",
+        "created",
+        "duplicate",
+    ]
+    assert body["items"][1]["id"] != existing["id"]
+    assert body["created"] == 1
+    assert body["duplicates"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_create_reports_invalid_references(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+
+    res = await test_app.post(
+        "/api/transactions/batch",
+        json={
+            "items": [
+                _item(99999, "a"),
+                _item(acc["id"], "b", category_id=99999),
+                _item(acc["id"], "c"),
+            ]
+        },
+    )
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert [i["status"] for i in body["items"]] == ["error", "error", "created"]
+    assert body["items"][0]["detail"] == "Account not found"
+    assert body["items"][1]["detail"] == "Category not found"
+    assert body["failed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_create_applies_rules_and_keeps_explicit_category(
+    test_app: AsyncClient,
+) -> None:
+    acc = await create_account(test_app)
+    groceries = await create_category(test_app, name="Groceries")
+    other = await create_category(test_app, name="Other")
+    await create_rule(test_app, value="Rewe", category_id=groceries["id"])
+
+    res = await test_app.post(
+        "/api/transactions/batch",
+        json={
+            "items": [
+                _item(acc["id"], "r1"),
+                _item(acc["id"], "r2", category_id=other["id"]),
+                _item(acc["id"], "r3", payee="Shell", notes="fuel"),
+            ]
+        },
+    )
+    assert res.status_code == 200, res.text
+
+    rows = {
+        r["external_id"]: r
+        for r in (
+            await test_app.get("/api/transactions", params={"account_id": acc["id"]})
+        ).json()["items"]
+    }
+    assert rows["r1"]["category_id"] == groceries["id"]
+    assert rows["r2"]["category_id"] == other["id"]
+    assert rows["r3"]["category_id"] is None
+    assert rows["r3"]["notes"] == "fuel"
+
+
+@pytest.mark.asyncio
+async def test_batch_create_rejects_empty_batch(test_app: AsyncClient) -> None:
+    res = await test_app.post("/api/transactions/batch", json={"items": []})
+    assert res.status_code == 422
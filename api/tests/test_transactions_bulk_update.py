@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+
+from tests.helpers import create_account, create_category, create_transaction
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_items_sets_fields(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    cat = await create_category(test_app, name="Groceries")
+    tx1 = await create_transaction(test_app, account_id=acc["id"], external_id="b1")
+    tx2 = await create_transaction(test_app, account_id=acc["id"], external_id="b2")
+
+    res = await test_app.patch(
+        "/api/transactions/bulk",
+        json={
+            "items": [
+                {"id": tx1["id"], "category_id": cat["id"]},
+                {"id": tx2["id"], "notes": "shared", "is_transfer": True},
+            ]
+        },
+    )
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["updated"] == 2
+    assert [i["status"] for i in body["items"]] == ["updated", "updated"]
+
+    rows = {
+        r["id"]: r
+        for r in (
+            await test_app.get("/api/transactions", params={"account_id": acc["id"]})
+        ).json()["items"]
+    }
+    assert rows[tx1["id"]]["category_id"] == cat["id"]
+    assert rows[tx1["id"]]["notes"] is None
+    assert rows[tx2["id"]]["category_id"] is None
+    assert rows[tx2["id"]]["notes"] == "shared"
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_reports_per_item_errors(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    cat = await create_category(test_app, name="Groceries")
+    tx = await create_transaction(test_app, account_id=acc["id"])
+
+    res = await test_app.patch(
+        "/api/transactions/bulk",
+        json={
+            "items": [
+                {"id": tx["id"], "category_id": cat["id"]},
+                {"id": 99999, "category_id": cat["id"]},
+                {"id": tx["id"], "category_id": 88888},
+            ]
+        },
+    )
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["updated"] == 1
+    assert [i["status"] for i in body["items"]] == [
+        "updated",
+        "not_found",
+        "invalid_category",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_clears_category_with_explicit_null(
+    test_app: AsyncClient,
+) -> None:
+    acc = await create_account(test_app)
+    cat = await create_category(test_app, name="Groceries")
+    tx = await create_transaction(test_app, account_id=acc["id"])
+    await test_app.patch(
+        f"/api/transactions/{tx['id']}", json={"category_id": cat["id"]}
+    )
+
+    res = await test_app.patch(
+        "/api/transactions/bulk",
+        json={"items": [{"id": tx["id"], "category_id": None}]},
+    )
+    assert res.status_code == 200
+    rows = (
+        await test_app.get("/api/transactions", params={"account_id": acc["id"]})
+    ).json()["items"]
+    assert rows[0]["category_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_by_filter(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    cat = await create_category(test_app, name="Groceries")
+    await create_transaction(
+        test_app, account_id=acc["id"], payee="REWE Markt", external_id="f1"
+    )
+    await create_transaction(
+        test_app, account_id=acc["id"], payee="REWE City", external_id="f2"
+    )
+    other = await create_transaction(
+        test_app, account_id=acc["id"], payee="Shell", external_id="f3"
+    )
+
+    res = await test_app.patch(
+        "/api/transactions/bulk",
+        json={
+            "filter": {"account_id": acc["id"], "q": "rewe"},
+            "category_id": cat["id"],
+        },
+    )
+    assert res.status_code == 200, res.text
+    assert res.json()["updated"] == 2
+
+    rows = (
+        await test_app.get("/api/transactions", params={"account_id": acc["id"]})
+    ).json()["items"]
+    by_id = {r["id"]: r["category_id"] for r in rows}
+    assert by_id[other["id"]] is None
+    assert sorted(v for v in by_id.values() if v is not None) == [cat["id"]] * 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_by_filter_validates_category(
+    test_app: AsyncClient,
+) -> None:
+    acc = await create_account(test_app)
+    res = await test_app.patch(
+        "/api/transactions/bulk",
+        json={"filter": {"account_id": acc["id"]}, "category_id": 99999},
+    )
+    assert res.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_empty_filter(test_app: AsyncClient) -> None:
+    cat = await create_category(test_app, name="Groceries")
+    res = await test_app.patch(
+        "/api/transactions/bulk",
+        json={"filter": {}, "category_id": cat["id"]},
+    )
+    assert res.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_requires_exactly_one_mode(test_app: AsyncClient) -> None:
+    res = await test_app.patch("/api/transactions/bulk", json={})
+    assert res.status_code == 422
+
+    res = await test_app.patch(
+        "/api/transactions/bulk",
+        json={"items": [], "filter": {"account_id": 1}, "category_id": None},
+    )
+    assert res.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "flt",
+    [
+        {"category_filter": "anything"},
+        {"q": ""},
+        {"q": "   "},
+    ],
+)
+async def test_bulk_update_rejects_filters_without_criteria(
+    test_app: AsyncClient, flt: dict[str, str]
+) -> None:
+    acc = await create_account(test_app)
+    cat = await create_category(test_app, name="Groceries")
+    await create_transaction(test_app, account_id=acc["id"])
+
+    res = await test_app.patch(
+        "/api/transactions/bulk",
+        json={"filter": flt, "category_id": cat["id"]},
+    )
+    assert res.status_code == 422
+
+    items = (await test_app.get("/api/transactions")).json()["items"]
+    assert [t["category_id"] for t in items] == [None]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_null_is_transfer(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    tx = await create_transaction(test_app, account_id=acc["id"])
+
+    res = await test_app.patch(
+        "/api/transactions/bulk",
+        json={"items": [{"id": tx["id"], "is_transfer": None}]},
+    )
+    assert res.status_code == 422
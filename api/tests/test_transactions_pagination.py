@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import pytest
+from httpx import AsyncClient
+
+from tests.helpers import create_account, create_transaction
+
+
+async def _seed(client: AsyncClient, account_id: int) -> list[int]:
+    """Create five transactions over three days; return ids in list order."""
+    dates = ["2026-01-01", "2026-01-02", "2026-01-02", "2026-01-03", "2026-01-03"]
+    created = [
+        await create_transaction(
+            client, account_id=account_id, booking_date=d, external_id=f"page-{i}"
+        )
+        for i, d in enumerate(dates)
+    ]
+    ordered = sorted(created, key=lambda t: (t["booking_date"], t["id"]), reverse=True)
+    return [t["id"] for t in ordered]
+
+
+@pytest.mark.asyncio
+async def test_cursor_walks_all_pages_in_order(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    expected = await _seed(test_app, acc["id"])
+
+    seen: list[int] = []
+    params: dict[str, object] = {"account_id": acc["id"], "limit": 2}
+    pages = 0
+    while True:
+        res = await test_app.get("/api/transactions", params=params)
+        assert res.status_code == 200, res.text
+        body = res.json()
+        seen.extend(row["id"] for row in body["items"])
+        pages += 1
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+
+    assert seen == expected
+    assert pages == 3
+
+
+@pytest.mark.asyncio
+async def test_total_only_on_first_page_by_default(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    await _seed(test_app, acc["id"])
+
+    first = (
+        await test_app.get(
+            "/api/transactions", params={"account_id": acc["id"], "limit": 2}
+        )
+    ).json()
+    assert first["total"] == 5
+
+    second = (
+        await test_app.get(
+            "/api/transactions",
+            params={
+                "account_id": acc["id"],
+                "limit": 2,
+                "cursor": first["next_cursor"],
+            },
+        )
+    ).json()
+    assert second["total"] is None
+
+    counted = (
+        await test_app.get(
+            "/api/transactions",
+            params={
+                "account_id": acc["id"],
+                "limit": 2,
+                "cursor": first["next_cursor"],
+                "include_total": True,
+            },
+        )
+    ).json()
+    assert counted["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_last_page_has_no_next_cursor(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    await _seed(test_app, acc["id"])
+
+    res = await test_app.get(
+        "/api/transactions", params={"account_id": acc["id"], "limit": 5}
+    )
+    body = res.json()
+    assert len(body["items"]) == 5
+    assert body["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_respects_filters(test_app: AsyncClient) -> None:
+    acc1 = await create_account(test_app, name="A1")
+    acc2 = await create_account(test_app, name="A2")
+    expected = await _seed(test_app, acc1["id"])
+    await _seed(test_app, acc2["id"])
+
+    first = (
+        await test_app.get(
+            "/api/transactions", params={"account_id": acc1["id"], "limit": 3}
+        )
+    ).json()
+    second = (
+        await test_app.get(
+            "/api/transactions",
+            params={
+                "account_id": acc1["id"],
+                "limit": 3,
+                "cursor": first["next_cursor"],
+            },
+        )
+    ).json()
+
+    ids = [r["id"] for r in first["items"]] + [r["id"] for r in second["items"]]
+    assert ids == expected
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_rejected(test_app: AsyncClient) -> None:
+    res = await test_app.get("/api/transactions", params={"cursor": "not-a-cursor"})
+    assert res.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_cursor_and_offset_cannot_be_combined(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    await _seed(test_app, acc["id"])
+    first = (
+        await test_app.get(
+            "/api/transactions", params={"account_id": acc["id"], "limit": 2}
+        )
+    ).json()
+
+    res = await test_app.get(
+        "/api/transactions",
+        params={"cursor": first["next_cursor"], "offset": 2},
+    )
+    assert res.status_code == 422
@@ -196,3 +196,126 @@ async def test_search_combined_with_account(test_app: AsyncClient) -> None:
     body = res.json()
     assert body["total"] == 1
     assert body["items"][0]["account_id"] == acc1["id"]
+
+
+@pytest.mark.asyncio
+async def test_search_matches_word_prefix(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    await create_transaction(
+        test_app, account_id=acc["id"], payee="NETFLIX.COM 1234", external_id="p1"
+    )
+    await create_transaction(
+        test_app, account_id=acc["id"], payee="Spotify", external_id="p2"
+    )
+
+    res = await test_app.get(
+        "/api/transactions", params={"account_id": acc["id"], "q": "netf"}
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["total"] == 1
+    assert body["items"][0]["payee"] == "NETFLIX.COM 1234"
+
+
+@pytest.mark.asyncio
+async def test_search_requires_all_words(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    await create_transaction(
+        test_app,
+        account_id=acc["id"],
+        payee="Landlord",
+        purpose="Rent January",
+        external_id="w1",
+    )
+    await create_transaction(
+        test_app,
+        account_id=acc["id"],
+        payee="Landlord",
+        purpose="Rent February",
+        external_id="w2",
+    )
+
+    res = await test_app.get(
+        "/api/transactions",
+        params={"account_id": acc["id"], "q": "landlord jan"},
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["total"] == 1
+    assert body["items"][0]["purpose"] == "Rent January"
+
+
+@pytest.mark.asyncio
+async def test_search_treats_operators_as_text(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    await create_transaction(
+        test_app, account_id=acc["id"], payee="PAYPAL *NETFLIX", external_id="o1"
+    )
+
+    for q in ['paypal "netflix', "paypal AND", "*netflix", "NEAR(netflix)"]:
+        res = await test_app.get(
+            "/api/transactions", params={"account_id": acc["id"], "q": q}
+        )
+        assert res.status_code == 200, f"q={q!r}: {res.text}"
+
+    res = await test_app.get(
+        "/api/transactions", params={"account_id": acc["id"], "q": "*netflix"}
+    )
+    assert res.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_deletes(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    await create_transaction(
+        test_app, account_id=acc["id"], payee="REWE", external_id="d1"
+    )
+
+    await test_app.delete("/api/data/transactions")
+    res = await test_app.get("/api/transactions", params={"q": "rewe"})
+    assert res.status_code == 200
+    assert res.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_search_sort_by_relevance(test_app: AsyncClient) -> None:
+    acc = await create_account(test_app)
+    weak = await create_transaction(
+        test_app,
+        account_id=acc["id"],
+        booking_date="2026-01-20",
+        payee="Bakery",
+        purpose="coffee and cake for the whole team at the office party",
+        external_id="r1",
+    )
+    strong = await create_transaction(
+        test_app,
+        account_id=acc["id"],
+        booking_date="2026-01-01",
+        payee="Coffee Shop",
+        purpose="coffee",
+        external_id="r2",
+    )
+
+    by_date = await test_app.get(
+        "/api/transactions", params={"account_id": acc["id"], "q": "coffee"}
+    )
+    assert [r["id"] for r in by_date.json()["items"]] == [weak["id"], strong["id"]]
+
+    by_rank = await test_app.get(
+        "/api/transactions",
+        params={"account_id": acc["id"], "q": "coffee", "sort": "relevance"},
+    )
+    assert by_rank.status_code == 200
+    body = by_rank.json()
+    assert body["total"] == 2
+    assert [r["id"] for r in body["items"]] == [strong["id"], weak["id"]]
+
+
+@pytest.mark.asyncio
+async def test_relevance_sort_rejects_cursor(test_app: AsyncClient) -> None:
+    res = await test_app.get(
+        "/api/transactions",
+        params={"q": "coffee", "sort": "relevance", "cursor": "MjAyNi0wMS0wMXwx"},
+    )
+    assert res.status_code == 422
@@ -2,18 +2,28 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 
 import pytest
 from httpx import AsyncClient
 
-from my_private_finances.db import create_engine, create_session_factory
+from my_private_finances.db import (
+    create_engine,
+    create_session_factory,
+    write_queue,
+)
+from my_private_finances.services.csv_import import parse_csv_file
 from my_private_finances.services.watch_folder import (
     _move_to_failed,
     _move_to_processed,
+    WatchWorkerPool,
     _process_file,
+    catch_up_scan,
+    wait_until_stable,
     watch_folder_task,
 )
+from my_private_finances.services.watch_observer import QueueHandler
 from tests.helpers import create_account
 
 
@@ -268,7 +278,7 @@ async def test_process_file_import_exception_moves_to_failed(
     session_factory = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
 
     with patch(
-        "my_private_finances.services.watch_folder.import_transactions_from_csv_path",
+        "my_private_finances.services.watch_folder.parse_csv_file",
         side_effect=ValueError("simulated import failure"),
     ):
         await _process_file(src, session_factory)
@@ -281,6 +291,38 @@ async def test_process_file_import_exception_moves_to_failed(
     )
 
 
+@pytest.mark.asyncio
+async def test_process_file_parses_outside_write_queue(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    """Only storing the parsed rows holds the write queue."""
+    account = await create_account(test_app)
+    await test_app.post(
+        "/api/watch-folder/configs",
+        json={"subfolder_name": "giro", "account_id": account["id"]},
+    )
+    src = tmp_path / "watch" / "giro" / "jan.csv"
+    src.parent.mkdir(parents=True)
+    src.write_text(
+        "booking_date,amount,currency,payee,purpose,external_id\n"
+        "2026-01-05,-12.50,EUR,Bakery,Bread,w-1\n"
+    )
+    session_factory = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+    queue = write_queue(session_factory)
+    depths: list[int] = []
+
+    def parse(*args: Any, **kwargs: Any) -> Any:
+        depths.append(queue.depth)
+        return parse_csv_file(*args, **kwargs)
+
+    with patch("my_private_finances.services.watch_folder.parse_csv_file", parse):
+        assert await _process_file(src, session_factory) == "processed"
+
+    assert depths == [0]
+    resp = await test_app.get("/api/transactions", params={"account_id": account["id"]})
+    assert len(resp.json()["items"]) == 1
+
+
 # ---------------------------------------------------------------------------
 # watch_folder_task lifecycle
 # ---------------------------------------------------------------------------
@@ -314,3 +356,271 @@ async def test_watch_folder_task_creates_directory_and_cancels_cleanly(
         pass  # expected
 
     await engine.dispose()
+
+
+# ---------------------------------------------------------------------------
+# Worker pool
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_settings_concurrency_default_and_update(test_app: AsyncClient) -> None:
+    resp = await test_app.get("/api/watch-folder/settings")
+    assert resp.json()["concurrency"] == 4
+
+    async def _noop(*args: object, **kwargs: object) -> None:
+        pass
+
+    with patch(
+        "my_private_finances.api.routes.watch_folder.watch_folder_task",
+        side_effect=_noop,
+    ):
+        resp = await test_app.patch(
+            "/api/watch-folder/settings", json={"concurrency": 2}
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"root_path": "data/watch", "concurrency": 2}
+
+        status = await test_app.get("/api/watch-folder/status")
+        assert status.json()["concurrency"] == 2
+
+    resp = await test_app.patch("/api/watch-folder/settings", json={"concurrency": 0})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_status_without_running_watcher(test_app: AsyncClient) -> None:
+    resp = await test_app.get("/api/watch-folder/status")
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "running": False,
+        "concurrency": 4,
+        "queue_depth": 0,
+        "in_flight": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_pool_serializes_per_account_and_parallelizes_across(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    """Files of one account run in order; other accounts run alongside."""
+    for name in ("giro", "savings"):
+        account = await create_account(test_app, name=name)
+        await test_app.post(
+            "/api/watch-folder/configs",
+            json={"subfolder_name": name, "account_id": account["id"]},
+        )
+
+    files = [
+        tmp_path / "watch" / "giro" / "jan.csv",
+        tmp_path / "watch" / "giro" / "feb.csv",
+        tmp_path / "watch" / "savings" / "jan.csv",
+    ]
+    for f in files:
+        f.parent.mkdir(parents=True, exist_ok=True)
+        f.write_text("booking_date,amount,currency\n")
+
+    events: list[str] = []
+    release = asyncio.Event()
+
+    async def fake_process(path: Path, session_factory: object) -> str:
+        label = f"{path.parent.name}/{path.name}"
+        events.append(f"start {label}")
+        await release.wait()
+        events.append(f"end {label}")
+        return "processed"
+
+    app_state = test_app._transport.app.state  # type: ignore[union-attr]
+    pool = WatchWorkerPool(
+        app_state.session_factory,
+        concurrency=3,
+        read_session_factory=app_state.read_session_factory,
+    )
+    queue: asyncio.Queue[Path] = asyncio.Queue()
+
+    with (
+        patch("my_private_finances.services.watch_folder._SETTLE_INITIAL_DELAY", 0),
+        patch(
+            "my_private_finances.services.watch_folder.WATCH_SETTLE_QUIET_SECONDS", 0
+        ),
+        patch(
+            "my_private_finances.services.watch_folder._process_file",
+            side_effect=fake_process,
+        ),
+    ):
+        runner = asyncio.create_task(pool.run(queue))
+        for f in files:
+            queue.put_nowait(f)
+
+        for _ in range(100):
+            if len(events) == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        # giro/feb waits behind giro/jan although a worker is free
+        assert sorted(events) == ["start giro/jan.csv", "start savings/jan.csv"]
+        status = pool.status()
+        assert status.running
+        assert status.queue_depth == 1
+        assert len(status.in_flight) == 2
+
+        release.set()
+        for _ in range(100):
+            if len(events) == 6:
+                break
+            await asyncio.sleep(0.01)
+
+        runner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await runner
+
+    assert events.index("end giro/jan.csv") < events.index("start giro/feb.csv")
+    assert pool.status().queue_depth == 0
+    assert not pool.status().running
+
+
+# ---------------------------------------------------------------------------
+# Readiness, events and catch-up
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_wait_until_stable_static_file(tmp_path: Path) -> None:
+    path = tmp_path / "done.csv"
+    path.write_text("a,b\n")
+    assert await wait_until_stable(path, initial_delay=0.01, quiet_period=0.02)
+
+
+@pytest.mark.asyncio
+async def test_wait_until_stable_waits_for_writer(tmp_path: Path) -> None:
+    path = tmp_path / "growing.csv"
+    path.write_text("header\n")
+
+    async def writer() -> None:
+        for i in range(5):
+            await asyncio.sleep(0.01)
+            with path.open("a") as f:
+                f.write(f"row {i}\n")
+
+    writing = asyncio.create_task(writer())
+    # Polls less often than the writer writes, so it cannot see a pause
+    assert await wait_until_stable(
+        path, initial_delay=0.03, max_delay=0.1, quiet_period=0.1
+    )
+    assert writing.done()
+    assert path.read_text().count("row") == 5
+
+
+@pytest.mark.asyncio
+async def test_wait_until_stable_outlasts_writer_pause(tmp_path: Path) -> None:
+    path = tmp_path / "paused.csv"
+    path.write_text("header\n")
+
+    async def writer() -> None:
+        for i in range(3):
+            # Longer than one polling interval, shorter than the quiet period
+            await asyncio.sleep(0.08)
+            with path.open("a") as f:
+                f.write(f"row {i}\n")
+
+    writing = asyncio.create_task(writer())
+    assert await wait_until_stable(
+        path, initial_delay=0.02, max_delay=0.02, quiet_period=0.2
+    )
+    assert writing.done()
+    assert path.read_text().count("row") == 3
+
+
+@pytest.mark.asyncio
+async def test_wait_until_stable_gives_up(tmp_path: Path) -> None:
+    missing = tmp_path / "gone.csv"
+    assert not await wait_until_stable(missing, initial_delay=0.01, quiet_period=0)
+
+    path = tmp_path / "busy.csv"
+    path.write_text("x")
+    stop = asyncio.Event()
+
+    async def writer() -> None:
+        while not stop.is_set():
+            with path.open("a") as f:
+                f.write("x")
+            await asyncio.sleep(0.005)
+
+    writing = asyncio.create_task(writer())
+    try:
+        assert not await wait_until_stable(
+            path, initial_delay=0.01, quiet_period=0, timeout=0.05
+        )
+    finally:
+        stop.set()
+        await writing
+
+
+@pytest.mark.asyncio
+async def test_queue_handler_forwards_moved_and_modified(tmp_path: Path) -> None:
+    from watchdog.events import (  # type: ignore[import-untyped]
+        DirModifiedEvent,
+        FileModifiedEvent,
+        FileMovedEvent,
+    )
+
+    queue: asyncio.Queue[Path] = asyncio.Queue()
+    handler = QueueHandler(queue, asyncio.get_running_loop())
+    handler.on_moved(FileMovedEvent(str(tmp_path / "a.part"), str(tmp_path / "a.csv")))
+    handler.on_modified(FileModifiedEvent(str(tmp_path / "b.csv")))
+    handler.on_modified(FileModifiedEvent(str(tmp_path / "notes.txt")))
+    handler.on_modified(DirModifiedEvent(str(tmp_path)))
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert [queue.get_nowait(), queue.get_nowait()] == [
+        tmp_path / "a.csv",
+        tmp_path / "b.csv",
+    ]
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_catch_up_scan_queues_configured_subfolders(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    import os
+
+    account = await create_account(test_app)
+    await test_app.post(
+        "/api/watch-folder/configs",
+        json={"subfolder_name": "giro", "account_id": account["id"]},
+    )
+    watch = tmp_path / "watch"
+    (watch / "giro").mkdir(parents=True)
+    (watch / "stray").mkdir()
+    newer = watch / "giro" / "feb.csv"
+    older = watch / "giro" / "jan.csv"
+    for i, path in enumerate((older, newer)):
+        path.write_text("x")
+        os.utime(path, ns=(1_000_000_000 * (i + 1), 1_000_000_000 * (i + 1)))
+    (watch / "giro" / "readme.txt").write_text("x")
+    (watch / "stray" / "other.csv").write_text("x")
+
+    queue: asyncio.Queue[Path] = asyncio.Queue()
+    session_factory = test_app._transport.app.state.session_factory  # type: ignore[union-attr]
+    assert await catch_up_scan(watch, queue, session_factory) == 2
+    assert [queue.get_nowait(), queue.get_nowait()] == [older, newer]
+
+
+@pytest.mark.asyncio
+async def test_pool_drops_repeated_events(
+    test_app: AsyncClient, tmp_path: Path
+) -> None:
+    app_state = test_app._transport.app.state  # type: ignore[union-attr]
+    pool = WatchWorkerPool(app_state.session_factory, max_backlog=4)
+    path = tmp_path / "watch" / "giro" / "jan.csv"
+
+    for _ in range(3):
+        await pool._capacity.acquire()
+        await pool.submit(path)
+
+    assert pool.queue_depth == 1
+    # Repeats hand their capacity straight back
+    assert pool._capacity._value == 3
@@ -4,7 +4,7 @@ import styles from "./Pagination.module.css";
 type Props = {
   page: number;
   totalPages: number;
-  total: number;
+  total: number | null;
   onPrevious: () => void;
   onNext: () => void;
 };
@@ -18,7 +18,11 @@ export function Pagination({ page, totalPages, total, onPrevious, onNext }: Prop
       <button disabled={page <= 1} onClick={onPrevious}>
         {t("pagination.previous")}
       </button>
-      <span>{t("pagination.pageInfo", { page, totalPages, total })}</span>
+      <span>
+        {total === null
+          ? t("pagination.pageInfoNoTotal", { page })
+          : t("pagination.pageInfo", { page, totalPages, total })}
+      </span>
       <button disabled={page >= totalPages} onClick={onNext}>
         {t("pagination.next")}
       </button>
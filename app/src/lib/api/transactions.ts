@@ -17,7 +17,9 @@ export type TransactionItem = {
 
 export type TransactionListResponse = {
   items: TransactionItem[];
-  total: number;
+  // null when the API skipped the count (cursor pages)
+  total: number | null;
+  next_cursor: string | null;
 };
 
 export type TransactionParams = {
@@ -2,6 +2,20 @@ import { apiDelete, apiGet, apiPatch, apiPost, apiPut } from "./client";
 
 export interface WatchSettings {
   root_path: string;
+  concurrency: number;
+}
+
+export interface WatchInFlightFile {
+  path: string;
+  account_id: number | null;
+  started_at: string;
+}
+
+export interface WatchStatus {
+  running: boolean;
+  concurrency: number;
+  queue_depth: number;
+  in_flight: WatchInFlightFile[];
 }
 
 export interface WatchFolderConfig {
@@ -30,6 +44,10 @@ export function updateWatchSettings(root_path: string): Promise<WatchSettings> {
   return apiPatch<WatchSettings>("/api/watch-folder/settings", { root_path });
 }
 
+export function getWatchStatus(): Promise<WatchStatus> {
+  return apiGet<WatchStatus>("/api/watch-folder/status");
+}
+
 export function getWatchConfigs(): Promise<WatchFolderConfig[]> {
   return apiGet<WatchFolderConfig[]>("/api/watch-folder/configs");
 }
@@ -52,9 +52,15 @@ export default function Transactions() {
     return map;
   }, [suggestionsData]);
 
-  const total = txQuery.data?.total ?? 0;
-  const totalPages = Math.max(1, Math.ceil(total / PAGE_SIZE));
+  const total = txQuery.data?.total ?? null;
   const page = Math.floor(offset / PAGE_SIZE) + 1;
+  // Without a count, only offer the next page while the API reports more rows
+  const totalPages =
+    total !== null
+      ? Math.max(1, Math.ceil(total / PAGE_SIZE))
+      : txQuery.data?.next_cursor
+        ? page + 1
+        : page;
 
   const currency =
     accountId === "all"
@@ -31,6 +31,15 @@ describe("Pagination", () => {
     expect(screen.getByText("Next")).toBeDisabled();
   });
 
+  it("omits the count when total is unknown", () => {
+    render(
+      <Pagination page={2} totalPages={3} total={null} onPrevious={vi.fn()} onNext={vi.fn()} />,
+    );
+
+    expect(screen.getByText("Page 2")).toBeInTheDocument();
+    expect(screen.getByText("Next")).not.toBeDisabled();
+  });
+
   it("returns null when single page", () => {
     const { container } = render(
       <Pagination page={1} totalPages={1} total={10} onPrevious={vi.fn()} onNext={vi.fn()} />,